@@ -1,6 +1,7 @@
 import argparse
-import queue
 import sys
+import threading
+from collections import Counter
 from pathlib import Path
 
 # [Created] by LLM model | 2025-11-13_01
@@ -9,19 +10,48 @@ CLI wrapper for headless operation of the sync engine.
 
 Usage:
     python cli_sync.py folder1 folder2 [folder3 ...]
+    python cli_sync.py --watch folder1 folder2 [folder3 ...]
+    python cli_sync.py --resume folder1 folder2 [folder3 ...]
+    python cli_sync.py scan folder1 folder2 [folder3 ...]
+    python cli_sync.py plan -o plan.jsonl folder1 folder2 [folder3 ...]
+    python cli_sync.py execute [--force] [--folder f1 --folder f2 ...] plan.jsonl
+    python cli_sync.py --stats folder1 folder2   (any command: print run statistics)
 
 This script:
 - Loads configuration via load_config()
 - Validates provided folders contain a .roo directory
-- Creates a SyncEngine with a Queue for events
-- Runs a synchronous sync via engine.run_sync(folders)
-- Prints basic progress events from the event queue to stdout
+- Creates a SyncEngine with a bounded event queue
+- Cleans up after an interrupted sync of the same folders (see SyncJournal) and,
+  with --resume or on confirmation, executes only its unfinished actions
+- Runs scan, plan and execute on a worker thread (Ctrl+C cancels cooperatively)
+- Prints progress events from the event queue to stdout while the sync runs
+- With --watch, keeps running and syncs changed files as they change
+- The scan/plan/execute subcommands split a sync in two: `plan` writes a plan
+  file (see utils_sync.plan_file) that `execute` runs later, streaming its
+  actions and skipping those whose files changed since the plan was written
+- With --stats, enables collect_stats and prints the run's phase timings and
+  counters (see utils_sync.sync_stats) when the command finishes
 """
 
 from utils_sync.sync_core import SyncEngine
 from utils_sync.config_sync import load_config
 from utils_sync.file_path_utils import has_roo_dir
-from utils_sync.progress_events import EventType, ProgressEvent
+from utils_sync.progress_events import BoundedEventQueue, EventType, ProgressEvent
+from utils_sync.watcher import run_watch_loop
+from utils_sync.sync_control import SyncCancelled, SyncControl
+from utils_sync.sync_journal import SyncJournal
+from utils_sync.plan_file import PLAN_CHUNK_SIZE, PlanFileError, PlanReader, config_hash, write_plan
+from utils_sync.sync_stats import format_stats
+
+# Subcommands; without one, the arguments are a plain sync (the "sync" command)
+COMMANDS = ("sync", "scan", "plan", "execute")
+
+# Explanations of PlanReader skip reasons
+_SKIP_MESSAGES = {
+    "done": "Already up to date",
+    "source_changed": "Source changed since the plan was written",
+    "destination_changed": "Destination changed since the plan was written",
+}
 
 def _print_event(event: ProgressEvent) -> None:
     """Print a concise, human-readable representation of a ProgressEvent."""
@@ -30,6 +60,8 @@ def _print_event(event: ProgressEvent) -> None:
         print(f"[SCAN_START] {event.folder} - {event.message}")
     elif et == EventType.SCAN_FILE:
         print(f"[SCAN_FILE] {event.folder}: {event.file_path}")
+    elif et == EventType.SCAN_PROGRESS:
+        print(f"[SCAN_PROGRESS] {event.folder}: {event.message}")
     elif et == EventType.COPY:
         print(f"[COPY] {event.file_path} - {event.message}")
     elif et == EventType.SKIP:
@@ -38,24 +70,132 @@ def _print_event(event: ProgressEvent) -> None:
         print(f"[ERROR] {event.message}")
     elif et == EventType.COMPLETE:
         print(f"[COMPLETE] {event.message}")
+    elif et == EventType.CANCELLED:
+        print(f"[CANCELLED] {event.message}")
     else:
         # Generic fallback
         print(f"[{et}] {event.message}")
 
-def run_cli_sync(folders):
-    # [Created-or-Modified] by LLM model | 2025-11-13_01
+def _drain_events(event_queue) -> None:
+    """Print every event currently waiting in the queue."""
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    while not event_queue.empty():
+        event = event_queue.get()
+        try:
+            _print_event(event)
+        except Exception:
+            # Best-effort printing
+            print(f"[EVENT] {getattr(event, 'message', repr(event))}")
+
+def _read_commands(control: SyncControl) -> None:
+    """Apply p(ause), r(esume) and c(ancel) commands typed on stdin to control."""
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    for line in sys.stdin:
+        command = line.strip().lower()
+        if command in ("p", "pause"):
+            control.pause()
+            print("[PAUSED] Enter r to resume, c to cancel")
+        elif command in ("r", "resume"):
+            control.resume()
+            print("[RESUMED]")
+        elif command in ("c", "cancel"):
+            control.cancel()
+            print("[CANCEL] Stopping after the current file...")
+        if control.cancelled:
+            return
+
+def _recover_journal(journal: SyncJournal, resume: bool):
     """
-    Run a synchronous CLI-based sync operation.
+    Clean up after an interrupted sync and decide whether to resume it.
 
-    Args:
-        folders: iterable of folder paths (str or Path)
+    Returns:
+        The unfinished actions to execute instead of a full sync, or None
     """
-    # Normalize folder paths to Path objects
-    folders = [Path(f) for f in folders]
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    pending = journal.recover()
+    print(
+        f"[JOURNAL] Unfinished sync from {journal.started}: {len(pending)} actions left "
+        f"(removed {journal.removed_temps} temp files, restored {journal.restored_backups} backups)"
+    )
+    if not pending:
+        journal.discard()
+        return None
+    if not resume and sys.stdin is not None and sys.stdin.isatty():
+        answer = input("Resume only the unfinished actions? [Y/n] ").strip().lower()
+        resume = answer in ("", "y", "yes")
+    if resume:
+        return pending
+    print("[JOURNAL] Running a full sync instead (use --resume to finish only the unfinished actions)")
+    return None
+
+def _run_job(job, event_queue, control: SyncControl):
+    """
+    Run job() on a worker thread while printing events as they arrive.
+
+    While it runs, Ctrl+C (or typing c) cancels control; on a terminal, p pauses
+    and r resumes. A second Ctrl+C aborts immediately.
+
+    Returns:
+        The return value of job()
+
+    Raises:
+        Whatever job() raised (e.g. SyncCancelled)
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    result = []
+    failure = []
+
+    def _run():
+        try:
+            result.append(job())
+        except BaseException as e:
+            failure.append(e)
+
+    worker = threading.Thread(target=_run, daemon=True)
+    worker.start()
+    if sys.stdin is not None and sys.stdin.isatty():
+        print("[SYNC] Enter p to pause, r to resume, c to cancel")
+        threading.Thread(target=_read_commands, args=(control,), daemon=True).start()
+    while worker.is_alive():
+        try:
+            worker.join(timeout=0.1)
+            _drain_events(event_queue)
+        except KeyboardInterrupt:
+            if control.cancelled:
+                raise
+            # First Ctrl+C: stop cooperatively; a second one aborts immediately
+            control.cancel()
+            print("[CANCEL] Stopping after the current file...")
+    _drain_events(event_queue)
+    if event_queue.dropped:
+        print(f"[EVENTS] {event_queue.dropped} low-priority events dropped")
+    if failure:
+        raise failure[0]
+    return result[0]
+
+def _create_engine(config_path=None, stats=False):
+    """Load the config and create an engine with a bounded event queue."""
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    config = load_config(config_path)
+    if stats:
+        config["collect_stats"] = True
+    # The queue is bounded: under load, per-file scan/skip events may be
+    # dropped, but COPY, ERROR and COMPLETE never are.
+    event_queue = BoundedEventQueue(config.get("event_queue_size", 10000))
+    return SyncEngine(config, event_queue), event_queue
 
-    # Load configuration
-    config = load_config(args.config)
+def _print_stats(engine) -> None:
+    """Print the engine's run statistics, if collect_stats is on."""
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    stats = engine.stats.as_dict()
+    if stats is None:
+        return
+    for line in format_stats(stats):
+        print(f"[STATS] {line}")
 
+def _check_folders(folders):
+    """Exit with an error unless there are two or more folders that each contain .roo."""
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
     # Validate number of folders
     if len(folders) < 2:
         print("Error: At least two folders must be provided for sync.", file=sys.stderr)
@@ -68,50 +208,344 @@ def run_cli_sync(folders):
             print(f"Error: Folder does not contain a .roo subdirectory: {bad}", file=sys.stderr)
         sys.exit(1)
 
-    # Create event queue and engine
-    event_queue = queue.Queue()
-    engine = SyncEngine(config, event_queue)
+def run_cli_sync(
+    folders,
+    watch=False,
+    debounce=0.5,
+    interval=2.0,
+    use_inotify=True,
+    resume=False,
+    config_path=None,
+    stats=False,
+):
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """
+    Run a synchronous CLI-based sync operation.
+
+    Args:
+        folders: iterable of folder paths (str or Path)
+        watch: if True, keep watching the folders after the initial sync and
+               sync changed paths incrementally until interrupted
+        debounce: seconds without further changes before a watch-mode sync
+        interval: poll interval in seconds when inotify is unavailable
+        use_inotify: set False to force the polling watcher
+        resume: if True, execute only the unfinished actions of an interrupted
+                sync of these folders (without scanning); a full sync runs if
+                there are none
+        config_path: optional config file (defaults to config.txt or AGENTFLOW_CONFIG)
+        stats: if True, collect and print run statistics (collect_stats)
+
+    While the sync runs, Ctrl+C (or typing c) cancels it after the current file;
+    on a terminal, p pauses and r resumes. A cancelled sync exits with code 130.
+    """
+    # Normalize folder paths to Path objects
+    folders = [Path(f) for f in folders]
+    _check_folders(folders)
+    engine, event_queue = _create_engine(config_path, stats=stats)
+
+    # An unfinished journal means the last sync of these folders was interrupted
+    journal = engine.open_journal(folders)
+    resume_actions = None
+    if journal is not None and journal.exists():
+        resume_actions = _recover_journal(journal, resume)
+    elif resume:
+        print("[JOURNAL] No unfinished sync to resume; running a full sync")
+
+    # Run the sync on a worker thread so events are printed (and released) as
+    # they arrive instead of accumulating until the end
+    control = SyncControl()
+
+    def _sync():
+        if resume_actions is not None:
+            return engine.execute_actions(resume_actions, control=control, journal=journal)
+        return engine.run_sync(folders, control=control, journal=journal)
 
-    # Run synchronous sync operation
     try:
-        engine.run_sync(folders)
-    except AttributeError:
-        # In case SyncEngine exposes only scan/plan/execute, try the sequence
+        pending = _run_job(_sync, event_queue, control)
+    except SyncCancelled:
+        print("[CANCELLED] Sync cancelled before any file was copied")
+        sys.exit(130)
+    except Exception as e:
+        print(f"Sync failed: {e}", file=sys.stderr)
+        sys.exit(2)
+    _print_stats(engine)
+    if pending:
+        if journal is not None:
+            print("[JOURNAL] Run again with --resume to finish the remaining actions")
+        sys.exit(130)
+
+    if watch:
+        print("[WATCH] Watching for changes (Ctrl+C to stop)")
+
+        def _on_cycle(actions):
+            _drain_events(event_queue)
+            _print_stats(engine)
+
+        # Like the initial sync: Ctrl+C cancels the control, so a copy in
+        # progress finishes and every cycle is journaled
+        watch_control = SyncControl()
+
+        def _watch():
+            return run_watch_loop(
+                engine,
+                folders,
+                debounce=debounce,
+                interval=interval,
+                use_inotify=use_inotify,
+                on_cycle=_on_cycle,
+                control=watch_control,
+                journal=journal,
+            )
+
         try:
-            file_index = engine.scan_folders(folders)
-            actions = engine.plan_actions(file_index)
-            engine.execute_actions(actions)
+            pending = _run_job(_watch, event_queue, watch_control)
+        except KeyboardInterrupt:
+            # A second Ctrl+C; the journal lets the next run clean up
+            pending = []
         except Exception as e:
             print(f"Sync failed: {e}", file=sys.stderr)
             sys.exit(2)
+        print("[WATCH] Stopped")
+        if pending:
+            if journal is not None:
+                print("[JOURNAL] Run again with --resume to finish the remaining actions")
+            sys.exit(130)
+
+def run_cli_scan(folders, config_path=None, stats=False):
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """Scan folders and print how many files each one has (nothing is planned or copied)."""
+    folders = [Path(f) for f in folders]
+    _check_folders(folders)
+    engine, event_queue = _create_engine(config_path, stats=stats)
+    control = SyncControl()
+    try:
+        file_index = _run_job(lambda: engine.scan_folders(folders, control=control), event_queue, control)
+    except SyncCancelled:
+        print("[CANCELLED] Scan cancelled")
+        sys.exit(130)
     except Exception as e:
-        print(f"Sync failed: {e}", file=sys.stderr)
+        print(f"Scan failed: {e}", file=sys.stderr)
         sys.exit(2)
+    counts = Counter(entry["base_folder"] for entries in file_index.values() for entry in entries)
+    for folder in folders:
+        print(f"[SCAN] {folder}: {counts.get(folder, 0)} files")
+    print(f"[SCAN] {sum(counts.values())} files, {len(file_index)} distinct paths")
+    _print_stats(engine)
+
+def run_cli_plan(folders, output, config_path=None, stats=False):
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """
+    Scan and plan folders, then write the plan to a plan file for `execute`.
+
+    Args:
+        folders: iterable of folder paths (str or Path)
+        output: plan file to write (a `.gz` name is gzip-compressed)
+        config_path: optional config file
+        stats: if True, collect and print run statistics (collect_stats)
+    """
+    folders = [Path(f) for f in folders]
+    _check_folders(folders)
+    engine, event_queue = _create_engine(config_path, stats=stats)
+    control = SyncControl()
+
+    def _plan():
+        file_index = engine.scan_folders(folders, control=control)
+        actions = engine.plan_actions(file_index, base_folders=folders, control=control)
+        return write_plan(output, actions, folders, engine.config)
+
+    try:
+        written = _run_job(_plan, event_queue, control)
+    except SyncCancelled:
+        print("[CANCELLED] Planning cancelled; no plan file was written")
+        sys.exit(130)
+    except Exception as e:
+        print(f"Planning failed: {e}", file=sys.stderr)
+        sys.exit(2)
+    print(f"[PLAN] Wrote {written} actions for {len(folders)} folders to {output}")
+    _print_stats(engine)
+
+def run_cli_execute(plan_path, config_path=None, force=False, stats=False, folders=None):
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """
+    Execute a plan file written by `plan`, streaming its actions.
+
+    Actions are read and executed about PLAN_CHUNK_SIZE at a time, in a single
+    engine run (one COMPLETE, one backup retention pass). Actions whose files
+    changed since the plan was written are skipped, so running the same plan
+    again finishes an interrupted execute.
+
+    Args:
+        plan_path: plan file to execute
+        config_path: optional config file
+        force: execute even if the plan was made with different settings
+        stats: if True, collect and print run statistics (collect_stats)
+        folders: optional folders replacing the plan's, in the plan's folder
+                 order (e.g. the same projects at other paths on this machine)
+    """
+    engine, event_queue = _create_engine(config_path, stats=stats)
+    if folders is not None:
+        folders = [Path(f) for f in folders]
+        _check_folders(folders)
+    try:
+        reader = PlanReader(plan_path, folders=folders)
+    except (OSError, PlanFileError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    with reader:
+        if folders is not None:
+            for planned, folder in zip(reader.planned_folders, reader.folders):
+                print(f"[PLAN] {planned} -> {folder}")
+        if reader.config_hash != config_hash(engine.config) and not force:
+            print(
+                "Error: The plan was made with different settings; "
+                "use --force to execute it anyway.",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        print(f"[PLAN] {reader.count} actions planned {reader.created} for {len(reader.folders)} folders")
+        control = SyncControl()
+        totals = reader.folder_totals
+
+        def _skip(action, reason):
+            print(f"[SKIP] {action['relative_path']} - {_SKIP_MESSAGES[reason]}: {action['destination_path']}")
+            # Skipped actions never reach the engine, so leave them out of the totals
+            folder = str(action.get("destination_folder"))
+            if totals is not None and folder in totals:
+                totals[folder] -= 1
+
+        def _execute():
+            return engine.execute_actions(
+                reader.actions(on_skip=_skip),
+                control=control,
+                chunk_size=PLAN_CHUNK_SIZE,
+                totals=totals,
+            )
 
-    # After run_sync completes, drain and print remaining events
-    while not event_queue.empty():
-        event = event_queue.get()
         try:
-            _print_event(event)
-        except Exception:
-            # Best-effort printing
-            print(f"[EVENT] {getattr(event, 'message', repr(event))}")
+            stopped = bool(_run_job(_execute, event_queue, control))
+        except SyncCancelled:
+            stopped = True
+        except (OSError, PlanFileError) as e:
+            print(f"Execute failed: {e}", file=sys.stderr)
+            sys.exit(2)
+        skipped = ", ".join(f"{count} {reason}" for reason, count in reader.skipped.items() if count)
+        if skipped:
+            print(f"[PLAN] Skipped: {skipped}")
+    _print_stats(engine)
+    if stopped:
+        print("[PLAN] Cancelled; run execute again with the same plan to finish it")
+        sys.exit(130)
 
-def _parse_args():
-    p = argparse.ArgumentParser(
-        description="Headless CLI wrapper for the AgentFlow sync engine."
-    )
+def _add_folder_args(p, with_config=True):
     p.add_argument(
         "folders",
         nargs="+",
         help="Folders to synchronize (must contain a .roo subdirectory)"
     )
+    if with_config:
+        _add_config_arg(p)
+
+def _add_config_arg(p):
     p.add_argument(
         "--config",
         help="Path to config file (optional, defaults to config.txt or AGENTFLOW_CONFIG env var)"
     )
-    return p.parse_args()
+    p.add_argument(
+        "--stats",
+        action="store_true",
+        help="Collect phase timings and counters and print them at the end (collect_stats)"
+    )
+
+def _parse_args(argv=None):
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    argv = sys.argv[1:] if argv is None else list(argv)
+    p = argparse.ArgumentParser(
+        description="Headless CLI wrapper for the AgentFlow sync engine.",
+        epilog="Without a command, the arguments are those of the sync command.",
+    )
+    commands = p.add_subparsers(dest="command")
+
+    sync = commands.add_parser("sync", help="Scan, plan and execute in one run (default)")
+    _add_folder_args(sync)
+    sync.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and sync files as they change (inotify on Linux, polling elsewhere)"
+    )
+    sync.add_argument(
+        "--debounce",
+        type=float,
+        default=0.5,
+        help="Seconds without further changes before a watch-mode sync runs (default: 0.5)"
+    )
+    sync.add_argument(
+        "--interval",
+        type=float,
+        default=2.0,
+        help="Poll interval in seconds when inotify is unavailable (default: 2.0)"
+    )
+    sync.add_argument(
+        "--resume",
+        action="store_true",
+        help="Finish an interrupted sync of these folders, executing only its unfinished actions"
+    )
+    sync.add_argument(
+        "--poll",
+        action="store_true",
+        help="Force the polling watcher even where inotify is available"
+    )
+
+    scan = commands.add_parser("scan", help="Scan folders and report file counts")
+    _add_folder_args(scan)
+
+    plan = commands.add_parser("plan", help="Scan and plan, then write a plan file for execute")
+    _add_folder_args(plan)
+    plan.add_argument(
+        "-o", "--output",
+        required=True,
+        help="Plan file to write (a .gz name is gzip-compressed)"
+    )
+
+    execute = commands.add_parser("execute", help="Execute a plan file written by plan")
+    execute.add_argument("plan_file", help="Plan file to execute")
+    _add_config_arg(execute)
+    execute.add_argument(
+        "--force",
+        action="store_true",
+        help="Execute even if the plan was made with different settings"
+    )
+    execute.add_argument(
+        "--folder",
+        action="append",
+        dest="folders",
+        metavar="FOLDER",
+        help="Run the plan against this folder instead of its own; give one per plan folder, in the plan's folder order"
+    )
+
+    # Plain "cli_sync.py [options] folder1 folder2" keeps working as a sync
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["sync"] + argv
+    return p.parse_args(argv)
 
 if __name__ == "__main__":
     args = _parse_args()
-    run_cli_sync(args.folders)
\ No newline at end of file
+    if args.command == "scan":
+        run_cli_scan(args.folders, config_path=args.config, stats=args.stats)
+    elif args.command == "plan":
+        run_cli_plan(args.folders, args.output, config_path=args.config, stats=args.stats)
+    elif args.command == "execute":
+        run_cli_execute(
+            args.plan_file, config_path=args.config, force=args.force, stats=args.stats,
+            folders=args.folders,
+        )
+    else:
+        run_cli_sync(
+            args.folders,
+            watch=args.watch,
+            debounce=args.debounce,
+            interval=args.interval,
+            use_inotify=not args.poll,
+            resume=args.resume,
+            config_path=args.config,
+            stats=args.stats,
+        )
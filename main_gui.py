@@ -8,12 +8,17 @@ from tkinter import ttk, filedialog, messagebox
 import queue
 from pathlib import Path
 from functools import partial
-import datetime
 from utils_sync import config_sync, file_path_utils
 from utils_sync.sync_core import SyncEngine
 from utils_sync.sync_worker import SyncWorker
-from utils_sync.progress_events import ProgressEvent, EventType
-from utils_sync.ui_utils import FolderItem
+from utils_sync.progress_events import BoundedEventQueue, ProgressEvent, EventType
+from utils_sync.ui_utils import GRAY_PREVIEW, FolderItem
+from utils_sync.background_tasks import BackgroundTasks
+from utils_sync.sync_control import SyncCancelled, SyncControl
+from utils_sync.sync_journal import SyncJournal
+from utils_sync.sync_plan import PlanChange, SyncPlan
+from utils_sync.plan_file import PlanReader, config_hash
+from utils_sync.preview_model import PreviewModel, format_mtime, preview_items
 
 # Global UI colors for dark mode
 DARK_BG = "#000000"
@@ -26,6 +31,17 @@ BUTTON_BG_HOVER = "#111111"
 BUTTON_BORDER = "#00ff5f"
 BUTTON_TEXT = FG_PRIMARY
 
+# Event pump: delay between UI ticks while work is pending, and the maximum
+# number of queued progress events applied per tick
+EVENT_TICK_MS = 50
+MAX_EVENTS_PER_TICK = 500
+# Background task results (e.g. one folder's preview) applied per tick
+MAX_TASK_RESULTS_PER_TICK = 2
+
+# Folder status shown after a failed copy; kept until the next run resets it
+ERROR_STATUS = "Error during sync"
+CANCELLED_STATUS = "Cancelled"
+
 class MainApp:
     """Main application window for Agentflow File Sync."""
     # [Created] by Claude Sonnet 4.5 | 2025-11-13_01
@@ -55,8 +71,9 @@ class MainApp:
         # Apply base dark background to root window
         self.root.configure(bg=DARK_BG)
         
-        # Create event queue for progress updates
-        self.event_queue = queue.Queue()
+        # Create event queue for progress updates; bounded so huge scans cannot
+        # pile up unbounded per-file events between UI ticks
+        self.event_queue = BoundedEventQueue(self.config.get("event_queue_size", 10000))
         
         # Initialize sync engine
         self.sync_engine = SyncEngine(self.config, self.event_queue)
@@ -66,6 +83,14 @@ class MainApp:
         
         # Initialize sync state
         self.is_syncing = False
+        self._sync_worker = None
+        self._event_pump_scheduled = False
+        
+        # Scan/plan and .bak work runs here instead of on the Tk thread
+        self.background_tasks = BackgroundTasks()
+        self._preview_task = None
+        # Pause/cancel token of the running preview or execution
+        self._run_control = None
         
         # Initialize folder widgets dictionary
         self.folder_widgets = {}
@@ -74,14 +99,18 @@ class MainApp:
         self.browse_button = None
         self.sync_button = None
         self.confirm_button = None
+        self.pause_button = None
+        self.cancel_button = None
         self.load_favorites_button = None
         
         # Store status label references
         self.dry_run_label = None
         self.ignore_patterns_label = None
         
-        # Store planned actions for two-stage sync (preview then execute)
-        self.planned_actions = []
+        # Store planned actions for two-stage sync (preview then execute); the
+        # SyncPlan notifies _on_plan_change so edits redraw only their folder
+        self.planned_actions = SyncPlan()
+        self._plan_unsubscribe = None
         
         # Create UI widgets
         self._create_widgets()
@@ -90,8 +119,11 @@ class MainApp:
         self._update_dry_run_status()
         self._update_ignore_patterns_display()
         
-        # Start periodic event processing
-        self._process_events()
+        # Event processing is scheduled on demand whenever a worker is started
+        # (see _schedule_event_pump); nothing wakes the UI while idle.
+        
+        # Offer to finish a sync that was interrupted last time
+        self.root.after_idle(self._offer_resume)
     
     def _create_widgets(self):
         """Create and layout all UI widgets."""
@@ -202,6 +234,22 @@ class MainApp:
             background=[("active", "#145232")],  # slightly lighter but still dark green on hover
         )
  
+        # Preview list style: the per-folder planned-overwrite Treeview blends into the dark rows
+        style.configure(
+            "AF.Treeview",
+            background=DARK_BG,
+            fieldbackground=DARK_BG,
+            foreground=GRAY_PREVIEW,
+            bordercolor=DARK_BG,
+            font=("TkDefaultFont", 8),
+            rowheight=16,
+        )
+        style.map(
+            "AF.Treeview",
+            background=[("selected", "#0f3b24")],
+            foreground=[("selected", FG_PRIMARY)],
+        )
+ 
         # Ensure the root window background matches the dark theme
         self.root.configure(bg=DARK_BG)
         
@@ -313,6 +361,25 @@ class MainApp:
         )
         self.confirm_button.grid(row=0, column=2, padx=(0, 5))
         
+        # Pause/Resume and Cancel buttons (enabled while a scan or execution runs)
+        self.pause_button = ttk.Button(
+            button_frame,
+            text="Pause",
+            state=tk.DISABLED,
+            command=self._toggle_pause,
+            style="AF.TButton",
+        )
+        self.pause_button.grid(row=0, column=3, padx=(0, 5))
+        
+        self.cancel_button = ttk.Button(
+            button_frame,
+            text="Cancel",
+            state=tk.DISABLED,
+            command=self._cancel_run,
+            style="AF.TButton",
+        )
+        self.cancel_button.grid(row=0, column=4, padx=(0, 5))
+        
         # Load Favorites button
         self.load_favorites_button = ttk.Button(
             button_frame,
@@ -320,7 +387,7 @@ class MainApp:
             command=self._load_favorite_folders,
             style="AF.TButton",
         )
-        self.load_favorites_button.grid(row=0, column=3, padx=(0, 5))
+        self.load_favorites_button.grid(row=0, column=5, padx=(0, 5))
         
         # Save Favorites button
         self.save_favorites_button = ttk.Button(
@@ -329,7 +396,7 @@ class MainApp:
             command=self._save_current_selection_as_favorites,
             style="AF.TButton",
         )
-        self.save_favorites_button.grid(row=0, column=4, padx=(0, 5))
+        self.save_favorites_button.grid(row=0, column=6, padx=(0, 5))
         
         # Delete .bak files button (disabled until at least one folder is selected)
         self.delete_bak_button = ttk.Button(
@@ -339,7 +406,7 @@ class MainApp:
             state=tk.DISABLED,
             style="AFDanger.TButton",
         )
-        self.delete_bak_button.grid(row=0, column=5, padx=(0, 5))
+        self.delete_bak_button.grid(row=0, column=7, padx=(0, 5))
         
         # Settings button
         self.settings_button = ttk.Button(
@@ -348,7 +415,16 @@ class MainApp:
             command=self._open_settings_window,
             style="AF.TButton",
         )
-        self.settings_button.grid(row=0, column=6)
+        self.settings_button.grid(row=0, column=8, padx=(0, 5))
+        
+        # Open a plan file written by "cli_sync.py plan"
+        self.open_plan_button = ttk.Button(
+            button_frame,
+            text="Open Plan...",
+            command=self._open_plan_file,
+            style="AF.TButton",
+        )
+        self.open_plan_button.grid(row=0, column=9)
     
     def _open_folder_dialog(self):
         """Open folder selection dialog and add valid folder to list."""
@@ -391,6 +467,9 @@ class MainApp:
         """Update the folder list UI to reflect current selected folders."""
         # [Modified] by openai/gpt-5.1 | 2025-11-15_01
         
+        # A changed selection makes in-flight previews and .bak discovery stale
+        self._cancel_selection_tasks()
+        
         # Destroy all existing widgets in the folder list frame
         for widget in self.folder_list_frame.winfo_children():
             widget.destroy()
@@ -433,130 +512,210 @@ class MainApp:
     
     def _format_mtime(self, mtime: float) -> str:
         """Format a POSIX mtime value for display in the preview."""
-        # [Created] by openai/gpt-5.1 | 2025-11-14_02
-        try:
-            dt = datetime.datetime.fromtimestamp(mtime)
-            return dt.strftime("%Y-%m-%d %H:%M:%S")
-        except Exception:
-            return ""
+        # [Modified] by [LLM model] | 2026-10-18_01
+        return format_mtime(mtime)
     
-    def _update_overwrite_previews(self) -> None:
-        """Rebuild per-folder overwrite previews from the current planned actions."""
-        # [Created] by openai/gpt-5.1 | 2025-11-14_02
+    def _preview_items(self, actions: list) -> list:
+        """Build preview row items (relative, timestamp, action) for one folder's actions.
+        
+        Pure computation (no widget access), so it can run on a background thread.
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        return preview_items(actions)
     
-        # Build per-folder list of planned overwrites, including timestamps and action refs
-        overwrites_by_folder = {folder: [] for folder in self.selected_folders}
-        for action in self.planned_actions:
-            dest_path = action.get("destination_path")
-            relative = str(action.get("relative_path", ""))
-            dest_mtime = action.get("destination_mtime")
+    def _set_plan(self, actions) -> None:
+        """Replace the planned actions (a SyncPlan or list) and follow its changes."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        if self._plan_unsubscribe is not None:
+            self._plan_unsubscribe()
+        plan = actions if isinstance(actions, SyncPlan) else SyncPlan(actions)
+        self.planned_actions = plan
+        self._plan_unsubscribe = plan.subscribe(self._on_plan_change)
     
-            # Pre-format timestamp once for display; use destination mtime snapshot from scan
-            timestamp = self._format_mtime(dest_mtime) if dest_mtime is not None else ""
+    def _on_plan_change(self, change: PlanChange) -> None:
+        """Update only the folder a plan change belongs to."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        widget = next(
+            (w for folder, w in self.folder_widgets.items() if str(folder) == change.folder), None
+        )
+        if widget is not None:
+            if change.kind == "remove":
+                widget.remove_preview_row(str(change.action.get("relative_path", "")))
+            else:
+                self._apply_folder_preview(
+                    widget.folder_path,
+                    self._preview_items(self.planned_actions.query(folder=change.folder)),
+                )
+        self._refresh_confirm_button()
     
-            if dest_path is None:
-                continue
+    def _update_overwrite_previews(self) -> None:
+        """Rebuild every folder's overwrite preview from the current planned actions."""
+        # [Modified] by [LLM model] | 2026-10-18_01
+        for folder_path in self.folder_widgets:
+            items = self._preview_items(self.planned_actions.query(folder=folder_path))
+            self._apply_folder_preview(folder_path, items)
+        self._refresh_confirm_button()
     
-            for base in self.selected_folders:
-                base_path = Path(base)
-                try:
-                    dest_path.relative_to(base_path)
-                    overwrites_by_folder[base].append(
-                        {
-                            "relative": relative,
-                            "timestamp": timestamp,
-                            "action": action,
-                        }
-                    )
-                    break
-                except ValueError:
-                    continue
+    def _apply_folder_preview(self, folder_path, items) -> None:
+        """Show the planned overwrites (item list or PreviewModel) of one folder and mark it as scanned."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        widget = self.folder_widgets.get(folder_path)
+        if widget is None:
+            return
+        # Update per-folder preview under the folder name
+        widget.update_preview(items)
+        # Show a clear post-scan status for the folder
+        widget.update_status("Scanned", "green")
     
-        any_actions = False
-        for folder_path, widget in self.folder_widgets.items():
-            items = overwrites_by_folder.get(folder_path, [])
-            # Update per-folder preview under the folder name
-            if hasattr(widget, "update_preview"):
-                widget.update_preview(items)
-            # Track whether any actions are planned for enabling the Execute button
-            if items:
-                any_actions = True
-            # Show a clear post-scan status for all folders
-            widget.update_status("Scanned", "green")
+    def _refresh_confirm_button(self) -> None:
+        """Enable Execute only while planned actions remain."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        if self.confirm_button:
+            state = tk.NORMAL if self.planned_actions and not self.is_syncing else tk.DISABLED
+            self.confirm_button.config(state=state)
     
-        # Enable or disable Execute based on whether any actions remain
-        if any_actions:
-            if self.confirm_button:
-                self.confirm_button.config(state=tk.NORMAL)
-        else:
-            if self.confirm_button:
-                self.confirm_button.config(state=tk.DISABLED)
+    def _find_bak_files(self, base_path: Path) -> list:
+        """Return cataloged .bak files of base_path as relative path strings (runs off the Tk thread)."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        try:
+            # The catalog is read instead of walking the project tree
+            return [entry.path for entry in self.sync_engine.backup_catalog(base_path).entries()]
+        except OSError as exc:
+            # Fail soft; log error and show no backups for this folder
+            print(f"Error reading the backup catalog of {base_path!s}: {exc}")
+            return []
     
     def _update_bak_previews(self) -> None:
-        """Refresh .bak backup file rows under each selected folder preview."""
-        # [Created-or-Modified] by openai/gpt-5.1 | 2025-12-04_02
+        """Refresh .bak backup file rows under each selected folder preview.
+        
+        Discovery runs as a background task; rows are filled in folder by folder
+        and the Delete .bak button is updated once every folder was checked.
+        """
+        # [Modified] by [LLM model] | 2026-10-18_01
         if not self.selected_folders or not self.folder_widgets:
             # No folders or widgets – ensure Delete .bak button is disabled.
             if getattr(self, "delete_bak_button", None) is not None:
                 self.delete_bak_button.config(state=tk.DISABLED)
             return
 
-        any_bak = False
-
-        for folder_path, widget in self.folder_widgets.items():
-            base_path = Path(folder_path)
-            if not base_path.exists():
-                # Folder no longer exists; clear any existing backup rows
-                if hasattr(widget, "show_backup_files"):
-                    widget.show_backup_files([])
-                continue
-
-            bak_relatives: list[str] = []
-            try:
-                for bak in base_path.rglob("*.bak"):
-                    try:
-                        rel = bak.relative_to(base_path)
-                    except ValueError:
-                        # Should not happen for descendants, but fail soft
-                        continue
-                    bak_relatives.append(str(rel))
-            except OSError as exc:
-                # Fail soft; log error and clear backups for this folder
-                print(f"Error scanning for .bak files under {base_path!s}: {exc}")
-                if hasattr(widget, "show_backup_files"):
-                    widget.show_backup_files([])
-                continue
+        # Only the latest discovery matters
+        self.background_tasks.cancel("bak")
+        folders = list(self.selected_folders)
 
-            if bak_relatives:
-                any_bak = True
+        def work(handle, report):
+            any_bak = False
+            for folder_path in folders:
+                if handle.cancelled:
+                    return None
+                base_path = Path(folder_path)
+                # Folders that no longer exist simply show no backup rows
+                bak_relatives = self._find_bak_files(base_path) if base_path.exists() else []
+                any_bak = any_bak or bool(bak_relatives)
+                report((folder_path, bak_relatives))
+            return any_bak
 
-            # Delegate to the folder widget to render (or clear) backup rows.
+        def show_rows(item):
+            folder_path, bak_relatives = item
+            widget = self.folder_widgets.get(folder_path)
             # Passing an empty list will remove any previously displayed .bak rows.
-            if hasattr(widget, "show_backup_files"):
+            if widget is not None:
                 widget.show_backup_files(bak_relatives)
 
-        # Enable Delete .bak files button only when at least one backup row is visible;
-        # otherwise keep it disabled and its text grayed out.
-        if getattr(self, "delete_bak_button", None) is not None:
-            if any_bak:
-                self.delete_bak_button.config(state=tk.NORMAL)
-            else:
-                self.delete_bak_button.config(state=tk.DISABLED)
+        def finish(any_bak):
+            # Enable Delete .bak files button only when at least one backup row is visible;
+            # otherwise keep it disabled and its text grayed out.
+            if getattr(self, "delete_bak_button", None) is not None:
+                self.delete_bak_button.config(state=tk.NORMAL if any_bak else tk.DISABLED)
+
+        self.background_tasks.submit("bak", work, on_result=finish, on_progress=show_rows)
+        self._schedule_event_pump()
     
     def _remove_planned_action(self, action_to_remove: dict) -> None:
         """Remove a single planned action from the queue and refresh previews."""
-        # [Created] by openai/gpt-5.1 | 2025-11-14_02
-        if not self.planned_actions:
-            return
+        # [Modified] by [LLM model] | 2026-10-18_01
+        # O(1) by identity; the plan notifies _on_plan_change, which drops only
+        # this row and updates the Execute button
+        self.planned_actions.remove(action_to_remove)
     
-        # Remove by identity; callbacks receive the original action dict instance
-        self.planned_actions = [
-            a for a in self.planned_actions
-            if a is not action_to_remove
-        ]
+    def _offer_resume(self) -> None:
+        """Clean up after interrupted syncs and offer to load their unfinished actions."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        if not self.config.get("journal", True) or self.is_syncing:
+            return
+        for journal in SyncJournal.find_unfinished(self.config.get("state_dir")):
+            pending = journal.recover()
+            folders = [f for f in journal.folders if file_path_utils.has_roo_dir(f)]
+            if not pending or len(folders) < 2:
+                journal.discard()
+                continue
+            resume = messagebox.askyesno(
+                "Resume Interrupted Sync",
+                f"A sync started {journal.started} did not finish; "
+                f"{len(pending)} actions are left in:\n" + "\n".join(folders) +
+                f"\n\nRemoved {journal.removed_temps} temp files and restored "
+                f"{journal.restored_backups} backups.\n\n"
+                "Load the unfinished actions? Execute will then copy only those."
+            )
+            if not resume:
+                journal.discard()
+                continue
+            # Resuming replaces the journal when Execute starts
+            self.selected_folders = [file_path_utils.normalize_path(f) for f in folders]
+            self._update_folder_list_ui()
+            self._set_plan(pending)
+            self._update_overwrite_previews()
+            return
     
-        # Rebuild previews and update Execute button state
-        self._update_overwrite_previews()
+    def _open_plan_file(self) -> None:
+        """Load the actions of a plan file (see utils_sync.plan_file) for Execute."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        if self.is_syncing:
+            return
+        plan_path = filedialog.askopenfilename(
+            title="Open plan file",
+            filetypes=[("Plan files", "*.jsonl *.jsonl.gz"), ("All files", "*.*")],
+        )
+        if not plan_path:
+            return
+        current_hash = config_hash(self.config)
+        
+        def work(handle, report):
+            # Streams the file off the Tk thread; actions changed since planning are dropped
+            with PlanReader(plan_path) as reader:
+                actions = list(reader.actions())
+                return reader, SyncPlan(actions)
+        
+        def finish(result):
+            reader, plan = result
+            folders = [str(f) for f in reader.folders if file_path_utils.has_roo_dir(f)]
+            if len(folders) < 2:
+                messagebox.showerror(
+                    "Open Plan",
+                    "The folders of this plan are not available:\n" + "\n".join(map(str, reader.folders)),
+                )
+                return
+            if reader.config_hash != current_hash and not messagebox.askyesno(
+                "Open Plan",
+                "This plan was made with different settings. Load it anyway?",
+            ):
+                return
+            skipped = sum(reader.skipped.values())
+            self.selected_folders = [file_path_utils.normalize_path(f) for f in folders]
+            self._update_folder_list_ui()
+            self._set_plan(plan)
+            self._update_overwrite_previews()
+            if skipped:
+                messagebox.showinfo(
+                    "Open Plan",
+                    f"Loaded {len(plan)} of {reader.count} planned actions. {skipped} were left out "
+                    "because their files are already up to date or changed since the plan was written.",
+                )
+        
+        def on_error(exc):
+            messagebox.showerror("Open Plan", f"Could not read the plan file:\n{exc}")
+        
+        self.background_tasks.submit("plan-file", work, on_result=finish, on_error=on_error)
+        self._schedule_event_pump()
     
     def _start_sync(self):
         """Run planning phase and show per-folder preview before actual sync."""
@@ -588,39 +747,130 @@ class MainApp:
             widget.reset_status()
             widget.update_status("Planning...", "blue")
         
-        try:
-            # Run scan and plan synchronously to compute actions
-            folder_paths = [Path(p) for p in self.selected_folders]
-            file_index = self.sync_engine.scan_folders(folder_paths)
-            actions = self.sync_engine.plan_actions(file_index)
-        except Exception as e:
+        # Scan and plan on the background executor; previews fill in per folder
+        self._start_preview_task()
+    
+    def _start_preview_task(self) -> None:
+        """Scan and plan in the background, then fill in previews folder by folder."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        self._cancel_preview()
+        folder_paths = [Path(p) for p in self.selected_folders]
+        control = SyncControl()
+        
+        def work(handle, report):
+            try:
+                file_index = self.sync_engine.scan_folders(folder_paths, control=control)
+                actions = self.sync_engine.plan_actions(
+                    file_index, base_folders=folder_paths, control=control
+                )
+            except SyncCancelled:
+                return None
+            if handle.cancelled:
+                return None
+            # Index the plan here, off the Tk thread
+            plan = SyncPlan(actions)
+            report(("actions", plan, None))
+            # Widgets are built per folder on separate UI ticks
+            for folder_path in folder_paths:
+                items = self._preview_items(plan.query(folder=folder_path))
+                # Sort and group the rows here too; the widget only renders what is opened
+                report(("folder", folder_path, PreviewModel(items)))
+            return plan
+        
+        def on_progress(item):
+            kind, value, items = item
+            if kind == "actions":
+                # Store planned actions for confirmation stage
+                self._set_plan(value)
+            else:
+                self._apply_folder_preview(value, items)
+        
+        def on_error(exc):
+            self._finish_planning()
             messagebox.showerror(
                 "Preview Failed",
-                f"Error while planning sync:\n{e}"
+                f"Error while planning sync:\n{exc}"
             )
-            self.is_syncing = False
-            self.sync_button.config(state=tk.NORMAL)
-            self.browse_button.config(state=tk.NORMAL)
-            return
         
-        # Store planned actions for confirmation stage
-        self.planned_actions = actions
-        
-        # Re-enable buttons after planning
+        self._preview_task = self.background_tasks.submit(
+            "preview",
+            work,
+            on_result=lambda actions: self._finish_planning(),
+            on_progress=on_progress,
+            on_error=on_error,
+        )
+        self._set_run_control(control)
+        self._schedule_event_pump()
+    
+    def _finish_planning(self) -> None:
+        """Re-enable controls once a preview task finished, failed or was cancelled."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        self._preview_task = None
+        self._set_run_control(None)
         self.is_syncing = False
         self.browse_button.config(state=tk.NORMAL)
         self.sync_button.config(state=tk.NORMAL)
-        
-        # Build per-folder preview list of files that will be overwritten
-        # including last-modified timestamps and per-file removal "X" controls.
-        self._update_overwrite_previews()
-        
-        # Clear any queued scan events so they don't overwrite the preview status
-        while not self.event_queue.empty():
-            try:
-                self.event_queue.get_nowait()
-            except queue.Empty:
-                break
+        self._refresh_confirm_button()
+    
+    def _cancel_preview(self) -> None:
+        """Stop a running preview task and drop its pending results."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        if self._preview_task is not None and self._run_control is not None:
+            self._run_control.cancel()
+        self.background_tasks.cancel("preview")
+    
+    def _cancel_selection_tasks(self) -> None:
+        """Cancel preview and .bak discovery tasks that belong to the old selection."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        self._cancel_preview()
+        self.background_tasks.cancel("bak")
+        if self._preview_task is not None:
+            self._set_plan([])
+            self._finish_planning()
+    
+    def _set_run_control(self, control) -> None:
+        """Attach the Pause/Cancel buttons to a running job's SyncControl (None disables them)."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        self._run_control = control
+        state = tk.NORMAL if control is not None else tk.DISABLED
+        self.pause_button.config(text="Pause", state=state)
+        self.cancel_button.config(state=state)
+    
+    def _toggle_pause(self) -> None:
+        """Pause the running scan/execution at its next checkpoint, or resume it."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        control = self._run_control
+        if control is None or control.cancelled:
+            return
+        if control.paused:
+            control.resume()
+            self.pause_button.config(text="Pause")
+            text, color = ("Executing...", "orange") if self._preview_task is None else ("Planning...", "blue")
+        else:
+            control.pause()
+            self.pause_button.config(text="Resume")
+            text, color = ("Paused", "orange")
+        for widget in self.folder_widgets.values():
+            if widget.status_label.cget("text") != ERROR_STATUS:
+                widget.update_status(text, color)
+    
+    def _cancel_run(self) -> None:
+        """Cancel the running scan/execution; a copy in progress is finished first."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        if self._run_control is None:
+            return
+        self.pause_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.DISABLED)
+        if self._preview_task is not None:
+            # Preview results are discarded right away
+            self._cancel_preview()
+            self._set_plan([])
+            self._finish_planning()
+            for widget in self.folder_widgets.values():
+                widget.update_status(CANCELLED_STATUS, "orange")
+            return
+        # The worker stops at its next checkpoint and reports CANCELLED
+        self._run_control.cancel()
     
     def _confirm_sync(self):
         """Execute the planned sync actions after user confirmation."""
@@ -655,82 +905,162 @@ class MainApp:
         
         # Start background worker to execute planned actions
         folder_paths = [Path(p) for p in self.selected_folders]
-        worker = SyncWorker(self.sync_engine, folder_paths, self.planned_actions)
-        worker.start()
+        self._sync_worker = SyncWorker(self.sync_engine, folder_paths, self.planned_actions)
+        self._set_run_control(self._sync_worker.control)
+        self._sync_worker.start()
+        self._schedule_event_pump()
+    
+    def _schedule_event_pump(self, delay_ms: int = EVENT_TICK_MS) -> None:
+        """Schedule one _process_events() tick unless one is already pending."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        if self._event_pump_scheduled:
+            return
+        self._event_pump_scheduled = True
+        self.root.after(delay_ms, self._process_events)
     
     def _process_events(self):
-        """Process events from the event queue periodically."""
-        # [Modified] by openai/gpt-5.1 | 2025-11-16_01
+        """Apply queued progress events to the UI in one batched update per tick.
+        
+        At most MAX_EVENTS_PER_TICK events are consumed per tick so huge runs keep
+        the UI responsive. Per-folder progress, statuses and ticked preview rows are
+        collected first and applied once per folder, followed by up to
+        MAX_TASK_RESULTS_PER_TICK background task results. Another tick is scheduled
+        only while a worker or background task is running or anything remains
+        queued; otherwise the pump sleeps until _schedule_event_pump() is called.
+        """
+        # [Modified] by [LLM model] | 2026-10-18_01
+        self._event_pump_scheduled = False
         
-        # Process all events currently in the queue
-        while not self.event_queue.empty():
+        # Events carry folders as strings; widgets are keyed by normalized Paths
+        widgets_by_folder = {str(folder): widget for folder, widget in self.folder_widgets.items()}
+        
+        progress = {}
+        statuses = {}
+        replaced = {}
+        completed = False
+        cancelled = None
+        
+        for _ in range(MAX_EVENTS_PER_TICK):
             try:
                 event = self.event_queue.get_nowait()
-                
-                # Handle different event types using the current ProgressEvent schema
-                if event.event_type == EventType.SCAN_START:
-                    # Global scan start – mark all folders as scanned
-                    for widget in self.folder_widgets.values():
-                        widget.update_status("Scanned", "green")
-                
-                elif event.event_type == EventType.SCAN_FILE:
-                    # Per-folder scan notification when folder is available
-                    folder_widget = self.folder_widgets.get(event.folder)
-                    if folder_widget:
-                        folder_widget.update_status("Scanned", "green")
-                
-                elif event.event_type == EventType.COPY:
-                    # A file was copied; show generic syncing state
-                    for widget in self.folder_widgets.values():
-                        widget.update_status("Syncing...", "orange")
-                
-                elif event.event_type == EventType.SKIP:
-                    # In dry-run, files are skipped; detailed per-file preview is handled
-                    # in the planning stage, so we keep the UI unchanged here.
-                    pass
-                
-                elif event.event_type == EventType.ERROR:
-                    # Show a generic error state; detailed message goes to the log
-                    for widget in self.folder_widgets.values():
-                        widget.update_status("Error during sync", "red")
-                
-                elif event.event_type == EventType.COMPLETE:
-                    # Re-enable buttons when the engine signals completion
-                    self.is_syncing = False
-                    self.sync_button.config(state=tk.NORMAL)
-                    self.browse_button.config(state=tk.NORMAL)
-                    
-                    # Update folder statuses to a clear completed state
-                    if self.config.get("dry_run", False):
-                        for widget in self.folder_widgets.values():
-                            widget.update_status("Dry run complete", "blue")
-                    else:
-                        for widget in self.folder_widgets.values():
-                            widget.update_status("Completed", "green")
-                    
-                    # For real executions, update preview header and mark files as replaced
-                    if not self.config.get("dry_run", False):
-                        for widget in self.folder_widgets.values():
-                            # Update header from "will be" to "are now"
-                            if hasattr(widget, "update_preview_header_to_completed"):
-                                widget.update_preview_header_to_completed()
-                            
-                            # Mark each file row with checkmark
-                            preview_rows = getattr(widget, "_preview_rows", {})
-                            for rel_key in list(preview_rows.keys()):
-                                if hasattr(widget, "mark_preview_replaced"):
-                                    widget.mark_preview_replaced(rel_key)
-    
-                        # Also show any .bak backup files that now exist on disk
-                        self._update_bak_previews()
-                    
-                    # Completion status is communicated via folder status and preview updates.
-                
             except queue.Empty:
                 break
+            
+            # Handle different event types using the current ProgressEvent schema
+            if event.event_type == EventType.SCAN_START:
+                if event.folder in widgets_by_folder:
+                    statuses[event.folder] = ("Scanning...", "blue")
+            
+            elif event.event_type in (EventType.SCAN_FILE, EventType.SCAN_PROGRESS):
+                # Per-folder scan notification when folder is available
+                if event.folder in widgets_by_folder:
+                    statuses[event.folder] = ("Scanning...", "blue")
+            
+            elif event.event_type in (EventType.COPY, EventType.SKIP, EventType.ERROR):
+                # Execution events name their destination folder; fall back to all
+                targets = [event.folder] if event.folder in widgets_by_folder else list(widgets_by_folder)
+                if event.total and event.folder in widgets_by_folder:
+                    progress[event.folder] = (event.count, event.total)
+                if event.event_type == EventType.ERROR:
+                    # Detailed message goes to the log; keep the error state visible
+                    for folder in targets:
+                        statuses[folder] = (ERROR_STATUS, "red")
+                elif event.event_type == EventType.COPY:
+                    for folder in targets:
+                        if statuses.get(folder, ("", ""))[0] != ERROR_STATUS:
+                            statuses[folder] = ("Syncing...", "orange")
+                    if event.folder in widgets_by_folder:
+                        # Tick the preview row as soon as its copy has landed
+                        replaced.setdefault(event.folder, []).append(event.file_path)
+            
+            elif event.event_type == EventType.COMPLETE:
+                completed = True
+            
+            elif event.event_type == EventType.CANCELLED:
+                cancelled = event
+        
+        # Apply the collected updates once per folder
+        for folder, (current, total) in progress.items():
+            widgets_by_folder[folder].update_progress(current, total)
+        for folder, (text, color) in statuses.items():
+            widget = widgets_by_folder[folder]
+            if text != ERROR_STATUS and widget.status_label.cget("text") == ERROR_STATUS:
+                continue
+            widget.update_status(text, color)
+        for folder, relative_paths in replaced.items():
+            widget = widgets_by_folder[folder]
+            for relative_path in relative_paths:
+                widget.mark_preview_replaced(relative_path)
+        
+        if completed:
+            self._on_sync_complete()
+        elif cancelled is not None:
+            self._on_sync_cancelled(cancelled)
+        
+        # Results of background scan/plan and .bak tasks. They are posted after the
+        # events their work emitted, so apply them only once those are drained.
+        if self.event_queue.empty():
+            self.background_tasks.process_results(MAX_TASK_RESULTS_PER_TICK)
+        
+        # Keep ticking only while there is (or may soon be) something to process.
+        # Check the workers first: once they have exited, an empty queue stays empty.
+        worker = self._sync_worker
+        if (
+            (worker is not None and worker.is_alive())
+            or self.background_tasks.has_pending()
+            or not self.event_queue.empty()
+        ):
+            self._schedule_event_pump()
+    
+    def _on_sync_complete(self) -> None:
+        """Restore controls and final statuses after the engine reports COMPLETE."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        # Re-enable buttons when the engine signals completion
+        self.is_syncing = False
+        self._set_run_control(None)
+        self.sync_button.config(state=tk.NORMAL)
+        self.browse_button.config(state=tk.NORMAL)
+        
+        # Update folder statuses to a clear completed state, keeping errors visible
+        dry_run = self.config.get("dry_run", False)
+        for widget in self.folder_widgets.values():
+            if widget.status_label.cget("text") == ERROR_STATUS:
+                continue
+            if dry_run:
+                widget.update_status("Dry run complete", "blue")
+            else:
+                widget.update_status("Completed", "green")
+        
+        # For real executions, update preview headers; rows were ticked per COPY
+        if not dry_run:
+            for widget in self.folder_widgets.values():
+                widget.update_preview_header_to_completed()
+            
+            # Also show any .bak backup files that now exist on disk
+            self._update_bak_previews()
+    
+    def _on_sync_cancelled(self, event: ProgressEvent) -> None:
+        """Restore controls after a cancelled execution; the pending actions stay executable."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        worker = self._sync_worker
+        if worker is not None:
+            # The worker exits right after emitting CANCELLED
+            worker.join(timeout=1.0)
+            self._set_plan(worker.pending_actions)
+        self.is_syncing = False
+        self._set_run_control(None)
+        self.sync_button.config(state=tk.NORMAL)
+        self.browse_button.config(state=tk.NORMAL)
+        self._refresh_confirm_button()
         
-        # Schedule next check (100ms from now)
-        self.root.after(100, self._process_events)
+        for widget in self.folder_widgets.values():
+            if widget.status_label.cget("text") != ERROR_STATUS:
+                widget.update_status(CANCELLED_STATUS, "orange")
+        messagebox.showinfo("Sync Cancelled", event.message)
+        
+        # Copies made before the cancel may have left backups
+        if not self.config.get("dry_run", False):
+            self._update_bak_previews()
     
     def _open_settings_window(self):
         """Open the settings configuration window."""
@@ -764,7 +1094,7 @@ class MainApp:
         backup_combo = ttk.Combobox(
             backup_frame,
             textvariable=backup_var,
-            values=["timestamped", "none"],
+            values=["timestamped", "store", "none"],
             state="readonly",
             width=15
         )
@@ -1020,8 +1350,8 @@ class MainApp:
         messagebox.showinfo("Favorites Saved", "Favorites saved from current selection.")
         
     def _delete_bak_files(self) -> None:
-        """Delete all .bak backup files in the listed folders."""
-        # [Created-or-Modified] by openai/gpt-5.1 | 2025-11-16_02
+        """Delete all backups in the listed folders: cataloged .bak files and backup-store versions."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
         if not self.selected_folders:
             messagebox.showinfo(
                 "Delete .bak Files",
@@ -1030,64 +1360,58 @@ class MainApp:
             return
         
         # Proceed immediately without an extra confirmation dialog to keep cleanup fast.
-        deleted_count = 0
-        errors: list[str] = []
-        
-        for folder in self.selected_folders:
-            base_path = Path(folder)
-            if not base_path.exists():
-                continue
-            
-            # Collect all .bak files first to avoid generator iteration issues during deletion
-            bak_files = list(base_path.rglob("*.bak"))
-            
-            # Delete all .bak files anywhere under this base folder
-            for bak in bak_files:
+        folders = list(self.selected_folders)
+        
+        def work(handle, report):
+            deleted_count = 0
+            errors: list[str] = []
+            for folder in folders:
+                base_path = Path(folder)
+                if not base_path.exists():
+                    continue
+                
+                # Delete the cataloged .bak files and the folder's backup-store versions
                 try:
-                    bak.unlink()
-                    deleted_count += 1
+                    deleted, failed = self.sync_engine.delete_backups(base_path)
                 except OSError as exc:
-                    errors.append(f"{bak}: {exc}")
+                    errors.append(f"{base_path}: {exc}")
+                    continue
+                deleted_count += deleted
+                errors.extend(failed)
+            return deleted_count, errors
+        
+        def finish(result):
+            deleted_count, errors = result
+            if deleted_count == 0:
+                messagebox.showinfo(
+                    "Delete .bak Files",
+                    "No .bak backup files were found to delete in the listed folders."
+                )
+            else:
+                if errors:
+                    print("Some .bak files could not be deleted:\n" + "\n".join(errors))
+            
+            # After deletion, refresh only the .bak backup previews
+            # so the executed/updated file list remains visible until the next Scan.
+            self._update_bak_previews()
         
-        if deleted_count == 0:
-            messagebox.showinfo(
-                "Delete .bak Files",
-                "No .bak backup files were found to delete in the listed folders."
-            )
-        else:
-            if errors:
-                print("Some .bak files could not be deleted:\n" + "\n".join(errors))
-
-        # After deletion, refresh only the .bak backup previews
-        # so the executed/updated file list remains visible until the next Scan.
-        self._update_bak_previews()
+        # Deletion is not tied to the selection, so it is never cancelled
+        self.background_tasks.submit("bak_delete", work, on_result=finish)
+        self._schedule_event_pump()
 
     def _rescan_after_bak_delete(self) -> None:
         """Re-scan folders to refresh planned file list after deleting backups."""
-        # [Created-or-Modified] by openai/gpt-5.1 | 2025-11-16_02
+        # [Modified] by [LLM model] | 2026-10-18_01
         if self.is_syncing:
             return
         if len(self.selected_folders) < 2:
             return
-        try:
-            folder_paths = [Path(p) for p in self.selected_folders]
-            file_index = self.sync_engine.scan_folders(folder_paths)
-            actions = self.sync_engine.plan_actions(file_index)
-        except Exception as exc:
-            # Fail soft; log error but keep GUI responsive
-            print(f"Rescan after .bak delete failed: {exc}")
-            return
-
         # Replace existing planned actions and previews with fresh scan results
-        self.planned_actions = actions
-        self._update_overwrite_previews()
-
-        # Clear any queued scan events so they don't overwrite the preview status
-        while not self.event_queue.empty():
-            try:
-                self.event_queue.get_nowait()
-            except queue.Empty:
-                break
+        self.is_syncing = True
+        self.sync_button.config(state=tk.DISABLED)
+        self.browse_button.config(state=tk.DISABLED)
+        self._refresh_confirm_button()
+        self._start_preview_task()
 
     def _update_dry_run_status(self):
         """Update the dry run status label based on current config."""
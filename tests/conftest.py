@@ -0,0 +1,9 @@
+import pytest
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+@pytest.fixture(autouse=True)
+def _isolated_state_dir(tmp_path, monkeypatch):
+    """Keep caches, catalogs and journals written during tests out of the user's state dir."""
+    monkeypatch.setenv("AGENTFLOW_STATE_DIR", str(tmp_path / "agentflow_state"))
@@ -0,0 +1,69 @@
+import threading
+import time
+
+from utils_sync.background_tasks import BackgroundTasks
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+def _pump(tasks, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while tasks.has_pending() and time.monotonic() < deadline:
+        tasks.process_results(10)
+        time.sleep(0.01)
+    assert not tasks.has_pending()
+
+
+def test_results_and_progress_are_delivered_only_by_process_results():
+    tasks = BackgroundTasks()
+    delivered = []
+    caller = threading.get_ident()
+
+    def work(handle, report):
+        report("first")
+        report("second")
+        return 42
+
+    def record(kind):
+        def callback(value):
+            # Callbacks run on the thread that calls process_results()
+            assert threading.get_ident() == caller
+            delivered.append((kind, value))
+        return callback
+
+    tasks.submit("job", work, on_result=record("result"), on_progress=record("progress"))
+    time.sleep(0.05)
+    assert delivered == []
+    _pump(tasks)
+    assert delivered == [("progress", "first"), ("progress", "second"), ("result", 42)]
+    tasks.shutdown()
+
+
+def test_cancelled_tasks_are_skipped_or_silenced():
+    tasks = BackgroundTasks()
+    release = threading.Event()
+    delivered = []
+    ran = []
+
+    def blocking(handle, report):
+        release.wait(5)
+        report("late progress")
+        return "stale"
+
+    def queued(handle, report):
+        ran.append("queued")
+        return "never"
+
+    tasks.submit("preview", blocking, on_result=delivered.append, on_progress=delivered.append)
+    tasks.submit("preview", queued, on_result=delivered.append)
+    errors = []
+    tasks.submit("other", lambda h, r: 1 / 0, on_error=errors.append)
+
+    tasks.cancel("preview")
+    release.set()
+    _pump(tasks)
+
+    assert delivered == []
+    assert ran == []
+    assert len(errors) == 1 and isinstance(errors[0], ZeroDivisionError)
+    tasks.shutdown()
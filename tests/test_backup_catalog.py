@@ -0,0 +1,102 @@
+import os
+import queue
+
+from utils_sync import backup_catalog
+from utils_sync.backup_catalog import BackupCatalog
+from utils_sync.sync_core import SyncEngine
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+def test_execute_catalogs_backups_and_lists_without_walking(tmp_path):
+    engine = SyncEngine({"backup_mode": "timestamped"}, queue.Queue())
+    bases = [tmp_path / "p1", tmp_path / "p2"]
+    for base in bases:
+        (base / ".roo").mkdir(parents=True)
+    old = bases[1] / ".roo" / "rule.md"
+    old.write_text("old")
+    os.utime(old, (1_600_000_000, 1_600_000_000))
+    (bases[0] / ".roo" / "rule.md").write_text("new")
+
+    actions = engine.plan_actions(engine.scan_folders(bases), base_folders=bases)
+    engine.execute_actions(actions)
+
+    # Files made by other tools elsewhere in the project are not backups of ours
+    (bases[1] / "node_modules").mkdir()
+    (bases[1] / "node_modules" / "other.bak").write_text("x")
+    catalog = BackupCatalog.for_folder(bases[1])
+    entries = catalog.entries()
+    assert len(entries) == 1
+    assert entries[0].original == ".roo/rule.md"
+    assert (bases[1] / entries[0].path).read_text() == "old"
+    assert catalog.total_bytes() == 3
+
+    assert catalog.delete(entries) == (1, [])
+    assert BackupCatalog.for_folder(bases[1]).count() == 0
+    assert (bases[1] / "node_modules" / "other.bak").exists()
+
+
+def test_existing_backups_are_bootstrapped_from_roo_and_top_level(tmp_path):
+    base = tmp_path / "p"
+    (base / ".roo" / "sub").mkdir(parents=True)
+    (base / "node_modules").mkdir()
+    (base / ".roo" / "sub" / "a.md_20260101T000000Z.bak").write_text("a")
+    (base / ".roomodes_20260102T000000Z.bak").write_text("bb")
+    (base / "node_modules" / "x_20260101T000000Z.bak").write_text("x")
+    (base / ".roo" / "notes.bak").write_text("not ours")
+
+    entries = BackupCatalog.for_folder(base).entries()
+
+    assert [(e.path, e.original, e.size) for e in entries] == [
+        (".roo/sub/a.md_20260101T000000Z.bak", ".roo/sub/a.md", 1),
+        (".roomodes_20260102T000000Z.bak", ".roomodes", 2),
+    ]
+
+
+def test_retention_policies_apply_together_in_one_pass(tmp_path, monkeypatch):
+    base = tmp_path / "p"
+    (base / ".roo").mkdir(parents=True)
+    catalog = BackupCatalog.for_folder(base)
+    day = 86400.0
+    now = 100 * day
+    # (file, age in days, size)
+    layout = [("a", 30, 10), ("a", 3, 10), ("a", 2, 10), ("a", 1, 10), ("b", 1, 50), ("c", 0, 40)]
+    for idx, (name, age, size) in enumerate(layout):
+        backup = base / ".roo" / f"{name}.md_{idx}.bak"
+        backup.write_bytes(b"x" * size)
+        monkeypatch.setattr(backup_catalog.time, "time", lambda t=now - age * day: t)
+        catalog.record(backup, base / ".roo" / f"{name}.md")
+
+    deleted, errors = catalog.apply_retention(
+        keep_last=2, max_age_days=10, max_total_bytes=100, now=now
+    )
+
+    # a: only the two newest survive keep_last (the 30-day one is also too old);
+    # newest first c(40) + b(50) + a(10) = 100 fits, the next a would exceed it
+    assert errors == []
+    assert deleted == 3
+    kept = sorted(e.path for e in BackupCatalog.for_folder(base).entries())
+    assert kept == [".roo/a.md_3.bak", ".roo/b.md_4.bak", ".roo/c.md_5.bak"]
+    assert sorted(p.name for p in (base / ".roo").iterdir()) == ["a.md_3.bak", "b.md_4.bak", "c.md_5.bak"]
+
+
+def test_engine_prunes_backups_after_each_run(tmp_path):
+    engine = SyncEngine({"backup_mode": "timestamped", "backup_keep_last": 1}, queue.Queue())
+    bases = [tmp_path / "p1", tmp_path / "p2"]
+    for base in bases:
+        (base / ".roo").mkdir(parents=True)
+    catalog = engine.backup_catalog(bases[1])
+    stale = bases[1] / ".roo" / "rule.md_20200101T000000Z.bak"
+    stale.write_text("older backup")
+    catalog.record(stale, bases[1] / ".roo" / "rule.md")
+
+    old = bases[1] / ".roo" / "rule.md"
+    old.write_text("old")
+    os.utime(old, (1_600_000_000, 1_600_000_000))
+    (bases[0] / ".roo" / "rule.md").write_text("new")
+    actions = engine.plan_actions(engine.scan_folders(bases), base_folders=bases)
+    engine.execute_actions([a for a in actions if a["relative_path"] == "rule.md"])
+
+    assert engine.last_run_stats["backups_pruned"] == 1
+    assert not stale.exists()
+    assert [(bases[1] / e.path).read_text() for e in catalog.entries()] == ["old"]
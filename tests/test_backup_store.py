@@ -0,0 +1,173 @@
+import calendar
+import os
+import queue
+from pathlib import Path
+
+from utils_sync.backup_store import BackupStore
+from utils_sync.hash_cache import HashCache
+from utils_sync.sync_core import SyncEngine
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+def test_backup_compresses_and_deduplicates_versions(tmp_path):
+    store = BackupStore(tmp_path / "store", HashCache(tmp_path / "hash_cache.json"))
+    first = tmp_path / "a.md"
+    second = tmp_path / "b.md"
+    first.write_text("same rules\n" * 1000)
+    second.write_text("same rules\n" * 1000)
+
+    digest = store.backup(first)
+    assert store.backup(second) == digest
+
+    assert store.stats()["backups"] == 2
+    assert store.stats()["new_objects"] == 1
+    assert 0 < store.object_path(digest).stat().st_size < first.stat().st_size // 10
+    assert [r["path"] for r in store.versions()] == [str(first), str(second)]
+
+    first.write_text("edited")
+    store.restore(store.versions(first)[0]["digest"], first)
+    assert first.read_text() == "same rules\n" * 1000
+
+
+def test_store_mode_keeps_roo_trees_free_of_bak_files(tmp_path):
+    state = tmp_path / "state"
+    engine = SyncEngine({"backup_mode": "store", "state_dir": str(state)}, queue.Queue())
+    bases = [tmp_path / f"p{idx}" for idx in range(3)]
+    for base in bases:
+        (base / ".roo").mkdir(parents=True)
+    for base in bases[1:]:
+        old = base / ".roo" / "rule.md"
+        old.write_text("old rule")
+        os.utime(old, (1_600_000_000, 1_600_000_000))
+    (bases[0] / ".roo" / "rule.md").write_text("new rule")
+
+    actions = engine.plan_actions(engine.scan_folders(bases), base_folders=bases)
+    engine.execute_actions(actions)
+
+    for base in bases[1:]:
+        assert (base / ".roo" / "rule.md").read_text() == "new rule"
+        assert sorted(p.name for p in (base / ".roo").iterdir()) == ["rule.md"]
+    assert engine.last_run_stats["backup_store"]["backups"] == 2
+    assert engine.last_run_stats["backup_store"]["new_objects"] == 1
+    store = BackupStore.for_state_dir(HashCache(state / "hash_cache.json"), state)
+    versions = store.versions(bases[1] / ".roo" / "rule.md")
+    assert len(versions) == 1
+    restored = tmp_path / "restored.md"
+    restored.write_text("")
+    store.restore(versions[0]["digest"], restored)
+    assert restored.read_text() == "old rule"
+
+
+def test_delete_versions_frees_objects_no_version_refers_to(tmp_path):
+    store = BackupStore(tmp_path / "store", HashCache(tmp_path / "hash_cache.json"))
+    files = {}
+    for name, text in (("p1/shared.md", "shared"), ("p1/own.md", "only p1"),
+                       ("p10/shared.md", "shared")):
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(text)
+        files[name] = store.backup(path)
+
+    assert store.delete_versions([tmp_path / "p1"]) == (2, [])
+
+    # p10 is not under p1, and its version still holds the shared object
+    assert [r["path"] for r in store.versions()] == [str(tmp_path / "p10" / "shared.md")]
+    assert store.object_path(files["p1/shared.md"]).exists()
+    assert not store.object_path(files["p1/own.md"]).exists()
+    assert store.stats()["removed_objects"] == 1
+    assert store.stats()["pruned_versions"] == 2
+
+
+def test_delete_backups_empties_the_store_of_a_folder(tmp_path):
+    state = tmp_path / "state"
+    engine = SyncEngine({"backup_mode": "store", "state_dir": str(state)}, queue.Queue())
+    bases = [tmp_path / "a", tmp_path / "b"]
+    for base in bases:
+        (base / ".roo").mkdir(parents=True)
+    old = bases[1] / ".roo" / "rule.md"
+    old.write_text("old rule")
+    os.utime(old, (1_600_000_000, 1_600_000_000))
+    (bases[0] / ".roo" / "rule.md").write_text("new rule")
+    engine.execute_actions(engine.plan_actions(engine.scan_folders(bases), base_folders=bases))
+
+    assert engine.delete_backups(bases[1]) == (1, [])
+    store = BackupStore.for_state_dir(HashCache(state / "hash_cache.json"), state)
+    assert store.versions() == []
+    assert list((state / "backup_store" / "objects").glob("*/*.z")) == []
+
+
+def _store_versions(store, tmp_path, specs):
+    """Back up (name, text, stored) versions, rewriting their backup times."""
+    for name, text, _ in specs:
+        path = tmp_path / name
+        path.write_text(text)
+        store.backup(path)
+    records = store.versions()
+    for record, (_, _, stored) in zip(records, specs):
+        record["stored"] = stored
+    store._rewrite_index(records)
+
+
+def test_store_retention_keeps_newest_versions_per_file_and_age(tmp_path):
+    store = BackupStore(tmp_path / "store", HashCache(tmp_path / "hash_cache.json"))
+    _store_versions(store, tmp_path, [
+        ("a.md", "a1", "20260101T000000Z"),
+        ("a.md", "a2", "20260102T000000Z"),
+        ("a.md", "a3", "20260103T000000Z"),
+        ("b.md", "b1", "20250101T000000Z"),
+    ])
+    old_digest = store.versions(tmp_path / "a.md")[0]["digest"]
+    now = calendar.timegm((2026, 1, 4, 0, 0, 0))
+
+    assert store.apply_retention(keep_last=2, max_age_days=30, now=now) == (2, [])
+
+    assert [(r["path"], r["stored"]) for r in store.versions()] == [
+        (str(tmp_path / "a.md"), "20260102T000000Z"),
+        (str(tmp_path / "a.md"), "20260103T000000Z"),
+    ]
+    assert not store.object_path(old_digest).exists()
+
+
+def test_store_retention_caps_compressed_size_counting_shared_objects_once(tmp_path):
+    store = BackupStore(tmp_path / "store", HashCache(tmp_path / "hash_cache.json"))
+    texts = [os.urandom(2000).hex() for _ in range(3)]
+    _store_versions(store, tmp_path, [
+        ("a.md", texts[0], "20260101T000000Z"),
+        ("b.md", texts[1], "20260102T000000Z"),
+        ("c.md", texts[2], "20260103T000000Z"),
+        ("d.md", texts[2], "20260104T000000Z"),
+    ])
+    size = store.object_path(store.versions()[-1]["digest"]).stat().st_size
+
+    # The two newest versions share one object, so two objects fit
+    store.apply_retention(max_total_bytes=2 * size + 10)
+
+    assert [Path(r["path"]).name for r in store.versions()] == ["b.md", "c.md", "d.md"]
+    objects = list((tmp_path / "store" / "objects").glob("*/*.z"))
+    assert len(objects) == 2
+    assert sum(p.stat().st_size for p in objects) <= 2 * size + 10
+
+
+def test_store_mode_sync_applies_retention_to_store(tmp_path):
+    state = tmp_path / "state"
+    config = {"backup_mode": "store", "backup_keep_last": 1, "state_dir": str(state)}
+    bases = [tmp_path / "a", tmp_path / "b"]
+    for base in bases:
+        (base / ".roo").mkdir(parents=True)
+    for version in range(3):
+        old = bases[1] / ".roo" / "rule.md"
+        old.write_text(f"old {version}")
+        os.utime(old, (1_600_000_000, 1_600_000_000))
+        (bases[0] / ".roo" / "rule.md").write_text(f"new {version}")
+        engine = SyncEngine(config, queue.Queue())
+        engine.execute_actions(engine.plan_actions(engine.scan_folders(bases), base_folders=bases))
+
+    assert engine.last_run_stats["backups_pruned"] == 1
+    store = BackupStore.for_state_dir(HashCache(state / "hash_cache.json"), state)
+    assert len(store.versions()) == 1
+    assert len(list((state / "backup_store" / "objects").glob("*/*.z"))) == 1
+    restored = tmp_path / "restored.md"
+    restored.write_text("")
+    store.restore(store.versions()[0]["digest"], restored)
+    assert restored.read_text() == "old 2"
@@ -0,0 +1,85 @@
+import json
+import os
+import queue
+
+import pytest
+
+from utils_sync import config_sync
+from utils_sync.benchmark import (
+    TreeSpec,
+    compare,
+    generate_tree,
+    load_results,
+    run_benchmark,
+    save_results,
+)
+from utils_sync.sync_core import SyncEngine
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+SMALL = TreeSpec(
+    name="small", projects=3, files=40, depth=2, fanout=2,
+    sizes=((64, 0.8), (4096, 0.2)), ignored=0.5, changed=0.25, seed=7,
+)
+
+
+def _tree_files(project):
+    return {
+        path.relative_to(project).as_posix(): path.read_bytes()
+        for path in sorted(project.rglob("*")) if path.is_file()
+    }
+
+
+def test_generated_tree_is_deterministic_and_plans_changed_files(tmp_path):
+    first = generate_tree(tmp_path / "a", SMALL)
+    second = generate_tree(tmp_path / "b", SMALL)
+    assert [_tree_files(p) for p in first] == [_tree_files(p) for p in second]
+
+    engine = SyncEngine(dict(config_sync.DEFAULTS), queue.Queue())
+    file_index = engine.scan_folders(first)
+    assert len(file_index) == SMALL.files
+    assert not any("node_modules" in rel or "__pycache__" in rel for rel in file_index)
+    actions = engine.plan_actions(file_index, base_folders=first)
+    changed = {a["relative_path"] for a in actions}
+    assert changed and len(actions) == len(changed) * (SMALL.projects - 1)
+
+
+def test_run_benchmark_reports_every_phase(tmp_path):
+    results = run_benchmark(SMALL, durability_modes=("none", "batch"), work_dir=tmp_path)
+
+    phases = results["phases"]
+    assert list(phases) == ["scan", "plan", "preview", "execute", "execute_durability_batch"]
+    assert phases["scan"]["files"] == SMALL.projects * SMALL.files
+    assert phases["execute"]["files"] > 0 and phases["execute"]["bytes"] > 0
+    assert phases["execute_durability_batch"]["fsyncs"] > 0
+    assert phases["execute"]["file_ops"] > 0
+    save_results(results, tmp_path / "baseline.json")
+    assert load_results(tmp_path / "baseline.json") == json.loads(json.dumps(results))
+
+
+def test_compare_flags_growth_beyond_threshold():
+    def result(seconds, rss, ops):
+        return {
+            "spec": SMALL._asdict(),
+            "phases": {"scan": {"seconds": seconds, "rss_growth_mb": rss, "file_ops": ops}},
+        }
+
+    baseline = json.loads(json.dumps(result(1.0, 100.0, 500)))
+    assert compare(result(1.2, 100.0, 500), baseline, threshold=0.25) == []
+    regressions = compare(result(1.5, 100.0, 700), baseline, threshold=0.25)
+    assert [(r.metric, round(r.change, 2)) for r in regressions] == [("seconds", 0.5), ("file_ops", 0.4)]
+    # Small absolute growth is noise
+    assert compare(result(0.03, 104.0, 500), result(0.01, 100.0, 500)) == []
+    with pytest.raises(ValueError):
+        compare(result(1.0, 100.0, 500), {**baseline, "spec": TreeSpec()._asdict()})
+
+
+@pytest.mark.skipif(
+    not os.getenv("AGENTFLOW_BENCH_BASELINE"),
+    reason="set AGENTFLOW_BENCH_BASELINE to a baseline saved on this machine",
+)
+def test_no_regression_against_baseline():
+    baseline = load_results(os.environ["AGENTFLOW_BENCH_BASELINE"])
+    threshold = float(os.getenv("AGENTFLOW_BENCH_THRESHOLD", "0.25"))
+    results = run_benchmark(TreeSpec.from_dict(baseline["spec"]), config=baseline.get("config"))
+    assert compare(results, baseline, threshold) == []
@@ -0,0 +1,94 @@
+import os
+import queue
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from utils_sync.columnar_index import ColumnarIndex, plan_columnar
+from utils_sync.sync_core import SyncEngine
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+def _make_tree(tmp_path):
+    bases = [tmp_path / f"p{idx}" for idx in range(4)]
+    for base in bases:
+        (base / ".roo" / "rules").mkdir(parents=True)
+    layout = {
+        # relative path -> {folder index: mtime}
+        "rules/a.md": {0: 1_600_000_100, 1: 1_600_000_000, 2: 1_600_000_100},
+        "rules/b.md": {2: 1_600_000_200},
+        "top.md": {1: 1_600_000_300, 3: 1_600_000_100},
+        ".roomodes": {3: 1_600_000_400, 0: 1_600_000_000},
+    }
+    for rel, per_folder in layout.items():
+        for folder_idx, mtime in per_folder.items():
+            base = bases[folder_idx]
+            path = base / rel if rel == ".roomodes" else base / ".roo" / rel
+            path.write_text(f"{rel} in p{folder_idx}")
+            os.utime(path, (mtime, mtime))
+    # A peer hard-linked to its source is already in sync
+    linked = bases[0] / ".roo" / "linked.md"
+    linked.write_text("shared")
+    os.utime(linked, (1_600_000_500, 1_600_000_500))
+    os.link(linked, bases[1] / ".roo" / "linked.md")
+    return bases
+
+
+def _plan(tmp_path, bases, **config):
+    engine = SyncEngine({"root_allowlist": [".roomodes"], **config}, queue.Queue())
+    file_index = engine.scan_folders(bases)
+    return file_index, engine.plan_actions(file_index, base_folders=bases + [tmp_path / "empty"])
+
+
+def _key(action):
+    return (action["relative_path"], str(action["destination_path"]))
+
+
+def test_columnar_plan_matches_dict_plan(tmp_path):
+    bases = _make_tree(tmp_path)
+    dict_index, expected = _plan(tmp_path, bases)
+    columnar_index, actions = _plan(tmp_path, bases, columnar_index=True)
+
+    assert isinstance(columnar_index, ColumnarIndex)
+    assert sorted(actions, key=_key) == sorted(expected, key=_key)
+    # Per relative path, peer updates come first, in scan order, like the dict planner
+    assert [a["relative_path"] for a in actions] == [a["relative_path"] for a in expected]
+    updates = [a for a in actions if a["destination_mtime"] is not None]
+    assert updates == [a for a in expected if a["destination_mtime"] is not None]
+    assert not any(a["relative_path"] == "linked.md" and a["destination_mtime"] for a in actions)
+
+    # The columnar index still reads like the dict index
+    assert list(columnar_index) == list(dict_index)
+    assert {rel: columnar_index[rel] for rel in columnar_index} == dict(dict_index)
+
+
+def test_concurrent_scan_merges_columnar_partials(tmp_path):
+    bases = _make_tree(tmp_path)
+    concurrent = {"scan_workers": 3, "scan_split_subdirs": True}
+    dict_index, expected = _plan(tmp_path, bases, **concurrent)
+    columnar_index, actions = _plan(tmp_path, bases, columnar_index=True, **concurrent)
+
+    assert list(columnar_index) == list(dict_index)
+    assert sorted(actions, key=_key) == sorted(expected, key=_key)
+
+
+def test_plan_columnar_ties_and_missing_folder_bitsets(tmp_path):
+    folders = [tmp_path / f"f{idx}" for idx in range(70)]
+    index = ColumnarIndex.from_file_index({
+        "same.md": [
+            {"path": folders[idx] / ".roo" / "same.md", "mtime": 5.0, "mtime_ns": 5,
+             "size": 1, "inode": idx + 1, "device": 1, "base_folder": folders[idx]}
+            for idx in (3, 65)
+        ],
+    })
+
+    plan = plan_columnar(index, folders)
+
+    # Equal mtimes: the first file is the source and nothing is updated
+    assert index.entry(int(plan.sources[0]))["base_folder"] == folders[3]
+    assert set(plan.kinds.tolist()) == {1}
+    missing = {plan.folders[arg] for arg in plan.args.tolist()}
+    assert missing == set(folders) - {folders[3], folders[65]}
+    assert index.presence(len(folders)).shape == (1, 2)
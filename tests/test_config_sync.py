@@ -157,3 +157,38 @@ def test_save_config_uses_comma_space_for_lists(tmp_path):
     assert "root_allowlist=.roomodes, README.md" in text
     assert "folders_faves=/one, /two" in text
 
+
+
+def test_scan_concurrency_settings_parsing(tmp_path):
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """
+    scan_workers parses as a positive int and scan_split_subdirs as a bool.
+    """
+    cfg_file = tmp_path / "config_scan.txt"
+    cfg_file.write_text("scan_workers=4\nscan_split_subdirs=true\n", encoding="utf-8")
+    cfg = config_sync.load_config(str(cfg_file))
+    assert cfg["scan_workers"] == 4
+    assert cfg["scan_split_subdirs"] is True
+
+    bad_file = tmp_path / "config_scan_bad.txt"
+    bad_file.write_text("scan_workers=0\n", encoding="utf-8")
+    bad = config_sync.load_config(str(bad_file))
+    assert bad["scan_workers"] == config_sync.DEFAULTS["scan_workers"]
+    assert bad["scan_split_subdirs"] is False
+
+
+def test_event_mode_settings_parsing(tmp_path):
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """
+    event_mode accepts verbose/batched case-insensitively; event sizes parse as ints.
+    """
+    cfg_file = tmp_path / "config_events.txt"
+    cfg_file.write_text("event_mode=Batched\nevent_interval_ms=250\nevent_queue_size=500\n", encoding="utf-8")
+    cfg = config_sync.load_config(str(cfg_file))
+    assert cfg["event_mode"] == "batched"
+    assert cfg["event_interval_ms"] == 250
+    assert cfg["event_queue_size"] == 500
+
+    bad_file = tmp_path / "config_events_bad.txt"
+    bad_file.write_text("event_mode=chatty\n", encoding="utf-8")
+    assert config_sync.load_config(str(bad_file))["event_mode"] == "verbose"
@@ -0,0 +1,217 @@
+import errno
+import os
+import queue
+
+import pytest
+
+from utils_sync import copy_backend
+from utils_sync.copy_backend import BACKENDS, CopyBackend
+from utils_sync.progress_events import EventType
+from utils_sync.sync_core import SyncEngine
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+def _source(tmp_path, data=b"hello backend"):
+    src = tmp_path / "src.bin"
+    src.write_bytes(data)
+    os.utime(src, (1_600_000_000, 1_600_000_000))
+    return src
+
+
+def test_copy_preserves_content_and_mtime_and_caches_probe(tmp_path):
+    src = _source(tmp_path)
+    dst = tmp_path / "dst.bin"
+    backend = CopyBackend()
+
+    used = backend.copy(src, dst)
+
+    assert used in BACKENDS
+    assert dst.read_bytes() == src.read_bytes()
+    assert dst.stat().st_mtime == src.stat().st_mtime
+    assert list(backend.probed_backends().values()) == [used]
+
+
+def test_unsupported_backends_fall_back_and_are_skipped_afterwards(tmp_path, monkeypatch):
+    calls = []
+
+    def unsupported(src, dst, size):
+        calls.append("reflink")
+        raise OSError(errno.EOPNOTSUPP, "no reflink")
+
+    def partial_then_cross_device(src, dst, size):
+        calls.append("copy_file_range")
+        dst.write(b"partial")
+        dst.flush()
+        raise OSError(errno.EXDEV, "cross device")
+
+    monkeypatch.setitem(copy_backend._COPIERS, "reflink", unsupported)
+    monkeypatch.setitem(copy_backend._COPIERS, "copy_file_range", partial_then_cross_device)
+    # Exercise the preallocation and fadvise hints as well
+    monkeypatch.setattr(copy_backend, "LARGE_FILE_BYTES", 1)
+    src = _source(tmp_path, b"x" * 100_000)
+    backend = CopyBackend()
+
+    assert backend.copy(src, tmp_path / "a.bin") in ("sendfile", "buffered")
+    assert (tmp_path / "a.bin").read_bytes() == src.read_bytes()
+    assert calls == ["reflink", "copy_file_range"]
+
+    calls.clear()
+    backend.copy(src, tmp_path / "b.bin")
+    assert calls == []
+    assert (tmp_path / "b.bin").read_bytes() == src.read_bytes()
+
+
+def test_real_copy_errors_are_raised(tmp_path, monkeypatch):
+    def failing(src, dst, size):
+        raise OSError(errno.EIO, "disk error")
+
+    monkeypatch.setitem(copy_backend._COPIERS, "reflink", failing)
+    with pytest.raises(OSError) as excinfo:
+        CopyBackend().copy(_source(tmp_path), tmp_path / "dst.bin")
+    assert excinfo.value.errno == errno.EIO
+
+
+def test_engine_reports_copy_backends_in_stats(tmp_path):
+    q = queue.Queue()
+    engine = SyncEngine({"backup_mode": "none", "copy_backend": "buffered"}, q)
+    bases = [tmp_path / "p1", tmp_path / "p2"]
+    for base in bases:
+        (base / ".roo").mkdir(parents=True)
+    (bases[0] / ".roo" / "a.md").write_text("a")
+    (bases[0] / ".roo" / "b.md").write_text("b")
+
+    actions = engine.plan_actions(engine.scan_folders(bases), base_folders=bases)
+    engine.execute_actions(actions)
+
+    assert engine.last_run_stats == {"copy_backends": {"buffered": 2}}
+    events = []
+    while not q.empty():
+        events.append(q.get_nowait())
+    assert events[-1].event_type == EventType.COMPLETE
+    assert events[-1].message == "Sync complete (copy backends: buffered=2)"
+    assert (bases[1] / ".roo" / "b.md").read_text() == "b"
+
+
+def test_copy_many_reads_the_source_once_for_probed_destinations(tmp_path, monkeypatch):
+    src = _source(tmp_path, b"shared content" * 100)
+    opened = []
+    real_open = open
+
+    def counting_open(path, *args, **kwargs):
+        opened.append(str(path))
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(copy_backend, "open", counting_open, raising=False)
+    destinations = [tmp_path / f"d{idx}.bin" for idx in range(4)]
+    backend = CopyBackend("buffered")
+
+    results = backend.copy_many(src, destinations)
+
+    # The first destination probes the filesystem pair, the rest share one read
+    assert [used for used, _ in results] == ["buffered", "fanout", "fanout", "fanout"]
+    assert opened.count(str(src)) == 2
+    for destination in destinations:
+        assert destination.read_bytes() == src.read_bytes()
+        assert destination.stat().st_mtime == src.stat().st_mtime
+
+
+def test_copy_many_streams_big_sources_and_isolates_failures(tmp_path, monkeypatch):
+    monkeypatch.setattr(copy_backend, "FANOUT_MMAP_BYTES", 10)
+    monkeypatch.setattr(copy_backend, "_CHUNK", 7)
+    src = _source(tmp_path, bytes(range(256)) * 4)
+    backend = CopyBackend("buffered")
+    backend.copy(src, tmp_path / "probe.bin")
+    destinations = [tmp_path / "a.bin", tmp_path / "missing" / "b.bin", tmp_path / "c.bin"]
+
+    results = backend.copy_many(src, destinations)
+
+    assert results[0] == ("fanout", None)
+    assert results[2] == ("fanout", None)
+    assert results[1][0] is None and isinstance(results[1][1], OSError)
+    assert (tmp_path / "a.bin").read_bytes() == src.read_bytes()
+    assert (tmp_path / "c.bin").read_bytes() == src.read_bytes()
+
+
+def test_engine_fans_out_one_source_to_many_destinations(tmp_path):
+    q = queue.Queue()
+    engine = SyncEngine({"backup_mode": "none", "copy_backend": "buffered"}, q)
+    bases = [tmp_path / f"p{idx}" for idx in range(5)]
+    for base in bases:
+        (base / ".roo").mkdir(parents=True)
+    (bases[0] / ".roo" / "new.md").write_text("new rule")
+
+    actions = engine.plan_actions(engine.scan_folders(bases), base_folders=bases)
+    assert len(actions) == 4
+    while not q.empty():
+        q.get_nowait()
+    engine.execute_actions(actions)
+
+    assert engine.last_run_stats == {"copy_backends": {"buffered": 1, "fanout": 3}}
+    copies = []
+    while not q.empty():
+        event = q.get_nowait()
+        if event.event_type == EventType.COPY:
+            copies.append(event)
+    assert sorted(e.folder for e in copies) == sorted(str(b) for b in bases[1:])
+    assert all((b / ".roo" / "new.md").read_text() == "new rule" for b in bases[1:])
+
+
+def test_hardlink_mode_links_peers_and_plans_them_as_in_sync(tmp_path):
+    q = queue.Queue()
+    engine = SyncEngine({"backup_mode": "timestamped", "link_mode": "hardlink"}, q)
+    bases = [tmp_path / f"p{idx}" for idx in range(3)]
+    for base in bases:
+        (base / ".roo").mkdir(parents=True)
+    source = bases[0] / ".roo" / "rule.md"
+    (bases[1] / ".roo" / "rule.md").write_text("old")
+    os.utime(bases[1] / ".roo" / "rule.md", (1_600_000_000, 1_600_000_000))
+    source.write_text("new")
+
+    actions = engine.plan_actions(engine.scan_folders(bases), base_folders=bases)
+    engine.execute_actions(actions)
+
+    assert engine.last_run_stats == {"copy_backends": {"hardlink": 2}}
+    for base in bases[1:]:
+        assert os.path.samefile(base / ".roo" / "rule.md", source)
+    assert len(list((bases[1] / ".roo").glob("rule.md_*.bak"))) == 1
+    assert not list((bases[1] / ".roo").glob(".tmp_*"))
+
+    # Linked peers share an inode and are never planned again
+    replanned = engine.plan_actions(engine.scan_folders(bases), base_folders=bases)
+    assert [a for a in replanned if a["relative_path"] == "rule.md"] == []
+
+
+def test_same_inode_peers_are_in_sync_even_with_differing_mtimes(tmp_path):
+    engine = SyncEngine({}, queue.Queue())
+    entry = {"inode": 42, "device": 7, "size": 1}
+    index = {
+        "rule.md": [
+            dict(entry, path=tmp_path / "a" / ".roo" / "rule.md", mtime=20.0, base_folder=tmp_path / "a"),
+            dict(entry, path=tmp_path / "b" / ".roo" / "rule.md", mtime=10.0, base_folder=tmp_path / "b"),
+        ]
+    }
+    assert engine.plan_actions(index) == []
+
+
+def test_hardlink_falls_back_to_copy_when_linking_fails(tmp_path, monkeypatch):
+    calls = []
+
+    def refuse(src, dst):
+        calls.append(dst)
+        raise OSError(errno.EXDEV, "cross device")
+
+    monkeypatch.setattr(copy_backend.os, "link", refuse)
+    src = _source(tmp_path)
+    backend = CopyBackend("buffered", link_mode="hardlink")
+
+    assert backend.transfer(src, tmp_path / "a.bin") == "buffered"
+    assert backend.transfer(src, tmp_path / "b.bin") == "buffered"
+    assert len(calls) == 1
+    assert (tmp_path / "b.bin").read_bytes() == src.read_bytes()
+    assert not os.path.samefile(tmp_path / "a.bin", src)
+
+
+def test_reflink_mode_tries_clones_before_the_preferred_backend():
+    assert CopyBackend("copy2", link_mode="reflink").preferred == "reflink"
+    assert CopyBackend("copy2").preferred == "copy2"
@@ -0,0 +1,79 @@
+import os
+import queue
+import random
+
+from utils_sync.delta_copy import delta_copy
+from utils_sync.progress_events import EventType
+from utils_sync.sync_core import SyncEngine
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+def _edited(data: bytes) -> bytes:
+    """Insert, delete and overwrite a few bytes, shifting everything after them."""
+    edited = bytearray(data)
+    edited[5000:5000] = b"a new line\n"
+    del edited[100_000:100_050]
+    edited[200_000:200_008] = b"CHANGED!"
+    return bytes(edited)
+
+
+def test_delta_copy_rebuilds_source_mostly_from_basis(tmp_path):
+    rng = random.Random(7)
+    old = bytes(rng.getrandbits(8) for _ in range(300_000))
+    new = _edited(old)
+    (tmp_path / "old").write_bytes(old)
+    (tmp_path / "new").write_bytes(new)
+
+    stats = delta_copy(tmp_path / "new", tmp_path / "old", tmp_path / "out")
+
+    assert (tmp_path / "out").read_bytes() == new
+    assert stats.written_bytes == len(new)
+    assert stats.literal_bytes + stats.reused_bytes == len(new)
+    assert stats.literal_bytes < len(new) // 10
+    assert (tmp_path / "out").stat().st_mtime == (tmp_path / "new").stat().st_mtime
+
+
+def test_delta_copy_gives_up_on_unrelated_content(tmp_path):
+    (tmp_path / "old").write_bytes(os.urandom(200_000))
+    (tmp_path / "new").write_bytes(os.urandom(200_000))
+    (tmp_path / "out").write_bytes(b"")
+
+    assert delta_copy(tmp_path / "new", tmp_path / "old", tmp_path / "out") is None
+    assert (tmp_path / "out").read_bytes() == b""
+
+
+def test_engine_uses_delta_for_large_existing_destinations(tmp_path):
+    q = queue.Queue()
+    engine = SyncEngine(
+        {"backup_mode": "timestamped", "delta_copy": True, "delta_min_bytes": 4096}, q
+    )
+    bases = [tmp_path / "p1", tmp_path / "p2", tmp_path / "p3"]
+    for base in bases:
+        (base / ".roo").mkdir(parents=True)
+    old = os.urandom(300_000)
+    stale = bases[1] / ".roo" / "modes.json"
+    stale.write_bytes(old)
+    os.utime(stale, (1_600_000_000, 1_600_000_000))
+    new = _edited(old)
+    (bases[0] / ".roo" / "modes.json").write_bytes(new)
+
+    actions = engine.plan_actions(engine.scan_folders(bases), base_folders=bases)
+    assert len(actions) == 2
+    while not q.empty():
+        q.get_nowait()
+    engine.execute_actions(actions)
+
+    assert stale.read_bytes() == new
+    assert (bases[2] / ".roo" / "modes.json").read_bytes() == new
+    # The backup kept the old bytes the delta was built from
+    assert [p.read_bytes() for p in (bases[1] / ".roo").glob("modes.json_*.bak")] == [old]
+    stats = engine.last_run_stats
+    assert stats["copy_backends"]["delta"] == 1
+    assert stats["delta"]["files"] == 1
+    assert stats["delta"]["literal_bytes"] < len(new) // 10
+    events = []
+    while not q.empty():
+        events.append(q.get_nowait())
+    assert any("delta" in e.message for e in events if e.event_type == EventType.COPY)
+    assert "delta reused" in events[-1].message
@@ -0,0 +1,81 @@
+import queue
+
+from utils_sync import durability
+from utils_sync.durability import WriteBatch
+from utils_sync.progress_events import EventType
+from utils_sync.sync_core import SyncEngine
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+def _temps(tmp_path, count):
+    pairs = []
+    for idx in range(count):
+        temp = tmp_path / f".tmp_f{idx}"
+        temp.write_text(f"data {idx}")
+        pairs.append((temp, tmp_path / f"f{idx}"))
+    return pairs
+
+
+def test_batch_mode_defers_renames_until_the_batch_is_full(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(durability, "fsync_file", lambda path: synced.append(path.name))
+    batch = WriteBatch("batch", batch_size=3)
+    done = []
+
+    pairs = _temps(tmp_path, 4)
+    for temp, destination in pairs[:2]:
+        batch.commit(temp, destination, done.append)
+    assert done == [] and not (tmp_path / "f0").exists()
+
+    batch.commit(*pairs[2], done.append)
+    assert done == [None, None, None]
+    assert synced == [".tmp_f0", ".tmp_f1", ".tmp_f2"]
+    assert (tmp_path / "f2").read_text() == "data 2"
+
+    batch.commit(*pairs[3], done.append)
+    batch.flush_if_pending(tmp_path / "other")
+    assert len(done) == 3
+    batch.flush_if_pending(tmp_path / "f3")
+    assert (tmp_path / "f3").read_text() == "data 3"
+    assert (batch.file_syncs, batch.dir_syncs) == (4, 2)
+
+
+def test_strict_mode_syncs_every_file_and_reports_errors(tmp_path):
+    batch = WriteBatch("strict")
+    done = []
+    for temp, destination in _temps(tmp_path, 2):
+        batch.commit(temp, destination, done.append)
+    batch.commit(tmp_path / ".tmp_missing", tmp_path / "missing", done.append)
+
+    assert done[:2] == [None, None]
+    assert isinstance(done[2], OSError)
+    assert (batch.file_syncs, batch.dir_syncs) == (2, 2)
+    assert (tmp_path / "f1").read_text() == "data 1"
+
+
+def test_engine_publishes_the_last_batch_before_complete(tmp_path):
+    q = queue.Queue()
+    engine = SyncEngine(
+        {"backup_mode": "none", "durability": "batch", "durability_batch_size": 2}, q
+    )
+    bases = [tmp_path / "p1", tmp_path / "p2"]
+    for base in bases:
+        (base / ".roo").mkdir(parents=True)
+    for name in ("a.md", "b.md", "c.md"):
+        (bases[0] / ".roo" / name).write_text(name)
+
+    actions = engine.plan_actions(engine.scan_folders(bases), base_folders=bases)
+    engine.execute_actions(actions)
+
+    for name in ("a.md", "b.md", "c.md"):
+        assert (bases[1] / ".roo" / name).read_text() == name
+    assert not list((bases[1] / ".roo").glob(".tmp_*"))
+    assert engine.last_run_stats["durability"] == {"mode": "batch", "file_syncs": 3, "dir_syncs": 2}
+    events = []
+    while not q.empty():
+        events.append(q.get_nowait())
+    copies = [e for e in events if e.event_type == EventType.COPY]
+    assert len(copies) == 3
+    assert copies[-1].count == copies[-1].total == 3
+    assert events[-1].event_type == EventType.COMPLETE
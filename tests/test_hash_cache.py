@@ -0,0 +1,87 @@
+import os
+import time
+import queue
+from utils_sync import hash_cache as hash_cache_module
+from utils_sync.hash_cache import HashCache, Fingerprint, PARTIAL_CHUNK
+from utils_sync.sync_core import SyncEngine
+from utils_sync.progress_events import EventType
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+def drain_queue(q):
+    items = []
+    while True:
+        try:
+            items.append(q.get_nowait())
+        except queue.Empty:
+            break
+    return items
+
+def _two_projects(tmp_path, content_a, content_b):
+    bases = []
+    for name, content in (("a", content_a), ("b", content_b)):
+        base = tmp_path / name; base.mkdir()
+        (base / ".roo").mkdir()
+        (base / ".roo" / "rule.md").write_bytes(content)
+        bases.append(base)
+    now = time.time()
+    os.utime(bases[0] / ".roo" / "rule.md", (now, now))
+    os.utime(bases[1] / ".roo" / "rule.md", (now - 100, now - 100))
+    return bases
+
+def test_content_check_drops_copy_of_identical_bytes(tmp_path):
+    bases = _two_projects(tmp_path, b"same bytes", b"same bytes")
+    q = queue.Queue()
+    config = {"ignore_patterns": [], "content_check": True, "state_dir": str(tmp_path / "state")}
+    engine = SyncEngine(config, q)
+    actions = engine.plan_actions(engine.scan_folders(bases))
+    assert actions == []
+    assert any(e.event_type == EventType.SKIP and "identical" in e.message for e in drain_queue(q))
+    assert (tmp_path / "state" / "hash_cache.json").exists()
+
+    # Without content_check the newer mtime still wins
+    plain = SyncEngine({"ignore_patterns": []}, queue.Queue())
+    assert len(plain.plan_actions(plain.scan_folders(bases))) == 1
+
+def test_content_check_keeps_copy_when_bytes_differ(tmp_path):
+    # Same size and same head/tail, different middle: needs the full hash to decide
+    size = 3 * PARTIAL_CHUNK
+    data_a = bytearray(b"x" * size)
+    data_b = bytearray(data_a)
+    data_b[size // 2] = ord("y")
+    bases = _two_projects(tmp_path, bytes(data_a), bytes(data_b))
+    config = {"ignore_patterns": [], "content_check": True, "state_dir": str(tmp_path / "state")}
+    engine = SyncEngine(config, queue.Queue())
+    actions = engine.plan_actions(engine.scan_folders(bases))
+    assert len(actions) == 1
+
+def test_unchanged_files_are_not_rehashed(tmp_path, monkeypatch):
+    bases = _two_projects(tmp_path, b"same bytes", b"same bytes")
+    config = {"ignore_patterns": [], "content_check": True, "state_dir": str(tmp_path / "state")}
+    SyncEngine(config, queue.Queue()).plan_actions(SyncEngine(config, queue.Queue()).scan_folders(bases))
+
+    calls = []
+    real_full = hash_cache_module._hash_full
+    monkeypatch.setattr(hash_cache_module, "_hash_full", lambda p: calls.append(p) or real_full(p))
+    # A fresh engine loads the persisted cache and needs no hashing at all
+    engine = SyncEngine(config, queue.Queue())
+    assert engine.plan_actions(engine.scan_folders(bases)) == []
+    assert calls == []
+
+def test_hash_cache_evicts_least_recently_used(tmp_path):
+    cache = HashCache(tmp_path / "h.json", max_entries=2)
+    paths = []
+    for i in range(3):
+        p = tmp_path / f"f{i}"
+        p.write_text(str(i))
+        paths.append(p)
+        cache.partial_hash(p, Fingerprint.from_stat(p.stat()))
+    # Make the first entry the oldest
+    first_key = hash_cache_module.fingerprint_key(paths[0], Fingerprint.from_stat(paths[0].stat()))
+    cache._entries[first_key]["u"] = 0
+    assert cache.save() is True
+
+    reloaded = HashCache(tmp_path / "h.json", max_entries=2)
+    reloaded.load()
+    assert len(reloaded) == 2
+    assert first_key not in reloaded._entries
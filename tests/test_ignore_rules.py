@@ -0,0 +1,62 @@
+import queue
+from utils_sync.ignore_rules import IgnoreRules
+from utils_sync.sync_core import SyncEngine
+from utils_sync import config_sync
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+def test_from_config_categorizes_names_globs_folders_and_files():
+    rules = IgnoreRules.from_config([
+        ".git", "*.pyc", ".roo/docs", r".roo\rules\02-database.md", ".roo/tmp/*.json", "a/b/node_modules/",
+    ])
+    assert rules.is_ignored("x/.git/config")
+    assert rules.is_ignored("rules/cache.pyc")
+    assert rules.is_ignored("docs")
+    assert rules.is_ignored("docs/deep/file.md")
+    assert rules.is_ignored("rules/02-database.md")
+    assert rules.is_ignored("tmp/out.json")
+    assert rules.is_ignored("pkg/node_modules/index.js")
+    # Near misses stay visible
+    assert not rules.is_ignored("rules/docs/file.md")
+    assert not rules.is_ignored("rules/02-database.md.txt")
+    assert not rules.is_ignored("rules/cache.py")
+    assert not rules.is_ignored("tmp/out.md")
+
+def test_default_glob_patterns_are_honored_during_scan(tmp_path):
+    base = tmp_path / "proj"; base.mkdir()
+    roo = base / ".roo"; roo.mkdir()
+    (roo / "mod.py").write_text("x")
+    (roo / "mod.pyc").write_text("x")
+    config = {"ignore_patterns": config_sync.DEFAULTS["ignore_patterns"]}
+    index = SyncEngine(config, queue.Queue()).scan_folders([base])
+    assert set(index) == {"mod.py"}
+
+def test_syncignore_applies_to_its_directory_and_below(tmp_path):
+    base = tmp_path / "proj"; base.mkdir()
+    roo = base / ".roo"; roo.mkdir()
+    rules_dir = roo / "rules"; (rules_dir / "drafts").mkdir(parents=True)
+    (rules_dir / ".syncignore").write_text("# local rules\n*.log\ndrafts/\n/notes/tmp\n")
+    (rules_dir / "keep.md").write_text("x")
+    (rules_dir / "run.log").write_text("x")
+    (rules_dir / "drafts" / "wip.md").write_text("x")
+    (rules_dir / "notes" / "tmp").mkdir(parents=True)
+    (rules_dir / "notes" / "tmp" / "a.md").write_text("x")
+    (rules_dir / "notes" / "b.md").write_text("x")
+    # Outside the .syncignore directory the rules do not apply
+    (roo / "other.log").write_text("x")
+
+    engine = SyncEngine({"ignore_patterns": []}, queue.Queue())
+    index = engine.scan_folders([base])
+    assert set(index) == {
+        "rules/.syncignore", "rules/keep.md", "rules/notes/b.md", "other.log",
+    }
+
+def test_compiled_rules_are_cached_per_pattern_list():
+    config = {"ignore_patterns": [".git"]}
+    engine = SyncEngine(config, queue.Queue())
+    first = engine._get_ignore_rules()
+    assert engine._get_ignore_rules() is first
+    config["ignore_patterns"] = [".git", "*.tmp"]
+    second = engine._get_ignore_rules()
+    assert second is not first
+    assert second.is_ignored("a.tmp")
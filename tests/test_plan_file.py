@@ -0,0 +1,143 @@
+import os
+import queue
+import shutil
+
+import pytest
+
+import cli_sync
+
+from utils_sync.progress_events import EventType
+
+from utils_sync.plan_file import PlanFileError, PlanReader, config_hash, write_plan
+from utils_sync.sync_core import SyncEngine
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+def _setup(tmp_path):
+    bases = [tmp_path / "p1", tmp_path / "p2"]
+    for base in bases:
+        (base / ".roo").mkdir(parents=True)
+    old = bases[1] / ".roo" / "rule.md"
+    old.write_text("old")
+    os.utime(old, (1_600_000_000, 1_600_000_000))
+    (bases[0] / ".roo" / "rule.md").write_text("new rule")
+    (bases[0] / ".roo" / "other.md").write_text("other")
+    (bases[0] / ".roomodes").write_text("modes")
+    return bases
+
+
+@pytest.mark.parametrize("name", ["plan.jsonl", "plan.jsonl.gz"])
+def test_plan_file_round_trips_actions(tmp_path, name):
+    bases = _setup(tmp_path)
+    config = {"root_allowlist": [".roomodes"]}
+    engine = SyncEngine(config, queue.Queue())
+    actions = engine.plan_actions(engine.scan_folders(bases), base_folders=bases)
+
+    assert write_plan(tmp_path / name, actions, bases, config) == 3
+    with PlanReader(tmp_path / name) as reader:
+        assert reader.folders == bases
+        assert reader.count == 3
+        assert reader.config_hash == config_hash({**config, "window_width": 1})
+        assert [entry.action for entry in reader] == actions
+
+
+def test_plan_reader_skips_changed_and_finished_actions(tmp_path):
+    bases = _setup(tmp_path)
+    engine = SyncEngine({"backup_mode": "none"}, queue.Queue())
+    actions = engine.plan_actions(engine.scan_folders(bases), base_folders=bases)
+    write_plan(tmp_path / "plan.jsonl", actions, bases, engine.config)
+
+    # Run one action, then change the source of another
+    engine.execute_actions([a for a in actions if a["relative_path"] == "rule.md"])
+    (bases[0] / ".roo" / "other.md").write_text("edited after planning")
+
+    with PlanReader(tmp_path / "plan.jsonl") as reader:
+        chunks = list(reader.chunks(size=1))
+        assert chunks == []
+        assert reader.skipped == {"done": 1, "source_changed": 1, "destination_changed": 0}
+
+
+def test_truncated_or_foreign_plan_files_are_rejected(tmp_path):
+    bases = _setup(tmp_path)
+    engine = SyncEngine({}, queue.Queue())
+    actions = engine.plan_actions(engine.scan_folders(bases), base_folders=bases)
+    plan_path = tmp_path / "plan.jsonl"
+    write_plan(plan_path, actions, bases, engine.config)
+    lines = plan_path.read_text().splitlines(keepends=True)
+    plan_path.write_text("".join(lines[:-1]))
+
+    with PlanReader(plan_path) as reader:
+        with pytest.raises(PlanFileError, match="truncated"):
+            list(reader.actions())
+    (tmp_path / "other.jsonl").write_text('{"version": 1}\n')
+    with pytest.raises(PlanFileError):
+        PlanReader(tmp_path / "other.jsonl")
+
+
+def test_streamed_plan_executes_as_one_run(tmp_path):
+    bases = [tmp_path / f"p{n}" for n in range(3)]
+    for base in bases:
+        (base / ".roo").mkdir(parents=True)
+    for idx in range(7):
+        (bases[0] / ".roo" / f"f{idx}.md").write_text(f"file {idx}")
+    engine = SyncEngine({"backup_mode": "none"}, queue.Queue())
+    actions = engine.plan_actions(engine.scan_folders(bases), base_folders=bases)
+    write_plan(tmp_path / "plan.jsonl", actions, bases, engine.config)
+
+    # Chunks are only cut between sources, so each source is still read once
+    chunks = list(SyncEngine._source_chunks(actions, 3))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 4, 2]
+    assert all(len({a["source_path"] for a in chunk}) == len(chunk) // 2 for chunk in chunks)
+
+    events = queue.Queue()
+    engine = SyncEngine({"backup_mode": "none"}, events)
+    with PlanReader(tmp_path / "plan.jsonl") as reader:
+        assert reader.folder_totals == {str(bases[0]): 0, str(bases[1]): 7, str(bases[2]): 7}
+        pending = engine.execute_actions(
+            reader.actions(), chunk_size=3, totals=reader.folder_totals
+        )
+
+    assert pending == []
+    drained = [events.get() for _ in range(events.qsize())]
+    assert [e.event_type for e in drained].count(EventType.COMPLETE) == 1
+    copies = [e for e in drained if e.event_type == EventType.COPY]
+    assert {(e.folder, e.count, e.total) for e in copies if e.count == 7} == {
+        (str(bases[1]), 7, 7), (str(bases[2]), 7, 7),
+    }
+    assert all(e.total == 7 for e in copies)
+
+
+def test_plan_runs_against_remapped_folders(tmp_path, capsys):
+    planned = _setup(tmp_path / "machine_a")
+    config_path = tmp_path / "config.txt"
+    config_path.write_text("backup_mode=none\nroot_allowlist=.roomodes\n")
+    plan_path = tmp_path / "plan.jsonl"
+    cli_sync.run_cli_plan(planned, plan_path, config_path=config_path)
+
+    # The same projects at other paths, copied with their mtimes
+    moved = [tmp_path / "machine_b" / base.name for base in planned]
+    for base, target in zip(planned, moved):
+        shutil.copytree(base, target)
+    with pytest.raises(PlanFileError, match="2 folders"):
+        PlanReader(plan_path, folders=moved[:1])
+    with PlanReader(plan_path, folders=moved) as reader:
+        assert reader.planned_folders == planned and reader.folders == moved
+        assert all(
+            moved[1] in entry.action["destination_path"].parents for entry in reader
+        )
+
+    args = cli_sync._parse_args([
+        "execute", "--config", str(config_path),
+        "--folder", str(moved[0]), "--folder", str(moved[1]), str(plan_path),
+    ])
+    cli_sync.run_cli_execute(
+        args.plan_file, config_path=args.config, folders=args.folders
+    )
+
+    out = capsys.readouterr().out
+    assert f"[PLAN] {planned[0]} -> {moved[0]}" in out
+    assert out.count("[COMPLETE]") == 1
+    assert (moved[1] / ".roo" / "rule.md").read_text() == "new rule"
+    assert (moved[1] / ".roomodes").read_text() == "modes"
+    assert (planned[1] / ".roo" / "rule.md").read_text() == "old"
@@ -0,0 +1,40 @@
+from utils_sync.preview_model import PreviewModel, group_key
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+def _items(*relatives):
+    return [{"relative": rel, "timestamp": "", "action": {"relative_path": rel}} for rel in relatives]
+
+
+def test_groups_keep_root_first_and_rules_before_rules_variants():
+    model = PreviewModel(_items(
+        "rules-ask/z.md", "rules/B.md", "top.md", "rules/a.md", "rules/sub/c.md", ".roomodes",
+    ))
+
+    assert model.groups() == ["", "rules", "rules/sub", "rules-ask"]
+    assert [i["relative"] for i in model.rows("")] == [".roomodes", "top.md"]
+    assert [i["relative"] for i in model.rows("rules")] == ["rules/a.md", "rules/B.md"]
+    assert len(model) == 6
+    assert group_key("rules/sub/c.md") == "rules/sub"
+
+
+def test_rows_are_paged_in_display_order():
+    model = PreviewModel(_items(*(f"big/{n:05d}.md" for n in reversed(range(500)))))
+
+    first = model.rows("big", 0, 200)
+    last = model.rows("big", 400, 200)
+    assert [i["relative"] for i in first[:2]] == ["big/00000.md", "big/00001.md"]
+    assert len(last) == 100 and last[-1]["relative"] == "big/00499.md"
+    assert model.rows("missing") == []
+
+
+def test_remove_and_mark_replaced():
+    model = PreviewModel(_items("a.md", "dir/b.md"))
+
+    assert model.mark_replaced("a.md") and model.is_replaced("a.md")
+    assert not model.mark_replaced("nope.md")
+    assert model.remove("dir/b.md")["relative"] == "dir/b.md"
+    assert model.groups() == [""] and model.remove("dir/b.md") is None
+    model.remove("a.md")
+    assert not model and not model.is_replaced("a.md")
@@ -0,0 +1,46 @@
+from utils_sync.progress_events import BoundedEventQueue, EventType, make_event
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+def _drain(q):
+    items = []
+    while not q.empty():
+        items.append(q.get_nowait())
+    return items
+
+
+def test_bounded_queue_drops_low_value_events_but_never_critical_ones():
+    q = BoundedEventQueue(limit=3)
+    for idx in range(10):
+        q.put(make_event(EventType.SCAN_FILE, folder="a", file_path=f"f{idx}"))
+    q.put(make_event(EventType.COPY, file_path="x"))
+    q.put(make_event(EventType.ERROR, message="boom"))
+    q.put(make_event(EventType.SKIP, file_path="y"))
+    q.put(make_event(EventType.COMPLETE, message="done"))
+
+    events = _drain(q)
+    assert [e.event_type for e in events] == [
+        EventType.SCAN_FILE, EventType.SCAN_FILE, EventType.SCAN_FILE,
+        EventType.COPY, EventType.ERROR, EventType.COMPLETE,
+    ]
+    assert q.dropped == 8
+
+
+def test_bounded_queue_merges_pending_scan_progress_per_folder():
+    q = BoundedEventQueue(limit=1)
+    q.put(make_event(EventType.SCAN_START))
+    for count in (1, 2, 3):
+        q.put(make_event(EventType.SCAN_PROGRESS, folder="a", count=count))
+    q.put(make_event(EventType.SCAN_PROGRESS, folder="b", count=7))
+
+    events = _drain(q)
+    assert [(e.event_type, e.folder, e.count) for e in events] == [
+        (EventType.SCAN_START, "", 0),
+        (EventType.SCAN_PROGRESS, "a", 3),
+        (EventType.SCAN_PROGRESS, "b", 7),
+    ]
+
+    # Once delivered, a new progress event is queued rather than merged
+    q.put(make_event(EventType.SCAN_PROGRESS, folder="a", count=4))
+    assert [e.count for e in _drain(q)] == [4]
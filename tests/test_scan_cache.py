@@ -0,0 +1,161 @@
+import os
+import queue
+from pathlib import Path
+from utils_sync.sync_core import SyncEngine
+from utils_sync.scan_cache import ScanCache
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+def _make_project(tmp_path):
+    base = tmp_path / "proj"; base.mkdir()
+    roo = base / ".roo"; roo.mkdir()
+    (roo / "rules").mkdir()
+    (roo / "rules" / "01.md").write_text("one")
+    (roo / "top.md").write_text("top")
+    return base, roo
+
+def _count_scandir(monkeypatch):
+    listed = []
+    real_scandir = os.scandir
+
+    def recording_scandir(path):
+        listed.append(Path(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", recording_scandir)
+    return listed
+
+def test_scan_cache_skips_listing_unchanged_directories(tmp_path, monkeypatch):
+    base, roo = _make_project(tmp_path)
+    config = {"ignore_patterns": [], "scan_cache": True, "state_dir": str(tmp_path / "state")}
+    engine = SyncEngine(config, queue.Queue())
+
+    first = engine.scan_folders([base])
+    cache_files = list((tmp_path / "state" / "scan_cache").glob("*.json"))
+    assert len(cache_files) == 1
+
+    listed = _count_scandir(monkeypatch)
+    second = engine.scan_folders([base])
+
+    # Nothing changed: no directory is re-listed and the index is identical
+    assert listed == []
+    assert {k: [(e["path"], e["size"], e["mtime_ns"]) for e in v] for k, v in first.items()} == \
+           {k: [(e["path"], e["size"], e["mtime_ns"]) for e in v] for k, v in second.items()}
+
+def _count_stat(monkeypatch):
+    stated = []
+    real_stat = os.stat
+
+    def recording_stat(path, *args, **kwargs):
+        stated.append(Path(path))
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", recording_stat)
+    return stated
+
+def _edit_in_place(path, text):
+    path.write_text(text)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+def test_warm_scan_cache_stats_only_directories(tmp_path, monkeypatch):
+    base, roo = _make_project(tmp_path)
+    for idx in range(20):
+        (roo / "rules" / f"extra{idx:02d}.md").write_text("x" * idx)
+    config = {"ignore_patterns": [], "scan_cache": True, "scan_cache_stat_files": False,
+              "state_dir": str(tmp_path / "state")}
+    first = SyncEngine(config, queue.Queue()).scan_folders([base])
+
+    stated = _count_stat(monkeypatch)
+    second = SyncEngine(config, queue.Queue()).scan_folders([base])
+
+    # No file is stat'ed; each directory once (.roo itself also by has_roo_dir)
+    assert {p for p in stated if roo in p.parents} == {roo / "rules"}
+    assert stated.count(roo / "rules") == 1
+    assert {k: [(e["path"], e["size"], e["mtime_ns"], e["inode"], e["device"]) for e in v]
+            for k, v in first.items()} == \
+           {k: [(e["path"], e["size"], e["mtime_ns"], e["inode"], e["device"]) for e in v]
+            for k, v in second.items()}
+
+def test_scan_cache_without_file_stats_misses_in_place_edits(tmp_path, monkeypatch):
+    base, roo = _make_project(tmp_path)
+    config = {"ignore_patterns": [], "scan_cache": True, "scan_cache_stat_files": False,
+              "state_dir": str(tmp_path / "state")}
+    engine = SyncEngine(config, queue.Queue())
+    engine.scan_folders([base])
+
+    # Adding a file moves the directory mtime, so only that directory is re-listed
+    (roo / "rules" / "02.md").write_text("two")
+    old_dir_mtime = os.stat(roo / "rules").st_mtime_ns
+    os.utime(roo / "rules", ns=(old_dir_mtime + 1_000_000_000, old_dir_mtime + 1_000_000_000))
+    # An in-place edit in an unchanged directory is not seen without file stats
+    _edit_in_place(roo / "top.md", "edited top")
+
+    listed = _count_scandir(monkeypatch)
+    index = engine.scan_folders([base])
+
+    assert listed == [roo / "rules"]
+    assert "rules/02.md" in index
+    assert index["top.md"][0]["size"] == len("top")
+
+def test_scan_cache_sees_in_place_edits_by_default(tmp_path, monkeypatch):
+    base, roo = _make_project(tmp_path)
+    config = {"ignore_patterns": [], "scan_cache": True, "state_dir": str(tmp_path / "state")}
+    engine = SyncEngine(config, queue.Queue())
+    engine.scan_folders([base])
+
+    top = roo / "top.md"
+    _edit_in_place(top, "edited top")
+
+    listed = _count_scandir(monkeypatch)
+    index = engine.scan_folders([base])
+
+    assert listed == []
+    assert index["top.md"][0]["size"] == len("edited top")
+    assert index["top.md"][0]["mtime_ns"] == top.stat().st_mtime_ns
+
+def test_in_place_edit_under_unchanged_directory_is_not_overwritten(tmp_path):
+    folders = []
+    for name in ("a", "b"):
+        base = tmp_path / name
+        (base / ".roo" / "rules").mkdir(parents=True)
+        rule = base / ".roo" / "rules" / "r.md"
+        rule.write_text("original")
+        os.utime(rule, (100, 100))
+        folders.append(base)
+    config = {"ignore_patterns": [], "scan_cache": True, "backup_mode": "none",
+              "state_dir": str(tmp_path / "state")}
+    SyncEngine(config, queue.Queue()).scan_folders(folders)
+
+    # A: edited in place at t=200, its directory mtime unchanged
+    a_rule = folders[0] / ".roo" / "rules" / "r.md"
+    a_dir_mtime = os.stat(a_rule.parent).st_mtime_ns
+    a_rule.write_text("A-edit")
+    os.utime(a_rule, (200, 200))
+    os.utime(a_rule.parent, ns=(a_dir_mtime, a_dir_mtime))
+    # B: edited through a rename at t=150, which moves its directory mtime
+    b_rule = folders[1] / ".roo" / "rules" / "r.md"
+    temp = b_rule.with_name("r.md.new")
+    temp.write_text("B-edit")
+    os.utime(temp, (150, 150))
+    os.replace(temp, b_rule)
+
+    engine = SyncEngine(config, queue.Queue())
+    actions = engine.plan_actions(engine.scan_folders(folders), base_folders=folders)
+    assert [(a["source_path"], a["destination_path"]) for a in actions] == [(a_rule, b_rule)]
+    engine.execute_actions(actions)
+    assert a_rule.read_text() == b_rule.read_text() == "A-edit"
+
+def test_scan_cache_ignores_cache_of_other_folder(tmp_path):
+    cache_path = tmp_path / "cache.json"
+    cache = ScanCache(tmp_path / "a", cache_path)
+    cache.record_dir("", 123, [], {})
+    assert cache.save() is True
+
+    other = ScanCache(tmp_path / "b", cache_path)
+    other.load()
+    assert other.lookup_dir("", 123) is None
+
+    same = ScanCache(tmp_path / "a", cache_path)
+    same.load()
+    assert same.lookup_dir("", 123) == ([], {})
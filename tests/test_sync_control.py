@@ -0,0 +1,110 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from utils_sync.progress_events import EventType
+from utils_sync.sync_control import SyncCancelled, SyncControl
+from utils_sync.sync_core import SyncEngine
+from utils_sync.sync_worker import SyncWorker
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+def _make_projects(tmp_path, files=3):
+    base1 = tmp_path / "p1"
+    base2 = tmp_path / "p2"
+    for base in (base1, base2):
+        (base / ".roo").mkdir(parents=True)
+    for idx in range(files):
+        (base1 / ".roo" / f"f{idx}.md").write_text(f"content {idx}")
+    return base1, base2
+
+
+def _events(q):
+    items = []
+    while not q.empty():
+        items.append(q.get_nowait())
+    return items
+
+
+class _CancelAfter(SyncControl):
+    """Cancels itself once `after` checkpoints have passed."""
+
+    def __init__(self, after):
+        super().__init__()
+        self.after = after
+
+    def checkpoint(self):
+        if self.after == 0:
+            self.cancel()
+        self.after -= 1
+        super().checkpoint()
+
+
+def test_cancel_during_execute_reports_pending_actions(tmp_path):
+    base1, base2 = _make_projects(tmp_path)
+    q = queue.Queue()
+    engine = SyncEngine({"backup_mode": "none"}, q)
+    actions = engine.plan_actions(engine.scan_folders([base1, base2]), base_folders=[base1, base2])
+    assert len(actions) == 3
+    _events(q)
+
+    pending = engine.execute_actions(actions, control=_CancelAfter(1))
+
+    assert pending == actions[1:]
+    assert actions[0]["destination_path"].exists()
+    assert not any(a["destination_path"].exists() for a in pending)
+    events = _events(q)
+    assert [e.event_type for e in events] == [EventType.COPY, EventType.CANCELLED]
+    assert events[-1].count == 2
+    assert events[-1].total == 3
+    assert "2 of 3 actions pending" in events[-1].message
+
+
+def test_cancelled_scan_raises_and_worker_emits_cancelled(tmp_path):
+    base1, base2 = _make_projects(tmp_path)
+    engine = SyncEngine({}, queue.Queue())
+    control = SyncControl()
+    control.cancel()
+    with pytest.raises(SyncCancelled):
+        engine.scan_folders([base1, base2], control=control)
+
+    q = queue.Queue()
+    worker = SyncWorker(SyncEngine({}, q), [base1, base2], control=control)
+    worker.run()
+    events = _events(q)
+    assert events[-1].event_type == EventType.CANCELLED
+    assert not (base2 / ".roo" / "f0.md").exists()
+
+
+def test_pause_holds_execution_until_resume(tmp_path):
+    base1, base2 = _make_projects(tmp_path)
+    engine = SyncEngine({"backup_mode": "none"}, queue.Queue())
+    actions = engine.plan_actions(engine.scan_folders([base1, base2]), base_folders=[base1, base2])
+    control = SyncControl()
+    control.pause()
+
+    thread = threading.Thread(target=engine.execute_actions, args=(actions,), kwargs={"control": control})
+    thread.start()
+    time.sleep(0.2)
+    assert thread.is_alive()
+    assert not any(a["destination_path"].exists() for a in actions)
+
+    control.resume()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert all(a["destination_path"].exists() for a in actions)
+
+
+def test_cancel_releases_a_paused_job():
+    control = SyncControl()
+    control.pause()
+    assert control.paused
+    threading.Timer(0.05, control.cancel).start()
+    start = time.monotonic()
+    with pytest.raises(SyncCancelled):
+        control.checkpoint()
+    assert time.monotonic() - start < 1.0
+    assert not control.paused
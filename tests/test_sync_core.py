@@ -278,4 +278,203 @@ def test_root_allowlist_safety_checks(tmp_path):
     engine4 = SyncEngine(config, q4)
     index4 = engine4.scan_folders([project4])
     assert "config.txt" in index4, "Valid regular files should be included"
-    assert index4["config.txt"][0]["path"] == valid_file
\ No newline at end of file
+    assert index4["config.txt"][0]["path"] == valid_file
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+def test_scan_folders_never_enters_ignored_subtrees(tmp_path, monkeypatch):
+    """
+    Ignored directories (by name or .roo-scoped path) must be pruned before they are
+    listed, while sibling files keep their .roo-relative keys and metadata.
+    """
+    q = queue.Queue()
+    config = {"ignore_patterns": ["node_modules", ".roo/docs"]}
+    engine = SyncEngine(config, q)
+
+    base = tmp_path / "proj"; base.mkdir()
+    roo = base / ".roo"; roo.mkdir()
+    (roo / "node_modules" / "pkg").mkdir(parents=True)
+    (roo / "node_modules" / "pkg" / "index.js").write_text("x")
+    (roo / "docs" / "deep").mkdir(parents=True)
+    (roo / "docs" / "deep" / "a.md").write_text("x")
+    (roo / "rules").mkdir()
+    kept = roo / "rules" / "01.md"
+    kept.write_text("keep")
+
+    listed = []
+    real_scandir = os.scandir
+
+    def recording_scandir(path):
+        listed.append(Path(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", recording_scandir)
+    index = engine.scan_folders([base])
+
+    assert set(index.keys()) == {"rules/01.md"}
+    entry = index["rules/01.md"][0]
+    assert entry["path"] == kept
+    assert entry["size"] == 4
+    assert entry["mtime_ns"] == kept.stat().st_mtime_ns
+    assert entry["base_folder"] == base
+
+    # Only .roo itself and the non-ignored subfolder are ever listed
+    assert set(listed) == {roo, roo / "rules"}
+
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+def _index_snapshot(index):
+    return {
+        rel: [(str(e["path"]), e["size"], e["mtime_ns"], str(e["base_folder"])) for e in group]
+        for rel, group in index.items()
+    }
+
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+def test_concurrent_scan_matches_sequential_and_attributes_events(tmp_path):
+    """
+    scan_workers > 1 (with and without per-subdirectory tasks) must produce the same
+    index as a sequential scan, with per-folder SCAN_START and SCAN_FILE events.
+    """
+    folders = []
+    for n in range(4):
+        base = tmp_path / f"p{n}"; base.mkdir()
+        roo = base / ".roo"; roo.mkdir()
+        for sub in ("rules", "commands", "rules-code"):
+            (roo / sub).mkdir()
+            for i in range(3):
+                (roo / sub / f"{i}.md").write_text(f"{n}-{sub}-{i}")
+        (roo / "top.md").write_text("top")
+        (base / ".roomodes").write_text("modes")
+        folders.append(base)
+
+    base_config = {"ignore_patterns": ["rules-code"], "root_allowlist": [".roomodes"]}
+    sequential = SyncEngine(dict(base_config), queue.Queue()).scan_folders(folders)
+
+    for split in (False, True):
+        q = queue.Queue()
+        config = dict(base_config, scan_workers=3, scan_split_subdirs=split,
+                      scan_cache=True, state_dir=str(tmp_path / f"state{split}"))
+        concurrent_index = SyncEngine(config, q).scan_folders(folders)
+        assert _index_snapshot(concurrent_index) == _index_snapshot(sequential)
+
+        events = drain_queue(q)
+        started = {e.folder for e in events if e.event_type == EventType.SCAN_START and e.folder}
+        assert started == {str(f) for f in folders}
+        for e in events:
+            if e.event_type == EventType.SCAN_FILE:
+                entries = concurrent_index[e.file_path]
+                assert any(str(entry["base_folder"]) == e.folder for entry in entries)
+
+        # A second cached concurrent scan sees the same tree
+        again = SyncEngine(config, queue.Queue()).scan_folders(folders)
+        assert _index_snapshot(again) == _index_snapshot(sequential)
+
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+def test_batched_event_mode_summarizes_scan_files(tmp_path):
+    q = queue.Queue()
+    engine = SyncEngine({"event_mode": "batched", "event_interval_ms": 60000}, q)
+    folders = []
+    for name, count in (("f1", 5), ("f2", 3)):
+        base = tmp_path / name
+        (base / ".roo").mkdir(parents=True)
+        for idx in range(count):
+            (base / ".roo" / f"file{idx}.md").write_text("x")
+        folders.append(base)
+
+    index = engine.scan_folders(folders)
+    assert len(index) == 5
+
+    events = drain_queue(q)
+    assert not any(e.event_type == EventType.SCAN_FILE for e in events)
+    final = {}
+    for event in events:
+        if event.event_type == EventType.SCAN_PROGRESS:
+            final[event.folder] = event.count
+    assert final == {str(folders[0]): 5, str(folders[1]): 3}
+
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+def test_plan_actions_places_missing_top_level_roo_files_under_roo(tmp_path):
+    q = queue.Queue()
+    engine = SyncEngine({"root_allowlist": [".roomodes"]}, q)
+    base1 = tmp_path / "f1"; (base1 / ".roo").mkdir(parents=True)
+    base2 = tmp_path / "f2"; (base2 / ".roo").mkdir(parents=True)
+    (base1 / ".roo" / "top.md").write_text("top")
+    (base1 / ".roomodes").write_text("{}")
+
+    index = engine.scan_folders([base1, base2])
+    actions = engine.plan_actions(index, base_folders=[base1, base2])
+
+    destinations = {a["relative_path"]: a["destination_path"] for a in actions}
+    assert destinations == {
+        "top.md": base2 / ".roo" / "top.md",
+        ".roomodes": base2 / ".roomodes",
+    }
+
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+def test_execute_actions_reports_per_destination_folder_progress(tmp_path):
+    q = queue.Queue()
+    engine = SyncEngine({"backup_mode": "none"}, q)
+    bases = []
+    for name in ("f1", "f2", "f3"):
+        base = tmp_path / name
+        (base / ".roo").mkdir(parents=True)
+        bases.append(base)
+    (bases[0] / ".roo" / "a.md").write_text("a")
+    (bases[0] / ".roo" / "b.md").write_text("b")
+    (bases[1] / ".roo" / "c.md").write_text("c")
+
+    actions = engine.plan_actions(engine.scan_folders(bases), base_folders=bases)
+    assert {a["destination_folder"] for a in actions} == set(bases)
+    drain_queue(q)
+    engine.execute_actions(actions)
+
+    copies = [e for e in drain_queue(q) if e.event_type == EventType.COPY]
+    assert len(copies) == len(actions) == 6
+    by_folder = {}
+    for event in copies:
+        by_folder.setdefault(event.folder, []).append((event.count, event.total))
+    assert by_folder == {
+        str(bases[0]): [(1, 1)],
+        str(bases[1]): [(1, 2), (2, 2)],
+        str(bases[2]): [(1, 3), (2, 3), (3, 3)],
+    }
+
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+def test_concurrent_execute_keeps_per_destination_order_and_events(tmp_path):
+    q = queue.Queue()
+    engine = SyncEngine({"backup_mode": "timestamped", "copy_workers": 4}, q)
+    src = tmp_path / "src" / ".roo"
+    dst = tmp_path / "dst"
+    src.mkdir(parents=True)
+    (dst / ".roo").mkdir(parents=True)
+    actions = []
+    for idx in range(40):
+        (src / f"f{idx}.md").write_text(f"file {idx}")
+        actions.append({
+            "action": "copy",
+            "source_path": src / f"f{idx}.md",
+            "destination_path": dst / ".roo" / f"f{idx}.md",
+            "destination_folder": dst,
+            "relative_path": f"f{idx}.md",
+        })
+    # A second action for the same destination must run after the first
+    (src / "second.md").write_text("second")
+    actions.append(dict(actions[0], source_path=src / "second.md"))
+
+    assert engine.execute_actions(actions) == []
+
+    assert (dst / ".roo" / "f0.md").read_text() == "second"
+    assert (dst / ".roo" / "f39.md").read_text() == "file 39"
+    assert len(list((dst / ".roo").glob("f0.md_*.bak"))) == 1
+    assert not list((dst / ".roo").glob(".tmp_*"))
+
+    events = drain_queue(q)
+    copies = [e for e in events if e.event_type == EventType.COPY]
+    assert sorted(e.count for e in copies) == list(range(1, 42))
+    assert all(e.total == 41 for e in copies)
+    assert [e.event_type for e in events].count(EventType.COMPLETE) == 1
+    assert events[-1].event_type == EventType.COMPLETE
@@ -0,0 +1,105 @@
+import datetime
+import os
+import queue
+import shutil
+
+from utils_sync.progress_events import EventType
+from utils_sync.sync_control import SyncControl
+from utils_sync.sync_core import SyncEngine
+from utils_sync.sync_journal import SyncJournal
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+class _CancelAfter(SyncControl):
+    """Cancels itself once `after` checkpoints have passed."""
+
+    def __init__(self, after):
+        super().__init__()
+        self.after = after
+
+    def checkpoint(self):
+        if self.after == 0:
+            self.cancel()
+        self.after -= 1
+        super().checkpoint()
+
+
+def _setup(tmp_path, files=4):
+    bases = [tmp_path / "p1", tmp_path / "p2"]
+    for base in bases:
+        (base / ".roo").mkdir(parents=True)
+    for idx in range(files):
+        old = bases[1] / ".roo" / f"f{idx}.md"
+        old.write_text(f"old {idx}")
+        os.utime(old, (1_600_000_000, 1_600_000_000))
+        (bases[0] / ".roo" / f"f{idx}.md").write_text(f"new {idx}")
+    engine = SyncEngine(
+        {"backup_mode": "timestamped", "state_dir": str(tmp_path / "state")}, queue.Queue()
+    )
+    actions = engine.plan_actions(engine.scan_folders(bases), base_folders=bases)
+    return engine, bases, sorted(actions, key=lambda a: a["relative_path"])
+
+
+def test_interrupted_run_is_cleaned_up_and_resumed_without_redoing_work(tmp_path):
+    engine, bases, actions = _setup(tmp_path)
+    journal = engine.open_journal(bases)
+    engine.execute_actions(actions, control=_CancelAfter(1), journal=journal)
+    assert journal.exists()
+
+    # Simulate a crash during f1 (temp written, destination moved to its backup)
+    # and after f2's copy landed but before it was journaled
+    dest1 = actions[1]["destination_path"]
+    (dest1.parent / ".tmp_f1.md.abc123").write_text("partial")
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    os.rename(dest1, str(dest1) + f"_{stamp}.bak")
+    shutil.copy2(actions[2]["source_path"], actions[2]["destination_path"])
+
+    resumed = SyncJournal.for_folders(bases, tmp_path / "state")
+    pending = resumed.recover()
+
+    assert [a["relative_path"] for a in pending] == ["f1.md", "f3.md"]
+    assert (resumed.removed_temps, resumed.restored_backups) == (1, 1)
+    assert dest1.read_text() == "old 1"
+    assert not list(dest1.parent.glob(".tmp_*"))
+
+    engine.execute_actions(pending, journal=resumed)
+    assert not resumed.exists()
+    assert sum(engine.last_run_stats["copy_backends"].values()) == 2
+    for idx in range(4):
+        assert (bases[1] / ".roo" / f"f{idx}.md").read_text() == f"new {idx}"
+
+
+def test_journal_ignores_torn_records_and_finished_runs_leave_none(tmp_path):
+    engine, bases, actions = _setup(tmp_path, files=2)
+    journal = engine.open_journal(bases)
+    journal.begin(actions)
+    journal.mark_done(actions[0])
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as fh:
+        fh.write('{"done": [1')
+
+    found = SyncJournal.find_unfinished(tmp_path / "state")
+    assert [j.path for j in found] == [journal.path]
+    assert found[0].folders == [str(b) for b in bases]
+    assert [a["destination_path"] for a in found[0].recover()] == [actions[1]["destination_path"]]
+
+    q = queue.Queue()
+    engine.event_queue = q
+    engine.execute_actions(actions, journal=journal)
+    assert not journal.exists()
+    events = []
+    while not q.empty():
+        events.append(q.get_nowait())
+    assert events[-1].event_type == EventType.COMPLETE
+
+
+def test_dry_runs_and_disabled_journals_are_not_written(tmp_path):
+    engine, bases, actions = _setup(tmp_path, files=1)
+    engine.config["journal"] = False
+    assert engine.open_journal(bases) is None
+
+    engine.config.update({"journal": True, "dry_run": True})
+    journal = SyncJournal.for_folders(bases, tmp_path / "state")
+    engine.execute_actions(actions, journal=journal)
+    assert not journal.exists()
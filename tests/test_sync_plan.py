@@ -0,0 +1,76 @@
+import queue
+from pathlib import Path
+
+from utils_sync.sync_core import SyncEngine
+from utils_sync.sync_plan import SyncPlan
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+def _action(folder, relative):
+    base = Path("/projects") / folder
+    return {
+        "action": "copy",
+        "source_path": Path("/projects/src/.roo") / relative,
+        "destination_path": base / ".roo" / relative,
+        "destination_folder": base,
+        "relative_path": relative,
+        "source_mtime": 2.0,
+        "destination_mtime": None,
+    }
+
+
+def test_plan_indexes_removes_and_notifies_per_folder():
+    actions = [_action(folder, f"rules/r{idx}.md") for idx in range(5) for folder in ("a", "b")]
+    plan = SyncPlan(actions)
+    changes = []
+    unsubscribe = plan.subscribe(changes.append)
+
+    assert len(plan) == 10
+    assert plan.count("/projects/a") == 5
+    assert plan.count(Path("/projects/b")) == 5
+    assert len(plan.for_path("rules/r3.md")) == 2
+
+    removed = plan.remove(actions[2])
+    assert removed is actions[2]
+    assert plan.remove(actions[2]) is None
+    assert actions[2] not in plan
+    assert [(c.kind, c.folder, c.action["relative_path"]) for c in changes] == [
+        ("remove", "/projects/a", "rules/r1.md")
+    ]
+    assert plan.count("/projects/a") == 4
+    assert list(plan) == actions[:2] + actions[3:]
+
+    action_id = plan.add(_action("c", "new.md"))
+    assert plan.get(action_id)["relative_path"] == "new.md"
+    assert changes[-1].kind == "add" and changes[-1].folder == "/projects/c"
+    unsubscribe()
+    plan.remove(action_id)
+    assert len(changes) == 2
+    assert plan.folders() == ["/projects/a", "/projects/b"]
+
+
+def test_plan_queries_filter_and_page_in_plan_order():
+    actions = [_action("a", f"r{idx:02d}.md") for idx in range(25)]
+    plan = SyncPlan(actions)
+
+    page = plan.query(folder="/projects/a", offset=10, limit=10)
+    assert [a["relative_path"] for a in page] == [f"r{idx:02d}.md" for idx in range(10, 20)]
+    odd = plan.query(predicate=lambda a: int(a["relative_path"][1:3]) % 2, offset=10)
+    assert [a["relative_path"] for a in odd] == ["r21.md", "r23.md"]
+    assert plan.query(folder="/projects/missing") == []
+
+
+def test_execute_actions_accepts_a_plan(tmp_path):
+    engine = SyncEngine({"backup_mode": "none"}, queue.Queue())
+    bases = [tmp_path / "p1", tmp_path / "p2"]
+    for base in bases:
+        (base / ".roo").mkdir(parents=True)
+    for name in ("a.md", "b.md"):
+        (bases[0] / ".roo" / name).write_text(name)
+    plan = SyncPlan(engine.plan_actions(engine.scan_folders(bases), base_folders=bases))
+    plan.remove(plan.query(predicate=lambda a: a["relative_path"] == "b.md")[0])
+
+    assert engine.execute_actions(plan) == []
+    assert (bases[1] / ".roo" / "a.md").exists()
+    assert not (bases[1] / ".roo" / "b.md").exists()
@@ -0,0 +1,98 @@
+import os
+import queue
+
+from utils_sync.progress_events import EventType
+from utils_sync.sync_core import SyncEngine
+from utils_sync.sync_stats import NULL_STATS, format_stats
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+def _setup(tmp_path):
+    bases = [tmp_path / "p1", tmp_path / "p2"]
+    for base in bases:
+        (base / ".roo" / "node_modules").mkdir(parents=True)
+        (base / ".roo" / "node_modules" / "dep.js").write_text("ignored")
+    old = bases[1] / ".roo" / "rule.md"
+    old.write_text("old")
+    os.utime(old, (1_600_000_000, 1_600_000_000))
+    (bases[0] / ".roo" / "rule.md").write_text("new rule")
+    (bases[0] / ".roo" / "extra.md").write_text("extra file")
+    return bases
+
+
+def _run(engine, bases):
+    file_index = engine.scan_folders(bases)
+    actions = engine.plan_actions(file_index, base_folders=bases)
+    engine.execute_actions(actions)
+    return actions
+
+
+def _complete_event(events):
+    found = None
+    while not events.empty():
+        event = events.get()
+        if event.event_type == EventType.COMPLETE:
+            found = event
+    return found
+
+
+def test_stats_are_off_by_default(tmp_path):
+    bases = _setup(tmp_path)
+    events = queue.Queue()
+    engine = SyncEngine({"ignore_patterns": ["node_modules"]}, events)
+
+    _run(engine, bases)
+
+    assert engine.stats is NULL_STATS and engine.stats.as_dict() is None
+    assert _complete_event(events).stats is None
+
+
+def test_run_records_phases_counters_and_complete_event(tmp_path):
+    bases = _setup(tmp_path)
+    events = queue.Queue()
+    engine = SyncEngine(
+        {"ignore_patterns": ["node_modules"], "backup_mode": "timestamped", "collect_stats": True},
+        events,
+    )
+
+    actions = _run(engine, bases)
+
+    stats = engine.stats.as_dict()
+    assert list(stats["phases"]) == ["scan", "plan", "execute"]
+    assert all(phase["calls"] == 1 for phase in stats["phases"].values())
+    counters = stats["counters"]
+    assert counters["files_indexed"] == 3
+    assert counters["entries_ignored"] == 2
+    assert counters["stat_calls"] >= 3
+    assert counters["actions_planned"] == len(actions) == 2
+    assert counters["files_copied"] == 2
+    assert counters["bytes_copied"] == len("new rule") + len("extra file")
+    assert counters["backups_made"] == 1
+    assert set(stats["timers"]) == {"copy", "backup"}
+    assert {folder: entry["files"] for folder, entry in stats["folders"].items()} == {
+        str(bases[0]): 2, str(bases[1]): 1,
+    }
+    # COMPLETE carries the run so far, execute included
+    complete = _complete_event(events)
+    assert complete.stats["counters"]["files_copied"] == 2
+    assert "execute" in complete.stats["phases"]
+    assert any(line.startswith("scan:") for line in format_stats(stats))
+
+
+def test_scan_starts_a_new_run_and_execute_chunks_add_up(tmp_path):
+    bases = _setup(tmp_path)
+    engine = SyncEngine({"collect_stats": True, "backup_mode": "none"}, queue.Queue())
+    file_index = engine.scan_folders(bases)
+    actions = engine.plan_actions(file_index, base_folders=bases)
+    first_run = engine.stats
+
+    engine.execute_actions(actions[:1])
+    engine.execute_actions(actions[1:])
+    assert engine.stats is first_run
+    assert first_run.as_dict()["phases"]["execute"]["calls"] == 2
+    assert first_run.as_dict()["counters"]["files_copied"] == len(actions)
+
+    engine.scan_folders(bases)
+    assert engine.stats is not first_run
+    assert list(engine.stats.as_dict()["phases"]) == ["scan"]
@@ -0,0 +1,189 @@
+import os
+import queue
+import threading
+import time
+
+import pytest
+
+from utils_sync.sync_control import SyncControl
+from utils_sync.sync_core import SyncEngine
+from utils_sync.watcher import InotifyWatcher, PollingWatcher, _load_libc, run_watch_loop
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+
+def _make_project(tmp_path, name):
+    base = tmp_path / name
+    (base / ".roo" / "rules").mkdir(parents=True)
+    (base / ".roo" / "rules" / "a.md").write_text("a")
+    return base
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_scan_paths_indexes_only_requested_paths_with_ignore_rules(tmp_path):
+    config = {"ignore_patterns": [".roo/docs"], "root_allowlist": [".roomodes"]}
+    engine = SyncEngine(config, queue.Queue())
+    base1 = _make_project(tmp_path, "p1")
+    base2 = _make_project(tmp_path, "p2")
+    (base1 / ".roo" / "rules" / "b.md").write_text("b")
+    (base1 / ".roo" / "rules" / "c.log").write_text("c")
+    (base1 / ".roo" / "rules" / ".syncignore").write_text("*.log\n")
+    (base1 / ".roo" / "docs").mkdir()
+    (base1 / ".roo" / "docs" / "d.md").write_text("d")
+    (base1 / ".roo" / "new").mkdir()
+    (base1 / ".roo" / "new" / "n.md").write_text("n")
+    (base1 / ".roomodes").write_text("{}")
+
+    index = engine.scan_paths(
+        [base1, base2],
+        ["rules/b.md", "rules/c.log", "docs/d.md", "new", "new/n.md", ".roomodes", "gone.md"],
+    )
+
+    assert sorted(index) == [".roomodes", "new/n.md", "rules/b.md"]
+    assert len(index["new/n.md"]) == 1
+
+    # base_folders lets plan_actions see folders that lack every indexed path
+    actions = engine.plan_actions(index, base_folders=[base1, base2])
+    destinations = sorted(str(a["destination_path"]) for a in actions)
+    assert destinations == sorted([
+        str(base2 / ".roomodes"),
+        str(base2 / ".roo" / "new" / "n.md"),
+        str(base2 / ".roo" / "rules" / "b.md"),
+    ])
+
+
+def test_polling_watcher_reports_changed_paths(tmp_path):
+    engine = SyncEngine({}, queue.Queue())
+    base1 = _make_project(tmp_path, "p1")
+    base2 = _make_project(tmp_path, "p2")
+    watcher = PollingWatcher(engine, [base1, base2], interval=0.01)
+
+    assert watcher.wait_for_changes(1.0) == set()
+
+    target = base2 / ".roo" / "rules" / "a.md"
+    target.write_text("changed")
+    os.utime(target, ns=(target.stat().st_atime_ns, target.stat().st_mtime_ns + 10**9))
+    (base1 / ".roo" / "extra.md").write_text("x")
+
+    assert watcher.wait_for_changes(1.0) == {"rules/a.md", "extra.md"}
+    watcher.close()
+
+
+@pytest.mark.skipif(_load_libc() is None, reason="inotify is not available")
+def test_inotify_watcher_reports_edits_and_files_in_new_directories(tmp_path):
+    engine = SyncEngine({"ignore_patterns": ["node_modules"]}, queue.Queue())
+    base = _make_project(tmp_path, "p1")
+    watcher = InotifyWatcher(engine, [base])
+    try:
+        (base / ".roo" / "rules" / "a.md").write_text("edited")
+        (base / ".roo" / "node_modules").mkdir()
+        changes = set()
+        assert _wait_for(lambda: changes.update(watcher.wait_for_changes(0.1)) or "rules/a.md" in changes)
+
+        (base / ".roo" / "sub").mkdir()
+        changes = set()
+        assert _wait_for(lambda: changes.update(watcher.wait_for_changes(0.1)) or "sub" in changes)
+
+        # The new directory is watched as well
+        (base / ".roo" / "sub" / "s.md").write_text("s")
+        changes = set()
+        assert _wait_for(lambda: changes.update(watcher.wait_for_changes(0.1)) or "sub/s.md" in changes)
+    finally:
+        watcher.close()
+
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_run_watch_loop_propagates_changes(tmp_path, use_inotify):
+    if use_inotify and _load_libc() is None:
+        pytest.skip("inotify is not available")
+    engine = SyncEngine({"backup_mode": "none"}, queue.Queue())
+    base1 = _make_project(tmp_path, "p1")
+    base2 = _make_project(tmp_path, "p2")
+    stop = threading.Event()
+    cycles = []
+    thread = threading.Thread(
+        target=run_watch_loop,
+        args=(engine, [base1, base2]),
+        kwargs={
+            "debounce": 0.05,
+            "interval": 0.05,
+            "stop_event": stop,
+            "use_inotify": use_inotify,
+            "on_cycle": cycles.append,
+        },
+        daemon=True,
+    )
+    thread.start()
+    try:
+        time.sleep(0.2)
+        (base1 / ".roo" / "rules" / "new.md").write_text("fresh")
+        copied = base2 / ".roo" / "rules" / "new.md"
+        assert _wait_for(lambda: copied.exists() and copied.read_text() == "fresh")
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert any(cycle for cycle in cycles)
+
+
+def test_cancelling_watch_loop_finishes_the_copy_in_progress(tmp_path):
+    engine = SyncEngine({"backup_mode": "none", "copy_workers": 1}, queue.Queue())
+    base1 = _make_project(tmp_path, "p1")
+    base2 = _make_project(tmp_path, "p2")
+    folders = [base1, base2]
+    control = SyncControl()
+    copier = engine._get_copy_backend()
+    real_transfer = copier.transfer
+
+    def transfer(source, destination):
+        # Ctrl+C arrives while a file is being copied
+        control.cancel()
+        return real_transfer(source, destination)
+
+    copier.transfer = transfer
+    result = []
+    thread = threading.Thread(
+        target=lambda: result.append(run_watch_loop(
+            engine, folders, debounce=0.05, interval=0.05, use_inotify=False,
+            control=control, journal=engine.open_journal(folders),
+        )),
+        daemon=True,
+    )
+    thread.start()
+    time.sleep(0.2)
+    # Both files appear at once, so one cycle plans them together
+    stage = tmp_path / "stage"
+    stage.mkdir()
+    (stage / "x.md").write_text("x" * 4096)
+    (stage / "y.md").write_text("y")
+    os.rename(stage, base1 / ".roo" / "new")
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    copied = [p for p in (base2 / ".roo" / "new").iterdir()]
+    assert not any(p.name.startswith(".tmp_") for p in copied)
+    # One file was copied whole; the other is reported as left over
+    assert len(copied) == 1 and len(result[0]) == 1
+    assert copied[0].read_bytes() == (base1 / ".roo" / "new" / copied[0].name).read_bytes()
+    assert engine.open_journal(folders).exists()
+
+
+def test_scans_skip_engine_working_files(tmp_path):
+    engine = SyncEngine({}, queue.Queue())
+    base1 = _make_project(tmp_path, "p1")
+    base2 = _make_project(tmp_path, "p2")
+    (base1 / ".roo" / "rules" / ".tmp_a.md.kmnvc2w_").write_text("half")
+    (base1 / ".roo" / "rules" / ".tmp_a.md.kmnvc2w_.link").write_text("half")
+
+    full = engine.scan_folders([base1, base2])
+    partial = engine.scan_paths([base1, base2], ["rules/.tmp_a.md.kmnvc2w_", "rules"])
+
+    assert set(full) == set(partial) == {"rules/a.md"}
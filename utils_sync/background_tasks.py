@@ -0,0 +1,158 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Background task executor for the GUI.
+
+Slow work (scanning, planning, .bak discovery and deletion) runs on a worker
+thread; its results and progress items are posted to a thread-safe queue and
+delivered to callbacks only when the Tk thread calls process_results(). This
+keeps every widget update on the Tk thread.
+
+Tasks run one at a time in submission order, because they share one SyncEngine.
+Cancelling a task that has not started yet skips it entirely; a running task
+can poll TaskHandle.cancelled to stop early. Either way, nothing it posts is
+delivered after cancellation.
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+
+class TaskHandle:
+    """
+    Handle to a submitted background task.
+
+    Attributes:
+        name: Task name used for grouped cancellation (e.g. "preview", "bak")
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(
+        self,
+        name: str,
+        on_result: Optional[Callable[[Any], None]] = None,
+        on_progress: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        self.name = name
+        self.on_result = on_result
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """True once cancel() was called."""
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Request cancellation; pending results of this task are discarded."""
+        self._cancelled.set()
+
+
+class BackgroundTasks:
+    """Runs GUI tasks off the Tk thread and hands their results back to it."""
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="agentflow-task")
+        # (handle, kind, value) tuples posted by workers; kind is progress/result/error/done
+        self._results: "queue.Queue[tuple]" = queue.Queue()
+        self._active: List[TaskHandle] = []
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        name: str,
+        fn: Callable[[TaskHandle, Callable[[Any], None]], Any],
+        on_result: Optional[Callable[[Any], None]] = None,
+        on_progress: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ) -> TaskHandle:
+        """
+        Queue fn for execution on the worker thread.
+
+        Args:
+            name: Task name used for grouped cancellation
+            fn: Callable receiving (handle, report); report(item) posts a progress
+                item to on_progress, and the return value is passed to on_result
+            on_result: Called on the Tk thread with fn's return value
+            on_progress: Called on the Tk thread for each reported item
+            on_error: Called on the Tk thread if fn raises
+
+        Returns:
+            TaskHandle for the submitted task
+        """
+        handle = TaskHandle(name, on_result, on_progress, on_error)
+        with self._lock:
+            self._active.append(handle)
+
+        def report(item: Any) -> None:
+            if not handle.cancelled:
+                self._results.put((handle, "progress", item))
+
+        def run() -> None:
+            try:
+                if handle.cancelled:
+                    return
+                value = fn(handle, report)
+            except Exception as exc:
+                self._results.put((handle, "error", exc))
+            else:
+                self._results.put((handle, "result", value))
+            finally:
+                self._results.put((handle, "done", None))
+
+        self._executor.submit(run)
+        return handle
+
+    def cancel(self, name: Optional[str] = None) -> None:
+        """Cancel all active tasks, or only those with the given name."""
+        with self._lock:
+            for handle in self._active:
+                if name is None or handle.name == name:
+                    handle.cancel()
+
+    def has_pending(self) -> bool:
+        """True while tasks are queued, running, or have undelivered results."""
+        with self._lock:
+            if self._active:
+                return True
+        return not self._results.empty()
+
+    def process_results(self, max_items: int) -> int:
+        """
+        Deliver up to max_items posted items to their callbacks (call on the Tk thread).
+
+        Items of cancelled tasks are dropped without calling any callback.
+
+        Returns:
+            Number of items taken from the result queue
+        """
+        taken = 0
+        while taken < max_items:
+            try:
+                handle, kind, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            taken += 1
+            if kind == "done":
+                with self._lock:
+                    if handle in self._active:
+                        self._active.remove(handle)
+                continue
+            if handle.cancelled:
+                continue
+            callback = {
+                "progress": handle.on_progress,
+                "result": handle.on_result,
+                "error": handle.on_error,
+            }[kind]
+            if callback is not None:
+                callback(value)
+        return taken
+
+    def shutdown(self) -> None:
+        """Cancel everything and stop accepting work (does not wait for a running task)."""
+        self.cancel()
+        self._executor.shutdown(wait=False)
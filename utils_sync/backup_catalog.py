@@ -0,0 +1,279 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Per-folder catalog of the timestamped `.bak` backups made by execute_actions().
+
+Listing, counting and deleting backups read the catalog instead of walking the
+whole project tree (node_modules, .venv, .git, ...) for `*.bak`. Each base
+folder has an append-only JSON-lines file at
+`<state_dir>/backup_catalog/<folder key>.jsonl`:
+
+    {"version": 1, "base_folder": "..."}
+    {"add": "<backup, relative to the base folder>", "of": "<original>", "size": N, "t": epoch}
+    {"del": "<backup, relative to the base folder>"}
+
+The file is rewritten without deleted entries once they make up most of it.
+
+When a folder has no catalog yet, it is bootstrapped once from the places where
+backups are created: the `.roo/` tree and the top level of the base folder.
+
+apply_retention() enforces keep-last-N-per-file, maximum age and maximum total
+size together, in a single newest-first pass over the catalog.
+"""
+import calendar
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from . import file_path_utils
+
+# Bump when the on-disk layout changes; older catalogs are rebuilt.
+CATALOG_VERSION = 1
+
+# Timestamp suffix of backups created by execute_actions()
+_BACKUP_SUFFIX = re.compile(r"^(?P<original>.+)_(?P<stamp>\d{8}T\d{6}Z)\.bak$")
+
+
+class BackupEntry(NamedTuple):
+    """One cataloged backup."""
+    path: str  # backup file, relative to the base folder
+    original: str  # file it is a backup of, relative to the base folder
+    size: int
+    created: float  # POSIX time the backup was made
+
+
+class BackupCatalog:
+    """
+    Thread-safe catalog of the backups under one base folder.
+
+    Attributes:
+        base_folder: Base folder the backups belong to
+        catalog_path: JSON-lines file the catalog is stored in
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(self, base_folder: Union[str, Path], catalog_path: Union[str, Path]):
+        """
+        Initialize a catalog; entries are loaded (or bootstrapped) on first use.
+
+        Args:
+            base_folder: Base folder (containing .roo/)
+            catalog_path: Path of the catalog file
+        """
+        self.base_folder = Path(base_folder)
+        self.catalog_path = Path(catalog_path)
+        self._entries: Optional[Dict[str, BackupEntry]] = None
+        self._deleted_records = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_folder(
+        cls,
+        base_folder: Union[str, Path],
+        state_dir: Optional[Union[str, Path]] = None,
+    ) -> "BackupCatalog":
+        """Return the catalog of a base folder in the state directory."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        catalog_dir = file_path_utils.get_state_dir(state_dir) / "backup_catalog"
+        key = file_path_utils.folder_state_key(base_folder)
+        return cls(file_path_utils.normalize_path(base_folder), catalog_dir / f"{key}.jsonl")
+
+    # ------------------------------------------------------------------ queries
+
+    def entries(self) -> List[BackupEntry]:
+        """Return the cataloged backups, oldest first."""
+        with self._lock:
+            return sorted(self._load().values(), key=lambda e: (e.created, e.path))
+
+    def count(self) -> int:
+        """Return the number of cataloged backups."""
+        with self._lock:
+            return len(self._load())
+
+    def total_bytes(self) -> int:
+        """Return the combined size of the cataloged backups."""
+        with self._lock:
+            return sum(entry.size for entry in self._load().values())
+
+    # ------------------------------------------------------------------ changes
+
+    def record(self, backup_path: Union[str, Path], original_path: Union[str, Path]) -> None:
+        """
+        Add a backup that was just created.
+
+        Args:
+            backup_path: The backup file (inside the base folder)
+            original_path: The file it backs up
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        backup_path = file_path_utils.normalize_path(backup_path)
+        entry = BackupEntry(
+            self._relative(backup_path),
+            self._relative(file_path_utils.normalize_path(original_path)),
+            os.stat(backup_path).st_size,
+            time.time(),
+        )
+        with self._lock:
+            self._load()[entry.path] = entry
+            self._append([_add_record(entry)])
+
+    def delete(self, entries: List[BackupEntry]) -> Tuple[int, List[str]]:
+        """
+        Delete backup files and drop them from the catalog.
+
+        Files that are already gone are dropped silently.
+
+        Returns:
+            (number of files deleted, error messages for files that could not be)
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        deleted = 0
+        errors: List[str] = []
+        dropped: List[str] = []
+        for entry in entries:
+            try:
+                (self.base_folder / entry.path).unlink()
+                deleted += 1
+            except FileNotFoundError:
+                pass
+            except OSError as exc:
+                errors.append(f"{self.base_folder / entry.path}: {exc}")
+                continue
+            dropped.append(entry.path)
+        with self._lock:
+            current = self._load()
+            dropped = [path for path in dropped if current.pop(path, None) is not None]
+            self._deleted_records += len(dropped)
+            if self._deleted_records > len(current):
+                self._rewrite()
+            else:
+                self._append([{"del": path} for path in dropped])
+        return deleted, errors
+
+    def apply_retention(
+        self,
+        keep_last: int = 0,
+        max_age_days: float = 0,
+        max_total_bytes: int = 0,
+        now: Optional[float] = None,
+    ) -> Tuple[int, List[str]]:
+        """
+        Delete the backups that fall outside the retention policies.
+
+        A backup is kept only if it is among the `keep_last` newest backups of
+        its file, younger than `max_age_days`, and fits, newest first, within
+        `max_total_bytes` of kept backups. A policy of 0 is not applied.
+
+        Returns:
+            Result of delete() for the expired backups
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        now = time.time() if now is None else now
+        oldest = now - max_age_days * 86400 if max_age_days > 0 else None
+        per_file: Dict[str, int] = {}
+        kept_bytes = 0
+        expired: List[BackupEntry] = []
+        for entry in reversed(self.entries()):
+            kept_of_file = per_file.get(entry.original, 0)
+            if (
+                (keep_last > 0 and kept_of_file >= keep_last)
+                or (oldest is not None and entry.created < oldest)
+                or (max_total_bytes > 0 and kept_bytes + entry.size > max_total_bytes)
+            ):
+                expired.append(entry)
+                continue
+            per_file[entry.original] = kept_of_file + 1
+            kept_bytes += entry.size
+        if not expired:
+            return 0, []
+        return self.delete(expired)
+
+    # ------------------------------------------------------------------ storage
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.base_folder).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _load(self) -> Dict[str, BackupEntry]:
+        """Return the entries, reading or bootstrapping the catalog on first use."""
+        if self._entries is not None:
+            return self._entries
+        entries: Dict[str, BackupEntry] = {}
+        deleted = 0
+        try:
+            with open(self.catalog_path, "r", encoding="utf-8") as fh:
+                header = json.loads(fh.readline())
+                if (
+                    not isinstance(header, dict)
+                    or header.get("version") != CATALOG_VERSION
+                    or header.get("base_folder") != str(self.base_folder)
+                ):
+                    raise ValueError("foreign or outdated catalog")
+                for line in fh:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if "add" in record:
+                        entries[record["add"]] = BackupEntry(
+                            record["add"], record["of"], record["size"], record["t"]
+                        )
+                    elif "del" in record and entries.pop(record["del"], None) is not None:
+                        deleted += 1
+        except (OSError, ValueError, KeyError):
+            self._entries = self._bootstrap()
+            self._deleted_records = 0
+            self._rewrite()
+            return self._entries
+        self._entries = entries
+        self._deleted_records = deleted
+        return entries
+
+    def _bootstrap(self) -> Dict[str, BackupEntry]:
+        """Catalog the backups already on disk where execute_actions() creates them."""
+        found: Dict[str, BackupEntry] = {}
+        candidates = list(self.base_folder.glob("*.bak"))
+        roo = self.base_folder / ".roo"
+        if roo.is_dir() and not roo.is_symlink():
+            candidates.extend(roo.rglob("*.bak"))
+        for path in candidates:
+            match = _BACKUP_SUFFIX.match(path.name)
+            if match is None:
+                continue
+            try:
+                stats = os.stat(path)
+            except OSError:
+                continue
+            original = path.with_name(match.group("original"))
+            created = calendar.timegm(time.strptime(match.group("stamp"), "%Y%m%dT%H%M%SZ"))
+            entry = BackupEntry(self._relative(path), self._relative(original), stats.st_size, created)
+            found[entry.path] = entry
+        return found
+
+    def _append(self, records: List[dict]) -> None:
+        if not records:
+            return
+        self.catalog_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.catalog_path, "a", encoding="utf-8") as fh:
+            for record in records:
+                fh.write(json.dumps(record) + "\n")
+
+    def _rewrite(self) -> None:
+        """Write the live entries to a fresh catalog file atomically."""
+        self.catalog_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.catalog_path.with_name(self.catalog_path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as fh:
+            fh.write(json.dumps({"version": CATALOG_VERSION, "base_folder": str(self.base_folder)}) + "\n")
+            for entry in self._entries.values():
+                fh.write(json.dumps(_add_record(entry)) + "\n")
+        os.replace(temp_path, self.catalog_path)
+        self._deleted_records = 0
+
+
+def _add_record(entry: BackupEntry) -> dict:
+    return {"add": entry.path, "of": entry.original, "size": entry.size, "t": entry.created}
@@ -0,0 +1,370 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Content-addressed, compressed backup store used by `backup_mode=store`.
+
+Instead of renaming an overwritten destination to a sibling `.bak` file, its
+current content is saved once into a per-user store:
+
+- objects/<first two hex digits>/<digest>.z holds the zlib-compressed bytes of
+  one version. The digest is the full-content hash from HashCache, so a file
+  already hashed (e.g. by content_check) is not read again to find its key;
+- index.jsonl gets one appended line per backup, naming the original path,
+  digest, size, mtime_ns and UTC time of the backup.
+
+Identical versions, even from different projects, share one object. A backup
+costs one hash (often cached) plus at most one compressed write, and the
+`.roo/` trees stay free of `.bak` files. The store lives under
+`<state_dir>/backup_store/`.
+
+delete_versions() and apply_retention() drop index records and then delete
+every object that no remaining record refers to. The index is rewritten atomically, so pruning
+should run in one process at a time.
+"""
+import calendar
+import datetime
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from . import file_path_utils
+from .hash_cache import Fingerprint, HashCache
+
+# Read size when compressing or restoring
+_CHUNK = 1024 * 1024
+
+# zlib level: fast, and most of the gain on text files
+COMPRESS_LEVEL = 6
+
+
+class BackupStore:
+    """
+    Thread-safe content-addressed store of overwritten file versions.
+
+    Attributes:
+        root: Store directory (objects/ and index.jsonl)
+        backups: Versions backed up since the store was created
+        new_objects: Backups that had to write a new object
+        stored_bytes: Compressed bytes written for new objects
+        pruned_versions: Index records dropped by pruning
+        removed_objects: Objects deleted because no record referred to them
+        freed_bytes: Compressed bytes of the deleted objects
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(self, root: Union[str, Path], hash_cache: HashCache):
+        """
+        Initialize a store.
+
+        Args:
+            root: Store directory (created on the first backup)
+            hash_cache: Cache used to look up or compute content digests
+        """
+        self.root = Path(root)
+        self.hash_cache = hash_cache
+        self.backups = 0
+        self.new_objects = 0
+        self.stored_bytes = 0
+        self.pruned_versions = 0
+        self.removed_objects = 0
+        self.freed_bytes = 0
+        # Digests of backups in progress; their objects are never collected
+        self._pending: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_state_dir(
+        cls,
+        hash_cache: HashCache,
+        state_dir: Optional[Union[str, Path]] = None,
+    ) -> "BackupStore":
+        """Return the shared backup store in the state directory."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        return cls(file_path_utils.get_state_dir(state_dir) / "backup_store", hash_cache)
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.jsonl"
+
+    def object_path(self, digest: str) -> Path:
+        """Return where the object for a digest is stored."""
+        return self.root / "objects" / digest[:2] / f"{digest}.z"
+
+    def backup(self, path: Union[str, Path]) -> str:
+        """
+        Save the current content of a file into the store.
+
+        Args:
+            path: File about to be overwritten
+
+        Returns:
+            Digest of the saved version
+
+        Raises:
+            OSError: If the file cannot be read or the store cannot be written
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        path = Path(path)
+        stats = os.stat(path)
+        digest = self.hash_cache.full_hash(path, Fingerprint.from_stat(stats))
+        object_path = self.object_path(digest)
+        with self._lock:
+            self._pending[digest] = self._pending.get(digest, 0) + 1
+        try:
+            written = 0
+            if not object_path.exists():
+                written = self._write_object(path, object_path)
+            record = {
+                "path": str(path),
+                "digest": digest,
+                "size": stats.st_size,
+                "mtime_ns": stats.st_mtime_ns,
+                "stored": datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+            }
+            with self._lock:
+                with open(self.index_path, "a", encoding="utf-8") as fh:
+                    fh.write(json.dumps(record) + "\n")
+                self.backups += 1
+                if written:
+                    self.new_objects += 1
+                    self.stored_bytes += written
+        finally:
+            with self._lock:
+                self._pending[digest] -= 1
+                if not self._pending[digest]:
+                    del self._pending[digest]
+        return digest
+
+    def _write_object(self, source: Path, object_path: Path) -> int:
+        """Compress source into object_path atomically; returns the compressed size."""
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(prefix=".tmp_", dir=object_path.parent)
+        try:
+            compressor = zlib.compressobj(COMPRESS_LEVEL)
+            with open(source, "rb") as src, os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = src.read(_CHUNK)
+                    if not chunk:
+                        break
+                    out.write(compressor.compress(chunk))
+                out.write(compressor.flush())
+                size = out.tell()
+            # Identical content written concurrently ends up as the same object
+            os.replace(temp_name, object_path)
+        except BaseException:
+            try:
+                os.remove(temp_name)
+            except OSError:
+                pass
+            raise
+        return size
+
+    def versions(self, path: Optional[Union[str, Path]] = None) -> List[Dict[str, Any]]:
+        """
+        Return index records, oldest first.
+
+        Args:
+            path: If given, only versions of this file
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        wanted = str(path) if path is not None else None
+        records = []
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if wanted is None or record.get("path") == wanted:
+                        records.append(record)
+        except OSError:
+            return []
+        return records
+
+    def restore(self, digest: str, destination: Union[str, Path]) -> None:
+        """
+        Write a stored version to destination (replacing it atomically).
+
+        Raises:
+            OSError: If the object is missing or destination cannot be written
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        destination = Path(destination)
+        fd, temp_name = tempfile.mkstemp(prefix=f".tmp_{destination.name}.", dir=destination.parent)
+        try:
+            decompressor = zlib.decompressobj()
+            with open(self.object_path(digest), "rb") as src, os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = src.read(_CHUNK)
+                    if not chunk:
+                        break
+                    out.write(decompressor.decompress(chunk))
+                out.write(decompressor.flush())
+            os.replace(temp_name, destination)
+        except BaseException:
+            try:
+                os.remove(temp_name)
+            except OSError:
+                pass
+            raise
+
+    def delete_versions(self, folders: List[Union[str, Path]]) -> Tuple[int, List[str]]:
+        """
+        Drop the stored versions of files under folders and free their objects.
+
+        Objects still referred to by versions of other files are kept.
+
+        Returns:
+            (number of versions dropped, error messages for objects that could not be deleted)
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        roots = set()
+        for folder in folders:
+            roots.add(str(Path(folder)))
+            roots.add(str(file_path_utils.normalize_path(folder)))
+        prefixes = tuple(root.rstrip(os.sep) + os.sep for root in roots)
+
+        def keep(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            return [
+                record for record in records
+                if record.get("path") not in roots and not str(record.get("path", "")).startswith(prefixes)
+            ]
+
+        return self._prune(keep)
+
+    def apply_retention(
+        self,
+        keep_last: int = 0,
+        max_age_days: float = 0,
+        max_total_bytes: int = 0,
+        now: Optional[float] = None,
+    ) -> Tuple[int, List[str]]:
+        """
+        Drop the versions that fall outside the retention policies and free their objects.
+
+        The same policies as BackupCatalog.apply_retention(), applied to the
+        whole store: a version is kept only if it is among the `keep_last`
+        newest versions of its file, younger than `max_age_days`, and its object
+        fits, newest first, within `max_total_bytes` of kept objects. An object
+        shared by several kept versions is counted once, so the cap bounds the
+        store's size on disk. A policy of 0 is not applied.
+
+        Returns:
+            (number of versions dropped, error messages for objects that could not be deleted)
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        now = time.time() if now is None else now
+        oldest = now - max_age_days * 86400 if max_age_days > 0 else None
+
+        def keep(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            per_file: Dict[str, int] = {}
+            kept_digests: set = set()
+            kept_bytes = 0
+            kept: List[Dict[str, Any]] = []
+            for record in reversed(records):
+                kept_of_file = per_file.get(record.get("path"), 0)
+                digest = record.get("digest")
+                cost = 0 if digest in kept_digests else self._object_size(digest)
+                if (
+                    (keep_last > 0 and kept_of_file >= keep_last)
+                    or (oldest is not None and _stored_time(record) < oldest)
+                    or (max_total_bytes > 0 and kept_bytes + cost > max_total_bytes)
+                ):
+                    continue
+                per_file[record.get("path")] = kept_of_file + 1
+                kept_digests.add(digest)
+                kept_bytes += cost
+                kept.append(record)
+            kept.reverse()
+            return kept
+
+        return self._prune(keep)
+
+    def _object_size(self, digest: Optional[str]) -> int:
+        """Return the compressed size of an object, 0 if it is missing."""
+        try:
+            return self.object_path(str(digest)).stat().st_size
+        except OSError:
+            return 0
+
+    def _prune(
+        self, keep: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+    ) -> Tuple[int, List[str]]:
+        """
+        Rewrite the index with the records keep() returns, then collect garbage.
+
+        Args:
+            keep: Given all records oldest first, returns the ones to keep
+
+        Returns:
+            (number of records dropped, error messages for objects that could not be deleted)
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        with self._lock:
+            records = self.versions()
+            kept = keep(records)
+            dropped = len(records) - len(kept)
+            if dropped:
+                self._rewrite_index(kept)
+                self.pruned_versions += dropped
+            referenced = {record.get("digest") for record in kept} | set(self._pending)
+            errors = self._collect_garbage(referenced)
+        return dropped, errors
+
+    def _rewrite_index(self, records: List[Dict[str, Any]]) -> None:
+        """Replace the index with records atomically."""
+        fd, temp_name = tempfile.mkstemp(prefix=".tmp_index.", dir=self.root)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                for record in records:
+                    fh.write(json.dumps(record) + "\n")
+            os.replace(temp_name, self.index_path)
+        except BaseException:
+            try:
+                os.remove(temp_name)
+            except OSError:
+                pass
+            raise
+
+    def _collect_garbage(self, referenced: set) -> List[str]:
+        """Delete the objects whose digest is not referenced; returns error messages."""
+        errors: List[str] = []
+        for object_path in (self.root / "objects").glob("*/*.z"):
+            if object_path.stem in referenced:
+                continue
+            try:
+                size = object_path.stat().st_size
+                object_path.unlink()
+            except FileNotFoundError:
+                continue
+            except OSError as exc:
+                errors.append(f"{object_path}: {exc}")
+                continue
+            self.removed_objects += 1
+            self.freed_bytes += size
+        return errors
+
+    def stats(self) -> Dict[str, int]:
+        """Return the backup and pruning counters."""
+        with self._lock:
+            return {
+                "backups": self.backups,
+                "new_objects": self.new_objects,
+                "stored_bytes": self.stored_bytes,
+                "pruned_versions": self.pruned_versions,
+                "removed_objects": self.removed_objects,
+                "freed_bytes": self.freed_bytes,
+            }
+
+
+def _stored_time(record: Dict[str, Any]) -> float:
+    """Return the POSIX time a version was stored (0 if the record has none)."""
+    try:
+        return calendar.timegm(time.strptime(record["stored"], "%Y%m%dT%H%M%SZ"))
+    except (KeyError, TypeError, ValueError):
+        return 0
@@ -0,0 +1,566 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Benchmarks of the sync pipeline on generated multi-project trees.
+
+Usage:
+    python -m utils_sync.benchmark [--projects 4] [--files 2000] [--depth 3] [--changed 0.05]
+                                   [--ignored 0.1] [--durability none,batch,strict]
+                                   [--save-baseline] [--baseline PATH] [--threshold 0.25]
+
+generate_tree() builds N projects that share one synthetic `.roo` layout:
+M files per project spread over directories up to `depth` levels deep, with
+sizes drawn from a weighted distribution. Every project starts with identical
+content and mtimes. Then, for a `changed` fraction of the files, one project
+gets a newer, different copy. An `ignored` fraction of extra files goes
+under `node_modules/` and `__pycache__/` subtrees, which the scan prunes.
+
+run_benchmark() times, on that tree:
+
+- scan: SyncEngine.scan_folders()
+- plan: SyncEngine.plan_actions()
+- preview: the GUI's preview building (SyncPlan + a PreviewModel per folder)
+- execute: SyncEngine.execute_actions() with durability=none, and one
+  execute_durability_<mode> phase per other durability mode, each on a fresh
+  copy of the tree
+
+Each phase reports wall and CPU seconds, files/s, MB/s (bytes copied, for
+the execute phases), peak RSS and its growth during the phase, read/write
+syscalls (Linux /proc/self/io), and file operations seen by a
+sys.addaudithook() hook (open, scandir, rename, ...). Metrics a platform
+cannot report are None.
+
+Results are JSON. A saved result is a baseline. compare() lists the phases
+whose time, RSS growth or file operations grew by more than a threshold over
+it. Baselines are machine-specific. They live under
+`<state_dir>/benchmarks/<name>.json` unless a path is given.
+"""
+import argparse
+import copy
+import datetime
+import json
+import os
+import platform
+import queue
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from . import config_sync, file_path_utils
+from .preview_model import PreviewModel, preview_items
+from .sync_core import SyncEngine
+from .sync_plan import SyncPlan
+from .sync_stats import peak_rss_bytes
+
+BENCHMARK_FORMAT = "agentflow-benchmark"
+BENCHMARK_VERSION = 1
+
+# Default allowed growth of a metric over its baseline before it is a regression
+DEFAULT_THRESHOLD = 0.25
+
+# Growth within this much of a baseline metric is noise, whatever the ratio
+NOISE_ALLOWANCE = {"seconds": 0.05, "rss_growth_mb": 8.0, "file_ops": 0}
+
+DURABILITY_MODES = ("none", "batch", "strict")
+
+# Metrics compare() checks; larger is worse for all of them
+COMPARED_METRICS = tuple(NOISE_ALLOWANCE)
+
+# Audit events counted as file operations
+_AUDITED_EVENTS = frozenset((
+    "open", "os.scandir", "os.listdir", "os.rename", "os.remove", "os.utime",
+    "os.chmod", "os.link", "os.symlink", "os.mkdir", "os.truncate",
+))
+
+# Ignored subtrees that receive the `ignored` fraction of files
+_IGNORED_DIRS = ("node_modules", "__pycache__")
+
+# Base mtime of generated files; changed sources are an hour newer
+_BASE_MTIME = 1_600_000_000
+_CHANGED_MTIME = _BASE_MTIME + 3600
+
+
+class TreeSpec(NamedTuple):
+    """Shape of a generated benchmark tree."""
+    name: str = "default"
+    projects: int = 4
+    files: int = 2000  # per project, excluding ignored files
+    depth: int = 3  # directory levels below .roo
+    fanout: int = 4  # subdirectories per directory
+    # (size in bytes, weight); each file's size is jittered by +/-50%
+    sizes: Tuple[Tuple[int, float], ...] = ((512, 0.7), (8 * 1024, 0.25), (64 * 1024, 0.05))
+    ignored: float = 0.1  # extra files in ignored subtrees, as a fraction of `files`
+    changed: float = 0.05  # fraction of files with a newer copy in one project
+    seed: int = 1
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TreeSpec":
+        """Rebuild a spec stored in a result (JSON turns tuples into lists)."""
+        values = {key: data[key] for key in cls._fields if key in data}
+        if "sizes" in values:
+            values["sizes"] = tuple((int(size), float(weight)) for size, weight in values["sizes"])
+        return cls(**values)
+
+
+class Regression(NamedTuple):
+    """A metric of one phase that grew beyond the threshold over its baseline."""
+    phase: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative growth, e.g. 0.4 for 40% worse."""
+        return self.current / self.baseline - 1 if self.baseline else float("inf")
+
+
+class _AuditCounter:
+    """Counts file-operation audit events while active (audit hooks cannot be removed)."""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.active = False
+        self._installed = False
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if not self._installed:
+            sys.addaudithook(self._hook)
+            self._installed = True
+        self.counts = Counter()
+        self.active = True
+
+    def stop(self) -> Dict[str, int]:
+        self.active = False
+        return dict(self.counts)
+
+    def _hook(self, event: str, args) -> None:
+        if self.active and event in _AUDITED_EVENTS:
+            with self._lock:
+                self.counts[event] += 1
+
+
+_audit = _AuditCounter()
+
+
+# ------------------------------------------------------------------ tree generation
+
+def generate_tree(root: Union[str, Path], spec: TreeSpec = TreeSpec()) -> List[Path]:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """
+    Create `spec.projects` project folders with generated `.roo` trees under root.
+
+    The same spec and seed always produce the same tree.
+
+    Returns:
+        The project folders, in order
+    """
+    root = Path(root)
+    rng = random.Random(spec.seed)
+    dirs = _directory_pool(spec)
+    size_values = [size for size, _ in spec.sizes]
+    size_weights = [weight for _, weight in spec.sizes]
+    block_size = max(size_values) * 2
+    block = rng.getrandbits(block_size * 8).to_bytes(block_size, "little")
+
+    layout = []
+    for index in range(spec.files):
+        directory = rng.choice(dirs)
+        relative = f"{directory}/f{index:06d}.md" if directory else f"f{index:06d}.md"
+        size = max(1, int(rng.choices(size_values, size_weights)[0] * rng.uniform(0.5, 1.5)))
+        changed_in = rng.randrange(spec.projects) if rng.random() < spec.changed else None
+        layout.append((relative, size, changed_in))
+    ignored = []
+    for index in range(int(spec.files * spec.ignored)):
+        sub = rng.choice(_IGNORED_DIRS)
+        ignored.append((f"{sub}/pkg{index % 16:02d}/i{index:06d}.js", rng.choice(size_values)))
+
+    projects = [root / f"project_{index:03d}" for index in range(spec.projects)]
+    for project_index, project in enumerate(projects):
+        roo = project / ".roo"
+        for directory in dirs:
+            (roo / directory).mkdir(parents=True, exist_ok=True)
+        for file_index, (relative, size, changed_in) in enumerate(layout):
+            changed = changed_in == project_index
+            offset = (file_index * 7 + (13 if changed else 0)) % max(1, len(block) - size)
+            path = roo / relative
+            with open(path, "wb") as fh:
+                fh.write(block[offset:offset + size])
+            mtime = _CHANGED_MTIME if changed else _BASE_MTIME
+            os.utime(path, (mtime, mtime))
+        for relative, size in ignored:
+            path = roo / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "wb") as fh:
+                fh.write(block[:size])
+    return projects
+
+
+def _directory_pool(spec: TreeSpec) -> List[str]:
+    """Relative directories of the layout, .roo itself ("") included."""
+    dirs = [""]
+    level = [""]
+    for depth in range(1, spec.depth + 1):
+        level = [
+            f"{parent}/d{depth}_{index}" if parent else f"d{depth}_{index}"
+            for parent in level for index in range(spec.fanout)
+        ]
+        dirs.extend(level)
+    return dirs
+
+
+# ------------------------------------------------------------------ measurement
+
+def _proc_io() -> Optional[Dict[str, int]]:
+    """Read/write syscall counters of this process (Linux only)."""
+    try:
+        with open("/proc/self/io", encoding="ascii") as fh:
+            fields = dict(line.split(":", 1) for line in fh if ":" in line)
+        return {"read": int(fields["syscr"]), "write": int(fields["syscw"])}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS mark so it covers one phase (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as fh:
+            fh.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process in bytes (Linux only)."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def measure(
+    fn: Callable[[], Any],
+    files: Optional[Callable[[Any], int]] = None,
+    bytes_moved: Optional[Callable[[Any], int]] = None,
+) -> Tuple[Any, Dict[str, Any]]:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """
+    Run fn() once and measure it.
+
+    Args:
+        fn: The work to measure
+        files: Maps fn's result to the number of files it handled (for files/s)
+        bytes_moved: Maps fn's result to the bytes it wrote (for MB/s)
+
+    Returns:
+        (fn's result, metrics dict)
+    """
+    _reset_peak_rss()
+    rss_before = _current_rss_bytes()
+    io_before = _proc_io()
+    _audit.start()
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    try:
+        result = fn()
+    finally:
+        seconds = time.perf_counter() - start
+        cpu_seconds = time.process_time() - cpu_start
+        ops = _audit.stop()
+    io_after = _proc_io()
+    peak = peak_rss_bytes()
+
+    count = files(result) if files is not None else None
+    moved = bytes_moved(result) if bytes_moved is not None else None
+    metrics: Dict[str, Any] = {
+        "seconds": round(seconds, 6),
+        "cpu_seconds": round(cpu_seconds, 6),
+        "files": count,
+        "files_per_s": round(count / seconds, 1) if count is not None and seconds > 0 else None,
+        "bytes": moved,
+        "mb_per_s": round(moved / seconds / 1e6, 2) if moved is not None and seconds > 0 else None,
+        "peak_rss_mb": round(peak / 1e6, 1) if peak is not None else None,
+        # Peak over the RSS the phase started with: comparable across host processes
+        "rss_growth_mb": (
+            round(max(0, peak - rss_before) / 1e6, 1)
+            if peak is not None and rss_before is not None else None
+        ),
+        "syscalls": (
+            {name: io_after[name] - io_before[name] for name in io_after}
+            if io_before is not None and io_after is not None else None
+        ),
+        "file_ops": sum(ops.values()),
+        "file_ops_by_event": ops,
+    }
+    return result, metrics
+
+
+def _drain(events: "queue.Queue") -> None:
+    while True:
+        try:
+            events.get_nowait()
+        except queue.Empty:
+            return
+
+
+def _index_size(file_index) -> int:
+    return sum(len(file_index[rel]) for rel in file_index)
+
+
+def _copied_bytes(actions: List[Dict[str, Any]]) -> int:
+    total = 0
+    for action in actions:
+        try:
+            total += os.path.getsize(action["destination_path"])
+        except OSError:
+            pass
+    return total
+
+
+def run_benchmark(
+    spec: TreeSpec = TreeSpec(),
+    config: Optional[Dict[str, Any]] = None,
+    durability_modes: Tuple[str, ...] = DURABILITY_MODES,
+    work_dir: Optional[Union[str, Path]] = None,
+) -> Dict[str, Any]:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """
+    Generate a tree for spec and time the sync phases on it.
+
+    Args:
+        spec: Tree to generate
+        config: Engine config (defaults: config_sync.DEFAULTS). Caches, journals
+            and backups of the run are kept in a state dir inside the work dir.
+        durability_modes: Modes to time execute with; "none" is the `execute`
+            phase, others are `execute_durability_<mode>` on a fresh tree
+        work_dir: Where to generate trees (default: a temporary directory,
+            removed afterwards)
+
+    Returns:
+        JSON-serializable result: format, version, created, platform, spec,
+        config and per-phase metrics under "phases"
+    """
+    config = copy.deepcopy(config if config is not None else config_sync.DEFAULTS)
+    temp_dir = None
+    if work_dir is None:
+        temp_dir = tempfile.mkdtemp(prefix="agentflow_bench_")
+        work_dir = temp_dir
+    work_dir = Path(work_dir)
+    phases: Dict[str, Dict[str, Any]] = {}
+    try:
+        for mode in durability_modes:
+            run_dir = work_dir / f"run_{mode}"
+            if run_dir.exists():
+                shutil.rmtree(run_dir)
+            projects = generate_tree(run_dir / "tree", spec)
+            events: "queue.Queue" = queue.Queue()
+            engine = SyncEngine(
+                dict(config, durability=mode, state_dir=str(run_dir / "state")), events
+            )
+            first = not phases
+            file_index, scan_metrics = measure(
+                lambda: engine.scan_folders(projects), files=_index_size
+            )
+            _drain(events)
+            actions, plan_metrics = measure(
+                lambda: engine.plan_actions(file_index, base_folders=projects),
+                files=lambda _: scan_metrics["files"],
+            )
+            _drain(events)
+            if first:
+                # Scan, plan and preview do not depend on the durability mode
+                phases["scan"] = scan_metrics
+                phases["plan"] = plan_metrics
+                _, phases["preview"] = measure(
+                    lambda: _build_previews(actions, projects), files=lambda _: len(actions)
+                )
+            name = "execute" if mode == "none" else f"execute_durability_{mode}"
+            _, phases[name] = measure(
+                lambda: engine.execute_actions(actions),
+                files=lambda _: len(actions),
+                bytes_moved=lambda _: _copied_bytes(actions),
+            )
+            _drain(events)
+            durability = engine.last_run_stats.get("durability")
+            if durability:
+                phases[name]["fsyncs"] = durability["file_syncs"] + durability["dir_syncs"]
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        "format": BENCHMARK_FORMAT,
+        "version": BENCHMARK_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+        "platform": {"python": platform.python_version(), "system": platform.platform()},
+        "spec": spec._asdict(),
+        "config": {key: config.get(key) for key in sorted(config) if key != "folders_faves"},
+        "phases": phases,
+    }
+
+
+def _build_previews(actions: List[Dict[str, Any]], projects: List[Path]) -> List[PreviewModel]:
+    """What the GUI's preview task builds off the Tk thread."""
+    plan = SyncPlan(actions)
+    return [PreviewModel(preview_items(plan.query(folder=project))) for project in projects]
+
+
+# ------------------------------------------------------------------ baselines
+
+def default_baseline_path(name: str, state_dir: Optional[Union[str, Path]] = None) -> Path:
+    """Return `<state_dir>/benchmarks/<name>.json`."""
+    return file_path_utils.get_state_dir(state_dir) / "benchmarks" / f"{name}.json"
+
+
+def save_results(results: Dict[str, Any], path: Union[str, Path]) -> None:
+    """Write results (e.g. as a baseline) atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".tmp_{path.name}.{os.getpid()}")
+    with open(temp_path, "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def load_results(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Read results written by save_results().
+
+    Raises:
+        ValueError: If the file is not a benchmark result of this version
+        OSError: If it cannot be read
+    """
+    with open(path, encoding="utf-8") as fh:
+        results = json.load(fh)
+    if not isinstance(results, dict) or results.get("format") != BENCHMARK_FORMAT:
+        raise ValueError(f"Not a benchmark result: {path}")
+    if results.get("version") != BENCHMARK_VERSION:
+        raise ValueError(f"Unsupported benchmark result version {results.get('version')} in {path}")
+    return results
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Regression]:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """
+    List the metrics of results that are worse than baseline by more than threshold.
+
+    A metric regresses when it grew by more than threshold (relative) and by
+    more than its NOISE_ALLOWANCE (absolute). Phases missing from either side
+    and metrics a platform did not report are skipped.
+
+    Raises:
+        ValueError: If the two runs used different tree specs
+    """
+    if TreeSpec.from_dict(results["spec"]) != TreeSpec.from_dict(baseline["spec"]):
+        raise ValueError("Benchmark results and baseline were run on different tree specs")
+    regressions = []
+    for phase, base_metrics in baseline["phases"].items():
+        metrics = results["phases"].get(phase)
+        if metrics is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = base_metrics.get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + threshold) and new - old > NOISE_ALLOWANCE[metric]:
+                regressions.append(Regression(phase, metric, old, new))
+    return regressions
+
+
+# ------------------------------------------------------------------ CLI
+
+def format_results(results: Dict[str, Any]) -> str:
+    """Render per-phase metrics as a text table."""
+    lines = [f"{'phase':<28}{'seconds':>9}{'files/s':>11}{'MB/s':>8}{'peak MB':>9}{'file ops':>10}{'syscalls':>10}"]
+    for phase, m in results["phases"].items():
+        syscalls = sum(m["syscalls"].values()) if m.get("syscalls") else None
+        lines.append(
+            f"{phase:<28}{m['seconds']:>9.3f}{_cell(m.get('files_per_s'), 11, '.0f')}"
+            f"{_cell(m.get('mb_per_s'), 8, '.1f')}{_cell(m.get('peak_rss_mb'), 9, '.1f')}"
+            f"{_cell(m.get('file_ops'), 10, 'd')}{_cell(syscalls, 10, 'd')}"
+        )
+    return "\n".join(lines)
+
+
+def _cell(value, width: int, fmt: str) -> str:
+    return f"{'-':>{width}}" if value is None else f"{value:>{width}{fmt}}"
+
+
+def _parse_args(argv=None):
+    defaults = TreeSpec()
+    parser = argparse.ArgumentParser(description="Benchmark scan, plan, preview and execute on a generated tree")
+    parser.add_argument("--name", default=defaults.name, help="Baseline name (default: %(default)s)")
+    parser.add_argument("--projects", type=int, default=defaults.projects)
+    parser.add_argument("--files", type=int, default=defaults.files, help="Files per project")
+    parser.add_argument("--depth", type=int, default=defaults.depth)
+    parser.add_argument("--fanout", type=int, default=defaults.fanout)
+    parser.add_argument("--ignored", type=float, default=defaults.ignored,
+                        help="Files in ignored subtrees, as a fraction of --files")
+    parser.add_argument("--changed", type=float, default=defaults.changed,
+                        help="Fraction of files with a newer copy in one project")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--durability", default=",".join(DURABILITY_MODES),
+                        help="Comma-separated durability modes to time execute with")
+    parser.add_argument("--config", help="Config file for the engine (default: built-in defaults)")
+    parser.add_argument("--work-dir", help="Keep generated trees here instead of a temp directory")
+    parser.add_argument("--baseline", help="Baseline file (default: <state_dir>/benchmarks/<name>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed growth over the baseline (default: %(default)s)")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """Run the benchmark; exit status 1 if it regressed against the baseline."""
+    args = _parse_args(argv)
+    modes = tuple(m.strip() for m in args.durability.split(",") if m.strip())
+    unknown = [m for m in modes if m not in DURABILITY_MODES]
+    if unknown:
+        print(f"Unknown durability mode(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    spec = TreeSpec(
+        name=args.name, projects=args.projects, files=args.files, depth=args.depth,
+        fanout=args.fanout, ignored=args.ignored, changed=args.changed, seed=args.seed,
+    )
+    config = config_sync.load_config(args.config) if args.config else None
+    results = run_benchmark(spec, config=config, durability_modes=modes, work_dir=args.work_dir)
+    print(json.dumps(results, indent=2) if args.json else format_results(results))
+
+    baseline_path = Path(args.baseline) if args.baseline else default_baseline_path(spec.name)
+    if args.save_baseline:
+        save_results(results, baseline_path)
+        print(f"Baseline saved: {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        return 0
+    try:
+        regressions = compare(results, load_results(baseline_path), args.threshold)
+    except ValueError as exc:
+        print(f"Baseline not compared: {exc}", file=sys.stderr)
+        return 0
+    for reg in regressions:
+        print(f"[REGRESSION] {reg.phase} {reg.metric}: {reg.baseline} -> {reg.current} (+{reg.change:.0%})")
+    if not regressions:
+        print(f"No regressions over {baseline_path} (threshold {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Columnar file index and vectorized planning (optional, needs NumPy).
+
+By default scan_folders() returns a dict mapping each relative path to a list
+of per-file dicts. At 100k+ files across dozens of projects those dicts, and
+the per-key max() and set arithmetic in plan_actions(), dominate memory and
+planning time. With `columnar_index=true` (and NumPy installed) the scan fills
+a ColumnarIndex instead:
+
+- relative paths are interned: each file row holds a key id;
+- base folders are interned the same way: each row holds a folder id;
+- mtime (the float st_mtime), mtime_ns, size, inode and device are packed
+  arrays, one entry per row;
+- file paths are not stored; a row is either under `<folder>/.roo/` or a
+  root-level allowlisted file directly in `<folder>`, and its path is rebuilt
+  from the folder and key.
+
+plan_columnar() then finds the newest source of every key, the older peers to
+update and, from a per-key bitset of folder presence, the folders missing each
+key, with grouped NumPy operations instead of a Python loop per key.
+
+A ColumnarIndex is also a read-only Mapping in the dict format (entry dicts
+are built on access), so code that walks a file index keeps working.
+"""
+import array
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Column name -> (array.array type code, NumPy dtype name)
+_COLUMNS = {
+    "key": ("i", "int32"),
+    "folder": ("i", "int32"),
+    "mtime": ("d", "float64"),
+    "mtime_ns": ("q", "int64"),
+    "size": ("q", "int64"),
+    "inode": ("Q", "uint64"),
+    "device": ("Q", "uint64"),
+    "root": ("B", "uint8"),
+}
+
+
+class ColumnarIndex(Mapping):
+    """
+    File index stored as packed columns with interned keys and folders.
+
+    Rows are appended by the scan (add_file(), extend()); they are never
+    removed. Not thread-safe: each scan task fills its own index and the
+    results are merged with extend().
+
+    Attributes:
+        relative_paths: Relative paths (keys), indexed by key id, in first-seen order
+        folders: Base folders, indexed by folder id, in first-seen order
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(self):
+        self.relative_paths: List[str] = []
+        self.folders: List[Path] = []
+        self._key_ids: Dict[str, int] = {}
+        self._folder_ids: Dict[Path, int] = {}
+        self._columns = {name: array.array(code) for name, (code, _) in _COLUMNS.items()}
+        # NumPy views of the columns and the rows grouped by key, built on first use
+        self._views: Optional[Dict[str, Any]] = None
+        self._groups = None
+
+    @classmethod
+    def from_file_index(cls, file_index: Dict[str, List[Dict[str, Any]]]) -> "ColumnarIndex":
+        """Build a columnar copy of a dict file index (e.g. from scan_paths())."""
+        index = cls()
+        for relative_path, entries in file_index.items():
+            for entry in entries:
+                folder = entry["base_folder"]
+                index._append(
+                    relative_path, folder, entry["mtime"], entry["mtime_ns"], entry["size"],
+                    entry.get("inode") or 0, entry.get("device") or 0,
+                    "/" not in relative_path and Path(entry["path"]).parent == Path(folder),
+                )
+        return index
+
+    # ------------------------------------------------------------------ building
+
+    def add_file(self, relative_path: str, folder: Path, stats, root: bool = False) -> None:
+        """
+        Append one scanned file.
+
+        Args:
+            relative_path: Key of the file (relative to .roo, or the allowlist entry)
+            folder: Base folder the file was found in
+            stats: os.stat_result of the file
+            root: True for a root-level allowlisted file (<folder>/<key>)
+        """
+        self._append(
+            relative_path, folder, stats.st_mtime, stats.st_mtime_ns, stats.st_size,
+            stats.st_ino, stats.st_dev, root,
+        )
+
+    def extend(self, other: "ColumnarIndex") -> None:
+        """Append all rows of another index, re-mapping its key and folder ids."""
+        if not len(other._columns["key"]):
+            return
+        self._invalidate()
+        key_map = np.array([self._key_id(key) for key in other.relative_paths], dtype=np.int32)
+        folder_map = np.array([self._folder_id(folder) for folder in other.folders], dtype=np.int32)
+        other_views = other._arrays()
+        for name, column in self._columns.items():
+            values = other_views[name]
+            if name == "key":
+                values = key_map[values]
+            elif name == "folder":
+                values = folder_map[values]
+            column.frombytes(values.tobytes())
+        other._invalidate()
+
+    def _append(self, relative_path, folder, mtime, mtime_ns, size, inode, device, root) -> None:
+        if self._views is not None:
+            self._invalidate()
+        columns = self._columns
+        columns["key"].append(self._key_id(relative_path))
+        columns["folder"].append(self._folder_id(folder))
+        columns["mtime"].append(mtime)
+        columns["mtime_ns"].append(mtime_ns)
+        columns["size"].append(size)
+        columns["inode"].append(inode)
+        columns["device"].append(device)
+        columns["root"].append(1 if root else 0)
+
+    def _key_id(self, relative_path: str) -> int:
+        key_id = self._key_ids.get(relative_path)
+        if key_id is None:
+            key_id = self._key_ids[relative_path] = len(self.relative_paths)
+            self.relative_paths.append(relative_path)
+        return key_id
+
+    def _folder_id(self, folder: Path) -> int:
+        folder_id = self._folder_ids.get(folder)
+        if folder_id is None:
+            folder_id = self._folder_ids[folder] = len(self.folders)
+            self.folders.append(folder)
+        return folder_id
+
+    def _invalidate(self) -> None:
+        # Views export the array buffers, which must be released before appending
+        self._views = None
+        self._groups = None
+
+    # ------------------------------------------------------------------ columns
+
+    @property
+    def rows(self) -> int:
+        """Number of indexed files."""
+        return len(self._columns["key"])
+
+    def column(self, name: str):
+        """Return a column as a read-only NumPy array (one entry per row)."""
+        return self._arrays()[name]
+
+    def _arrays(self) -> Dict[str, Any]:
+        if self._views is None:
+            self._views = {
+                name: np.frombuffer(self._columns[name], dtype=dtype)
+                if len(self._columns[name]) else np.empty(0, dtype=dtype)
+                for name, (_, dtype) in _COLUMNS.items()
+            }
+        return self._views
+
+    def presence(self, folder_count: Optional[int] = None):
+        """
+        Return the folder-presence bitsets of all keys.
+
+        Args:
+            folder_count: Number of folder ids to make room for (default: the
+                          folders of this index)
+
+        Returns:
+            uint64 array of shape (len(keys), words); bit f % 64 of word f // 64
+            is set when folder id f has the key
+        """
+        folder_count = len(self.folders) if folder_count is None else folder_count
+        words = max(1, (folder_count + 63) // 64)
+        bits = np.zeros((len(self.relative_paths), words), dtype=np.uint64)
+        folder = self.column("folder")
+        np.bitwise_or.at(
+            bits,
+            (self.column("key"), folder // 64),
+            np.left_shift(np.uint64(1), (folder % 64).astype(np.uint64)),
+        )
+        return bits
+
+    def entry(self, row: int) -> Dict[str, Any]:
+        """Return one row in the dict format of scan_folders()."""
+        columns = self._columns
+        folder = self.folders[columns["folder"][row]]
+        return {
+            "path": self.path(row),
+            "mtime": columns["mtime"][row],
+            "mtime_ns": columns["mtime_ns"][row],
+            "size": columns["size"][row],
+            "inode": columns["inode"][row],
+            "device": columns["device"][row],
+            "base_folder": folder,
+        }
+
+    def path(self, row: int) -> Path:
+        """Return the file path of a row."""
+        folder = self.folders[self._columns["folder"][row]]
+        relative_path = self.relative_paths[self._columns["key"][row]]
+        if self._columns["root"][row]:
+            return folder / relative_path
+        return folder / ".roo" / relative_path
+
+    def is_root(self, row: int) -> bool:
+        """Return True if a row is a root-level allowlisted file."""
+        return bool(self._columns["root"][row])
+
+    # ------------------------------------------------------------------ Mapping
+
+    def __getitem__(self, relative_path: str) -> List[Dict[str, Any]]:
+        key_id = self._key_ids[relative_path]
+        if self._groups is None:
+            order = np.argsort(self.column("key"), kind="stable")
+            bounds = np.searchsorted(self.column("key")[order], np.arange(len(self.relative_paths) + 1))
+            self._groups = (order, bounds)
+        order, bounds = self._groups
+        return [self.entry(int(row)) for row in order[bounds[key_id]:bounds[key_id + 1]]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.relative_paths))
+
+    def __len__(self) -> int:
+        return len(self.relative_paths)
+
+    def __contains__(self, relative_path: object) -> bool:
+        return relative_path in self._key_ids
+
+
+class ColumnarPlan(NamedTuple):
+    """
+    Planned steps of plan_columnar(), in plan order.
+
+    Step i concerns key `keys[i]`. With `kinds[i] == 0` it updates the existing
+    peer in row `args[i]`; with `kinds[i] == 1` it creates the file in the
+    folder `folders[args[i]]`, which does not have it yet. `sources[k]` is the
+    row of the newest file of key k.
+    """
+    folders: List[Path]
+    sources: Any
+    keys: Any
+    kinds: Any
+    args: Any
+
+
+def plan_columnar(index: ColumnarIndex, base_folders: Optional[Iterable[Path]] = None) -> ColumnarPlan:
+    """
+    Compute sources, peer updates and missing folders for all keys at once.
+
+    Matches plan_actions() on the dict index: the source of a key is its newest
+    file (the first one on ties), a peer is updated when it is strictly older
+    and not a hard link to the source, and every folder without the key gets
+    it. Content checks are left to the caller.
+
+    Args:
+        index: Index to plan
+        base_folders: All folders taking part in the sync (folders seen in the
+                      index are always included)
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    folders = list(index.folders)
+    known = set(folders)
+    for folder in base_folders or ():
+        if folder not in known:
+            known.add(folder)
+            folders.append(folder)
+
+    key = index.column("key")
+    mtime = index.column("mtime")
+    inode = index.column("inode")
+    device = index.column("device")
+    rows = np.arange(len(key))
+
+    # Newest source per key: sort by key, then newest first, then by row so
+    # that ties go to the first file like max() does
+    order = np.lexsort((rows, -mtime, key))
+    sorted_keys = key[order]
+    group_start = np.ones(len(order), dtype=bool)
+    group_start[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    sources = np.zeros(len(index.relative_paths), dtype=np.int64)
+    sources[sorted_keys[group_start]] = order[group_start]
+
+    # Existing peers strictly older than their source and not linked to it
+    source_rows = sources[key]
+    linked = (inode != 0) & (inode == inode[source_rows]) & (device == device[source_rows])
+    updates = np.nonzero((rows != source_rows) & (mtime[source_rows] > mtime) & ~linked)[0]
+
+    # Folders missing each key, one pass over the presence bitsets per folder
+    bits = index.presence(len(folders))
+    missing_keys = []
+    missing_folders = []
+    for folder_id in range(len(folders)):
+        word = bits[:, folder_id // 64]
+        absent = np.nonzero(((word >> np.uint64(folder_id % 64)) & np.uint64(1)) == 0)[0]
+        missing_keys.append(absent)
+        missing_folders.append(np.full(len(absent), folder_id, dtype=np.int64))
+
+    step_keys = np.concatenate([key[updates].astype(np.int64)] + missing_keys)
+    step_kinds = np.concatenate(
+        [np.zeros(len(updates), dtype=np.int8)]
+        + [np.ones(len(keys), dtype=np.int8) for keys in missing_keys]
+    )
+    step_args = np.concatenate([updates.astype(np.int64)] + missing_folders)
+    # Per key: peer updates in row order, then missing folders in folder order
+    step_order = np.lexsort((step_args, step_kinds, step_keys))
+    return ColumnarPlan(
+        folders,
+        sources,
+        step_keys[step_order],
+        step_kinds[step_order],
+        step_args[step_order],
+    )
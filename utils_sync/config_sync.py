@@ -7,17 +7,58 @@ try:
 except ImportError:
     DOTENV_AVAILABLE = False
 
+from .copy_backend import COPY_BACKENDS, LINK_MODES
+from .durability import DURABILITY_MODES
+
 DEFAULTS = {
     "window_width": 800,
     "window_height": 480,
     "ignore_patterns": [".git", "__pycache__", ".venv", ".idea", ".vscode", "node_modules", "*.pyc"],
     "backup_mode": "timestamped",
+    "backup_keep_last": 0,  # backups kept per file, .bak or stored (0 = all)
+    "backup_max_age_days": 0,  # delete backups older than this (0 = never)
+    "backup_max_total_bytes": 0,  # size cap of .bak files per folder and of the backup store (0 = none)
     "preserve_mtime": True,
     "dry_run": False,
     "root_allowlist": [],  # comma-separated list of root-level files to sync
     "folders_faves": [],  # comma-separated list of favorite folders for UI
+    "scan_cache": False,  # persist per-folder directory listings between scans
+    "scan_cache_stat_files": True,  # with scan_cache: stat every file (false trusts cached stats; misses in-place edits)
+    "scan_workers": 1,  # >1 scans folders concurrently on a bounded thread pool
+    "scan_split_subdirs": False,  # with scan_workers > 1, scan top-level .roo subfolders as separate tasks
+    "copy_workers": 1,  # >1 executes copies concurrently on a bounded thread pool
+    "copy_backend": "auto",  # "auto" probes reflink/copy_file_range/sendfile/buffered; "copy2" = shutil.copy2
+    "delta_copy": False,  # rebuild large existing destinations from a rolling-checksum delta
+    "delta_min_bytes": 1048576,  # smallest source size for a delta copy
+    "link_mode": "copy",  # "copy", "reflink" (clone where possible) or "hardlink" (same-device peers share an inode)
+    "durability": "none",  # "none", "batch" (grouped fsync) or "strict" (fsync per file)
+    "durability_batch_size": 64,  # durability=batch: files published per group fsync
+    "journal": True,  # write-ahead journal of each execution, for crash recovery and resume
+    "content_check": False,  # skip copies whose destination already has identical content
+    "hash_cache_max_entries": 100000,  # size limit of the persistent content-hash cache
+    "columnar_index": False,  # with NumPy installed: packed scan index and vectorized planning
+    "event_mode": "verbose",  # "verbose": one SCAN_FILE per file; "batched": periodic SCAN_PROGRESS
+    "event_interval_ms": 100,  # batched mode: minimum time between SCAN_PROGRESS events per folder
+    "event_queue_size": 10000,  # pending events above which low-value events are dropped
+    "collect_stats": False,  # record phase timings and counters of each run in SyncEngine.stats
 }
 
+# Accepted values of event_mode
+EVENT_MODES = ("verbose", "batched")
+
+# Keys parsed as booleans by load_config()
+_BOOL_KEYS = (
+    "preserve_mtime", "dry_run", "scan_cache", "scan_cache_stat_files", "scan_split_subdirs",
+    "content_check", "delta_copy", "journal", "columnar_index", "collect_stats",
+)
+
+# Keys parsed as positive integers by load_config()
+_INT_KEYS = (
+    "window_width", "window_height", "scan_workers", "copy_workers", "hash_cache_max_entries",
+    "event_interval_ms", "event_queue_size", "delta_min_bytes", "durability_batch_size",
+    "backup_keep_last", "backup_max_age_days", "backup_max_total_bytes",
+)
+
 
 def _to_bool(value: str) -> bool:
     # [Created-or-Modified] by [LLM model] | 2025-11-13_01
@@ -64,11 +105,19 @@ def load_config(config_path: Optional[str] = None):
     Rules:
     - Lines beginning with '#' or empty lines are skipped.
     - Keys and values are trimmed of whitespace.
-    - Integers: window_width, window_height (must be positive).
-    - Booleans: preserve_mtime, dry_run (true/false, case-insensitive).
+    - Integers: window_width, window_height, scan_workers, copy_workers, hash_cache_max_entries,
+      event_interval_ms, event_queue_size, delta_min_bytes, durability_batch_size,
+      backup_keep_last, backup_max_age_days, backup_max_total_bytes (must be positive).
+    - Booleans: preserve_mtime, dry_run, scan_cache, scan_cache_stat_files,
+      scan_split_subdirs, content_check, delta_copy, journal, columnar_index, collect_stats (true/false,
+      case-insensitive).
     - ignore_patterns: comma-separated list -> list of strings.
     - root_allowlist: comma-separated list -> list of strings.
     - folders_faves: comma-separated list -> list of strings.
+    - event_mode: "verbose" or "batched" (case-insensitive); anything else -> default.
+    - copy_backend: one of COPY_BACKENDS (case-insensitive); anything else -> default.
+    - link_mode: one of LINK_MODES (case-insensitive); anything else -> default.
+    - durability: one of DURABILITY_MODES (case-insensitive); anything else -> default.
     - Unknown keys are returned as strings.
     - If file missing or parsing error, defaults are returned.
     """
@@ -93,7 +142,7 @@ def load_config(config_path: Optional[str] = None):
                 key = key_part.strip()
                 val = val_part.strip()
 
-                if key in ("window_width", "window_height"):
+                if key in _INT_KEYS:
                     try:
                         ival = int(val)
                         if ival > 0:
@@ -102,7 +151,7 @@ def load_config(config_path: Optional[str] = None):
                     except ValueError:
                         # leave default on invalid int
                         pass
-                elif key in ("preserve_mtime", "dry_run"):
+                elif key in _BOOL_KEYS:
                     config[key] = _to_bool(val)
                 elif key == "ignore_patterns":
                     parts: List[str] = [p.strip() for p in val.split(",") if p.strip()]
@@ -131,8 +180,16 @@ def load_config(config_path: Optional[str] = None):
         config["root_allowlist"] = DEFAULTS["root_allowlist"].copy()
     if not isinstance(config.get("folders_faves"), list):
         config["folders_faves"] = DEFAULTS["folders_faves"].copy()
+    event_mode = str(config.get("event_mode", "")).strip().lower()
+    config["event_mode"] = event_mode if event_mode in EVENT_MODES else DEFAULTS["event_mode"]
+    copy_backend = str(config.get("copy_backend", "")).strip().lower()
+    config["copy_backend"] = copy_backend if copy_backend in COPY_BACKENDS else DEFAULTS["copy_backend"]
+    link_mode = str(config.get("link_mode", "")).strip().lower()
+    config["link_mode"] = link_mode if link_mode in LINK_MODES else DEFAULTS["link_mode"]
+    durability = str(config.get("durability", "")).strip().lower()
+    config["durability"] = durability if durability in DURABILITY_MODES else DEFAULTS["durability"]
     
-    for b in ("preserve_mtime", "dry_run"):
+    for b in _BOOL_KEYS:
         if not isinstance(config.get(b), bool):
             config[b] = bool(config.get(b))
 
@@ -0,0 +1,461 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Pluggable file copy backends used by SyncEngine.execute_actions().
+
+CopyBackend copies a file's bytes with the fastest mechanism the source and
+destination filesystems support, trying in order:
+
+- reflink: FICLONE ioctl; the copy shares blocks with the source (btrfs, XFS)
+- copy_file_range: in-kernel copy, no round trip through userspace
+- sendfile: in-kernel copy for kernels or filesystems without copy_file_range
+- buffered: plain read/write loop (works everywhere)
+
+The first backend that works for a (source device, destination device) pair is
+cached, so later copies between the same filesystems go straight to it. A backend
+that fails with an "unsupported" error is skipped and the next one is tried on a
+truncated destination. Any other error is raised to the caller.
+
+Files of at least LARGE_FILE_BYTES get hints: the destination is preallocated
+(not for reflinks, which share blocks) and the source is read with
+POSIX_FADV_SEQUENTIAL, then dropped from the page cache with POSIX_FADV_DONTNEED.
+
+Metadata (mtime, mode) is copied afterwards with shutil.copystat, matching
+shutil.copy2.
+
+copy_many() copies one source to several destinations. Destinations that can be
+reflinked, or whose filesystems were not probed yet, use copy(). The others
+share a single read of the source ("fanout"). Files up to FANOUT_MMAP_BYTES are
+mmapped once and written to every destination. Bigger files are streamed through
+a double-buffered pipeline: a reader thread fills the next chunk while the
+current one is written to all destinations.
+
+link_mode changes what a "copy" is. "reflink" always tries a clone first, even if
+the preferred backend is lower or "copy2". "hardlink" makes the destination
+another name for the source inode, which is O(1) whatever the file size. If the
+files are on different devices, or the filesystem refuses links, it falls back to
+copy(); refusals are remembered per device pair.
+"""
+import errno
+import mmap
+import os
+import queue
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Backends in probe order; "copy2" bypasses probing and uses shutil.copy2
+BACKENDS = ("reflink", "copy_file_range", "sendfile", "buffered")
+COPY_BACKENDS = ("auto",) + BACKENDS + ("copy2",)
+
+# Accepted values of link_mode
+LINK_MODES = ("copy", "reflink", "hardlink")
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# Files at least this large get preallocation and fadvise hints
+LARGE_FILE_BYTES = 8 * 1024 * 1024
+
+# Chunk size for the in-kernel loops and the buffered copy
+_CHUNK = 8 * 1024 * 1024
+_BUFFER = 1024 * 1024
+
+# Fan-out: sources up to this size are mmapped whole, bigger ones are streamed
+FANOUT_MMAP_BYTES = 64 * 1024 * 1024
+
+# Errors meaning "this backend cannot copy between these files", not a real failure
+_UNSUPPORTED_ERRNOS = frozenset(
+    code for code in (
+        getattr(errno, "EXDEV", None),
+        getattr(errno, "EOPNOTSUPP", None),
+        getattr(errno, "ENOTSUP", None),
+        getattr(errno, "ENOSYS", None),
+        getattr(errno, "EINVAL", None),
+        getattr(errno, "ENOTTY", None),
+        getattr(errno, "EBADF", None),
+        getattr(errno, "EPERM", None),
+    )
+    if code is not None
+)
+
+# os.link errors meaning "cannot link here", answered by falling back to a copy
+_NO_LINK_ERRNOS = frozenset(
+    code for code in (
+        getattr(errno, "EXDEV", None),
+        getattr(errno, "EPERM", None),
+        getattr(errno, "EMLINK", None),
+        getattr(errno, "EOPNOTSUPP", None),
+        getattr(errno, "ENOTSUP", None),
+        getattr(errno, "ENOSYS", None),
+        getattr(errno, "EACCES", None),
+    )
+    if code is not None
+)
+
+
+class CopyBackend:
+    """
+    Copies files with the fastest supported backend, caching probes per device pair.
+
+    Thread-safe: one instance is shared by all copy workers of a SyncEngine.
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(self, preferred: str = "auto", link_mode: str = "copy"):
+        """
+        Args:
+            preferred: "auto" to probe from the fastest backend, a backend name
+                       from BACKENDS to start probing there, or "copy2" to always
+                       use shutil.copy2
+            link_mode: "copy", "reflink" (clone first) or "hardlink" (see transfer())
+        """
+        self.link_mode = link_mode if link_mode in LINK_MODES else "copy"
+        self.preferred = preferred if preferred in COPY_BACKENDS else "auto"
+        if self.link_mode == "reflink":
+            self.preferred = "reflink"
+        # (source device, destination device) -> index into BACKENDS
+        self._probed: Dict[Tuple[int, int], int] = {}
+        # Device pairs where os.link failed
+        self._no_hardlink: set = set()
+        self._lock = threading.Lock()
+
+    def transfer(self, source: Union[str, Path], destination: Union[str, Path]) -> str:
+        """
+        Put source's content at destination according to link_mode.
+
+        With link_mode "hardlink", destination becomes a hard link to source (an
+        existing destination file is atomically replaced). Otherwise, or where
+        linking is impossible, this is copy().
+
+        Returns:
+            "hardlink" or the name of the copy backend used
+        """
+        if self.link_mode != "hardlink":
+            return self.copy(source, destination)
+        destination = Path(destination)
+        key = (os.stat(source).st_dev, os.stat(destination.parent).st_dev)
+        with self._lock:
+            linkable = key[0] == key[1] and key not in self._no_hardlink
+        if linkable:
+            # os.link cannot overwrite, so link beside the destination and rename
+            link_path = destination.with_name(destination.name + ".link")
+            try:
+                os.link(source, link_path)
+            except OSError as exc:
+                if exc.errno not in _NO_LINK_ERRNOS:
+                    raise
+                with self._lock:
+                    self._no_hardlink.add(key)
+            else:
+                try:
+                    os.replace(link_path, destination)
+                except OSError:
+                    os.unlink(link_path)
+                    raise
+                return "hardlink"
+        return self.copy(source, destination)
+
+    def copy(self, source: Union[str, Path], destination: Union[str, Path]) -> str:
+        """
+        Copy source to destination (created or truncated) including metadata.
+
+        Args:
+            source: File to copy
+            destination: Target path, normally a temp file next to the final path
+
+        Returns:
+            Name of the backend that performed the copy
+
+        Raises:
+            OSError: If the copy fails for a reason other than an unsupported backend
+        """
+        if self.preferred == "copy2":
+            shutil.copy2(source, destination)
+            return "copy2"
+
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            src_fd = src.fileno()
+            dst_fd = dst.fileno()
+            src_stat = os.fstat(src_fd)
+            key = (src_stat.st_dev, os.fstat(dst_fd).st_dev)
+            size = src_stat.st_size
+            large = size >= LARGE_FILE_BYTES
+            if large:
+                _advise(src_fd, "POSIX_FADV_SEQUENTIAL")
+
+            for index in self._candidates(key):
+                backend = BACKENDS[index]
+                if large and backend != "reflink":
+                    _preallocate(dst_fd, size)
+                try:
+                    _COPIERS[backend](src, dst, size)
+                except OSError as exc:
+                    if exc.errno not in _UNSUPPORTED_ERRNOS or backend == "buffered":
+                        raise
+                    # Start the next backend from a clean destination
+                    os.ftruncate(dst_fd, 0)
+                    os.lseek(dst_fd, 0, os.SEEK_SET)
+                    os.lseek(src_fd, 0, os.SEEK_SET)
+                    continue
+                self._remember(key, index)
+                break
+
+            if large:
+                _advise(src_fd, "POSIX_FADV_DONTNEED")
+
+        shutil.copystat(source, destination)
+        return backend
+
+    def copy_many(
+        self,
+        source: Union[str, Path],
+        destinations: List[Path],
+    ) -> List[Tuple[Optional[str], Optional[Exception]]]:
+        """
+        Copy one source to several destinations, reading the source once where possible.
+
+        Args:
+            source: File to copy
+            destinations: Target paths (normally temp files), in their parent directories
+
+        Returns:
+            One (backend, error) pair per destination, in order; backend is None
+            when error is set
+        """
+        results: List[Tuple[Optional[str], Optional[Exception]]] = [(None, None)] * len(destinations)
+        if self.link_mode == "hardlink":
+            # Links cost no reads at all
+            for position, destination in enumerate(destinations):
+                try:
+                    results[position] = (self.transfer(source, destination), None)
+                except Exception as exc:
+                    results[position] = (None, exc)
+            return results
+        shared: List[int] = []
+        try:
+            src_dev = os.stat(source).st_dev
+        except OSError as exc:
+            return [(None, exc)] * len(destinations)
+
+        for position, destination in enumerate(destinations):
+            try:
+                key = (src_dev, os.stat(Path(destination).parent).st_dev)
+                with self._lock:
+                    probed = self._probed.get(key)
+                if self.preferred == "copy2" or probed is None or BACKENDS[probed] == "reflink":
+                    # Clones are cheaper than a shared read; unknown pairs get probed
+                    results[position] = (self.copy(source, destination), None)
+                else:
+                    shared.append(position)
+            except Exception as exc:
+                results[position] = (None, exc)
+
+        if len(shared) == 1:
+            position = shared[0]
+            try:
+                results[position] = (self.copy(source, destinations[position]), None)
+            except Exception as exc:
+                results[position] = (None, exc)
+        elif shared:
+            errors = _fan_out(source, [destinations[position] for position in shared])
+            for position, error in zip(shared, errors):
+                results[position] = (None, error) if error is not None else ("fanout", None)
+        return results
+
+    def probed_backends(self) -> Dict[Tuple[int, int], str]:
+        """Return the cached backend per (source device, destination device) pair."""
+        with self._lock:
+            return {key: BACKENDS[index] for key, index in self._probed.items()}
+
+    def _candidates(self, key: Tuple[int, int]) -> List[int]:
+        """Backend indexes to try for a device pair, starting at the cached one."""
+        with self._lock:
+            start = self._probed.get(key)
+        if start is None:
+            start = BACKENDS.index(self.preferred) if self.preferred in BACKENDS else 0
+        return list(range(start, len(BACKENDS)))
+
+    def _remember(self, key: Tuple[int, int], index: int) -> None:
+        with self._lock:
+            if self._probed.get(key, -1) < index:
+                self._probed[key] = index
+
+
+def _copy_reflink(src, dst, size: int) -> None:
+    """Clone the source's blocks into dst with the FICLONE ioctl."""
+    if fcntl is None:
+        raise OSError(errno.ENOSYS, "FICLONE is not available")
+    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def _copy_file_range(src, dst, size: int) -> None:
+    """Copy with os.copy_file_range until EOF."""
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "copy_file_range is not available")
+    src_fd = src.fileno()
+    dst_fd = dst.fileno()
+    while os.copy_file_range(src_fd, dst_fd, _CHUNK):
+        pass
+
+
+def _copy_sendfile(src, dst, size: int) -> None:
+    """Copy with os.sendfile until EOF (file-to-file works on Linux)."""
+    if not hasattr(os, "sendfile"):
+        raise OSError(errno.ENOSYS, "sendfile is not available")
+    src_fd = src.fileno()
+    dst_fd = dst.fileno()
+    offset = 0
+    while True:
+        sent = os.sendfile(dst_fd, src_fd, offset, _CHUNK)
+        if not sent:
+            break
+        offset += sent
+
+
+def _copy_buffered(src, dst, size: int) -> None:
+    """Copy through a userspace buffer."""
+    shutil.copyfileobj(src, dst, _BUFFER)
+
+
+_COPIERS = {
+    "reflink": _copy_reflink,
+    "copy_file_range": _copy_file_range,
+    "sendfile": _copy_sendfile,
+    "buffered": _copy_buffered,
+}
+
+
+def _fan_out(source: Union[str, Path], destinations: List[Path]) -> List[Optional[Exception]]:
+    """
+    Write one read of source to every destination.
+
+    A failing destination is dropped and the others continue. A failure to read
+    the source fails every destination.
+
+    Returns:
+        One error (or None) per destination
+    """
+    errors: List[Optional[Exception]] = [None] * len(destinations)
+    outputs: Dict[int, object] = {}
+    try:
+        with open(source, "rb") as src:
+            src_fd = src.fileno()
+            size = os.fstat(src_fd).st_size
+            large = size >= LARGE_FILE_BYTES
+            for position, destination in enumerate(destinations):
+                try:
+                    outputs[position] = open(destination, "wb")
+                    if large:
+                        _preallocate(outputs[position].fileno(), size)
+                except OSError as exc:
+                    errors[position] = exc
+
+            def write_all(data) -> None:
+                for position in list(outputs):
+                    try:
+                        outputs[position].write(data)
+                    except OSError as exc:
+                        errors[position] = exc
+                        _close_quietly(outputs.pop(position))
+
+            if size == 0:
+                pass
+            elif size <= FANOUT_MMAP_BYTES:
+                with mmap.mmap(src_fd, 0, access=mmap.ACCESS_READ) as mapped:
+                    with memoryview(mapped) as view:
+                        write_all(view)
+            else:
+                _advise(src_fd, "POSIX_FADV_SEQUENTIAL")
+                _pipeline(src, write_all)
+                _advise(src_fd, "POSIX_FADV_DONTNEED")
+
+            for position in list(outputs):
+                try:
+                    outputs.pop(position).close()
+                except OSError as exc:
+                    errors[position] = exc
+    except OSError as exc:
+        for position, output in outputs.items():
+            _close_quietly(output)
+        return [error if error is not None else exc for error in errors]
+
+    for position, destination in enumerate(destinations):
+        if errors[position] is None:
+            try:
+                shutil.copystat(source, destination)
+            except OSError as exc:
+                errors[position] = exc
+    return errors
+
+
+def _pipeline(src, write_all) -> None:
+    """Read src in chunks on a helper thread (one chunk ahead) and pass each to write_all."""
+    chunks: "queue.Queue" = queue.Queue(maxsize=1)
+    stop = threading.Event()
+
+    def read() -> None:
+        try:
+            while not stop.is_set():
+                chunk = src.read(_CHUNK)
+                chunks.put(chunk)
+                if not chunk:
+                    return
+        except OSError as exc:
+            chunks.put(exc)
+
+    reader = threading.Thread(target=read, name="sync-fanout-read", daemon=True)
+    reader.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if isinstance(chunk, OSError):
+                raise chunk
+            if not chunk:
+                return
+            write_all(chunk)
+    finally:
+        stop.set()
+        # Unblock a reader waiting to hand over its next chunk
+        while reader.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        reader.join()
+
+
+def _close_quietly(handle) -> None:
+    try:
+        handle.close()
+    except OSError:
+        pass
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Reserve size bytes for fd where posix_fallocate is supported."""
+    fallocate = getattr(os, "posix_fallocate", None)
+    if fallocate is None:
+        return
+    try:
+        fallocate(fd, 0, size)
+    except OSError:
+        # Only a hint; e.g. some network filesystems do not support it
+        pass
+
+
+def _advise(fd: int, advice_name: str) -> None:
+    """Apply a posix_fadvise hint to the whole file where supported."""
+    fadvise = getattr(os, "posix_fadvise", None)
+    advice: Optional[int] = getattr(os, advice_name, None)
+    if fadvise is None or advice is None:
+        return
+    try:
+        fadvise(fd, 0, 0, advice)
+    except OSError:
+        pass
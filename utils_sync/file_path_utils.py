@@ -6,6 +6,7 @@ Utilities for normalizing file system paths and deduplicating path lists.
 """
 from __future__ import annotations
 
+import hashlib
 import os
 from pathlib import Path
 from typing import Union, Iterable, List, Optional
@@ -144,4 +145,35 @@ def get_roo_relative_path(full_path: Union[str, Path], base_folder: Union[str, P
         return None
 
     # Return as POSIX-style string with no leading slash.
-    return rel.as_posix()
\ No newline at end of file
+    return rel.as_posix()
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+def get_state_dir(state_dir: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Return the per-user directory for persistent sync state (caches, journals).
+
+    Resolution order:
+    - Explicit `state_dir` argument (e.g. the `state_dir` config value).
+    - The AGENTFLOW_STATE_DIR environment variable.
+    - `~/.agentflow_sync`.
+
+    The directory is not created; callers create subfolders on first write.
+    """
+    if state_dir:
+        return normalize_path(state_dir)
+    env_dir = os.getenv("AGENTFLOW_STATE_DIR")
+    if env_dir:
+        return normalize_path(env_dir)
+    return normalize_path(Path.home() / ".agentflow_sync")
+
+
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+def folder_state_key(folder: Union[str, Path]) -> str:
+    """
+    Return a short, filesystem-safe key identifying a base folder in state files.
+
+    The key is derived from the normalized folder path, so different spellings of
+    the same folder map to the same cache/catalog file.
+    """
+    normalized = str(normalize_path(folder))
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,277 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Persistent content-hash cache used for content-aware planning.
+
+Hashes are keyed by a file's stat fingerprint (device, inode, size, mtime_ns), so
+a file is only ever re-hashed after it changes. Two digests are kept per file:
+
+- partial: hash of the first and last PARTIAL_CHUNK bytes plus the size, which
+  is cheap and rules out most differing files without a full read;
+- full: hash of the whole file, computed only when partial hashes agree.
+
+For files no larger than two chunks the partial hash already covers every byte,
+so it doubles as the full hash.
+
+The cache is a JSON file under `<state_dir>/hash_cache.json`. When it grows
+beyond `max_entries`, the least recently used entries are evicted on save.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Union
+
+from . import file_path_utils
+
+# Bump when digest inputs or the on-disk layout change; older files are ignored.
+CACHE_VERSION = 1
+
+# Bytes hashed from each end of a file for the partial digest
+PARTIAL_CHUNK = 64 * 1024
+
+# Read size for full-file hashing
+_READ_SIZE = 1024 * 1024
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+# Seconds after which a cache hit refreshes an entry's last-used stamp
+_TOUCH_INTERVAL = 24 * 60 * 60
+
+
+def new_hasher() -> "hashlib._Hash":
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """Return a fresh hash object of the kind used for all cached digests."""
+    return hashlib.blake2b(digest_size=20)
+
+
+class Fingerprint(NamedTuple):
+    """Stat fields identifying one version of a file's content."""
+    device: int
+    inode: int
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def from_stat(cls, stats: os.stat_result) -> "Fingerprint":
+        """Build a fingerprint from an os.stat_result."""
+        return cls(stats.st_dev, stats.st_ino, stats.st_size, stats.st_mtime_ns)
+
+    @classmethod
+    def from_index_entry(cls, entry: Dict[str, Any]) -> "Fingerprint":
+        """Build a fingerprint from a scan_folders() index entry."""
+        mtime_ns = entry.get("mtime_ns")
+        if mtime_ns is None:
+            mtime_ns = int(entry["mtime"] * 1_000_000_000)
+        return cls(entry.get("device", 0), entry.get("inode", 0), entry["size"], mtime_ns)
+
+
+def fingerprint_key(path: Union[str, Path], fingerprint: Fingerprint) -> str:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """
+    Build the cache key for a file version.
+
+    Platforms that report no inode number (inode == 0) fall back to including the
+    path so unrelated files can never share a key.
+    """
+    if fingerprint.inode:
+        return f"{fingerprint.device}:{fingerprint.inode}:{fingerprint.size}:{fingerprint.mtime_ns}"
+    return f"p:{path}:{fingerprint.size}:{fingerprint.mtime_ns}"
+
+
+class HashCache:
+    """
+    Thread-safe, persistent cache of partial and full content hashes.
+
+    Attributes:
+        cache_path: JSON file the cache is loaded from and saved to
+        max_entries: Maximum number of entries kept on save
+        hashed_bytes: Bytes read for hashing since the cache was created
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(self, cache_path: Union[str, Path], max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize an empty cache bound to a cache file.
+
+        Args:
+            cache_path: Path of the JSON cache file
+            max_entries: Maximum number of entries kept on save
+        """
+        self.cache_path = Path(cache_path)
+        self.max_entries = max_entries
+        self.hashed_bytes = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_state_dir(
+        cls,
+        state_dir: Optional[Union[str, Path]] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> "HashCache":
+        """
+        Create and load the shared hash cache from the state directory.
+
+        Args:
+            state_dir: Optional override for the state directory
+            max_entries: Maximum number of entries kept on save
+
+        Returns:
+            HashCache with any previously saved entries loaded
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        cache = cls(file_path_utils.get_state_dir(state_dir) / "hash_cache.json", max_entries)
+        cache.load()
+        return cache
+
+    def load(self) -> None:
+        """Load cached entries from disk; unreadable or outdated files are ignored."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            entries = data.get("entries")
+            if isinstance(entries, dict):
+                with self._lock:
+                    self._entries = entries
+
+    def save(self) -> bool:
+        """
+        Evict least recently used entries beyond max_entries and persist atomically.
+
+        Returns:
+            True if the cache file was written, False if unchanged or on error.
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        with self._lock:
+            if not self._dirty:
+                return False
+            if len(self._entries) > self.max_entries:
+                newest = sorted(
+                    self._entries.items(), key=lambda kv: kv[1].get("u", 0), reverse=True
+                )[:self.max_entries]
+                self._entries = dict(newest)
+            payload = {"version": CACHE_VERSION, "entries": self._entries}
+            temp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(temp_path, "w", encoding="utf-8") as fh:
+                    json.dump(payload, fh, separators=(",", ":"))
+                os.replace(temp_path, self.cache_path)
+            except OSError:
+                # The cache is an optimization only; never fail a sync because of it
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                return False
+            self._dirty = False
+            return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def partial_hash(self, path: Union[str, Path], fingerprint: Fingerprint) -> str:
+        """
+        Return the partial digest (size + head + tail) of a file.
+
+        Args:
+            path: File to hash
+            fingerprint: Current fingerprint of the file (used as cache key)
+
+        Returns:
+            Hex digest string
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        return self._get(path, fingerprint, "p")
+
+    def full_hash(self, path: Union[str, Path], fingerprint: Fingerprint) -> str:
+        """
+        Return the full-content digest of a file.
+
+        Args:
+            path: File to hash
+            fingerprint: Current fingerprint of the file (used as cache key)
+
+        Returns:
+            Hex digest string
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        if fingerprint.size <= 2 * PARTIAL_CHUNK:
+            # The partial digest already covers every byte of small files
+            return self._get(path, fingerprint, "p")
+        return self._get(path, fingerprint, "f")
+
+    def _get(self, path: Union[str, Path], fingerprint: Fingerprint, field: str) -> str:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Return a cached digest or compute and store it."""
+        key = fingerprint_key(path, fingerprint)
+        now = int(time.time())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and field in entry:
+                # Recency only needs day granularity for eviction; avoid rewriting
+                # the cache file just because entries were read
+                if now - entry.get("u", 0) > _TOUCH_INTERVAL:
+                    entry["u"] = now
+                    self._dirty = True
+                return entry[field]
+
+        # Hash outside the lock so concurrent callers can hash different files
+        if field == "p":
+            digest, read = _hash_partial(path, fingerprint.size)
+        else:
+            digest, read = _hash_full(path)
+
+        with self._lock:
+            self.hashed_bytes += read
+            entry = self._entries.setdefault(key, {})
+            entry[field] = digest
+            entry["u"] = now
+            self._dirty = True
+        return digest
+
+
+def _hash_partial(path: Union[str, Path], size: int):
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """Hash size + first and last PARTIAL_CHUNK bytes; returns (hex digest, bytes read)."""
+    if size <= 2 * PARTIAL_CHUNK:
+        # Small files: the "partial" digest is a digest of the whole content
+        return _hash_full(path)
+    hasher = new_hasher()
+    hasher.update(str(size).encode("ascii") + b"\0")
+    with open(path, "rb") as fh:
+        head = fh.read(PARTIAL_CHUNK)
+        fh.seek(-PARTIAL_CHUNK, os.SEEK_END)
+        tail = fh.read(PARTIAL_CHUNK)
+    hasher.update(head)
+    hasher.update(tail)
+    return hasher.hexdigest(), len(head) + len(tail)
+
+
+def _hash_full(path: Union[str, Path]):
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """Hash a whole file; returns (hex digest, bytes read)."""
+    hasher = new_hasher()
+    read = 0
+    with open(path, "rb") as fh:
+        while True:
+            chunk = fh.read(_READ_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            read += len(chunk)
+    return hasher.hexdigest(), read
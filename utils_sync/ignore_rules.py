@@ -0,0 +1,295 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Compiled ignore-rule matching for folder scans.
+
+IgnoreRules turns a list of ignore patterns into structures whose matching cost
+does not grow with the number of rules:
+
+- Exact names (".git", "__pycache__") live in a hash set and match any path
+  component.
+- Name globs ("*.pyc", "*.egg-info") are combined into a single regex.
+- Folder paths (".roo/docs") are stored in a prefix trie of path segments. The
+  scanner carries the current trie node while descending, so checking an entry
+  is one dict lookup regardless of how many folder rules exist.
+- Exact file paths (".roo/commands/run-sync.md") live in a hash set.
+- Path globs (".roo/rules/*.tmp") are combined into a single regex matched
+  against the relative path. As with fnmatch, "*" may also match "/".
+
+Rules come either from the `ignore_patterns` config value (via from_config) or
+from `.syncignore` files inside .roo (via from_syncignore). A `.syncignore`
+applies to the directory containing it and everything below, with its paths
+relative to that directory:
+
+    # comment
+    *.log          name rule, matches at any depth below the file
+    drafts/        trailing "/" is accepted; treated like "drafts"
+    /notes/tmp     leading "/" or an inner "/" makes a path rule
+    build/*.json   path glob
+
+Negated ("!") patterns are not supported and are skipped.
+"""
+import fnmatch
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+# Name of per-directory ignore files honored inside .roo
+SYNCIGNORE_NAME = ".syncignore"
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _has_glob(text: str) -> bool:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """Return True if text contains fnmatch wildcard characters."""
+    return any(ch in _GLOB_CHARS for ch in text)
+
+
+def _combine_globs(globs: Iterable[str]) -> Optional[Pattern]:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """Compile several fnmatch-style globs into one case-sensitive regex (or None)."""
+    parts = [fnmatch.translate(g) for g in sorted(set(globs))]
+    if not parts:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in parts))
+
+
+class TrieNode:
+    """
+    One path segment in a folder-rule trie.
+
+    Attributes:
+        children: Child nodes keyed by path segment
+        terminal: True if the path ending at this node is ignored (with everything below)
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    __slots__ = ("children", "terminal")
+
+    def __init__(self):
+        self.children: Dict[str, "TrieNode"] = {}
+        self.terminal = False
+
+    def insert(self, rel_path: str) -> None:
+        """Add a "/"-separated relative path to the trie."""
+        node = self
+        for segment in rel_path.split("/"):
+            if not segment:
+                continue
+            node = node.children.setdefault(segment, TrieNode())
+        node.terminal = True
+
+    def descend(self, rel_prefix: str) -> Optional["TrieNode"]:
+        """Return the node for a relative directory prefix, or None if no rules below it."""
+        node: Optional[TrieNode] = self
+        for segment in rel_prefix.split("/"):
+            if not segment:
+                continue
+            if node is None:
+                return None
+            node = node.children.get(segment)
+        return node
+
+
+class IgnoreRules:
+    """
+    A compiled set of ignore rules for one scope (.roo itself or a .syncignore dir).
+
+    Attributes:
+        names: Exact names ignored at any depth
+        name_regex: Combined regex of name globs, or None
+        folders: Trie of ignored folder paths (relative to the scope)
+        files: Exact relative file paths ignored
+        path_regex: Combined regex of relative-path globs, or None
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(
+        self,
+        names: Iterable[str] = (),
+        name_globs: Iterable[str] = (),
+        folders: Iterable[str] = (),
+        files: Iterable[str] = (),
+        path_globs: Iterable[str] = (),
+    ):
+        """
+        Compile rule collections into lookup structures.
+
+        Args:
+            names: Exact component names to ignore
+            name_globs: Globs matched against each component name
+            folders: Relative folder paths ignored together with their contents
+            files: Relative file paths ignored exactly
+            path_globs: Globs matched against relative paths
+        """
+        self.names: Set[str] = set(names)
+        self.name_regex = _combine_globs(name_globs)
+        self.folders = TrieNode()
+        for folder in folders:
+            self.folders.insert(folder)
+        self.files: Set[str] = set(files)
+        self.path_regex = _combine_globs(path_globs)
+
+    @classmethod
+    def from_config(cls, patterns: Iterable[str]) -> "IgnoreRules":
+        """
+        Build rules from the `ignore_patterns` config list.
+
+        Categorization follows the long-standing config semantics:
+        - ".roo/"-prefixed paths are relative to .roo; the last segment containing
+          a dot marks a file rule, otherwise a folder rule. Globs become path globs.
+        - Other patterns match by name; for paths with slashes the last segment
+          is used. Globs such as "*.pyc" become name globs.
+
+        Backslashes are accepted as separators.
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        names: List[str] = []
+        name_globs: List[str] = []
+        folders: List[str] = []
+        files: List[str] = []
+        path_globs: List[str] = []
+
+        for pattern in patterns or []:
+            if not pattern:
+                continue
+            norm = str(pattern).replace("\\", "/").strip()
+
+            # Treat .roo-prefixed patterns as paths relative to the .roo/ directory
+            if norm.startswith(".roo/"):
+                rel = norm[len(".roo/"):].strip("/")
+                if not rel:
+                    continue
+                if _has_glob(rel):
+                    path_globs.append(rel)
+                    continue
+                last_seg = rel.split("/")[-1]
+                # Heuristic: if the last segment contains a dot, treat as a file; otherwise a folder
+                if "." in last_seg:
+                    files.append(rel)
+                else:
+                    folders.append(rel)
+            else:
+                # Simple names like ".git"; for other paths match on the last component
+                name = norm.rstrip("/").split("/")[-1]
+                if not name:
+                    continue
+                if _has_glob(name):
+                    name_globs.append(name)
+                else:
+                    names.append(name)
+
+        return cls(names, name_globs, folders, files, path_globs)
+
+    @classmethod
+    def from_syncignore(cls, lines: Iterable[str]) -> "IgnoreRules":
+        """
+        Build rules from the lines of a `.syncignore` file (see module docstring).
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        names: List[str] = []
+        name_globs: List[str] = []
+        folders: List[str] = []
+        path_globs: List[str] = []
+
+        for raw in lines:
+            line = raw.strip().replace("\\", "/")
+            if not line or line.startswith("#") or line.startswith("!"):
+                continue
+            anchored = line.startswith("/")
+            rel = line.strip("/")
+            if not rel:
+                continue
+            if anchored or "/" in rel:
+                if _has_glob(rel):
+                    path_globs.append(rel)
+                else:
+                    folders.append(rel)
+            elif _has_glob(rel):
+                name_globs.append(rel)
+            else:
+                names.append(rel)
+
+        return cls(names, name_globs, folders, (), path_globs)
+
+    def is_empty(self) -> bool:
+        """Return True if these rules can never ignore anything."""
+        return not (
+            self.names or self.name_regex or self.folders.children
+            or self.files or self.path_regex
+        )
+
+    def check_entry(
+        self, name: str, rel_path: str, is_dir: bool, node: Optional[TrieNode]
+    ) -> Tuple[bool, Optional[TrieNode]]:
+        """
+        Decide whether a directory entry is ignored during a top-down walk.
+
+        Args:
+            name: Entry name
+            rel_path: Entry path relative to this rule scope
+            is_dir: True if the entry is a directory
+            node: Trie node of the entry's parent directory (None if no folder
+                  rules apply below it)
+
+        Returns:
+            Tuple of (ignored, trie node to carry into the entry if it is a directory)
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        if name in self.names:
+            return True, None
+        if self.name_regex is not None and self.name_regex.match(name):
+            return True, None
+        child = node.children.get(name) if node is not None else None
+        if child is not None and child.terminal:
+            return True, None
+        if self.path_regex is not None and self.path_regex.match(rel_path):
+            return True, None
+        if not is_dir and rel_path in self.files:
+            return True, None
+        return False, child
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """
+        Return True if a relative path (or any of its parent folders) is ignored.
+
+        Unlike check_entry(), this does not rely on the caller having pruned
+        parent directories, so it can be used for arbitrary paths.
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        segments = [s for s in rel_path.split("/") if s]
+        node: Optional[TrieNode] = self.folders
+        for idx, segment in enumerate(segments):
+            last = idx == len(segments) - 1
+            prefix = "/".join(segments[:idx + 1])
+            ignored, node = self.check_entry(segment, prefix, is_dir or not last, node)
+            if ignored:
+                return True
+        return False
+
+
+# A rule scope active during a walk: (relative prefix length, rules, current trie node)
+Scope = Tuple[int, IgnoreRules, Optional[TrieNode]]
+
+
+def check_scopes(
+    scopes: List[Scope], name: str, relative_str: str, is_dir: bool
+) -> Tuple[bool, List[Scope]]:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """
+    Check an entry against nested .syncignore scopes.
+
+    Args:
+        scopes: Scopes active in the entry's parent directory
+        name: Entry name
+        relative_str: Entry path relative to .roo
+        is_dir: True if the entry is a directory
+
+    Returns:
+        Tuple of (ignored, scopes to carry into the entry if it is a directory)
+    """
+    child_scopes: List[Scope] = []
+    for prefix_len, rules, node in scopes:
+        ignored, child = rules.check_entry(name, relative_str[prefix_len:], is_dir, node)
+        if ignored:
+            return True, []
+        child_scopes.append((prefix_len, rules, child))
+    return False, child_scopes
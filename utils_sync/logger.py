@@ -259,6 +259,9 @@ def log_event(event: "ProgressEvent") -> None:
         "file_path": event.file_path,
         "timestamp": event.timestamp
     }
+    # Run statistics travel on COMPLETE when collect_stats is enabled
+    if getattr(event, "stats", None):
+        meta["stats"] = event.stats
     
     # Write to rolling log
     _write_json_log("event", event.message, meta)
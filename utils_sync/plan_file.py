@@ -0,0 +1,352 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Versioned plan files: plan once, review, execute later without re-scanning.
+
+`cli_sync.py plan` writes the actions of plan_actions() to a JSON-lines file
+(gzip-compressed when the name ends in `.gz`); `cli_sync.py execute` and the
+GUI's "Open Plan..." read it back:
+
+    {"format": "agentflow-plan", "version": 1, "created": "...", "folders": [...],
+     "config_hash": "...", "actions": N, "folder_actions": [n0, n1, ...]}
+    {"r": "<relative path>", "s": [folder, "<path>"], "d": [folder, "<path>"],
+     "sm": source mtime, "dm": destination mtime or null,
+     "sf": [size, mtime_ns], "df": [size, mtime_ns] or null}      (N lines)
+
+Paths are stored relative to one of the header folders (by index); a path
+outside all of them is stored absolute with folder -1. "sf" and "df" are the
+stat fingerprints of the source and destination when the plan was written.
+"folder_actions" counts the actions per destination folder, by index, so
+execute can report per-folder progress totals without reading ahead (plans
+written before it was added simply lack it).
+
+PlanReader streams the actions in plan order, one line at a time, and checks
+each against the files on disk. An action is skipped when:
+
+- "done": the destination already matches the source (size and mtime), e.g.
+  because an interrupted execute of the same plan got that far;
+- "source_changed": the source is gone or differs from its fingerprint;
+- "destination_changed": the destination differs from its fingerprint (or
+  now exists where the plan expected none).
+
+Running execute again on the same plan therefore finishes an interrupted run.
+
+Because paths are stored relative to the header folders, a plan can run
+against other folders, e.g. the same projects checked out elsewhere on another
+machine: PlanReader(path, folders=[...]) replaces the header folders by index.
+Paths stored absolute (folder -1) are used as they are.
+
+config_hash() covers the settings that affect planning and execution, so a
+plan made with different settings can be detected before it runs.
+"""
+import datetime
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+PLAN_FORMAT = "agentflow-plan"
+
+# Bump when the on-disk layout changes; older plans are rejected.
+PLAN_VERSION = 1
+
+# Actions handed to execute_actions() at a time when executing a plan file
+PLAN_CHUNK_SIZE = 1000
+
+# Settings that only affect the UI or event reporting, left out of config_hash()
+_UNHASHED_KEYS = (
+    "window_width", "window_height", "folders_faves", "event_mode", "event_interval_ms",
+    "event_queue_size", "collect_stats",
+)
+
+# Reasons a planned action is skipped by PlanReader
+SKIP_REASONS = ("done", "source_changed", "destination_changed")
+
+
+class PlanFileError(ValueError):
+    """Raised for a plan file that is not a complete plan of a supported version."""
+
+
+class PlanEntry(NamedTuple):
+    """One action of a plan file with the fingerprints recorded for it."""
+    action: Dict[str, Any]
+    source_fingerprint: Optional[List[int]]  # [size, mtime_ns]
+    destination_fingerprint: Optional[List[int]]  # None: no destination when planned
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """Return a short hash of the settings that affect planning and execution."""
+    relevant = {key: value for key, value in config.items() if key not in _UNHASHED_KEYS}
+    encoded = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def write_plan(
+    path: Union[str, Path],
+    actions: Iterable[Dict[str, Any]],
+    folders: List[Path],
+    config: Dict[str, Any],
+) -> int:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """
+    Write actions to a plan file atomically.
+
+    Source and destination are stat'ed now; their fingerprints are what
+    PlanReader later compares the files on disk against.
+
+    Args:
+        path: Plan file to create (`.gz` suffix: gzip-compressed)
+        actions: Actions from plan_actions() (a list or a SyncPlan)
+        folders: Base folders of the sync
+        config: Config the plan was made with
+
+    Returns:
+        Number of actions written
+    """
+    path = Path(path)
+    actions = list(actions)
+    folders = [Path(f) for f in folders]
+    folder_ids = {folder: idx for idx, folder in enumerate(folders)}
+    destinations = [_split(Path(action["destination_path"]), folder_ids) for action in actions]
+    folder_actions = [0] * len(folders)
+    for folder_id, _ in destinations:
+        if folder_id >= 0:
+            folder_actions[folder_id] += 1
+    header = {
+        "format": PLAN_FORMAT,
+        "version": PLAN_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+        "folders": [str(f) for f in folders],
+        "config_hash": config_hash(config),
+        "actions": len(actions),
+        "folder_actions": folder_actions,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".tmp_{path.name}.{os.getpid()}")
+    try:
+        with _open(temp_path, "w", compressed=_is_compressed(path)) as fh:
+            fh.write(json.dumps(header) + "\n")
+            for action, destination in zip(actions, destinations):
+                record = {
+                    "r": str(action["relative_path"]),
+                    "s": _split(Path(action["source_path"]), folder_ids),
+                    "d": destination,
+                    "sm": action.get("source_mtime"),
+                    "dm": action.get("destination_mtime"),
+                    "sf": _fingerprint(action["source_path"]),
+                    "df": _fingerprint(action["destination_path"]),
+                }
+                fh.write(json.dumps(record, separators=(",", ":")) + "\n")
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    return len(actions)
+
+
+class PlanReader:
+    """
+    Streaming reader of a plan file.
+
+    The header is read on construction; actions are read lazily, so a plan of
+    any size is executed with bounded memory.
+
+    Attributes:
+        path: Plan file
+        folders: Base folders actions are resolved against (the header's, or
+                 the ones given to the constructor)
+        planned_folders: Base folders recorded in the header
+        created: UTC stamp of when the plan was written
+        config_hash: config_hash() of the config the plan was made with
+        count: Number of actions in the plan
+        folder_totals: Actions per destination folder (str) from the header, or
+                       None for a plan written without them
+        skipped: Actions skipped so far by actions()/chunks(), per reason
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        folders: Optional[List[Union[str, Path]]] = None,
+    ):
+        """
+        Open a plan file and read its header.
+
+        Args:
+            path: Plan file
+            folders: Optional base folders replacing the header's, matched by
+                     index (the plan's folders on another machine or checkout)
+
+        Raises:
+            PlanFileError: If the file is not a plan of a supported version, or
+                           folders does not have one entry per header folder
+            OSError: If the file cannot be read
+        """
+        self.path = Path(path)
+        self.skipped: Dict[str, int] = {reason: 0 for reason in SKIP_REASONS}
+        self._fh = _open(self.path, "r", compressed=_is_compressed(self.path))
+        try:
+            header = json.loads(self._fh.readline())
+        except (OSError, ValueError, EOFError) as exc:
+            self._fh.close()
+            raise PlanFileError(f"Not a plan file: {self.path} ({exc})") from exc
+        if not isinstance(header, dict) or header.get("format") != PLAN_FORMAT:
+            self._fh.close()
+            raise PlanFileError(f"Not a plan file: {self.path}")
+        if header.get("version") != PLAN_VERSION:
+            self._fh.close()
+            raise PlanFileError(
+                f"Unsupported plan version {header.get('version')} in {self.path} "
+                f"(expected {PLAN_VERSION})"
+            )
+        self.planned_folders = [Path(f) for f in header.get("folders", [])]
+        self.folders = list(self.planned_folders)
+        if folders is not None:
+            if len(folders) != len(self.planned_folders):
+                self._fh.close()
+                raise PlanFileError(
+                    f"The plan {self.path} has {len(self.planned_folders)} folders, "
+                    f"but {len(folders)} were given"
+                )
+            self.folders = [Path(f) for f in folders]
+        self.created = str(header.get("created", ""))
+        self.config_hash = str(header.get("config_hash", ""))
+        self.count = int(header.get("actions", 0))
+        folder_actions = header.get("folder_actions")
+        self.folder_totals: Optional[Dict[str, int]] = None
+        if isinstance(folder_actions, list) and len(folder_actions) == len(self.folders):
+            self.folder_totals = {
+                str(folder): int(total) for folder, total in zip(self.folders, folder_actions)
+            }
+
+    def __enter__(self) -> "PlanReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the file."""
+        self._fh.close()
+
+    def __iter__(self) -> Iterator[PlanEntry]:
+        """
+        Yield every entry in plan order, without checking it.
+
+        Raises:
+            PlanFileError: If a line is malformed or the file ends early
+        """
+        read = 0
+        for line in self._fh:
+            try:
+                record = json.loads(line)
+                action = {
+                    "action": "copy",
+                    "source_path": self._join(record["s"]),
+                    "destination_path": self._join(record["d"]),
+                    "destination_folder": self._folder(record["d"]),
+                    "relative_path": record["r"],
+                    "source_mtime": record["sm"],
+                    "destination_mtime": record["dm"],
+                }
+            except (ValueError, KeyError, IndexError, TypeError) as exc:
+                raise PlanFileError(f"Malformed action {read + 1} in {self.path}: {exc}") from exc
+            read += 1
+            yield PlanEntry(action, record.get("sf"), record.get("df"))
+        if read != self.count:
+            raise PlanFileError(f"Plan file {self.path} is truncated: {read} of {self.count} actions")
+
+    def actions(
+        self,
+        on_skip: Optional[Callable[[Dict[str, Any], str], None]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the actions that still apply to the files on disk.
+
+        Args:
+            on_skip: Called with (action, reason) for each skipped action
+        """
+        for entry in self:
+            reason = check_entry(entry)
+            if reason is None:
+                yield entry.action
+                continue
+            self.skipped[reason] += 1
+            if on_skip is not None:
+                on_skip(entry.action, reason)
+
+    def chunks(
+        self,
+        size: int = PLAN_CHUNK_SIZE,
+        on_skip: Optional[Callable[[Dict[str, Any], str], None]] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the actions of actions() in lists of at most `size`."""
+        chunk: List[Dict[str, Any]] = []
+        for action in self.actions(on_skip=on_skip):
+            chunk.append(action)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _join(self, stored: List[Any]) -> Path:
+        folder_id, relative = stored
+        if folder_id < 0:
+            return Path(relative)
+        return self.folders[folder_id] / relative
+
+    def _folder(self, stored: List[Any]) -> Optional[Path]:
+        return self.folders[stored[0]] if stored[0] >= 0 else None
+
+
+def check_entry(entry: PlanEntry) -> Optional[str]:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """
+    Compare a plan entry with the files on disk.
+
+    Returns:
+        None if the action should run, otherwise one of SKIP_REASONS
+    """
+    source = _fingerprint(entry.action["source_path"])
+    destination = _fingerprint(entry.action["destination_path"])
+    if source is not None and source == destination:
+        return "done"
+    if source is None or source != entry.source_fingerprint:
+        return "source_changed"
+    if destination != entry.destination_fingerprint:
+        return "destination_changed"
+    return None
+
+
+def _is_compressed(path: Path) -> bool:
+    return path.name.endswith(".gz")
+
+
+def _open(path: Path, mode: str, compressed: bool):
+    if compressed:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _fingerprint(path: Union[str, Path]) -> Optional[List[int]]:
+    try:
+        stats = os.stat(path)
+    except OSError:
+        return None
+    return [stats.st_size, stats.st_mtime_ns]
+
+
+def _split(path: Path, folder_ids: Dict[Path, int]) -> List[Any]:
+    """Return [folder index, path relative to it] for the nearest base folder above path."""
+    for parent in path.parents:
+        folder_id = folder_ids.get(parent)
+        if folder_id is not None:
+            return [folder_id, path.relative_to(parent).as_posix()]
+    return [-1, str(path)]
@@ -0,0 +1,139 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Presorted, grouped model behind a folder's planned-overwrite preview.
+
+FolderItem shows a folder's planned files in a ttk.Treeview that only holds
+what is on screen: one collapsible node per subdirectory, whose rows are
+inserted in chunks when it is opened. This module is the data side of that
+view. It has no Tk dependency, so it can be built on a background thread.
+
+PreviewModel groups preview items by parent directory and sorts them once:
+
+- root-level files (the "" group) come first;
+- other groups are ordered by their first path segment, then by full
+  directory, so "rules" comes before "rules-architect";
+- rows within a group are ordered by relative path (case-insensitive).
+
+Removal and "replaced" marks are O(1) per row.
+"""
+import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional
+
+PreviewItem = Dict[str, Any]
+
+
+def format_mtime(mtime: float) -> str:
+    """Format a POSIX mtime value for display in the preview."""
+    try:
+        return datetime.datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
+    except Exception:
+        return ""
+
+
+def preview_items(actions: Iterable[Dict[str, Any]]) -> List[PreviewItem]:
+    """
+    Build preview items (relative, timestamp, action) for one folder's actions.
+
+    Pure computation, so it can run on a background thread.
+    """
+    items = []
+    for action in actions:
+        if action.get("destination_path") is None:
+            continue
+        dest_mtime = action.get("destination_mtime")
+        items.append({
+            "relative": str(action.get("relative_path", "")),
+            # Pre-format timestamp once for display; use destination mtime snapshot from scan
+            "timestamp": format_mtime(dest_mtime) if dest_mtime is not None else "",
+            "action": action,
+        })
+    return items
+
+
+def group_key(relative_path: str) -> str:
+    """Return the preview group of a relative path: its parent directory ("" at the top)."""
+    return relative_path.rpartition("/")[0]
+
+
+def _group_sort_key(group: str):
+    if not group:
+        return (0, "", "")
+    return (1, group.split("/", 1)[0].lower(), group.lower())
+
+
+class PreviewModel:
+    """
+    Preview rows of one folder, grouped by directory in display order.
+
+    Items are dicts with "relative" (relative path), "timestamp" (display
+    string) and optionally "action" (the planned action, for removal).
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(self, items: Iterable[PreviewItem] = ()):
+        """
+        Build and sort the model.
+
+        Args:
+            items: Preview items, in any order
+        """
+        grouped: Dict[str, List[PreviewItem]] = {}
+        for item in items:
+            relative = str(item.get("relative", "") or "")
+            grouped.setdefault(group_key(relative), []).append(item)
+        # Per group: relative path -> item, in display order (dicts keep order)
+        self._groups: Dict[str, Dict[str, PreviewItem]] = {}
+        for group in sorted(grouped, key=_group_sort_key):
+            rows = sorted(grouped[group], key=lambda i: str(i.get("relative", "") or "").lower())
+            self._groups[group] = {str(i.get("relative", "") or ""): i for i in rows}
+        self._replaced: set = set()
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in self._groups.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._groups)
+
+    def groups(self) -> List[str]:
+        """Return the non-empty groups in display order."""
+        return list(self._groups)
+
+    def group_size(self, group: str) -> int:
+        """Return the number of rows in a group."""
+        return len(self._groups.get(group, ()))
+
+    def rows(self, group: str, offset: int = 0, limit: Optional[int] = None) -> List[PreviewItem]:
+        """Return a slice of a group's rows in display order."""
+        rows = self._groups.get(group)
+        if not rows:
+            return []
+        end = None if limit is None else offset + limit
+        return list(islice(rows.values(), offset, end))
+
+    def item(self, relative_path: str) -> Optional[PreviewItem]:
+        """Return the item of a relative path, or None."""
+        return self._groups.get(group_key(relative_path), {}).get(relative_path)
+
+    def remove(self, relative_path: str) -> Optional[PreviewItem]:
+        """Remove a row; an emptied group is dropped. Returns the removed item or None."""
+        group = group_key(relative_path)
+        rows = self._groups.get(group)
+        if rows is None or relative_path not in rows:
+            return None
+        item = rows.pop(relative_path)
+        if not rows:
+            del self._groups[group]
+        self._replaced.discard(relative_path)
+        return item
+
+    def mark_replaced(self, relative_path: str) -> bool:
+        """Mark a row as replaced (copied). Returns False if the row is unknown."""
+        if self.item(relative_path) is None:
+            return False
+        self._replaced.add(relative_path)
+        return True
+
+    def is_replaced(self, relative_path: str) -> bool:
+        """True if the row was marked replaced."""
+        return relative_path in self._replaced
@@ -5,21 +5,28 @@ Progress event types and data structures for file sync operations.
 This module provides event types and a dataclass for tracking progress
 during file synchronization operations. Events are emitted at key stages
 to enable logging, UI updates, and monitoring.
+
+BoundedEventQueue is a drop-in queue.Queue replacement that bounds the
+per-file scan events of very large trees (see its docstring for the drop/merge
+policy and what it does not bound).
 """
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, Optional
 import datetime
+import queue
 
 
 class EventType(Enum):
     """Event types for file sync progress tracking."""
     SCAN_START = "scan_start"
     SCAN_FILE = "scan_file"
+    SCAN_PROGRESS = "scan_progress"
     COPY = "copy"
     SKIP = "skip"
     ERROR = "error"
     COMPLETE = "complete"
+    CANCELLED = "cancelled"
 
 
 @dataclass
@@ -33,19 +40,103 @@ class ProgressEvent:
         file_path: File path related to the event
         message: Human-readable message describing the event
         timestamp: ISO8601 UTC timestamp when event was created
+        count: Number of files covered (SCAN_PROGRESS: files scanned so far in folder;
+               COPY/SKIP/ERROR: actions processed so far for the destination folder)
+        total: Total number of actions for the destination folder (COPY/SKIP/ERROR)
+               CANCELLED uses count for the pending actions and total for all actions
+        stats: COMPLETE only: SyncStats.as_dict() of the run when `collect_stats`
+               is enabled, otherwise None
     """
     event_type: EventType
     folder: str = ""
     file_path: str = ""
     message: str = ""
     timestamp: Optional[str] = None
+    count: int = 0
+    total: int = 0
+    stats: Optional[Dict[str, Any]] = None
+
+
+# Events a BoundedEventQueue may drop (or, for SCAN_PROGRESS, merge) under load.
+# Everything else (SCAN_START, COPY, ERROR, COMPLETE, CANCELLED, ...) is always delivered.
+LOW_VALUE_EVENTS = frozenset({EventType.SCAN_FILE, EventType.SCAN_PROGRESS, EventType.SKIP})
+
+
+class BoundedEventQueue(queue.Queue):
+    """
+    Event queue that bounds the low-value events of a slow consumer.
+
+    Only SCAN_FILE, SKIP and SCAN_PROGRESS events are bounded: the first two by
+    `limit`, SCAN_PROGRESS to one pending event per folder. Every other event is
+    kept, so a consumer that falls behind still holds up to one COPY (or ERROR)
+    event per executed action. Memory is therefore bounded by the plan size, not
+    by the number of scanned files.
+
+    Policy:
+    - A SCAN_PROGRESS event for a folder that still has an undelivered
+      SCAN_PROGRESS in the queue replaces that event's contents in place, so
+      consumers always see the latest counts and each folder holds at most one
+      pending progress event.
+    - Other low-value events (SCAN_FILE, SKIP) are dropped while `limit` or more
+      events are pending; `dropped` counts them.
+    - All other events, including ERROR and COMPLETE, are never dropped, even
+      past the limit. put() therefore never blocks.
+
+    Attributes:
+        limit: Pending-event count above which low-value events are dropped
+        dropped: Number of events dropped so far
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(self, limit: int = 10000):
+        """
+        Initialize the queue.
+
+        Args:
+            limit: Pending-event count above which low-value events are dropped
+        """
+        super().__init__()
+        self.limit = limit
+        self.dropped = 0
+        # Undelivered SCAN_PROGRESS events keyed by folder
+        self._pending_progress: Dict[str, ProgressEvent] = {}
+
+    def put(self, item, block=True, timeout=None):
+        """Enqueue an event according to the drop/merge policy (never blocks)."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        event_type = getattr(item, "event_type", None)
+        with self.not_full:
+            if event_type == EventType.SCAN_PROGRESS:
+                pending = self._pending_progress.get(item.folder)
+                if pending is not None:
+                    pending.file_path = item.file_path
+                    pending.message = item.message
+                    pending.timestamp = item.timestamp
+                    pending.count = item.count
+                    return
+                self._pending_progress[item.folder] = item
+            elif event_type in LOW_VALUE_EVENTS and self._qsize() >= self.limit:
+                self.dropped += 1
+                return
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def _get(self):
+        item = super()._get()
+        if getattr(item, "event_type", None) == EventType.SCAN_PROGRESS:
+            if self._pending_progress.get(item.folder) is item:
+                del self._pending_progress[item.folder]
+        return item
 
 
 def make_event(
     event_type: EventType,
     folder: str = "",
     file_path: str = "",
-    message: str = ""
+    message: str = "",
+    count: int = 0,
+    total: int = 0
 ) -> ProgressEvent:
     """
     Create a ProgressEvent with automatic timestamp.
@@ -55,6 +146,8 @@ def make_event(
         folder: Folder path related to the event (default: "")
         file_path: File path related to the event (default: "")
         message: Human-readable message describing the event (default: "")
+        count: Number of files covered by the event (default: 0)
+        total: Total number of actions for the event's folder (default: 0)
     
     Returns:
         ProgressEvent with ISO8601 UTC timestamp
@@ -70,5 +163,7 @@ def make_event(
         folder=folder,
         file_path=file_path,
         message=message,
-        timestamp=timestamp
+        timestamp=timestamp,
+        count=count,
+        total=total
     )
\ No newline at end of file
@@ -0,0 +1,227 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Persistent per-folder scan cache for repeat syncs.
+
+A ScanCache remembers, for every directory visited under a base folder's .roo/
+tree, the directory's mtime_ns and its raw listing (child directory names plus
+the (size, mtime_ns, inode, mtime, device) fingerprint of each file seen last
+time).
+
+Adding, removing or renaming an entry moves its directory's mtime. When a
+directory's mtime is unchanged, the scanner re-uses the cached listing and
+skips os.scandir() for it.
+
+Editing a file in place does NOT move its directory's mtime, so by default
+(stat_files=True) files are still stat'ed once each and in-place edits are
+seen. With stat_files=False (config `scan_cache_stat_files=false`) the files of
+an unchanged directory are built from the cached fingerprints instead, so a
+warm scan costs one stat per directory. An in-place edit is then not seen until
+its directory changes, and a peer's older copy can overwrite it: only use it
+where files are always saved by replacing them.
+
+Cache files are small JSON documents stored under
+`<state_dir>/scan_cache/<folder key>.json` and are written atomically.
+"""
+import json
+import os
+import stat
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from . import file_path_utils
+
+# Bump when the on-disk layout changes; older files are ignored.
+CACHE_VERSION = 2
+
+
+class CachedStat(NamedTuple):
+    """The os.stat_result fields the scanner reads, rebuilt from a cached fingerprint."""
+    st_size: int
+    st_mtime_ns: int
+    st_ino: int
+    st_mtime: float
+    st_dev: int
+    st_mode: int = stat.S_IFREG
+
+    @classmethod
+    def from_fingerprint(cls, values: Optional[List[Any]]) -> Optional["CachedStat"]:
+        """Return the stat of a fingerprint, or None for None or a malformed entry."""
+        if not isinstance(values, list) or len(values) != 5:
+            return None
+        return cls(*values)
+
+
+def fingerprint(stats: os.stat_result) -> List[Any]:
+    """Return the JSON-friendly fingerprint of a file's stat result."""
+    return [stats.st_size, stats.st_mtime_ns, stats.st_ino, stats.st_mtime, stats.st_dev]
+
+
+class ScanCache:
+    """
+    Directory-listing cache for a single base folder.
+
+    Attributes:
+        base_folder: Base folder (containing .roo/) this cache describes
+        cache_path: JSON file the cache is loaded from and saved to
+        stat_files: If True (default), files in unchanged directories are stat'ed
+                    instead of being rebuilt from their cached fingerprints
+        hits: Number of directories served from the cache during the last scan
+        misses: Number of directories that had to be re-listed
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(
+        self,
+        base_folder: Union[str, Path],
+        cache_path: Optional[Union[str, Path]] = None,
+        stat_files: bool = True,
+    ):
+        """
+        Initialize an empty cache bound to a base folder and cache file.
+
+        Args:
+            base_folder: Base folder (containing .roo/) the cache describes
+            cache_path: Path of the JSON cache file, or None for a cache that
+                        only lives in memory (e.g. for repeated change polling)
+            stat_files: If False, trust cached file stats in unchanged directories
+        """
+        self.base_folder = str(base_folder)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.stat_files = stat_files
+        self.hits = 0
+        self.misses = 0
+        # Directory entries loaded from disk, keyed by .roo-relative prefix
+        self._dirs: Dict[str, Dict[str, Any]] = {}
+        # Directory entries recorded during the current scan
+        self._visited: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def for_folder(
+        cls,
+        base_folder: Union[str, Path],
+        state_dir: Optional[Union[str, Path]] = None,
+        stat_files: bool = True,
+    ) -> "ScanCache":
+        """
+        Create and load the cache for a base folder from the state directory.
+
+        Args:
+            base_folder: Base folder (containing .roo/)
+            state_dir: Optional override for the state directory
+            stat_files: If False, trust cached file stats in unchanged directories
+
+        Returns:
+            ScanCache with any previously saved entries loaded
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        cache_dir = file_path_utils.get_state_dir(state_dir) / "scan_cache"
+        key = file_path_utils.folder_state_key(base_folder)
+        cache = cls(base_folder, cache_dir / f"{key}.json", stat_files=stat_files)
+        cache.load()
+        return cache
+
+    def load(self) -> None:
+        """
+        Load cached directory entries from disk.
+
+        Missing, unreadable, foreign (other base folder) or outdated cache files
+        are treated as empty caches.
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        self._dirs = {}
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        if data.get("version") != CACHE_VERSION or data.get("base_folder") != self.base_folder:
+            return
+        dirs = data.get("dirs")
+        if isinstance(dirs, dict):
+            self._dirs = dirs
+
+    def lookup_dir(
+        self, rel_prefix: str, mtime_ns: int
+    ) -> Optional[Tuple[List[str], Dict[str, Optional[List[Any]]]]]:
+        """
+        Return the cached listing of a directory if its mtime is unchanged.
+
+        Args:
+            rel_prefix: .roo-relative prefix of the directory ("" for .roo itself,
+                        otherwise ending in "/")
+            mtime_ns: Current st_mtime_ns of the directory
+
+        Returns:
+            Tuple of (child directory names, {file name: fingerprint or None}) on a
+            hit, or None when the directory must be re-listed.
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        entry = self._dirs.get(rel_prefix)
+        if entry is None or entry.get("m") != mtime_ns:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.get("d", []), entry.get("f", {})
+
+    def record_dir(
+        self,
+        rel_prefix: str,
+        mtime_ns: int,
+        dir_names: List[str],
+        files: Dict[str, Optional[List[Any]]],
+    ) -> None:
+        """
+        Record the raw listing of a directory visited during the current scan.
+
+        Args:
+            rel_prefix: .roo-relative prefix of the directory
+            mtime_ns: st_mtime_ns of the directory at listing time
+            dir_names: Names of child directories (symlinks excluded)
+            files: Non-directory entry names mapped to their fingerprint()
+                   or None when the entry was not stat'ed as a regular file
+                   (ignored, or not a regular file)
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        self._visited[rel_prefix] = {"m": mtime_ns, "d": dir_names, "f": files}
+
+    def save(self) -> bool:
+        """
+        Replace the stored entries with those recorded during this scan and persist.
+
+        Directories not visited this scan (deleted or now ignored) are dropped. The
+        file is written via a temp file and os.replace, and only when it changed.
+        In-memory caches only swap in the new entries.
+
+        Returns:
+            True if the cache file was written, False if unchanged, in-memory or on error.
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        visited, self._visited = self._visited, {}
+        if visited == self._dirs:
+            return False
+        self._dirs = visited
+        if self.cache_path is None:
+            return False
+        payload = {
+            "version": CACHE_VERSION,
+            "base_folder": self.base_folder,
+            "dirs": visited,
+        }
+        temp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as fh:
+                json.dump(payload, fh, separators=(",", ":"))
+            os.replace(temp_path, self.cache_path)
+            return True
+        except OSError:
+            # The cache is an optimization only; never fail a scan because of it
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return False
@@ -0,0 +1,69 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Cooperative cancellation and pause for sync operations.
+
+A SyncControl is created per job and passed to SyncEngine.scan_folders(),
+plan_actions() and execute_actions(). The engine calls checkpoint() between
+directories, file groups and actions:
+
+- while paused, checkpoint() blocks, so a resumed job continues exactly where
+  it stopped (e.g. at the next action);
+- once cancelled, checkpoint() raises SyncCancelled. Scanning and planning let
+  it propagate; execute_actions() catches it and emits a CANCELLED event that
+  summarizes the actions still pending.
+
+cancel(), pause() and resume() are thread-safe and meant to be called from the
+GUI/CLI thread while the job runs elsewhere.
+"""
+import threading
+
+
+class SyncCancelled(Exception):
+    """Raised at a checkpoint after SyncControl.cancel() was called."""
+
+
+class SyncControl:
+    """Cancellation and pause token shared between a job and its controller."""
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        # Set while running, cleared while paused
+        self._running = threading.Event()
+        self._running.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """True once cancel() was called."""
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        """True while the job is paused."""
+        return not self._running.is_set()
+
+    def cancel(self) -> None:
+        """Request cancellation; also releases a paused job so it can stop."""
+        self._cancelled.set()
+        self._running.set()
+
+    def pause(self) -> None:
+        """Hold the job at its next checkpoint."""
+        if not self._cancelled.is_set():
+            self._running.clear()
+
+    def resume(self) -> None:
+        """Let a paused job continue."""
+        self._running.set()
+
+    def checkpoint(self) -> None:
+        """
+        Block while paused, then raise if cancelled.
+
+        Raises:
+            SyncCancelled: If cancel() has been called
+        """
+        if not self._running.is_set():
+            self._running.wait()
+        if self._cancelled.is_set():
+            raise SyncCancelled()
@@ -7,15 +7,56 @@ process through three main phases: scanning folders, planning actions, and
 executing those actions. Progress events are emitted throughout for monitoring.
 """
 import datetime
+import functools
 import os
 import queue
-import shutil
+import stat
+import tempfile
+import threading
+import time
 from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterable, Iterator, List, Any, NamedTuple, Optional, Set, Tuple, Union
 
 from . import file_path_utils
+from .columnar_index import NUMPY_AVAILABLE, ColumnarIndex, plan_columnar
+from .copy_backend import COPY_BACKENDS, LINK_MODES, CopyBackend
+from .delta_copy import DELTA_MIN_BYTES, DeltaStats, delta_copy
+from .durability import DEFAULT_BATCH_SIZE, WriteBatch
+from .backup_catalog import BackupCatalog
+from .backup_store import BackupStore
+from .hash_cache import DEFAULT_MAX_ENTRIES, Fingerprint, HashCache
+from .ignore_rules import SYNCIGNORE_NAME, IgnoreRules, Scope, TrieNode, check_scopes
 from .progress_events import EventType, ProgressEvent
+from .scan_cache import CachedStat, ScanCache, fingerprint
+from .sync_control import SyncCancelled, SyncControl
+from .sync_journal import SyncJournal
+from .sync_plan import SyncPlan, folder_key
+from .sync_stats import NULL_STATS, SyncStats
+
+# Prefix of the engine's own working files next to destinations (copy temp files
+# and the `.link` files of hardlink mode); scans never index them
+WORKING_FILE_PREFIX = ".tmp_"
+
+
+class _WalkFrame(NamedTuple):
+    """A directory pending in a .roo walk, with the ignore state carried into it."""
+    dir_path: str
+    rel_prefix: str
+    node: Optional[TrieNode]
+    scopes: List[Scope]
+
+
+def _stats_phase(name: str, new_run: bool = False):
+    """Time a SyncEngine method as a phase of engine.stats; new_run starts a fresh run."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self._begin_stats(new_run).phase(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
 
 
 class SyncEngine:
@@ -31,6 +72,10 @@ class SyncEngine:
     Attributes:
         config: Configuration dictionary containing sync settings
         event_queue: Thread-safe queue for emitting ProgressEvent instances
+        last_run_stats: Statistics of the last execute_actions() call, e.g.
+                        {"copy_backends": {"copy_file_range": 12}}
+        stats: Timings and counters of the current run (see utils_sync.sync_stats);
+               NULL_STATS unless `collect_stats` is enabled
     """
     
     def __init__(self, config: Dict[str, Any], event_queue: queue.Queue):
@@ -44,159 +89,756 @@ class SyncEngine:
         """
         self.config = config
         self.event_queue = event_queue
+        # Compiled ignore rules keyed by the ignore_patterns they were built from
+        self._ignore_rules_cache: Optional[Tuple[Tuple[str, ...], IgnoreRules]] = None
+        # Compiled .syncignore rules keyed by path -> ((size, mtime_ns), rules)
+        self._syncignore_cache: Dict[str, Tuple[Tuple[int, int], Optional[IgnoreRules]]] = {}
+        # Persistent content-hash cache, loaded on first content-aware plan
+        self._hash_cache: Optional[HashCache] = None
+        # Copy backend (with its per-device probe results) for the configured copy_backend
+        self._copy_backend: Optional[CopyBackend] = None
+        self._copy_backend_key: Optional[Tuple[str, str]] = None
+        # Content-addressed store for backup_mode=store, created on first backup
+        self._backup_store: Optional[BackupStore] = None
+        # Per-folder catalogs of timestamped backups, keyed by str(base folder)
+        self._backup_catalogs: Dict[str, BackupCatalog] = {}
+        self._catalog_lock = threading.Lock()
+        self._cataloged_folders: Set[str] = set()
+        self.last_run_stats: Dict[str, Any] = {}
+        self.stats: SyncStats = NULL_STATS
+        # Batched event mode: per-folder scanned-file counts and last SCAN_PROGRESS time
+        self._progress_lock = threading.Lock()
+        self._scan_counts: Dict[str, int] = {}
+        self._progress_emitted: Dict[str, float] = {}
     
-    def scan_folders(self, folders: List[Path]) -> Dict[str, List[Dict[str, Any]]]:
-        # [Modified] by google/gemini-2.5-pro | 2025-11-13_02
+    @_stats_phase("scan", new_run=True)
+    def scan_folders(
+        self,
+        folders: List[Path],
+        control: Optional[SyncControl] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        # [Modified] by [LLM model] | 2026-10-18_03
         """
         Scan folders to build a file index.
         
         Recursively scans the .roo/ subdirectory within each provided folder,
         collecting file metadata and building an index keyed by relative paths.
         
+        With `scan_workers` > 1 in config, folders are walked concurrently on a
+        bounded thread pool (and, with `scan_split_subdirs`, each top-level .roo
+        subdirectory becomes its own task). Results are merged in folder order, so
+        the index has the same shape and entry order as a sequential scan.
+        
         Args:
             folders: List of folder paths to scan
+            control: Optional SyncControl, checked before each directory is listed
+        
+        With `columnar_index` enabled and NumPy installed, a ColumnarIndex is
+        returned instead: the same mapping, stored as packed columns, which
+        plan_actions() plans with vectorized operations.
         
         Returns:
             Dictionary mapping relative paths (within .roo) to lists of file metadata dicts.
-            Each file dict contains: path, mtime, size, base_folder
+            Each file dict contains: path, mtime, mtime_ns, size, inode, device, base_folder
+        
+        Raises:
+            SyncCancelled: If control was cancelled during the scan
         """
         # Emit scan start event
         self._emit_event(EventType.SCAN_START, message="Starting folder scan")
+        self._reset_scan_progress()
         
-        # Initialize file index - maps relative paths to list of file metadata
-        file_index: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        # Compiled ignore rules are cached on the engine per ignore_patterns value
+        ignore_rules = self._get_ignore_rules()
         
-        # Get ignore patterns from config and categorize them.
-        # We support three kinds of ignore rules:
-        # - Simple names (".git", "__pycache__"): skip any path component with that name.
-        # - .roo-scoped folder paths (".roo/docs", ".roo/docs/"): skip everything under that folder.
-        # - .roo-scoped file paths (".roo/commands/run-sync.md"): skip exactly that file.
-        raw_ignore_patterns = self.config.get("ignore_patterns", [])
-        name_ignores = set()
-        folder_path_ignores = set()
-        file_path_ignores = set()
-        
-        for pattern in raw_ignore_patterns:
-            if not pattern:
-                continue
-            norm = str(pattern).replace("\\", "/").strip()
-            
-            # Treat .roo-prefixed patterns as paths relative to the .roo/ directory
-            if norm.startswith(".roo/"):
-                rel = norm[len(".roo/"):].rstrip("/")
-                if not rel:
+        workers = self._config_int("scan_workers", 1)
+        split_subdirs = bool(self.config.get("scan_split_subdirs", False))
+        
+        if workers > 1 and (len(folders) > 1 or split_subdirs):
+            partials = self._scan_folders_concurrent(
+                folders, ignore_rules, workers, split_subdirs, control
+            )
+        else:
+            partials = [
+                [self._scan_folder(folder, ignore_rules, control=control)[0]] for folder in folders
+            ]
+        
+        # Initialize file index - maps relative paths to list of file metadata.
+        # Merging per folder, in folder order, keeps entry order deterministic.
+        file_index = self._new_file_index()
+        for folder_partials in partials:
+            for partial in folder_partials:
+                if isinstance(file_index, ColumnarIndex):
+                    file_index.extend(partial)
                     continue
-                last_seg = rel.split("/")[-1]
-                # Heuristic: if the last segment contains a dot, treat as a file; otherwise a folder
-                if "." in last_seg:
-                    file_path_ignores.add(rel)
-                else:
-                    folder_path_ignores.add(rel)
-            else:
-                # Backwards-compatible behavior for simple names like ".git" or "__pycache__"
-                if "/" in norm:
-                    # For non-.roo paths with slashes, fall back to matching on the last component
-                    last_seg = norm.rstrip("/").split("/")[-1]
-                    if last_seg:
-                        name_ignores.add(last_seg)
-                else:
-                    name_ignores.add(norm)
+                for relative_path, entries in partial.items():
+                    file_index[relative_path].extend(entries)
         
-        # Scan each folder
-        for folder in folders:
-            # Validate folder contains .roo directory
-            if not file_path_utils.has_roo_dir(folder):
-                self._emit_event(
-                    EventType.ERROR,
-                    folder=str(folder),
-                    message=f"Folder does not contain .roo directory: {folder}"
+        self._flush_scan_progress()
+        return file_index
+    
+    def _scan_folder(
+        self,
+        folder: Path,
+        ignore_rules: IgnoreRules,
+        split_subdirs: bool = False,
+        control: Optional[SyncControl] = None,
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], List["_WalkFrame"], Optional[ScanCache]]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Scan a single base folder into its own partial index.
+        
+        Args:
+            folder: Base folder to scan
+            ignore_rules: Compiled rules from _get_ignore_rules()
+            split_subdirs: If True, top-level .roo subdirectories are not walked but
+                           returned so the caller can scan them as separate tasks
+            control: Optional SyncControl checked during the walk
+        
+        Returns:
+            Tuple of (partial index, deferred walk frames, scan cache or None). A cache is returned only when subdirectories were
+            deferred; the caller must save it once they have all been walked.
+        """
+        partial = self._new_file_index()
+        
+        # Validate folder contains .roo directory
+        if not file_path_utils.has_roo_dir(folder):
+            self._emit_event(
+                EventType.ERROR,
+                folder=str(folder),
+                message=f"Folder does not contain .roo directory: {folder}"
+            )
+            return partial, [], None
+        
+        self._emit_event(
+            EventType.SCAN_START,
+            folder=str(folder),
+            message=f"Scanning folder: {folder}"
+        )
+        
+        # Optional persistent cache of directory listings for repeat scans
+        cache = None
+        if self.config.get("scan_cache", False):
+            cache = ScanCache.for_folder(
+                folder, self.config.get("state_dir"),
+                stat_files=self.config.get("scan_cache_stat_files", True),
+            )
+        
+        # Walk the .roo subdirectory, pruning ignored subtrees before entering them
+        deferred = self._walk_roo_tree(
+            folder,
+            ignore_rules,
+            partial,
+            cache=cache,
+            split_top_level=split_subdirs,
+            control=control,
+        )
+        if cache is not None and not deferred:
+            cache.save()
+        
+        # After scanning .roo, attempt to include root-level allowlisted files
+        self._scan_root_allowlist(folder, partial)
+        
+        # Only hand the cache back when the caller still has to save it
+        return partial, deferred, cache if deferred else None
+    
+    def _scan_folders_concurrent(
+        self,
+        folders: List[Path],
+        ignore_rules: IgnoreRules,
+        workers: int,
+        split_subdirs: bool,
+        control: Optional[SyncControl] = None,
+    ) -> List[List[Dict[str, List[Dict[str, Any]]]]]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Scan folders on a bounded thread pool.
+        
+        Each folder is one task. With split_subdirs, a folder task only lists the top
+        level of .roo and the coordinator (this thread) submits one task per deferred
+        subdirectory, so no worker ever blocks waiting on another task.
+        
+        Args:
+            folders: Base folders to scan
+            ignore_rules: Compiled rules from _get_ignore_rules()
+            workers: Maximum number of concurrent scan threads
+            split_subdirs: Scan top-level .roo subdirectories as separate tasks
+            control: Optional SyncControl checked by every task
+        
+        Returns:
+            One list of partial indexes per folder, in folder order.
+        """
+        partials: List[List[Dict[str, List[Dict[str, Any]]]]] = [[] for _ in folders]
+        outstanding = [0] * len(folders)
+        caches: List[Optional[ScanCache]] = [None] * len(folders)
+        
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sync-scan")
+        try:
+            pending = {}
+            for idx, folder in enumerate(folders):
+                future = pool.submit(
+                    self._scan_folder, folder, ignore_rules, split_subdirs, control
                 )
-                continue
+                pending[future] = (idx, True)
+                outstanding[idx] += 1
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx, is_folder_task = pending.pop(future)
+                    outstanding[idx] -= 1
+                    if is_folder_task:
+                        partial, deferred, caches[idx] = future.result()
+                        for frame in deferred:
+                            sub_index = self._new_file_index()
+                            sub_future = pool.submit(
+                                self._walk_roo_tree,
+                                folders[idx],
+                                ignore_rules,
+                                sub_index,
+                                cache=caches[idx],
+                                start=frame,
+                                control=control,
+                            )
+                            pending[sub_future] = (idx, False)
+                            outstanding[idx] += 1
+                            partials[idx].append(sub_index)
+                        partials[idx].insert(0, partial)
+                    else:
+                        # Subtree walks fill their index in place; surface errors
+                        future.result()
+                    
+                    # Persist the folder's cache once all of its tasks have finished
+                    if outstanding[idx] == 0 and caches[idx] is not None:
+                        caches[idx].save()
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+        pool.shutdown(wait=True)
+        
+        return partials
+    
+    def _begin_stats(self, new_run: bool = False) -> SyncStats:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Return the collector for the current run, starting a new one if asked or needed."""
+        if not self.config.get("collect_stats", False):
+            self.stats = NULL_STATS
+        elif new_run or not self.stats.enabled:
+            self.stats = SyncStats()
+        return self.stats
+    
+    def _new_file_index(self) -> Union[Dict[str, List[Dict[str, Any]]], ColumnarIndex]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Return an empty index for scan_folders(): columnar if enabled and NumPy is installed."""
+        if NUMPY_AVAILABLE and self.config.get("columnar_index", False):
+            return ColumnarIndex()
+        return defaultdict(list)
+    
+    def _config_int(self, key: str, default: int) -> int:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Read a positive integer setting from config, falling back to default.
+        
+        Args:
+            key: Config key to read
+            default: Value used when the key is missing or invalid
+        
+        Returns:
+            Positive integer value
+        """
+        try:
+            value = int(self.config.get(key, default))
+        except (TypeError, ValueError):
+            return default
+        return value if value > 0 else default
+    
+    def _get_ignore_rules(self) -> IgnoreRules:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_02
+        """
+        Return compiled ignore rules for the current `ignore_patterns` config value.
+        
+        Rules are compiled once and cached on the engine; they are rebuilt only when
+        the configured pattern list changes (e.g. after saving Settings in the GUI).
+        
+        Returns:
+            IgnoreRules for the .roo scope
+        """
+        patterns = tuple(self.config.get("ignore_patterns", []) or [])
+        cached = self._ignore_rules_cache
+        if cached is None or cached[0] != patterns:
+            cached = (patterns, IgnoreRules.from_config(patterns))
+            self._ignore_rules_cache = cached
+        return cached[1]
+    
+    def _load_syncignore(self, path: str, stats: os.stat_result) -> Optional[IgnoreRules]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Load and compile a .syncignore file, reusing the compiled rules while the
+        file's size and mtime are unchanged.
+        
+        Args:
+            path: Path of the .syncignore file
+            stats: Current stat result of the file
+        
+        Returns:
+            Compiled rules, or None if the file is empty or unreadable
+        """
+        key = (stats.st_size, stats.st_mtime_ns)
+        cached = self._syncignore_cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as fh:
+                rules = IgnoreRules.from_syncignore(fh)
+        except OSError:
+            return None
+        compiled = None if rules.is_empty() else rules
+        self._syncignore_cache[path] = (key, compiled)
+        return compiled
+    
+    def _walk_roo_tree(
+        self,
+        folder: Path,
+        ignore_rules: IgnoreRules,
+        file_index: Dict[str, List[Dict[str, Any]]],
+        cache: Optional[ScanCache] = None,
+        start: Optional["_WalkFrame"] = None,
+        split_top_level: bool = False,
+        emit_events: bool = True,
+        control: Optional[SyncControl] = None,
+    ) -> List["_WalkFrame"]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_04
+        """
+        Walk <folder>/.roo with os.scandir and append surviving files to file_index.
+        
+        Ignore rules are applied to each directory entry before it is entered, so an
+        ignored subtree (e.g. "node_modules" or ".roo/docs") costs no syscalls beyond
+        the listing of its parent. The .roo-relative key and the folder-rule trie
+        node are carried down while descending, and file metadata comes from the
+        DirEntry stat cache, so each indexed file costs at most one stat call.
+        
+        A `.syncignore` file in any directory adds rules for that directory and
+        everything below it (see utils_sync.ignore_rules). The engine's own working
+        files (WORKING_FILE_PREFIX) are skipped like ignored entries.
+        
+        When a ScanCache is given, each directory is stat'ed first. A directory whose
+        mtime is unchanged is not re-listed. Its files are still stat'ed, unless the
+        cache has stat_files=False: then they are indexed from their cached
+        fingerprints and the directory costs one stat in total (see
+        utils_sync.scan_cache for why in-place edits then go unseen).
+        
+        Like Path.rglob, symlinked directories are not descended into and unreadable
+        directories are skipped silently.
+        
+        Args:
+            folder: Base folder that contains the .roo directory
+            ignore_rules: Compiled rules from _get_ignore_rules()
+            file_index: Index to append file metadata to (mutated in place)
+            cache: Optional scan cache for this folder (updated in place)
+            start: Optional frame to walk instead of the whole .roo tree, used for
+                   per-subdirectory scan tasks
+            split_top_level: If True, subdirectories directly under the start
+                             directory are returned instead of being walked
+            emit_events: If False, no SCAN_FILE events are emitted and nothing is
+                         added to engine.stats (used by background change polling)
+            control: Optional SyncControl, checked before each directory
+        
+        Returns:
+            Deferred walk frames when split_top_level is set, otherwise an empty list.
+        """
+        folder_str = str(folder)
+        if start is None:
+            start = _WalkFrame(os.path.join(folder_str, ".roo"), "", ignore_rules.folders, [])
+        stack = [start]
+        deferred: List[_WalkFrame] = []
+        # Kept in locals and reported to engine.stats once per walk
+        walk_start = time.perf_counter()
+        dirs_listed = dirs_cached = visited = ignored_count = stat_calls = indexed = 0
+        
+        while stack:
+            if control is not None:
+                control.checkpoint()
+            dir_path, rel_prefix, node, scopes = stack.pop()
             
-            # Define scan root as .roo subdirectory
-            scan_root = folder.joinpath(".roo")
+            # Children as (name, is_dir, DirEntry or None when served from cache)
+            children: List[Tuple[str, bool, Optional[os.DirEntry]]] = []
+            dir_mtime_ns = 0
+            listing = None
+            cached_files: Dict[str, Optional[List[Any]]] = {}
+            if cache is not None:
+                stat_calls += 1
+                try:
+                    dir_mtime_ns = os.stat(dir_path).st_mtime_ns
+                except OSError:
+                    continue
+                listing = cache.lookup_dir(rel_prefix, dir_mtime_ns)
             
-            # Recursively scan all files in .roo directory
-            for item_path in scan_root.rglob("*"):
-                # Compute .roo-relative path once for all ignore checks
-                relative_path_roo = item_path.relative_to(scan_root)
-                relative_str = relative_path_roo.as_posix()
-                relative_parts = relative_path_roo.parts
-                
-                # 1) Simple name ignores: match any component (e.g., ".git", "__pycache__")
-                if any(part in name_ignores for part in relative_parts):
+            if listing is not None:
+                dirs_cached += 1
+                cached_dirs, cached_files = listing
+                children.extend((name, True, None) for name in cached_dirs)
+                children.extend((name, False, None) for name in cached_files)
+                if cache.stat_files:
+                    cached_files = {}
+            else:
+                dirs_listed += 1
+                try:
+                    with os.scandir(dir_path) as it:
+                        for entry in it:
+                            try:
+                                is_dir = entry.is_dir(follow_symlinks=False)
+                            except OSError:
+                                is_dir = False
+                            children.append((entry.name, is_dir, entry))
+                except OSError:
+                    # Match rglob(): unreadable directories are skipped
                     continue
+            visited += len(children)
+            
+            # Raw listing recorded for the cache, independent of ignore rules
+            dir_names: List[str] = []
+            file_fingerprints: Dict[str, Optional[List[Any]]] = {}
+            
+            # A .syncignore in this directory applies to all of its entries
+            for name, is_dir, entry in children:
+                if name == SYNCIGNORE_NAME and not is_dir:
+                    syncignore_path = os.path.join(dir_path, name)
+                    ignore_stats = CachedStat.from_fingerprint(cached_files.get(name))
+                    if ignore_stats is None:
+                        stat_calls += 1
+                        try:
+                            ignore_stats = entry.stat() if entry is not None else os.stat(syncignore_path)
+                        except OSError:
+                            break
+                        if not stat.S_ISREG(ignore_stats.st_mode):
+                            break
+                    file_fingerprints[name] = fingerprint(ignore_stats)
+                    local_rules = self._load_syncignore(syncignore_path, ignore_stats)
+                    if local_rules is not None:
+                        scopes = scopes + [(len(rel_prefix), local_rules, local_rules.folders)]
+                    break
+            
+            for name, is_dir, entry in children:
+                if is_dir:
+                    dir_names.append(name)
+                else:
+                    file_fingerprints.setdefault(name, None)
                 
-                # 2) .roo-scoped folder path ignores: match direct prefix under .roo
-                #    Example: ".roo/docs" ignores ".roo/docs" and everything beneath it,
-                #    but does not ignore unrelated ".../docs" directories elsewhere.
-                skip_for_folder = False
-                for folder_rel in folder_path_ignores:
-                    if relative_str == folder_rel or relative_str.startswith(folder_rel + "/"):
-                        skip_for_folder = True
-                        break
-                if skip_for_folder:
+                relative_str = rel_prefix + name
+                
+                # A working file left by an interrupted copy must never spread
+                if not is_dir and name.startswith(WORKING_FILE_PREFIX):
+                    ignored_count += 1
                     continue
                 
-                # 3) .roo-scoped file path ignores: match exact relative path under .roo
-                #    Example: ".roo/commands/run-sync.md" ignores only that one file.
-                if relative_str in file_path_ignores:
+                # Config rules: names, name globs, folder trie, file paths, path globs
+                ignored, child_node = ignore_rules.check_entry(name, relative_str, is_dir, node)
+                if ignored:
+                    ignored_count += 1
                     continue
+                child_scopes = scopes
+                if scopes:
+                    ignored, child_scopes = check_scopes(scopes, name, relative_str, is_dir)
+                    if ignored:
+                        ignored_count += 1
+                        continue
                 
-                # Process only files (skip directories)
-                if item_path.is_file():
-                    # Get file stats
-                    stats = item_path.stat()
-                    mtime = stats.st_mtime
-                    size = stats.st_size
-                    
-                    # Get relative path within .roo scope
-                    relative_path = file_path_utils.get_roo_relative_path(item_path, folder)
-                    
-                    # Emit scan file event
-                    self._emit_event(
-                        EventType.SCAN_FILE,
-                        folder=str(folder),
-                        file_path=str(relative_path),
-                        message=f"Scanning: {relative_path}"
+                if is_dir:
+                    child = _WalkFrame(
+                        os.path.join(dir_path, name), relative_str + "/", child_node, child_scopes
                     )
-                    
-                    # Add file metadata to index
-                    file_index[relative_path].append({
-                        "path": item_path,
-                        "mtime": mtime,
-                        "size": size,
-                        "base_folder": folder
-                    })
+                    if split_top_level and dir_path == start.dir_path:
+                        deferred.append(child)
+                    else:
+                        stack.append(child)
+                    continue
+                
+                # Process only files (skip sockets, dangling links, etc.). Files of
+                # an unchanged directory reuse their cached stat.
+                stats = CachedStat.from_fingerprint(cached_files.get(name))
+                if stats is None:
+                    stat_calls += 1
+                    try:
+                        if entry is not None:
+                            if not entry.is_file():
+                                continue
+                            stats = entry.stat()
+                        else:
+                            stats = os.stat(os.path.join(dir_path, name))
+                            if not stat.S_ISREG(stats.st_mode):
+                                continue
+                    except OSError:
+                        # Entry vanished or became unreadable between listing and stat
+                        continue
+                
+                file_fingerprints[name] = fingerprint(stats)
+                
+                indexed += 1
+                self._index_file(
+                    file_index, folder, relative_str, Path(os.path.join(dir_path, name)),
+                    stats, emit_events=emit_events
+                )
             
-            # After scanning .roo, attempt to include root-level allowlisted files
-            root_allowlist = self.config.get("root_allowlist", [])
-            for allowlist_entry in root_allowlist:
-                candidate_path = folder / allowlist_entry
-                # Include only if: exists, is_file, not symlink
-                if (candidate_path.exists() and
-                    candidate_path.is_file() and
-                    not candidate_path.is_symlink()):
-                    stats = candidate_path.stat()
-                    # Use synthetic relative key = filename only
-                    synthetic_key = allowlist_entry
-                    self._emit_event(
-                        EventType.SCAN_FILE,
-                        folder=str(folder),
-                        file_path=synthetic_key,
-                        message=f"Scanning allowlisted root file: {synthetic_key}"
-                    )
-                    file_index[synthetic_key].append({
-                        "path": candidate_path,
-                        "mtime": stats.st_mtime,
-                        "size": stats.st_size,
-                        "base_folder": folder
-                    })
+            if cache is not None:
+                cache.record_dir(rel_prefix, dir_mtime_ns, dir_names, file_fingerprints)
+        
+        if emit_events:
+            self.stats.add_folder_scan(folder_str, time.perf_counter() - walk_start, indexed)
+            self.stats.add(
+                dirs_listed=dirs_listed, dirs_cached=dirs_cached, entries_visited=visited,
+                entries_ignored=ignored_count, stat_calls=stat_calls, files_indexed=indexed,
+            )
+        return deferred
+    
+    @_stats_phase("scan", new_run=True)
+    def scan_paths(
+        self,
+        folders: List[Path],
+        relative_paths: List[str],
+        control: Optional[SyncControl] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Build a file index covering only the given relative paths.
+        
+        Used for incremental (watch mode) syncs: instead of walking every .roo tree,
+        each relative path is looked up directly in every folder. A path naming a
+        directory is walked as a subtree. Ignore rules, including `.syncignore`
+        files in parent directories, apply exactly as in scan_folders(). Keys equal
+        to a root_allowlist entry refer to the root-level file.
+        
+        Pass the same folders to plan_actions(index, base_folders=folders) so that
+        folders missing a changed file are still detected.
+        
+        Args:
+            folders: List of folder paths to look in
+            relative_paths: Paths relative to .roo (or root allowlist keys)
+            control: Optional SyncControl, checked before each path
         
+        Returns:
+            File index in the same format as scan_folders()
+        
+        Raises:
+            SyncCancelled: If control was cancelled during the scan
+        """
+        ignore_rules = self._get_ignore_rules()
+        root_allowlist = set(self.config.get("root_allowlist", []))
+        
+        # A directory path already covers any path below it
+        requested = {p.replace("\\", "/").strip("/") for p in relative_paths}
+        paths: List[str] = []
+        for rel in sorted(requested):
+            if not rel or rel in root_allowlist:
+                paths.append(rel)
+                continue
+            parts = rel.split("/")
+            if any("/".join(parts[:idx]) in requested for idx in range(len(parts))):
+                continue
+            paths.append(rel)
+        
+        self._reset_scan_progress()
+        file_index: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for folder in folders:
+            if not file_path_utils.has_roo_dir(folder):
+                continue
+            for rel in paths:
+                if control is not None:
+                    control.checkpoint()
+                if rel in root_allowlist:
+                    self._scan_root_allowlist(folder, file_index, entries=[rel])
+                    continue
+                self._scan_roo_path(folder, rel, ignore_rules, file_index)
+        self._flush_scan_progress()
+        return file_index
+    
+    def index_folder(
+        self,
+        folder: Path,
+        cache: Optional[ScanCache] = None,
+        emit_events: bool = False,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Index one folder (.roo tree plus root allowlist) without any scan framing.
+        
+        Unlike scan_folders(), no SCAN_START events are emitted and, by default, no
+        SCAN_FILE events either, which suits repeated background polling.
+        
+        Args:
+            folder: Base folder containing .roo
+            cache: Optional scan cache, saved after the walk
+            emit_events: If True, emit SCAN_FILE events for indexed files
+        
+        Returns:
+            File index in the same format as scan_folders()
+        """
+        file_index: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._walk_roo_tree(
+            folder, self._get_ignore_rules(), file_index, cache=cache, emit_events=emit_events
+        )
+        if cache is not None:
+            cache.save()
+        self._scan_root_allowlist(folder, file_index, emit_events=emit_events)
         return file_index
     
-    def plan_actions(self, file_index: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
-        # [Modified] by openai/gpt-5.1 | 2025-11-16_01
+    def _scan_roo_path(
+        self,
+        folder: Path,
+        rel: str,
+        ignore_rules: IgnoreRules,
+        file_index: Dict[str, List[Dict[str, Any]]],
+    ) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Index one .roo-relative file, or walk one directory ("" for all of .roo)."""
+        frame: Optional[_WalkFrame] = _WalkFrame(
+            os.path.join(str(folder), ".roo"), "", ignore_rules.folders, []
+        )
+        if not rel:
+            self._walk_roo_tree(folder, ignore_rules, file_index, start=frame)
+            return
+        
+        # Descend to the target, applying every ancestor's rules and .syncignore
+        segments = rel.split("/")
+        for idx, name in enumerate(segments):
+            frame = self._with_syncignore(frame)
+            path = os.path.join(frame.dir_path, name)
+            try:
+                stats = os.lstat(path)
+            except OSError:
+                return
+            is_dir = stat.S_ISDIR(stats.st_mode)
+            last = idx == len(segments) - 1
+            if not last and not is_dir:
+                return
+            if not is_dir and name.startswith(WORKING_FILE_PREFIX):
+                return
+            relative_str = frame.rel_prefix + name
+            ignored, node = ignore_rules.check_entry(name, relative_str, is_dir, frame.node)
+            if ignored:
+                return
+            scopes = frame.scopes
+            if scopes:
+                ignored, scopes = check_scopes(scopes, name, relative_str, is_dir)
+                if ignored:
+                    return
+            if is_dir:
+                frame = _WalkFrame(path, relative_str + "/", node, scopes)
+                continue
+            # Follow a symlinked file like DirEntry.is_file() does during a walk
+            if stat.S_ISLNK(stats.st_mode):
+                try:
+                    stats = os.stat(path)
+                except OSError:
+                    return
+            if stat.S_ISREG(stats.st_mode):
+                self._index_file(file_index, folder, relative_str, Path(path), stats)
+            return
+        
+        self._walk_roo_tree(folder, ignore_rules, file_index, start=frame)
+    
+    def _with_syncignore(self, frame: "_WalkFrame") -> "_WalkFrame":
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Return frame with the scope of its directory's .syncignore added, if any."""
+        path = os.path.join(frame.dir_path, SYNCIGNORE_NAME)
+        try:
+            stats = os.stat(path)
+        except OSError:
+            return frame
+        if not stat.S_ISREG(stats.st_mode):
+            return frame
+        local_rules = self._load_syncignore(path, stats)
+        if local_rules is None:
+            return frame
+        return frame._replace(
+            scopes=frame.scopes + [(len(frame.rel_prefix), local_rules, local_rules.folders)]
+        )
+    
+    def _index_file(
+        self,
+        file_index: Dict[str, List[Dict[str, Any]]],
+        folder: Path,
+        relative_str: str,
+        path: Path,
+        stats: os.stat_result,
+        emit_events: bool = True,
+        message: Optional[str] = None,
+        root: bool = False,
+    ) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Emit a SCAN_FILE event for a file and append its metadata to file_index."""
+        if emit_events:
+            self._emit_event(
+                EventType.SCAN_FILE,
+                folder=str(folder),
+                file_path=relative_str,
+                message=message or f"Scanning: {relative_str}"
+            )
+        if isinstance(file_index, ColumnarIndex):
+            # Root-level allowlisted files live in the base folder, all others under .roo/
+            file_index.add_file(relative_str, folder, stats, root=root)
+            return
+        file_index[relative_str].append({
+            "path": path,
+            "mtime": stats.st_mtime,
+            "mtime_ns": stats.st_mtime_ns,
+            "size": stats.st_size,
+            "inode": stats.st_ino,
+            "device": stats.st_dev,
+            "base_folder": folder
+        })
+    
+    def _scan_root_allowlist(
+        self,
+        folder: Path,
+        file_index: Dict[str, List[Dict[str, Any]]],
+        entries: Optional[List[str]] = None,
+        emit_events: bool = True,
+    ) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Append root-level allowlisted files of a folder to file_index.
+        
+        Each candidate costs a single lstat: only regular files that are not
+        symlinks are included, under a synthetic key equal to the allowlist entry.
+        
+        Args:
+            folder: Base folder to check for allowlisted files
+            file_index: Index to append file metadata to (mutated in place)
+            entries: Optional subset of allowlist entries to check
+            emit_events: If False, no SCAN_FILE events are emitted
+        """
+        root_allowlist = self.config.get("root_allowlist", []) if entries is None else entries
+        indexed = 0
+        for allowlist_entry in root_allowlist:
+            candidate_path = folder / allowlist_entry
+            # Include only if: exists, is a regular file, not symlink
+            try:
+                stats = os.lstat(candidate_path)
+            except OSError:
+                continue
+            if not stat.S_ISREG(stats.st_mode):
+                continue
+            indexed += 1
+            # Use synthetic relative key = filename only
+            synthetic_key = allowlist_entry
+            self._index_file(
+                file_index, folder, synthetic_key, candidate_path, stats,
+                emit_events=emit_events,
+                message=f"Scanning allowlisted root file: {synthetic_key}",
+                root=True,
+            )
+        if emit_events and root_allowlist:
+            self.stats.add_folder_scan(str(folder), 0.0, indexed)
+            self.stats.add(stat_calls=len(root_allowlist), files_indexed=indexed)
+    
+    @_stats_phase("plan")
+    def plan_actions(
+        self,
+        file_index: Dict[str, List[Dict[str, Any]]],
+        base_folders: Optional[List[Path]] = None,
+        control: Optional[SyncControl] = None,
+    ) -> List[Dict[str, Any]]:
+        # [Modified] by [LLM model] | 2026-10-18_01
         """
         Plan copy actions based on file index.
         
@@ -204,20 +846,35 @@ class SyncEngine:
         to be synchronized. Uses modification time (mtime) to determine the source
         file (most recently modified) and identifies destinations that need updating.
         
+        With `content_check` enabled in config, an existing destination that is
+        older than the source is only updated if its content differs: sizes are
+        compared first, then a partial hash, then a full hash. Hashes come from a
+        persistent cache keyed by (device, inode, size, mtime_ns), so unchanged
+        files are never re-hashed. Dropped actions are reported as SKIP events.
+        
         In addition to updating existing peers, this method will also plan copy
         actions for folders that are missing a given file (including root-level
         allowlisted files such as ".roomodes") so that new files are created
         where needed.
         
+        A ColumnarIndex (see `columnar_index`) is planned with vectorized
+        operations over all keys at once; the actions are the same.
+        
         Args:
             file_index: File index from scan_folders(), mapping relative paths to
                         lists of file metadata dictionaries.
+            base_folders: Optional list of all folders taking part in the sync.
+                          Needed when file_index only covers some paths (see
+                          scan_paths()); by default the folders seen in the index
+                          are used.
+            control: Optional SyncControl, checked before each relative path
         
         Returns:
             List of action dictionaries. Each action contains:
             - action: 'copy'
             - source_path: Path object of the source file
             - destination_path: Path object of the destination file
+            - destination_folder: Base folder the destination file belongs to
             - relative_path: Relative path within .roo directory or synthetic key
             - source_mtime: Modification time of source file
             - destination_mtime: Modification time of destination file (or None
@@ -225,9 +882,19 @@ class SyncEngine:
         """
         actions: List[Dict[str, Any]] = []
         
+        # Optional content-aware planning backed by the persistent hash cache
+        hash_cache = self._get_hash_cache() if self.config.get("content_check", False) else None
+        
+        if isinstance(file_index, ColumnarIndex):
+            actions = self._plan_columnar(file_index, base_folders, control, hash_cache)
+            if hash_cache is not None:
+                hash_cache.save()
+            self.stats.add(paths_planned=len(file_index), actions_planned=len(actions))
+            return actions
+        
         # Collect all base folders that participated in the scan. This lets us
         # create actions for folders that are missing a given file entirely.
-        all_base_folders = set()
+        all_base_folders = set(base_folders or [])
         for group in file_index.values():
             for meta in group:
                 base_folder = meta.get("base_folder")
@@ -236,6 +903,8 @@ class SyncEngine:
         
         # Iterate through each file group in the index
         for relative_path, file_group in file_index.items():
+            if control is not None:
+                control.checkpoint()
             # Skip if only one file exists and there are no other folders to sync to
             if len(file_group) <= 1 and len(all_base_folders) <= 1:
                 continue
@@ -255,12 +924,25 @@ class SyncEngine:
             
             # Create copy actions for existing destinations that need updating
             for dest_file in destination_files:
+                # Peers hard-linked to the source (link_mode=hardlink) are the same file
+                if self._same_inode(source_file, dest_file):
+                    continue
                 # Only create action if source is newer than destination
                 if source_file["mtime"] > dest_file["mtime"]:
+                    # Skip peers whose bytes already match (e.g. after a touch or checkout)
+                    if hash_cache is not None and self._same_content(source_file, dest_file, hash_cache):
+                        self.stats.add(content_matches=1)
+                        self._emit_event(
+                            EventType.SKIP,
+                            file_path=str(relative_path),
+                            message=f"Content identical, skipping copy: {dest_file['path']}"
+                        )
+                        continue
                     action = {
                         "action": "copy",
                         "source_path": source_file["path"],
                         "destination_path": dest_file["path"],
+                        "destination_folder": dest_file.get("base_folder"),
                         "relative_path": relative_path,
                         "source_mtime": source_file["mtime"],
                         "destination_mtime": dest_file["mtime"],
@@ -270,20 +952,24 @@ class SyncEngine:
             # Create copy actions for folders that are missing this file entirely.
             # This applies both to .roo-relative paths and root-level allowlisted
             # files (which use a synthetic key such as ".roomodes").
+            # Root-level allowlisted files live directly in their base folder;
+            # everything else (including top-level .roo files) lives under .roo/.
+            source_is_root = (
+                "/" not in str(relative_path)
+                and Path(source_file["path"]).parent == Path(source_file["base_folder"])
+            )
             for base_folder in missing_base_folders:
-                # Determine destination path:
-                # - If the relative path contains a '/', treat it as under .roo/.
-                # - Otherwise, treat it as a root-level allowlisted file.
                 rel_str = str(relative_path)
-                if "/" in rel_str:
-                    destination_path = base_folder / ".roo" / Path(rel_str)
-                else:
+                if source_is_root:
                     destination_path = base_folder / rel_str
+                else:
+                    destination_path = base_folder / ".roo" / Path(rel_str)
                 
                 action = {
                     "action": "copy",
                     "source_path": source_file["path"],
                     "destination_path": destination_path,
+                    "destination_folder": base_folder,
                     "relative_path": relative_path,
                     "source_mtime": source_file["mtime"],
                     # Destination did not previously exist in the index
@@ -291,77 +977,913 @@ class SyncEngine:
                 }
                 actions.append(action)
         
+        if hash_cache is not None:
+            hash_cache.save()
+        
+        self.stats.add(paths_planned=len(file_index), actions_planned=len(actions))
+        return actions
+    
+    def _plan_columnar(
+        self,
+        file_index: ColumnarIndex,
+        base_folders: Optional[List[Path]],
+        control: Optional[SyncControl],
+        hash_cache: Optional[HashCache],
+    ) -> List[Dict[str, Any]]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Build plan_actions() output for a ColumnarIndex from plan_columnar() steps.
+        
+        Only files that get an action are materialized as dicts. Content checks
+        still run per candidate peer, as in the dict planner.
+        """
+        plan = plan_columnar(file_index, base_folders)
+        actions: List[Dict[str, Any]] = []
+        current_key = -1
+        source_file: Dict[str, Any] = {}
+        relative_path = ""
+        source_is_root = False
+        for key_id, kind, arg in zip(plan.keys.tolist(), plan.kinds.tolist(), plan.args.tolist()):
+            if key_id != current_key:
+                if control is not None:
+                    control.checkpoint()
+                current_key = key_id
+                relative_path = file_index.relative_paths[key_id]
+                source_row = int(plan.sources[key_id])
+                source_file = file_index.entry(source_row)
+                source_is_root = "/" not in relative_path and file_index.is_root(source_row)
+            
+            if kind == 0:
+                dest_file = file_index.entry(arg)
+                if hash_cache is not None and self._same_content(source_file, dest_file, hash_cache):
+                    self.stats.add(content_matches=1)
+                    self._emit_event(
+                        EventType.SKIP,
+                        file_path=relative_path,
+                        message=f"Content identical, skipping copy: {dest_file['path']}"
+                    )
+                    continue
+                destination_path = dest_file["path"]
+                base_folder = dest_file["base_folder"]
+                destination_mtime = dest_file["mtime"]
+            else:
+                base_folder = plan.folders[arg]
+                if source_is_root:
+                    destination_path = base_folder / relative_path
+                else:
+                    destination_path = base_folder / ".roo" / Path(relative_path)
+                destination_mtime = None
+            
+            actions.append({
+                "action": "copy",
+                "source_path": source_file["path"],
+                "destination_path": destination_path,
+                "destination_folder": base_folder,
+                "relative_path": relative_path,
+                "source_mtime": source_file["mtime"],
+                "destination_mtime": destination_mtime,
+            })
         return actions
     
-    def execute_actions(self, actions: List[Dict[str, Any]]) -> None:
+    @staticmethod
+    def _same_inode(first: Dict[str, Any], second: Dict[str, Any]) -> bool:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Return True if two indexed files are links to one inode (always in sync)."""
+        inode = first.get("inode")
+        return (
+            bool(inode)
+            and inode == second.get("inode")
+            and first.get("device") == second.get("device")
+        )
+    
+    def _get_hash_cache(self) -> HashCache:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Return the engine's persistent hash cache, loading it on first use.
+        
+        Returns:
+            HashCache stored under the configured state directory
+        """
+        if self._hash_cache is None:
+            self._hash_cache = HashCache.for_state_dir(
+                self.config.get("state_dir"),
+                self._config_int("hash_cache_max_entries", DEFAULT_MAX_ENTRIES),
+            )
+        return self._hash_cache
+    
+    def _same_content(
+        self,
+        source_file: Dict[str, Any],
+        dest_file: Dict[str, Any],
+        hash_cache: HashCache,
+    ) -> bool:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Return True if two indexed files have identical content.
+        
+        Checks size first, then the cached partial hash, then the cached full hash.
+        Any read error is treated as "different" so the copy still happens.
+        
+        Args:
+            source_file: Index entry of the planned source
+            dest_file: Index entry of the existing destination
+            hash_cache: Cache used to look up or compute digests
+        
+        Returns:
+            True if the destination already holds the source's bytes
+        """
+        if source_file["size"] != dest_file["size"]:
+            return False
+        if source_file["size"] == 0:
+            return True
+        source_fp = Fingerprint.from_index_entry(source_file)
+        dest_fp = Fingerprint.from_index_entry(dest_file)
+        try:
+            if (hash_cache.partial_hash(source_file["path"], source_fp)
+                    != hash_cache.partial_hash(dest_file["path"], dest_fp)):
+                return False
+            return (hash_cache.full_hash(source_file["path"], source_fp)
+                    == hash_cache.full_hash(dest_file["path"], dest_fp))
+        except OSError:
+            return False
+    
+    def backup_catalog(self, base_folder: Union[str, Path]) -> BackupCatalog:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Return the catalog of timestamped backups under a base folder.
+        
+        Catalogs are cached per folder, so the GUI and execute_actions() share
+        one in-memory view.
+        
+        Args:
+            base_folder: Base folder (containing .roo/)
+        """
+        key = str(base_folder)
+        with self._catalog_lock:
+            catalog = self._backup_catalogs.get(key)
+            if catalog is None:
+                catalog = BackupCatalog.for_folder(base_folder, self.config.get("state_dir"))
+                self._backup_catalogs[key] = catalog
+            return catalog
+    
+    def _record_backup(self, action: Dict[str, Any], backup_path: Path) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Add a backup just created for action to its destination folder's catalog."""
+        folder = action.get("destination_folder")
+        if folder is None:
+            return
+        try:
+            self.backup_catalog(folder).record(backup_path, action["destination_path"])
+        except OSError:
+            # The backup itself exists; only its listing is lost
+            return
+        with self._catalog_lock:
+            self._cataloged_folders.add(str(folder))
+    
+    def apply_backup_retention(self, folders: Optional[List[Union[str, Path]]] = None) -> int:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Delete backups outside the configured retention policies.
+        
+        Policies (0 = off): backup_keep_last per file, backup_max_age_days, and
+        backup_max_total_bytes per folder for `.bak` files and for the whole
+        backup store. Once this engine has used the backup store, its versions
+        are pruned as well, and objects no kept version refers to are deleted.
+        
+        Args:
+            folders: Base folders whose cataloged backups are pruned; defaults
+                     to the folders that got a backup since the last call
+        
+        Returns:
+            Number of backup files and store versions deleted
+        """
+        keep_last = self._config_int("backup_keep_last", 0)
+        max_age_days = self._config_int("backup_max_age_days", 0)
+        max_total_bytes = self._config_int("backup_max_total_bytes", 0)
+        with self._catalog_lock:
+            if folders is None:
+                folders = sorted(self._cataloged_folders)
+            self._cataloged_folders.clear()
+        if not (keep_last or max_age_days or max_total_bytes):
+            return 0
+        deleted = 0
+        for folder in folders:
+            count, errors = self.backup_catalog(folder).apply_retention(
+                keep_last, max_age_days, max_total_bytes
+            )
+            deleted += count
+            for error in errors:
+                self._emit_event(EventType.ERROR, message=f"Error deleting old backup: {error}")
+        if self._backup_store is not None:
+            count, errors = self._backup_store.apply_retention(keep_last, max_age_days, max_total_bytes)
+            deleted += count
+            for error in errors:
+                self._emit_event(EventType.ERROR, message=f"Error deleting old backup: {error}")
+        return deleted
+    
+    def delete_backups(self, base_folder: Union[str, Path]) -> Tuple[int, List[str]]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Delete every backup of the files under a base folder.
+
+        Removes the cataloged `.bak` files and drops the folder's versions from
+        the backup store, whose objects are deleted once no version refers to them.
+
+        Args:
+            base_folder: Base folder (containing .roo/)
+
+        Returns:
+            (number of backups deleted, error messages for those that could not be)
+        """
+        catalog = self.backup_catalog(base_folder)
+        deleted, errors = catalog.delete(catalog.entries())
+        dropped, failed = self._get_backup_store().delete_versions([base_folder])
+        return deleted + dropped, errors + failed
+
+    def _get_backup_store(self) -> BackupStore:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Return the backup store used by backup_mode=store, creating it on first use.
+        
+        The store shares the engine's hash cache, so versions hashed while
+        planning are not read again to find their key.
+        """
+        if self._backup_store is None:
+            self._backup_store = BackupStore.for_state_dir(
+                self._get_hash_cache(), self.config.get("state_dir")
+            )
+        return self._backup_store
+    
+    def open_journal(self, folders: List[Path]) -> Optional[SyncJournal]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Return the write-ahead journal for syncing folders, or None if disabled.
+        
+        Journals are kept unless `journal` is false in config; dry runs are never
+        journaled.
+        
+        Args:
+            folders: Base folders of the sync
+        
+        Returns:
+            SyncJournal under the configured state directory, or None
+        """
+        if not self.config.get("journal", True) or self.config.get("dry_run", False):
+            return None
+        return SyncJournal.for_folders(folders, self.config.get("state_dir"))
+
+    def run_sync(
+        self,
+        folders: List[Path],
+        control: Optional[SyncControl] = None,
+        journal: Optional[SyncJournal] = None,
+    ) -> List[Dict[str, Any]]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Scan, plan and execute a full sync of folders in one call.
+
+        Args:
+            folders: Base folders to sync
+            control: Optional SyncControl shared by all three phases
+            journal: Optional journal for execute_actions() (see open_journal())
+
+        Returns:
+            Actions not executed because the run was cancelled (see execute_actions())
+
+        Raises:
+            SyncCancelled: If control was cancelled before execution started
+        """
+        file_index = self.scan_folders(folders, control=control)
+        actions = self.plan_actions(file_index, base_folders=folders, control=control)
+        return self.execute_actions(actions, control=control, journal=journal)
+
+    @_stats_phase("execute")
+    def execute_actions(
+        self,
+        actions: Union[List[Dict[str, Any]], SyncPlan, Iterable[Dict[str, Any]]],
+        control: Optional[SyncControl] = None,
+        journal: Optional[SyncJournal] = None,
+        chunk_size: Optional[int] = None,
+        totals: Optional[Dict[str, int]] = None,
+    ) -> List[Dict[str, Any]]:
         # [Modified] by anthropic/claude-sonnet-4.5 | 2025-11-13_01
         """
         Execute planned copy actions with safe atomic operations.
         
         Performs file copy operations with the following features:
         - Respects dry_run mode (skips actual copying)
-        - Creates timestamped backups when backup_mode is enabled
+        - Creates timestamped backups, or stores overwritten versions in the
+          content-addressed backup store (backup_mode=store)
         - Uses atomic copy operations (temp file + rename)
         - Emits progress events for monitoring
         - Handles errors gracefully
         
+        Actions that share a source are executed together as one fan-out unit, so
+        the source is read once for all of its destinations (see
+        CopyBackend.copy_many()). Each destination still gets its own event.
+        
+        With `copy_workers` > 1 in config, units run concurrently on a bounded
+        thread pool. Actions sharing a destination path always run in plan order
+        on the same worker; temp files are uniquely named per copy.
+        
+        With `delta_copy` enabled, an existing destination whose source is at least
+        `delta_min_bytes` large is rebuilt with a rolling-checksum delta against
+        its old content (see utils_sync/delta_copy.py); byte counts are added to
+        last_run_stats["delta"].
+        
+        The `durability` setting decides how finished temp files are published:
+        `none` renames right away, `batch` fsyncs files and their directories in
+        groups of `durability_batch_size`, `strict` fsyncs per file (see
+        utils_sync/durability.py). In batch mode a COPY event is emitted once its
+        batch is on disk.
+        
+        COPY, ERROR and dry-run SKIP events for an action carry the destination
+        base folder as `folder`, the number of that folder's actions processed so
+        far as `count` and the folder's action total as `total`. COMPLETE is
+        emitted once, after every action has finished.
+        
+        If control is paused, execution waits before the next unit. If it is
+        cancelled, copies in progress are finished, no further unit is started,
+        and a CANCELLED event (instead of COMPLETE) reports what was left.
+        
+        With a journal (see open_journal()), the actions are written to it before
+        the first copy and each COPY is recorded as done. The journal is deleted
+        when the run finishes and kept when it is cancelled, so an interrupted
+        run can be resumed with SyncJournal.recover().
+        
+        With chunk_size, actions may be any iterable (e.g. PlanReader.actions())
+        and is read chunk_size actions at a time, so memory stays bounded. A chunk
+        is never cut between actions sharing a source, which keeps the read-once
+        fan-out of plan_actions() output. It is still one run: per-folder counts
+        carry on across chunks, and retention and COMPLETE happen once at the end.
+        
         Args:
-            actions: List of action dictionaries from plan_actions()
+            actions: List of action dictionaries from plan_actions(), or a SyncPlan
+                     (any iterable with chunk_size)
+            control: Optional SyncControl, checked before each unit
+            journal: Optional SyncJournal recording the run (ignored in dry run;
+                     needs the whole list, so not allowed with chunk_size)
+            chunk_size: Stream actions in chunks of about this many
+            totals: Optional per-destination-folder action totals (e.g. from a plan
+                    file header) reported as `total` instead of counting actions.
+                    The dict is read at each event, so a caller streaming actions
+                    may lower a folder's total for actions it drops.
+        
+        Returns:
+            Actions that were not executed because of cancellation ([] if all ran).
+            When streaming, actions not yet read are neither executed nor returned.
+        
+        Raises:
+            ValueError: If both journal and chunk_size are given
         """
+        streamed = chunk_size is not None
+        if streamed:
+            if journal is not None:
+                raise ValueError("A journal needs the whole action list; it cannot record streamed actions")
+            chunks: Iterable[List[Dict[str, Any]]] = self._source_chunks(actions, chunk_size)
+        else:
+            # A SyncPlan is executed as a snapshot in plan order
+            actions = list(actions)
+            chunks = [actions] if actions else []
+        
         # Get configuration settings
         dry_run = self.config.get("dry_run", False)
         backup_mode = self.config.get("backup_mode", "none")
+        workers = self._config_int("copy_workers", 1)
+        store_before = None
+        if backup_mode == "store" and not dry_run and (streamed or actions):
+            store_before = self._get_backup_store().stats()
         
-        # Execute each action
-        for action in actions:
-            if action["action"] == "copy":
-                source_path = action["source_path"]
-                destination_path = action["destination_path"]
-                relative_path = action["relative_path"]
-                
-                # Skip if dry run mode
-                if dry_run:
-                    self._emit_event(
-                        EventType.SKIP,
-                        file_path=str(relative_path),
-                        message="Dry run, skipping copy"
-                    )
-                    continue
-                
-                # Perform file copy with error handling
+        copier = self._get_copy_backend()
+        backend_counts: Dict[str, int] = defaultdict(int)
+        delta_min = self._delta_min_bytes(copier)
+        delta_totals: Dict[str, int] = defaultdict(int)
+        batch = WriteBatch(
+            self.config.get("durability", "none"),
+            self._config_int("durability_batch_size", DEFAULT_BATCH_SIZE),
+        )
+        
+        # Per-destination-folder totals and progress for progress reporting. Without
+        # given totals, a streamed run's totals grow as its chunks are read.
+        count_totals = totals is None
+        if count_totals:
+            totals = defaultdict(int)
+        processed: Dict[str, int] = defaultdict(int)
+        progress_lock = threading.Lock()
+        stats = self.stats
+        
+        if dry_run or not actions:
+            journal = None
+        if journal is not None:
+            journal.begin(actions, durable=batch.mode != "none")
+        
+        def emit(
+            event_type: EventType,
+            action: Dict[str, Any],
+            message: str,
+            backend: Optional[str] = None,
+        ) -> None:
+            # Count and emit under one lock so each folder's counts arrive in order
+            folder = self._destination_folder(action)
+            if stats.enabled:
+                if event_type == EventType.COPY:
+                    try:
+                        written = os.path.getsize(action["destination_path"])
+                    except OSError:
+                        written = 0
+                    stats.add(files_copied=1, bytes_copied=written)
+                elif event_type == EventType.SKIP:
+                    stats.add(files_skipped=1)
+                elif event_type == EventType.ERROR:
+                    stats.add(copy_errors=1)
+            with progress_lock:
+                processed[folder] += 1
+                if backend is not None:
+                    backend_counts[backend] += 1
+                if journal is not None and event_type == EventType.COPY:
+                    journal.mark_done(action)
+                self._emit_event(
+                    event_type,
+                    file_path=str(action["relative_path"]),
+                    message=message,
+                    folder=folder,
+                    count=processed[folder],
+                    total=totals.get(folder, 0)
+                )
+        
+        def record_delta(stats: DeltaStats) -> None:
+            with progress_lock:
+                delta_totals["files"] += 1
+                for name, value in stats._asdict().items():
+                    delta_totals[name] += value
+        
+        def run(unit: List[Dict[str, Any]]) -> None:
+            copies = [action for action in unit if action["action"] == "copy"]
+            if delta_min is not None and not dry_run:
+                # Large existing destinations get a delta each instead of the shared read
+                shared = []
+                for action in copies:
+                    if self._wants_delta(action, delta_min):
+                        self._execute_copy(
+                            action, dry_run, backup_mode, emit, copier, batch, on_delta=record_delta
+                        )
+                    else:
+                        shared.append(action)
+                copies = shared
+            if copies:
+                self._execute_unit(copies, dry_run, backup_mode, emit, copier, batch)
+        
+        pending: List[Dict[str, Any]] = []
+        read = 0
+        try:
+            for chunk in chunks:
+                read += len(chunk)
+                if count_totals:
+                    for action in chunk:
+                        if action["action"] == "copy":
+                            totals[self._destination_folder(action)] += 1
+                pending = self._execute_chunk(chunk, workers, run, control)
+                if pending:
+                    break
+            # Publish the last (partial) batch before reporting the outcome
+            batch.flush()
+        except BaseException:
+            # Keep the journal so the run can be resumed
+            if journal is not None:
+                journal.close()
+            raise
+        if journal is not None:
+            if pending:
+                journal.close()
+            else:
+                journal.finish()
+        
+        self.last_run_stats = {"copy_backends": dict(backend_counts)}
+        if delta_totals:
+            self.last_run_stats["delta"] = dict(delta_totals)
+        if batch.mode != "none":
+            self.last_run_stats["durability"] = {
+                "mode": batch.mode,
+                "file_syncs": batch.file_syncs,
+                "dir_syncs": batch.dir_syncs,
+            }
+        pruned = self.apply_backup_retention()
+        if pruned:
+            self.last_run_stats["backups_pruned"] = pruned
+        if store_before is not None:
+            store_after = self._backup_store.stats()
+            self.last_run_stats["backup_store"] = {
+                name: store_after[name] - store_before[name] for name in store_after
+            }
+            # Digests computed for backups are reused by later runs
+            self._hash_cache.save()
+        if pending:
+            self.stats.add(actions_pending=len(pending))
+            self._emit_cancelled(pending, read)
+            return pending
+        
+        # Emit completion event, naming the copy backends that were used
+        message = "Sync complete"
+        if backend_counts:
+            used = ", ".join(f"{name}={count}" for name, count in sorted(backend_counts.items()))
+            message += f" (copy backends: {used})"
+        if delta_totals:
+            message += (
+                f"; delta reused {delta_totals['reused_bytes']} of "
+                f"{delta_totals['written_bytes']} bytes"
+            )
+        self._emit_event(EventType.COMPLETE, message=message, stats=self.stats.as_dict())
+        return []
+    
+    def _execute_chunk(
+        self,
+        actions: List[Dict[str, Any]],
+        workers: int,
+        run,
+        control: Optional[SyncControl] = None,
+    ) -> List[Dict[str, Any]]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Run a list of actions as fan-out units, concurrently with workers > 1.
+        
+        Returns:
+            Actions that were not started because of cancellation, in plan order
+        """
+        units = self._fan_out_units(actions)
+        if workers > 1 and len(units) > 1:
+            return self._execute_concurrent(actions, units, workers, run, control)
+        for index, unit in enumerate(units):
+            if control is not None:
                 try:
-                    # Create timestamped backup if needed
-                    if backup_mode == "timestamped" and destination_path.exists():
-                        timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-                        backup_path = Path(str(destination_path) + f"_{timestamp}.bak")
-                        os.rename(destination_path, backup_path)
-                    
-                    # Ensure parent directory exists
-                    destination_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # Atomic copy: copy to temp file, then rename
-                    temp_path = destination_path.parent / f".tmp_{destination_path.name}"
-                    shutil.copy2(source_path, temp_path)
-                    os.replace(temp_path, destination_path)
-                    
-                    # Emit success event
-                    self._emit_event(
-                        EventType.COPY,
-                        file_path=str(relative_path),
-                        message=f"Copied: {source_path} -> {destination_path}"
-                    )
-                    
-                except Exception as e:
-                    # Emit error event and continue
-                    self._emit_event(
-                        EventType.ERROR,
-                        file_path=str(relative_path),
-                        message=f"Error copying file: {str(e)}"
-                    )
-                    continue
+                    control.checkpoint()
+                except SyncCancelled:
+                    remaining = sorted(p for rest in units[index:] for p in rest)
+                    return [actions[p] for p in remaining]
+            run([actions[p] for p in unit])
+        return []
+    
+    @staticmethod
+    def _source_chunks(
+        actions: Iterable[Dict[str, Any]], size: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Yield actions in lists of at least `size` (the last may be shorter).
+        
+        A list is only cut where the source path changes. plan_actions() lists a
+        source's actions together, so each source's fan-out stays in one list.
+        """
+        size = max(1, size)
+        chunk: List[Dict[str, Any]] = []
+        for action in actions:
+            if len(chunk) >= size and action.get("source_path") != chunk[-1].get("source_path"):
+                yield chunk
+                chunk = []
+            chunk.append(action)
+        if chunk:
+            yield chunk
+    
+    @staticmethod
+    def _fan_out_units(actions: List[Dict[str, Any]]) -> List[List[int]]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Group action positions by source path into fan-out units.
+        
+        Units are ordered by their first action. An action only joins its source's
+        unit if no earlier action targets the same destination; otherwise it starts
+        a new unit. Running units in order therefore keeps every destination's
+        actions in plan order.
+        
+        Args:
+            actions: Actions from plan_actions()
+        
+        Returns:
+            Lists of positions into actions, one list per unit
+        """
+        units: List[List[int]] = []
+        unit_by_source: Dict[str, int] = {}
+        seen_destinations = set()
+        for position, action in enumerate(actions):
+            source = str(action.get("source_path"))
+            destination = str(action.get("destination_path"))
+            index = unit_by_source.get(source)
+            if index is None or destination in seen_destinations:
+                index = len(units)
+                units.append([])
+                unit_by_source[source] = index
+            units[index].append(position)
+            seen_destinations.add(destination)
+        return units
+    
+    def _execute_unit(
+        self,
+        unit: List[Dict[str, Any]],
+        dry_run: bool,
+        backup_mode: str,
+        emit,
+        copier: CopyBackend,
+        batch: WriteBatch,
+    ) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Execute copy actions that share one source, reading the source once.
+        
+        Args:
+            unit: Copy actions with the same source_path
+            dry_run: If True, only report a SKIP per action
+            backup_mode: "timestamped" renames existing destinations first
+            emit: Callable(event_type, action, message, backend=None) that emits a
+                  progress event (and counts the backend of a COPY)
+            copier: Backend used to copy the bytes
+            batch: Publishes finished temp files at the configured durability
+        """
+        if len(unit) == 1:
+            self._execute_copy(unit[0], dry_run, backup_mode, emit, copier, batch)
+            return
+        if dry_run:
+            for action in unit:
+                emit(EventType.SKIP, action, "Dry run, skipping copy")
+            return
+        
+        prepared: List[Tuple[Dict[str, Any], Path]] = []
+        for action in unit:
+            try:
+                batch.flush_if_pending(action["destination_path"])
+                prepared.append((action, self._prepare_destination(action, backup_mode)[0]))
+            except Exception as e:
+                emit(EventType.ERROR, action, f"Error copying file: {str(e)}")
+        if not prepared:
+            return
+        
+        source_path = unit[0]["source_path"]
+        with self.stats.timer("copy"):
+            results = copier.copy_many(source_path, [temp_path for _, temp_path in prepared])
+        for (action, temp_path), (backend, error) in zip(prepared, results):
+            if error is not None:
+                self._discard_temp(temp_path)
+                emit(EventType.ERROR, action, f"Error copying file: {str(error)}")
+                continue
+            message = f"Copied: {source_path} -> {action['destination_path']}"
+            self._publish(batch, emit, action, temp_path, backend, message)
+    
+    def _execute_copy(
+        self,
+        action: Dict[str, Any],
+        dry_run: bool,
+        backup_mode: str,
+        emit,
+        copier: CopyBackend,
+        batch: WriteBatch,
+        on_delta=None,
+    ) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Perform one copy action (backup, temp copy, atomic rename) and report it.
+        
+        Args:
+            action: Copy action from plan_actions()
+            dry_run: If True, only report a SKIP
+            backup_mode: "timestamped" renames an existing destination first
+            emit: Callable(event_type, action, message, backend=None) that emits a
+                  progress event (and counts the backend of a COPY)
+            copier: Backend used to copy the bytes
+            batch: Publishes the finished temp file at the configured durability
+            on_delta: If given, try a delta against the old destination first and
+                      pass its DeltaStats to this callable when it was used
+        """
+        source_path = action["source_path"]
+        destination_path = action["destination_path"]
+        
+        # Skip if dry run mode
+        if dry_run:
+            emit(EventType.SKIP, action, "Dry run, skipping copy")
+            return
+        
+        # Perform file copy with error handling
+        temp_path = None
+        try:
+            # A queued earlier write to this destination must land first
+            batch.flush_if_pending(destination_path)
+            
+            # Atomic copy: copy to a uniquely named temp file, then rename
+            temp_path, basis_path = self._prepare_destination(action, backup_mode)
+            with self.stats.timer("copy"):
+                delta = None
+                if on_delta is not None and basis_path is not None:
+                    delta = delta_copy(source_path, basis_path, temp_path)
+                if delta is not None:
+                    backend = "delta"
+                    copied = f"Copied (delta, {delta.literal_bytes} of {delta.written_bytes} bytes from source)"
+                    on_delta(delta)
+                else:
+                    backend = copier.transfer(source_path, temp_path)
+                    copied = "Copied"
+            
+        except Exception as e:
+            # Emit error event and continue
+            if temp_path is not None:
+                self._discard_temp(temp_path)
+            emit(EventType.ERROR, action, f"Error copying file: {str(e)}")
+            return
+        
+        message = f"{copied}: {source_path} -> {destination_path}"
+        self._publish(batch, emit, action, temp_path, backend, message)
+    
+    def _publish(
+        self,
+        batch: WriteBatch,
+        emit,
+        action: Dict[str, Any],
+        temp_path: Path,
+        backend: str,
+        message: str,
+    ) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Rename a finished temp file into place via batch and emit COPY or ERROR when done."""
+        def on_done(error: Optional[Exception]) -> None:
+            if error is not None:
+                self._discard_temp(temp_path)
+                emit(EventType.ERROR, action, f"Error copying file: {str(error)}")
+            else:
+                emit(EventType.COPY, action, message, backend=backend)
+        
+        batch.commit(temp_path, action["destination_path"], on_done)
+    
+    def _prepare_destination(
+        self,
+        action: Dict[str, Any],
+        backup_mode: str,
+    ) -> Tuple[Path, Optional[Path]]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Back up an existing destination if configured and create its temp file.
+        
+        Args:
+            action: Copy action from plan_actions()
+            backup_mode: "timestamped" renames an existing destination first;
+                         "store" saves its content to the backup store
+        
+        Returns:
+            (temp_path, basis_path): a new, empty, uniquely named `.tmp_` file next
+            to the destination, and where the old destination content now lives
+            (its backup or the destination itself; None if there was none)
+        """
+        destination_path = action["destination_path"]
+        basis_path = destination_path if destination_path.exists() else None
+        
+        # Create timestamped backup if needed
+        if backup_mode == "timestamped" and basis_path is not None:
+            with self.stats.timer("backup"):
+                timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+                backup_path = Path(str(destination_path) + f"_{timestamp}.bak")
+                os.rename(destination_path, backup_path)
+                basis_path = backup_path
+                self._record_backup(action, backup_path)
+            self.stats.add(backups_made=1)
+        elif backup_mode == "store" and basis_path is not None:
+            # The destination stays in place until the atomic rename replaces it
+            with self.stats.timer("backup"):
+                self._get_backup_store().backup(destination_path)
+            self.stats.add(backups_made=1)
+        
+        # Ensure parent directory exists
+        destination_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        fd, temp_name = tempfile.mkstemp(
+            prefix=f"{WORKING_FILE_PREFIX}{destination_path.name}.", dir=destination_path.parent
+        )
+        os.close(fd)
+        return Path(temp_name), basis_path
+    
+    def _delta_min_bytes(self, copier: CopyBackend) -> Optional[int]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Return the delta size threshold, or None if delta copies are disabled."""
+        if not self.config.get("delta_copy", False) or copier.link_mode == "hardlink":
+            return None
+        return self._config_int("delta_min_bytes", DELTA_MIN_BYTES)
+    
+    @staticmethod
+    def _wants_delta(action: Dict[str, Any], delta_min: int) -> bool:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """True if an action updates an existing destination from a large enough source."""
+        if action.get("destination_mtime") is None:
+            return False
+        try:
+            return os.stat(action["source_path"]).st_size >= delta_min
+        except OSError:
+            return False
+    
+    @staticmethod
+    def _discard_temp(temp_path: Path) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Remove a temp file left by a failed copy."""
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+    
+    def _get_copy_backend(self) -> CopyBackend:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Return the copy backend for the current `copy_backend` and `link_mode` config values.
+        
+        The backend keeps its per-device probe results between runs; it is only
+        replaced when a configured value changes.
+        """
+        preferred = self.config.get("copy_backend", "auto")
+        if preferred not in COPY_BACKENDS:
+            preferred = "auto"
+        link_mode = self.config.get("link_mode", "copy")
+        if link_mode not in LINK_MODES:
+            link_mode = "copy"
+        key = (preferred, link_mode)
+        if self._copy_backend is None or self._copy_backend_key != key:
+            self._copy_backend = CopyBackend(preferred, link_mode)
+            self._copy_backend_key = key
+        return self._copy_backend
+    
+    def _execute_concurrent(
+        self,
+        actions: List[Dict[str, Any]],
+        units: List[List[int]],
+        workers: int,
+        run,
+        control: Optional[SyncControl] = None,
+    ) -> List[Dict[str, Any]]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """
+        Run fan-out units on a bounded thread pool.
+        
+        Units that share a destination path are chained into one task and run in
+        order, so each destination's actions keep their plan order.
+        
+        Args:
+            actions: Actions to run
+            units: Position lists from _fan_out_units()
+            workers: Maximum number of concurrent units
+            run: Callable executing the actions of one unit
+            control: Optional SyncControl, checked before each unit
+        
+        Returns:
+            Actions that were not started because of cancellation, in plan order
+        """
+        # Union units that touch a common destination
+        parent = list(range(len(units)))
         
-        # Emit completion event
-        self._emit_event(EventType.COMPLETE, message="Sync complete")
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+        
+        owner: Dict[str, int] = {}
+        for index, unit in enumerate(units):
+            for position in unit:
+                destination = str(actions[position].get("destination_path", position))
+                if destination in owner:
+                    root, other = find(index), find(owner[destination])
+                    if root != other:
+                        parent[max(root, other)] = min(root, other)
+                else:
+                    owner[destination] = index
+        chains: Dict[int, List[int]] = defaultdict(list)
+        for index in range(len(units)):
+            chains[find(index)].append(index)
+        executed = [False] * len(actions)
+        
+        def run_chain(unit_indexes: List[int]) -> None:
+            for index in unit_indexes:
+                if control is not None:
+                    control.checkpoint()
+                run([actions[p] for p in units[index]])
+                for position in units[index]:
+                    executed[position] = True
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sync-copy") as pool:
+            futures = [pool.submit(run_chain, chain) for chain in chains.values()]
+            for future in futures:
+                try:
+                    future.result()
+                except SyncCancelled:
+                    # Queued chains hit the cancelled checkpoint immediately
+                    pass
+        return [action for action, ran in zip(actions, executed) if not ran]
+    
+    def _emit_cancelled(self, pending: List[Dict[str, Any]], total: int) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Emit a CANCELLED event summarizing the actions that were not executed."""
+        message = f"Sync cancelled: {len(pending)} of {total} actions pending"
+        examples = [str(action.get("relative_path", "")) for action in pending[:5]]
+        if examples:
+            more = ", ..." if len(pending) > len(examples) else ""
+            message += f" ({', '.join(examples)}{more})"
+        self._emit_event(EventType.CANCELLED, message=message, count=len(pending), total=total)
+    
+    @staticmethod
+    def _destination_folder(action: Dict[str, Any]) -> str:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Return the destination base folder of an action as a string ("" if unknown)."""
+        return folder_key(action)
     
     def _emit_event(self, event_type: EventType, **kwargs) -> None:
         # Created by anthropic/claude-sonnet-4.5 | 2025-11-13_01
@@ -370,14 +1892,65 @@ class SyncEngine:
         
         Helper method to create ProgressEvent instances and put them on the queue.
         
+        With `event_mode=batched` in config, SCAN_FILE events are not emitted one by
+        one; they are counted per folder and summarized as SCAN_PROGRESS events at
+        most once per `event_interval_ms`, plus a final summary per folder.
+        
         Args:
             event_type: Type of event from EventType enum
-            **kwargs: Additional event parameters (folder, file_path, message)
+            **kwargs: Additional event parameters (folder, file_path, message, count, total,
+                      stats)
         """
+        if event_type == EventType.SCAN_FILE and self.config.get("event_mode") == "batched":
+            self._count_scanned_file(kwargs.get("folder", ""), kwargs.get("file_path", ""))
+            return
         event = ProgressEvent(
             event_type=event_type,
             folder=kwargs.get("folder", ""),
             file_path=kwargs.get("file_path", ""),
-            message=kwargs.get("message", "")
+            message=kwargs.get("message", ""),
+            count=kwargs.get("count", 0),
+            total=kwargs.get("total", 0),
+            stats=kwargs.get("stats"),
         )
-        self.event_queue.put(event)
\ No newline at end of file
+        self.event_queue.put(event)
+    
+    def _count_scanned_file(self, folder: str, file_path: str) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Count a scanned file and emit a SCAN_PROGRESS once the folder's window elapsed."""
+        interval = self._config_int("event_interval_ms", 100) / 1000.0
+        with self._progress_lock:
+            count = self._scan_counts.get(folder, 0) + 1
+            self._scan_counts[folder] = count
+            now = time.monotonic()
+            if now - self._progress_emitted.get(folder, 0.0) < interval:
+                return
+            self._progress_emitted[folder] = now
+            self._emit_event(
+                EventType.SCAN_PROGRESS,
+                folder=folder,
+                file_path=file_path,
+                message=f"Scanning: {count} files",
+                count=count
+            )
+    
+    def _reset_scan_progress(self) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Forget per-folder scan counts before a new scan."""
+        with self._progress_lock:
+            self._scan_counts = {}
+            self._progress_emitted = {}
+    
+    def _flush_scan_progress(self) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Emit the final SCAN_PROGRESS summary of every folder counted in batched mode."""
+        with self._progress_lock:
+            counts, self._scan_counts = self._scan_counts, {}
+            self._progress_emitted = {}
+        for folder, count in counts.items():
+            self._emit_event(
+                EventType.SCAN_PROGRESS,
+                folder=folder,
+                message=f"Scanned {count} files",
+                count=count
+            )
\ No newline at end of file
@@ -0,0 +1,370 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Write-ahead journal for execute_actions(), used for crash recovery and resume.
+
+Before the first copy, every planned action is written to a journal file, and
+the file is fsynced. As actions finish, their indexes are appended in batches
+of `done` records. A run that completes deletes its journal. A journal that is
+still on disk at startup therefore belongs to a sync that crashed or was
+cancelled part way through.
+
+recover() tidies up after such a run and returns the actions that still need
+to run:
+
+- stray `.tmp_<name>.*` files next to unfinished destinations are removed;
+- a destination that was renamed to a `.bak` by that run but never replaced is
+  restored from the backup;
+- unfinished actions whose destination already matches its source (same size
+  and mtime, or the same inode) are dropped. Their copy landed, but the crash
+  happened before it was journaled.
+
+Journals are JSON-lines files under `<state_dir>/journal/<folder set key>.jsonl`,
+one per set of synced folders:
+
+    {"version": 1, "started": "...", "folders": [...], "actions": N}
+    {"a": {...action...}}          (N lines, in plan order)
+    {"done": [index, ...]}         (appended while the sync runs)
+
+A torn last line (the process died while writing it) is ignored.
+"""
+import datetime
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Union
+
+from . import file_path_utils
+
+# Bump when the on-disk layout changes; older journals are ignored.
+JOURNAL_VERSION = 1
+
+# Completed actions buffered before a `done` record is appended...
+DONE_BATCH = 256
+# ...or seconds since the last append, whichever comes first
+DONE_INTERVAL = 1.0
+
+# Action keys holding paths; stored as strings and restored as Path
+_PATH_KEYS = ("source_path", "destination_path", "destination_folder")
+
+# Timestamp format of journal starts and of timestamped backups (sorts by time)
+_STAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+
+
+def folder_set_key(folders) -> str:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """Return a short, filesystem-safe key for a set of base folders (order-insensitive)."""
+    normalized = sorted(str(file_path_utils.normalize_path(f)) for f in folders)
+    return hashlib.sha1("\n".join(normalized).encode("utf-8")).hexdigest()[:16]
+
+
+class SyncJournal:
+    """
+    Write-ahead journal of one execute_actions() run.
+
+    Attributes:
+        path: Journal file
+        folders: Base folders of the sync (as strings)
+        started: UTC start stamp of the journaled run ("" until begin() or load())
+        removed_temps: Stray temp files deleted by the last recover()
+        restored_backups: Destinations restored from a backup by the last recover()
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(self, path: Union[str, Path], folders=()):
+        """
+        Initialize a journal bound to a file.
+
+        Args:
+            path: Journal file (created by begin())
+            folders: Base folders of the sync, recorded in the header
+        """
+        self.path = Path(path)
+        self.folders = [str(f) for f in folders]
+        self.started = ""
+        self.removed_temps = 0
+        self.restored_backups = 0
+        self._fh = None
+        self._durable = False
+        self._indexes: Dict[int, int] = {}
+        self._done: List[int] = []
+        self._last_append = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_folders(
+        cls,
+        folders,
+        state_dir: Optional[Union[str, Path]] = None,
+    ) -> "SyncJournal":
+        """
+        Return the journal of a set of base folders in the state directory.
+
+        Args:
+            folders: Base folders being synced
+            state_dir: Optional override for the state directory
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        journal_dir = file_path_utils.get_state_dir(state_dir) / "journal"
+        folders = [file_path_utils.normalize_path(f) for f in folders]
+        return cls(journal_dir / f"{folder_set_key(folders)}.jsonl", folders)
+
+    @classmethod
+    def find_unfinished(cls, state_dir: Optional[Union[str, Path]] = None) -> List["SyncJournal"]:
+        """
+        Return the journals left in the state directory, most recent first.
+
+        Unreadable or outdated journal files are skipped.
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        journal_dir = file_path_utils.get_state_dir(state_dir) / "journal"
+        found = []
+        for path in sorted(journal_dir.glob("*.jsonl")):
+            journal = cls(path)
+            header = journal._read_header()
+            if header is not None:
+                journal.folders = [str(f) for f in header.get("folders", [])]
+                journal.started = str(header.get("started", ""))
+                found.append(journal)
+        found.sort(key=lambda j: j.started, reverse=True)
+        return found
+
+    def exists(self) -> bool:
+        """True if an unfinished journal is on disk."""
+        return self.path.exists()
+
+    # ------------------------------------------------------------------ writing
+
+    def begin(self, actions: List[Dict[str, Any]], durable: bool = False) -> None:
+        """
+        Write the plan of a run before its first copy.
+
+        An earlier journal for the same folders (e.g. the one being resumed) is
+        replaced atomically.
+
+        Args:
+            actions: Actions about to be executed; completions are reported with
+                     mark_done() using these same dict objects
+            durable: If True, fsync every `done` record (use with durability
+                     batch/strict; otherwise records only survive a process crash)
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        self.started = datetime.datetime.now(datetime.timezone.utc).strftime(_STAMP_FORMAT)
+        self._durable = durable
+        self._indexes = {id(action): index for index, action in enumerate(actions)}
+        self._done = []
+        header = {
+            "version": JOURNAL_VERSION,
+            "started": self.started,
+            "folders": self.folders,
+            "actions": len(actions),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as fh:
+            fh.write(json.dumps(header) + "\n")
+            for action in actions:
+                fh.write(json.dumps({"a": _encode_action(action)}) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(temp_path, self.path)
+        self._fh = open(self.path, "a", encoding="utf-8")
+        self._last_append = time.monotonic()
+
+    def mark_done(self, action: Dict[str, Any]) -> None:
+        """Record that an action's copy is in place (appended in batches)."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        index = self._indexes.get(id(action))
+        if index is None:
+            return
+        with self._lock:
+            self._done.append(index)
+            if len(self._done) >= DONE_BATCH or time.monotonic() - self._last_append >= DONE_INTERVAL:
+                self._append_done()
+
+    def flush(self) -> None:
+        """Append any buffered completions."""
+        with self._lock:
+            self._append_done()
+
+    def close(self) -> None:
+        """Flush and close the journal, keeping it on disk (the run did not finish)."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        with self._lock:
+            self._append_done()
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def finish(self) -> None:
+        """Close and delete the journal after a run that executed every action."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            self._done = []
+        self.discard()
+
+    def discard(self) -> None:
+        """Delete the journal file, if any."""
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def _append_done(self) -> None:
+        if not self._done or self._fh is None:
+            return
+        self._fh.write(json.dumps({"done": self._done}) + "\n")
+        self._fh.flush()
+        if self._durable:
+            os.fsync(self._fh.fileno())
+        self._done = []
+        self._last_append = time.monotonic()
+
+    # ------------------------------------------------------------------ reading
+
+    def _read_header(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                header = json.loads(fh.readline())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(header, dict) or header.get("version") != JOURNAL_VERSION:
+            return None
+        return header
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the journal.
+
+        Returns:
+            {"actions": [...], "done": set of indexes}, or None if the journal is
+            missing, outdated or its plan was not completely written
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        actions: List[Dict[str, Any]] = []
+        done: Set[int] = set()
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                header = json.loads(fh.readline())
+                if not isinstance(header, dict) or header.get("version") != JOURNAL_VERSION:
+                    return None
+                for line in fh:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn final write
+                        break
+                    if "a" in record:
+                        actions.append(_decode_action(record["a"]))
+                    elif "done" in record:
+                        done.update(record["done"])
+        except (OSError, ValueError):
+            return None
+        if len(actions) != header.get("actions"):
+            return None
+        self.folders = [str(f) for f in header.get("folders", [])]
+        self.started = str(header.get("started", ""))
+        return {"actions": actions, "done": done}
+
+    def recover(self) -> List[Dict[str, Any]]:
+        """
+        Clean up after an interrupted run and return its unfinished actions.
+
+        See the module docstring for what is cleaned up. An unreadable journal
+        is discarded and yields [].
+
+        Returns:
+            Unfinished actions in plan order
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        self.removed_temps = 0
+        self.restored_backups = 0
+        loaded = self.load()
+        if loaded is None:
+            self.discard()
+            return []
+        pending = []
+        for index, action in enumerate(loaded["actions"]):
+            if index in loaded["done"]:
+                continue
+            destination_path = action["destination_path"]
+            self.removed_temps += _remove_stray_temps(destination_path)
+            if action.get("destination_mtime") is not None and not destination_path.exists():
+                if _restore_backup(destination_path, self.started):
+                    self.restored_backups += 1
+            if _already_copied(action):
+                continue
+            pending.append(action)
+        return pending
+
+
+def _encode_action(action: Dict[str, Any]) -> Dict[str, Any]:
+    encoded = dict(action)
+    for key in _PATH_KEYS:
+        if encoded.get(key) is not None:
+            encoded[key] = str(encoded[key])
+    return encoded
+
+
+def _decode_action(record: Dict[str, Any]) -> Dict[str, Any]:
+    action = dict(record)
+    for key in _PATH_KEYS:
+        if action.get(key) is not None:
+            action[key] = Path(action[key])
+    return action
+
+
+def _remove_stray_temps(destination_path: Path) -> int:
+    """Delete `.tmp_<name>.*` files left next to a destination; returns how many."""
+    removed = 0
+    try:
+        strays = list(destination_path.parent.glob(f".tmp_{glob.escape(destination_path.name)}.*"))
+    except OSError:
+        return 0
+    for stray in strays:
+        try:
+            stray.unlink()
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def _restore_backup(destination_path: Path, started: str) -> bool:
+    """Move back the newest backup of a destination taken at or after `started`."""
+    prefix = destination_path.name + "_"
+    stamps = []
+    for backup in destination_path.parent.glob(f"{glob.escape(destination_path.name)}_*.bak"):
+        stamp = backup.name[len(prefix):-len(".bak")]
+        try:
+            datetime.datetime.strptime(stamp, _STAMP_FORMAT)
+        except ValueError:
+            # Backup of another file whose name starts with this one
+            continue
+        if stamp >= started:
+            stamps.append((stamp, backup))
+    if not stamps:
+        return False
+    try:
+        os.rename(max(stamps)[1], destination_path)
+    except OSError:
+        return False
+    return True
+
+
+def _already_copied(action: Dict[str, Any]) -> bool:
+    """True if an action's destination already holds its source (copy or link)."""
+    try:
+        source = os.stat(action["source_path"])
+        destination = os.stat(action["destination_path"])
+    except OSError:
+        return False
+    if source.st_ino and (source.st_ino, source.st_dev) == (destination.st_ino, destination.st_dev):
+        return True
+    return source.st_size == destination.st_size and source.st_mtime_ns == destination.st_mtime_ns
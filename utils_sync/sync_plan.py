@@ -0,0 +1,226 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Indexed container for planned sync actions.
+
+plan_actions() returns a flat list of action dicts. Editing such a list (the
+GUI's per-file "X" buttons) means rebuilding it and regrouping every action by
+folder. A SyncPlan keeps the actions in plan order and indexes them by:
+
+- action id: a small integer assigned on add (action_id() maps an action
+  dict back to it, by identity);
+- destination base folder (str(action["destination_folder"]));
+- relative path.
+
+so that removal is O(1), per-folder and per-path lookups avoid scanning the
+plan, and query() filters and pages without copying the whole plan.
+Subscribers get a PlanChange for every add and remove, naming the affected
+folder, so a view can update just that folder.
+
+A SyncPlan iterates like the list it replaces, and execute_actions() accepts
+either.
+"""
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+Action = Dict[str, Any]
+
+
+class PlanChange(NamedTuple):
+    """Notification sent to SyncPlan subscribers."""
+    kind: str  # "add" or "remove"
+    action_id: int
+    folder: str  # destination base folder ("" if unknown)
+    action: Action
+
+
+def folder_key(action: Action) -> str:
+    """Return the destination base folder of an action as a string ("" if unknown)."""
+    folder = action.get("destination_folder")
+    return str(folder) if folder is not None else ""
+
+
+class SyncPlan:
+    """
+    Planned actions in plan order, indexed by id, destination folder and relative path.
+
+    All methods are thread-safe. Subscribers are called after the change is
+    applied, on the thread that made it.
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(self, actions: Iterable[Action] = ()):
+        """
+        Initialize a plan.
+
+        Args:
+            actions: Initial actions (e.g. from plan_actions()), in plan order
+        """
+        self._actions: Dict[int, Action] = {}
+        self._ids: Dict[int, int] = {}
+        self._by_folder: Dict[str, Dict[int, Action]] = {}
+        self._by_path: Dict[str, Dict[int, Action]] = {}
+        self._next_id = 0
+        self._subscribers: List[Callable[[PlanChange], None]] = []
+        self._lock = threading.RLock()
+        for action in actions:
+            self._insert(action)
+
+    # ------------------------------------------------------------------ container
+
+    def __len__(self) -> int:
+        return len(self._actions)
+
+    def __bool__(self) -> bool:
+        return bool(self._actions)
+
+    def __iter__(self) -> Iterator[Action]:
+        with self._lock:
+            return iter(list(self._actions.values()))
+
+    def __contains__(self, action: object) -> bool:
+        return id(action) in self._ids
+
+    def actions(self) -> List[Action]:
+        """Return all actions in plan order."""
+        with self._lock:
+            return list(self._actions.values())
+
+    # ------------------------------------------------------------------ changes
+
+    def add(self, action: Action) -> int:
+        """
+        Append an action to the plan.
+
+        Returns:
+            The action's id (an action already in the plan keeps its id)
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        with self._lock:
+            existing = self._ids.get(id(action))
+            if existing is not None:
+                return existing
+            action_id = self._insert(action)
+        self._notify(PlanChange("add", action_id, folder_key(action), action))
+        return action_id
+
+    def remove(self, action: Union[Action, int]) -> Optional[Action]:
+        """
+        Remove an action, given as the action dict or its id, in O(1).
+
+        Returns:
+            The removed action, or None if it was not in the plan
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        with self._lock:
+            action_id = action if isinstance(action, int) else self._ids.get(id(action))
+            removed = self._actions.pop(action_id, None) if action_id is not None else None
+            if removed is None:
+                return None
+            del self._ids[id(removed)]
+            folder = folder_key(removed)
+            _discard(self._by_folder, folder, action_id)
+            _discard(self._by_path, str(removed.get("relative_path", "")), action_id)
+        self._notify(PlanChange("remove", action_id, folder, removed))
+        return removed
+
+    def subscribe(self, callback: Callable[[PlanChange], None]) -> Callable[[], None]:
+        """
+        Call callback(change) after every add and remove.
+
+        Returns:
+            A function that unsubscribes the callback
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    # ------------------------------------------------------------------ queries
+
+    def action_id(self, action: Action) -> Optional[int]:
+        """Return the id of an action dict in this plan, or None."""
+        return self._ids.get(id(action))
+
+    def get(self, action_id: int) -> Optional[Action]:
+        """Return the action with the given id, or None."""
+        return self._actions.get(action_id)
+
+    def folders(self) -> List[str]:
+        """Return the destination folders that have planned actions."""
+        with self._lock:
+            return [folder for folder, actions in self._by_folder.items() if actions]
+
+    def count(self, folder: Optional[Union[str, Any]] = None) -> int:
+        """Return the number of actions, in total or for one destination folder."""
+        if folder is None:
+            return len(self._actions)
+        return len(self._by_folder.get(str(folder), ()))
+
+    def for_path(self, relative_path: str) -> List[Action]:
+        """Return the actions (one per destination folder) for a relative path."""
+        with self._lock:
+            return list(self._by_path.get(str(relative_path), {}).values())
+
+    def query(
+        self,
+        folder: Optional[Union[str, Any]] = None,
+        predicate: Optional[Callable[[Action], bool]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Action]:
+        """
+        Return a page of actions in plan order.
+
+        Args:
+            folder: Only actions for this destination base folder
+            predicate: Only actions for which predicate(action) is true
+            offset: Number of matching actions to skip
+            limit: Maximum number of actions to return (None = all)
+
+        Returns:
+            Matching actions; only the requested page is materialized
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        with self._lock:
+            source = self._actions if folder is None else self._by_folder.get(str(folder), {})
+            page: List[Action] = []
+            skipped = 0
+            for action in source.values():
+                if predicate is not None and not predicate(action):
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                if limit is not None and len(page) >= limit:
+                    break
+                page.append(action)
+            return page
+
+    # ------------------------------------------------------------------ internals
+
+    def _insert(self, action: Action) -> int:
+        action_id = self._next_id
+        self._next_id += 1
+        self._actions[action_id] = action
+        self._ids[id(action)] = action_id
+        self._by_folder.setdefault(folder_key(action), {})[action_id] = action
+        self._by_path.setdefault(str(action.get("relative_path", "")), {})[action_id] = action
+        return action_id
+
+    def _notify(self, change: PlanChange) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(change)
+
+
+def _discard(index: Dict[str, Dict[int, Action]], key: str, action_id: int) -> None:
+    bucket = index.get(key)
+    if bucket is not None:
+        bucket.pop(action_id, None)
+        if not bucket:
+            del index[key]
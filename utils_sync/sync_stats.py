@@ -0,0 +1,230 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Per-run instrumentation of the sync engine: phase timings, counters and memory.
+
+With `collect_stats` enabled, SyncEngine.stats is a SyncStats that
+scan_folders(), plan_actions() and execute_actions() update. A scan
+(scan_folders() or scan_paths()) starts a new run, and plan and execute add
+to it. A streamed execute of a plan file is one execute phase. With
+`collect_stats` disabled (the default), SyncEngine.stats is NULL_STATS.
+Its methods do nothing, so the engine pays about one no-op call per phase,
+directory walk and copied file.
+
+as_dict() returns:
+
+    {
+      "phases": {"scan": {"wall_s": 0.41, "cpu_s": 0.38, "calls": 1}, "plan": {...},
+                 "execute": {...}},
+      "timers": {"copy": {"seconds": 0.2, "calls": 12}, "backup": {...}},
+      "folders": {"/path/p1": {"scan_s": 0.2, "files": 1200}, ...},
+      "counters": {"dirs_listed": 40, "stat_calls": 1210, "bytes_copied": 48213, ...},
+      "peak_rss_bytes": 73400320
+    }
+
+Phase CPU time is process CPU time, so it includes worker threads. Timers
+add up the wall time of each call, so with copy_workers > 1 they can exceed
+the phase's wall time. Phases still running when as_dict() is called (e.g.
+execute, while it emits COMPLETE) are included with their time so far.
+peak_rss_bytes is the process's peak resident set size so far, sampled
+after each phase (None where the platform cannot report it).
+
+COUNTERS lists the counters and what they count.
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional
+
+# Counter names, in report order, with what they count
+COUNTERS = {
+    "dirs_listed": "directories listed with scandir",
+    "dirs_cached": "directory listings served from the scan cache",
+    "entries_visited": "directory entries looked at by the walk",
+    "entries_ignored": "entries pruned by ignore rules and .syncignore",
+    "stat_calls": "stat/lstat calls issued while scanning",
+    "files_indexed": "files added to the index",
+    "paths_planned": "relative paths compared by the planner",
+    "content_matches": "updates dropped because the content was identical",
+    "actions_planned": "copy actions planned",
+    "files_copied": "destinations written",
+    "bytes_copied": "bytes written to destinations",
+    "files_skipped": "copies skipped (dry run)",
+    "copy_errors": "copies that failed",
+    "backups_made": "destinations backed up before being overwritten",
+    "actions_pending": "actions left by a cancelled execute",
+}
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Return the peak resident set size of this process in bytes, or None."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class SyncStats:
+    """
+    Timings, counters and peak memory of one sync run.
+
+    All methods are thread-safe; scan and copy workers report concurrently.
+
+    Attributes:
+        enabled: True (NullStats: False), so callers can skip work that only
+                 feeds the stats
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    enabled = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._phases: Dict[str, Dict[str, float]] = {}
+        self._open: Dict[str, tuple] = {}
+        self._timers: Dict[str, Dict[str, float]] = {}
+        self._folders: Dict[str, Dict[str, float]] = {}
+        self._counters: Counter = Counter()
+        self._peak_rss: Optional[int] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a top-level phase (wall and process CPU time) and sample peak RSS after it.
+
+        A phase entered again while it is still running (e.g. from another
+        thread) is timed once, by the call that entered it first.
+        """
+        with self._lock:
+            outer = name not in self._open
+            if outer:
+                self._open[name] = (time.perf_counter(), time.process_time())
+        try:
+            yield
+        finally:
+            if outer:
+                with self._lock:
+                    wall_start, cpu_start = self._open.pop(name)
+                    self._add_phase(name, time.perf_counter() - wall_start, time.process_time() - cpu_start)
+                self._sample_rss()
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Add the wall time of the block to a timer (e.g. "copy", "backup")."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                timer = self._timers.setdefault(name, {"seconds": 0.0, "calls": 0})
+                timer["seconds"] += elapsed
+                timer["calls"] += 1
+
+    def add(self, **counts: int) -> None:
+        """Add to counters, e.g. add(files_copied=1, bytes_copied=512)."""
+        with self._lock:
+            self._counters.update(counts)
+
+    def add_folder_scan(self, folder: str, seconds: float, files: int) -> None:
+        """Add a walk of one base folder (a folder scanned in several tasks adds up)."""
+        with self._lock:
+            entry = self._folders.setdefault(folder, {"scan_s": 0.0, "files": 0})
+            entry["scan_s"] += seconds
+            entry["files"] += files
+
+    def as_dict(self) -> Optional[Dict[str, Any]]:
+        """Return a JSON-serializable snapshot (see the module docstring)."""
+        now_wall, now_cpu = time.perf_counter(), time.process_time()
+        with self._lock:
+            phases = {name: dict(values) for name, values in self._phases.items()}
+            for name, (wall_start, cpu_start) in self._open.items():
+                entry = phases.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "calls": 0})
+                entry["wall_s"] += now_wall - wall_start
+                entry["cpu_s"] += now_cpu - cpu_start
+                entry["calls"] += 1
+            return {
+                "phases": {name: _rounded(values) for name, values in phases.items()},
+                "timers": {name: _rounded(values) for name, values in self._timers.items()},
+                "folders": {name: _rounded(values) for name, values in self._folders.items()},
+                "counters": {name: self._counters[name] for name in _counter_order(self._counters)},
+                "peak_rss_bytes": self._peak_rss,
+            }
+
+    def _add_phase(self, name: str, wall: float, cpu: float) -> None:
+        entry = self._phases.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "calls": 0})
+        entry["wall_s"] += wall
+        entry["cpu_s"] += cpu
+        entry["calls"] += 1
+
+    def _sample_rss(self) -> None:
+        peak = peak_rss_bytes()
+        if peak is not None:
+            with self._lock:
+                self._peak_rss = max(peak, self._peak_rss or 0)
+
+
+class NullStats(SyncStats):
+    """Stats collector that records nothing, used while `collect_stats` is off."""
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    enabled = False
+
+    def __init__(self):
+        pass
+
+    def phase(self, name: str):
+        return nullcontext()
+
+    def timer(self, name: str):
+        return nullcontext()
+
+    def add(self, **counts: int) -> None:
+        pass
+
+    def add_folder_scan(self, folder: str, seconds: float, files: int) -> None:
+        pass
+
+    def as_dict(self) -> Optional[Dict[str, Any]]:
+        """Always None: nothing was collected."""
+        return None
+
+
+NULL_STATS = NullStats()
+
+
+def format_stats(stats: Dict[str, Any]) -> List[str]:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """Render an as_dict() snapshot as human-readable lines."""
+    lines = []
+    for name, phase in stats["phases"].items():
+        calls = f" in {phase['calls']} calls" if phase["calls"] > 1 else ""
+        lines.append(f"{name}: {phase['wall_s']:.3f}s wall, {phase['cpu_s']:.3f}s CPU{calls}")
+    for name, timer in stats["timers"].items():
+        lines.append(f"{name}: {timer['seconds']:.3f}s over {timer['calls']} calls")
+    for folder, entry in stats["folders"].items():
+        files = entry["files"]
+        lines.append(f"scanned {folder}: {files} file{'' if files == 1 else 's'} in {entry['scan_s']:.3f}s")
+    if stats["counters"]:
+        lines.append(" ".join(f"{name}={value}" for name, value in stats["counters"].items()))
+    if stats.get("peak_rss_bytes") is not None:
+        lines.append(f"peak RSS: {stats['peak_rss_bytes'] / 1e6:.1f} MB")
+    return lines
+
+
+def _rounded(values: Dict[str, float]) -> Dict[str, float]:
+    return {key: round(value, 6) if isinstance(value, float) else value for key, value in values.items()}
+
+
+def _counter_order(counters: Counter) -> List[str]:
+    known = [name for name in COUNTERS if counters.get(name)]
+    return known + sorted(name for name in counters if name not in COUNTERS and counters[name])
@@ -7,9 +7,10 @@ in a separate thread to avoid blocking the main application thread.
 """
 import threading
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from .sync_core import SyncEngine
 from .progress_events import EventType
+from .sync_control import SyncCancelled, SyncControl
 
 class SyncWorker(threading.Thread):
     """
@@ -22,7 +23,13 @@ class SyncWorker(threading.Thread):
     """
     # [Created] by Claude Sonnet 4.5 | 2025-11-13_01
     
-    def __init__(self, sync_engine: SyncEngine, folders: List[Path], actions=None):
+    def __init__(
+        self,
+        sync_engine: SyncEngine,
+        folders: List[Path],
+        actions=None,
+        control: Optional[SyncControl] = None,
+    ):
         """
         Initialize the SyncWorker.
         
@@ -31,12 +38,17 @@ class SyncWorker(threading.Thread):
             folders: List of folder paths to synchronize
             actions: Optional precomputed list of planned actions to execute.
                      If provided, the worker will skip scan/plan and only execute.
+            control: Optional SyncControl; a new one is created if omitted.
+                     Use worker.control to pause, resume or cancel the run.
         """
         # [Modified] by openai/gpt-5.1 | 2025-11-14_01
         super().__init__()
         self.sync_engine = sync_engine
         self.folders = folders
         self.actions = actions
+        self.control = control or SyncControl()
+        # Actions left unexecuted when the run was cancelled during execution
+        self.pending_actions = []
         # Set as daemon thread so it doesn't prevent app shutdown
         self.daemon = True
     
@@ -49,20 +61,33 @@ class SyncWorker(threading.Thread):
         2) Executes a precomputed list of actions directly.
         
         All progress is communicated via the SyncEngine's event queue.
-        Any exceptions are caught and emitted as ERROR events.
+        Execution is recorded in the engine's write-ahead journal (if enabled).
+        Any exceptions are caught and emitted as ERROR events. A run cancelled
+        through self.control ends with a CANCELLED event.
         """
-        # [Modified] by openai/gpt-5.1 | 2025-11-14_01
+        # [Modified] by [LLM model] | 2026-10-18_01
         try:
             # When no actions are precomputed, run full scan/plan/execute
             if self.actions is None:
-                file_index = self.sync_engine.scan_folders(self.folders)
-                actions = self.sync_engine.plan_actions(file_index)
+                file_index = self.sync_engine.scan_folders(self.folders, control=self.control)
+                actions = self.sync_engine.plan_actions(
+                    file_index, base_folders=self.folders, control=self.control
+                )
             else:
                 actions = self.actions
             
-            # Execute the planned actions
-            self.sync_engine.execute_actions(actions)
+            # Execute the planned actions, journaled so a crash can be resumed
+            journal = self.sync_engine.open_journal(self.folders)
+            self.pending_actions = self.sync_engine.execute_actions(
+                actions, control=self.control, journal=journal
+            )
             
+        except SyncCancelled:
+            # Cancelled while scanning or planning: nothing was copied yet
+            self.sync_engine._emit_event(
+                EventType.CANCELLED,
+                message="Sync cancelled before any file was copied"
+            )
         except Exception as e:
             # Emit error event if anything goes wrong
             error_msg = f"Sync worker error: {str(e)}"
@@ -6,12 +6,47 @@ Provides reusable tkinter widgets and UI helpers.
 import tkinter as tk
 from tkinter import ttk
 
+from .preview_model import PreviewModel, group_key
+
 # Global UI colors tuned for the main dark-mode GUI
 GREEN_BRIGHT = "#00ff5f"
 GRAY_PREVIEW = "#b0b0b0"  # lighter gray for after-scan file list
 GRAY_BAK = "#9a9a9a"      # slightly darker gray for .bak rows
 FG_PRIMARY = "#e0e0e0"    # default light text on dark background
 
+# Preview list: rows inserted per group at a time, and the most rows shown before scrolling
+PREVIEW_CHUNK = 200
+PREVIEW_MAX_HEIGHT = 12
+
+# Tree item id of the .bak group; planned files use "g:<dir>" groups and "f:<path>" rows
+_BAK_GROUP = "bak"
+
+
+def _group_iid(group: str) -> str:
+    return f"g:{group}"
+
+
+def _row_iid(relative_path: str) -> str:
+    return f"f:{relative_path}"
+
+
+def _placeholder_iid(group: str) -> str:
+    return f"p:{group}"
+
+
+def _more_iid(group: str) -> str:
+    return f"m:{group}"
+
+
+def _iid_group(iid: str, prefix: str):
+    """Return what follows prefix in a tree item id, or None for other ids."""
+    return iid[len(prefix):] if iid and iid.startswith(prefix) else None
+
+
+def _row_name(relative_path: str) -> str:
+    return relative_path.rpartition("/")[2]
+
+
 class FolderItem:
     """A UI component representing a single folder in the folder list."""
     # [Modified] by openai/gpt-5.1 | 2025-11-14_02
@@ -94,13 +129,49 @@ class FolderItem:
         )
         self.remove_button.pack(side=tk.RIGHT, padx=(0, 5), pady=2)
         
-        # Container for planned overwrite rows (shown under the main row)
+        # Container for the planned overwrite list (shown under the main row)
         self.preview_frame = ttk.Frame(self.frame)
         self.preview_frame.pack(fill=tk.X, padx=(20, 5), pady=(0, 2))
-        # Map relative file paths to the label widgets for their preview rows
-        self._preview_rows = {}
-        # Track row frames for .bak backup file display so we can clear only those
-        self._backup_rows = []
+        self._preview_header_label = ttk.Label(
+            self.preview_frame,
+            text="",
+            anchor=tk.W,
+            justify=tk.LEFT,
+            font=("TkDefaultFont", 8, "bold"),
+        )
+        # Virtualized list: one collapsible node per directory group; a group's
+        # rows are inserted in chunks of PREVIEW_CHUNK only when it is opened
+        self._tree_frame = ttk.Frame(self.preview_frame)
+        self.preview_tree = ttk.Treeview(
+            self._tree_frame,
+            columns=("timestamp", "remove"),
+            show="tree",
+            selectmode="extended",
+            height=1,
+            style="AF.Treeview",
+        )
+        self.preview_tree.column("#0", width=320, stretch=True)
+        self.preview_tree.column("timestamp", width=140, stretch=False, anchor=tk.W)
+        self.preview_tree.column("remove", width=24, stretch=False, anchor=tk.CENTER)
+        self.preview_tree.tag_configure("group", foreground=FG_PRIMARY)
+        self.preview_tree.tag_configure("file", foreground=GRAY_PREVIEW)
+        self.preview_tree.tag_configure("replaced", foreground="green")
+        self.preview_tree.tag_configure("bak", foreground=GRAY_BAK)
+        self.preview_tree.tag_configure("more", foreground=GRAY_BAK)
+        scrollbar = ttk.Scrollbar(self._tree_frame, orient=tk.VERTICAL, command=self.preview_tree.yview)
+        self.preview_tree.configure(yscrollcommand=scrollbar.set)
+        self.preview_tree.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.preview_tree.bind("<<TreeviewOpen>>", self._on_tree_open)
+        self.preview_tree.bind("<<TreeviewClose>>", lambda event: self._refresh_tree_layout())
+        self.preview_tree.bind("<ButtonRelease-1>", self._on_tree_click)
+        self.preview_tree.bind("<Delete>", self._on_tree_delete)
+        self._tree_shown = False
+        # Planned overwrites (presorted, grouped) and rows inserted so far per group
+        self._model = PreviewModel()
+        self._loaded = {}
+        # .bak backup files, listed in their own group after the planned overwrites
+        self._backups = []
     
     def update_status(self, text: str, color: str = "black"):
         """Update the status label text and color.
@@ -134,150 +205,223 @@ class FolderItem:
     def update_preview(self, items):
         """Update the planned overwrite preview UI for this folder item.
         
-        Each item in `items` should be a dict with:
+        `items` is a PreviewModel (build it off the Tk thread for big plans) or
+        a list of dicts with:
             - relative: Relative file path within the sync scope
             - timestamp: Human-readable last modified timestamp string
             - action: The underlying planned action object
-        """
-        # [Created-or-Modified] by Sonnet 4.5 | 2025-12-04_03
-        
-        # Clear any existing rows and label mapping
-        for child in self.preview_frame.winfo_children():
-            child.destroy()
-        
-        # Reset preview mapping so executed rows can be marked later
-        self._preview_rows = {}
-        
-        if not items:
-            return
-        
-        # Header row showing planned updates (before execution)
-        header_frame = ttk.Frame(self.preview_frame)
-        header_frame.pack(fill=tk.X, pady=(0, 1))
-        self._preview_header_label = ttk.Label(
-            header_frame,
-            text="These files will be updated:",
-            anchor=tk.W,
-            justify=tk.LEFT,
-            font=("TkDefaultFont", 8, "bold"),
-        )
-        self._preview_header_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
-        # Sort so that:
-        # - Root-level files (no "/") appear first
-        # - Then entries are grouped by their first path segment so "rules" comes before "rules-architect"
-        # - Within each group, paths are sorted lexicographically, giving patterns like:
-        #   "root" → "root/rules" → "root/rules-architect" → "root/rules-ask"
-        def _sort_key(item):
-            rel = item.get("relative", "") or ""
-            rel_str = str(rel)
-            
-            # Root-level: no "/" in path
-            if "/" not in rel_str:
-                return (0, rel_str.lower())
-            
-            # Nested: group by first segment so "rules/..." sorts before "rules-architect/..."
-            first_segment = rel_str.split("/", 1)[0]
-            return (1, first_segment.lower(), rel_str.lower())
+        Only the group nodes are created here; rows appear when a group is opened.
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        self._model = items if isinstance(items, PreviewModel) else PreviewModel(items or ())
+        tree = self.preview_tree
+        for iid in tree.get_children(""):
+            if iid != _BAK_GROUP:
+                tree.delete(iid)
+        self._loaded = {}
         
-        sorted_items = sorted(items, key=_sort_key)
+        groups = self._model.groups()
+        for index, group in enumerate(groups):
+            self._insert_group(group, index)
+        # A single small group is shown expanded, like a plain list
+        if len(groups) == 1 and self._model.group_size(groups[0]) <= PREVIEW_CHUNK:
+            self._fill_group(groups[0])
+            tree.item(_group_iid(groups[0]), open=True)
         
-        for item in sorted_items:
-            row_frame = ttk.Frame(self.preview_frame)
-            row_frame.pack(fill=tk.X, pady=(0, 1))
-            
-            text = f"- {item.get('relative', '')}  {item.get('timestamp', '')}"
-            label = ttk.Label(
-                row_frame,
-                text=text,
-                anchor=tk.W,
-                justify=tk.LEFT,
-                font=("TkDefaultFont", 8),
-                foreground=GRAY_PREVIEW,
-            )
-            label.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            
-            # Track label widget by relative path for later updates (e.g., marking as replaced)
-            rel_key = str(item.get("relative", "") or "")
-            self._preview_rows[rel_key] = label
-            
-            # Per-file "X" button to remove this planned overwrite from the queue
-            if self.overwrite_remove_callback is not None and "action" in item:
-                remove_button = ttk.Button(
-                    row_frame,
-                    text="X",
-                    width=2,
-                    command=lambda action=item["action"]: self.overwrite_remove_callback(action),
-                    style="AFMini.TButton",
-                )
-                remove_button.pack(side=tk.RIGHT, padx=(5, 0))
+        self._show_header("These files will be updated:" if self._model else None)
+        self._refresh_tree_layout()
     
     def reset_status(self):
         """Reset the status label, progress bar, and preview area to initial states."""
-        # [Created-or-Modified] by openai/gpt-5.1 | 2025-12-04_02
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
         self.status_label.config(text="", foreground=FG_PRIMARY)
         self.progress_bar["value"] = 0
-        for child in self.preview_frame.winfo_children():
-            child.destroy()
-        # Reset preview label mapping as well
-        self._preview_rows = {}
-        # Reset backup rows tracking
-        self._backup_rows = []
+        self.preview_tree.delete(*self.preview_tree.get_children(""))
+        self._model = PreviewModel()
+        self._loaded = {}
+        self._backups = []
+        self._show_header(None)
+        self._refresh_tree_layout()
     
     def update_preview_header_to_completed(self) -> None:
         """Update the preview header from 'will be' to 'are now' after execution completes."""
-        # [Created] by Sonnet 4.5 | 2025-12-04_03
-        if hasattr(self, "_preview_header_label") and self._preview_header_label:
-            self._preview_header_label.config(text="These files are now updated:")
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        if self._model:
+            self._show_header("These files are now updated:")
     
     def mark_preview_replaced(self, relative_path: str) -> None:
         """Mark a single preview row as replaced for the given relative path."""
-        # [Created-or-Modified] by Sonnet 4.5 | 2025-12-04_03
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
         if not relative_path:
             return
         key = str(relative_path)
-        label = getattr(self, "_preview_rows", {}).get(key)
-        if label is None:
+        if not self._model.mark_replaced(key):
             return
-        # Prefix with a checkmark once and change color to green to indicate replacement
-        current_text = label.cget("text")
-        if not current_text.startswith("✓ "):
-            label.config(text=f"✓ {current_text}", foreground="green")
+        # Rows not inserted yet pick up the mark when their group is opened
+        iid = _row_iid(key)
+        if self.preview_tree.exists(iid):
+            self.preview_tree.item(iid, text=f"✓ {_row_name(key)}", tags=("replaced",))
     
-    def show_backup_files(self, relative_paths: list[str]) -> None:
-        """Append rows for .bak backup files under this folder."""
-        # [Created-or-Modified] by openai/gpt-5.1 | 2025-12-04_01
-        # First remove any existing backup rows so this call fully refreshes the .bak display
-        for row in getattr(self, "_backup_rows", []):
-            try:
-                row.destroy()
-            except Exception:
-                # Fail soft; stale widgets should not break the GUI
-                pass
-        self._backup_rows = []
-
-        if not relative_paths:
+    def remove_preview_row(self, relative_path: str) -> None:
+        """Remove the planned-overwrite row of one relative path, leaving other rows untouched."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        key = str(relative_path)
+        if self._model.remove(key) is None:
             return
-
+        tree = self.preview_tree
+        group = group_key(key)
+        iid = _row_iid(key)
+        if tree.exists(iid):
+            tree.delete(iid)
+            # Inserted rows are always the first ones of their group
+            self._loaded[group] = self._loaded.get(group, 1) - 1
+        if self._model.group_size(group):
+            tree.item(_group_iid(group), text=self._group_text(group))
+            self._update_more_row(group)
+        elif tree.exists(_group_iid(group)):
+            tree.delete(_group_iid(group))
+            self._loaded.pop(group, None)
+        if not self._model:
+            # Last row gone: drop the header too
+            self._show_header(None)
+        self._refresh_tree_layout()
+    
+    def show_backup_files(self, relative_paths: list[str]) -> None:
+        """List .bak backup files under this folder in their own collapsed group."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        # Replace any existing backup group so this call fully refreshes the .bak display
+        tree = self.preview_tree
+        if tree.exists(_BAK_GROUP):
+            tree.delete(_BAK_GROUP)
+        self._loaded.pop(_BAK_GROUP, None)
         # Keep display ordering stable and case-insensitive
-        for rel in sorted(relative_paths, key=lambda p: str(p).lower()):
-            row_frame = ttk.Frame(self.preview_frame)
-            row_frame.pack(fill=tk.X, pady=(0, 1))
-
-            text = f"  .bak: {rel}"
-            label = ttk.Label(
-                row_frame,
-                text=text,
-                anchor=tk.W,
-                justify=tk.LEFT,
-                font=("TkDefaultFont", 8),
-                foreground=GRAY_BAK,
+        self._backups = sorted((str(p) for p in relative_paths or ()), key=str.lower)
+        if self._backups:
+            tree.insert(
+                "", "end", iid=_BAK_GROUP, text=f".bak files ({len(self._backups)})",
+                open=False, tags=("bak",),
             )
-            label.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            # Track backup rows so they can be cleared independently of main preview rows
-            self._backup_rows.append(row_frame)
-        # Note: we intentionally do not add these labels to _preview_rows so they
-        # are not affected by checkmarks or per-file removal controls.
+            # Placeholder child so the group can be expanded; replaced on first open
+            tree.insert(_BAK_GROUP, "end", iid=_placeholder_iid(_BAK_GROUP))
+            self._loaded[_BAK_GROUP] = 0
+        self._refresh_tree_layout()
+    
+    # ------------------------------------------------------------------ tree helpers
+    
+    def _group_text(self, group: str) -> str:
+        count = self._model.group_size(group)
+        name = f"{group}/" if group else "(top level)"
+        return f"{name}  ({count} file{'s' if count != 1 else ''})"
+    
+    def _insert_group(self, group: str, index: int) -> None:
+        iid = _group_iid(group)
+        self.preview_tree.insert("", index, iid=iid, text=self._group_text(group), open=False, tags=("group",))
+        # Placeholder child so the group can be expanded; replaced on first open
+        self.preview_tree.insert(iid, "end", iid=_placeholder_iid(group))
+        self._loaded[group] = 0
+    
+    def _fill_group(self, group: str) -> None:
+        """Insert the next PREVIEW_CHUNK rows of a group (planned files or .bak files)."""
+        tree = self.preview_tree
+        for iid in (_placeholder_iid(group), _more_iid(group)):
+            if tree.exists(iid):
+                tree.delete(iid)
+        start = self._loaded.get(group, 0)
+        if group == _BAK_GROUP:
+            backups = self._backups[start:start + PREVIEW_CHUNK]
+            for rel in backups:
+                tree.insert(_BAK_GROUP, "end", text=f".bak: {rel}", tags=("bak",))
+            self._loaded[group] = start + len(backups)
+        else:
+            rows = self._model.rows(group, start, PREVIEW_CHUNK)
+            parent = _group_iid(group)
+            removable = self.overwrite_remove_callback is not None
+            for item in rows:
+                rel = str(item.get("relative", "") or "")
+                replaced = self._model.is_replaced(rel)
+                tree.insert(
+                    parent, "end", iid=_row_iid(rel),
+                    text=f"✓ {_row_name(rel)}" if replaced else _row_name(rel),
+                    values=(item.get("timestamp", ""), "✕" if removable and "action" in item else ""),
+                    tags=("replaced",) if replaced else ("file",),
+                )
+            self._loaded[group] = start + len(rows)
+        self._update_more_row(group)
+    
+    def _update_more_row(self, group: str) -> None:
+        """Show, update or drop the "... N more" row at the end of an opened group."""
+        tree = self.preview_tree
+        if tree.exists(_placeholder_iid(group)):
+            return
+        total = len(self._backups) if group == _BAK_GROUP else self._model.group_size(group)
+        remaining = total - self._loaded.get(group, 0)
+        iid = _more_iid(group)
+        if remaining <= 0:
+            if tree.exists(iid):
+                tree.delete(iid)
+            return
+        text = f"... {remaining} more (click to show)"
+        if tree.exists(iid):
+            tree.item(iid, text=text)
+        else:
+            parent = _BAK_GROUP if group == _BAK_GROUP else _group_iid(group)
+            tree.insert(parent, "end", iid=iid, text=text, tags=("more",))
+    
+    def _on_tree_open(self, event) -> None:
+        iid = self.preview_tree.focus()
+        group = _BAK_GROUP if iid == _BAK_GROUP else _iid_group(iid, "g:")
+        if group is not None and self.preview_tree.exists(_placeholder_iid(group)):
+            self._fill_group(group)
+        self._refresh_tree_layout()
+    
+    def _on_tree_click(self, event) -> None:
+        tree = self.preview_tree
+        iid = tree.identify_row(event.y)
+        group = _iid_group(iid, "m:")
+        if group is not None:
+            self._fill_group(group)
+            self._refresh_tree_layout()
+            return
+        # The last column holds the per-file "X" that drops the planned overwrite
+        if tree.identify_column(event.x) == "#2":
+            self._request_remove([iid])
+    
+    def _on_tree_delete(self, event) -> None:
+        self._request_remove(self.preview_tree.selection())
+    
+    def _request_remove(self, iids) -> None:
+        if self.overwrite_remove_callback is None:
+            return
+        for iid in list(iids):
+            rel = _iid_group(iid, "f:")
+            item = self._model.item(rel) if rel is not None else None
+            if item is not None and "action" in item:
+                self.overwrite_remove_callback(item["action"])
+    
+    def _show_header(self, text) -> None:
+        label = self._preview_header_label
+        if text is None:
+            label.pack_forget()
+            return
+        label.config(text=text)
+        if not label.winfo_manager():
+            label.pack(fill=tk.X, pady=(0, 1), before=self._tree_frame if self._tree_shown else None)
+    
+    def _refresh_tree_layout(self) -> None:
+        """Size the list to its visible rows (up to PREVIEW_MAX_HEIGHT) and hide it when empty."""
+        tree = self.preview_tree
+        top = tree.get_children("")
+        if not top:
+            if self._tree_shown:
+                self._tree_frame.pack_forget()
+                self._tree_shown = False
+            return
+        visible = len(top) + sum(len(tree.get_children(i)) for i in top if tree.item(i, "open"))
+        tree.configure(height=max(1, min(visible, PREVIEW_MAX_HEIGHT)))
+        if not self._tree_shown:
+            self._tree_frame.pack(fill=tk.X)
+            self._tree_shown = True
     
     def _on_favorite_toggle(self):
         """Handle favorite button toggle.
@@ -0,0 +1,459 @@
+# [Created-or-Modified] by [LLM model] | 2026-10-18_01
+"""
+Change watching for continuous (watch mode) syncs.
+
+Two watchers report which sync-relative paths changed since the last call:
+
+- InotifyWatcher: Linux only, uses inotify through ctypes (no extra dependency).
+  Every non-ignored directory under each .roo tree is watched, plus the base
+  folder itself for root allowlist files. New directories are watched as they
+  appear.
+- PollingWatcher: portable fallback. Each poll re-indexes the folders with an
+  in-memory ScanCache (unchanged directories are not re-listed, but files
+  are still stat'ed) and diffs
+  (size, mtime_ns) per file against the previous poll.
+
+run_watch_loop() debounces bursts of changes, then re-indexes only the affected
+paths with SyncEngine.scan_paths(), plans and executes. A watcher returns None
+instead of a set when it lost track of changes (e.g. an inotify queue
+overflow); the loop then falls back to one full scan.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .file_path_utils import has_roo_dir
+from .scan_cache import ScanCache
+from .sync_control import SyncCancelled, SyncControl
+from .sync_core import SyncEngine
+from .sync_journal import SyncJournal
+
+# inotify constants from <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+_ENTRY_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE
+)
+_TREE_MASK = _ENTRY_MASK | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+
+# struct inotify_event header: int wd; uint32 mask, cookie, len
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+# Upper bound on how long a continuous stream of changes can postpone a sync,
+# as a multiple of the debounce delay
+_MAX_DEBOUNCE_FACTOR = 10
+
+# How long the watch loop blocks while idle before re-checking its stop flag
+_IDLE_WAIT = 0.5
+
+
+def _load_libc() -> Optional[Any]:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """Return libc with inotify functions configured, or None if unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_init1.restype = ctypes.c_int
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_add_watch.restype = ctypes.c_int
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        libc.inotify_rm_watch.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class InotifyWatcher:
+    """
+    Change watcher backed by Linux inotify.
+
+    Attributes:
+        folders: Base folders being watched
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(self, engine: SyncEngine, folders: List[Path]):
+        """
+        Create the inotify instance and watch every folder.
+
+        Args:
+            engine: Sync engine whose ignore rules and root allowlist are used
+            folders: Base folders (each containing .roo) to watch
+
+        Raises:
+            OSError: If inotify is unavailable or the watch limit is exhausted
+        """
+        self._libc = _load_libc()
+        if self._libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available on this platform")
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._engine = engine
+        self._allowlist = set(engine.config.get("root_allowlist", []))
+        # wd -> (folder, .roo-relative prefix of the directory, or None for the base folder)
+        self._watches: Dict[int, Tuple[Path, Optional[str]]] = {}
+        self.folders = list(folders)
+        try:
+            for folder in self.folders:
+                self._add_watch(str(folder), folder, None, _ENTRY_MASK | _IN_ONLYDIR)
+                self._add_tree(folder, os.path.join(str(folder), ".roo"), "")
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, path: str, folder: Path, rel_prefix: Optional[str], mask: int) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Watch one directory; vanished or unreadable directories are skipped."""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, "inotify watch limit reached (fs.inotify.max_user_watches)")
+            return
+        self._watches[wd] = (folder, rel_prefix)
+
+    def _add_tree(self, folder: Path, dir_path: str, rel_prefix: str) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Watch a directory and every non-ignored directory below it."""
+        ignore_rules = self._engine._get_ignore_rules()
+        stack = [(dir_path, rel_prefix)]
+        while stack:
+            path, prefix = stack.pop()
+            self._add_watch(path, folder, prefix, _TREE_MASK)
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            if not entry.is_dir(follow_symlinks=False):
+                                continue
+                        except OSError:
+                            continue
+                        rel = prefix + entry.name
+                        if not ignore_rules.is_ignored(rel, is_dir=True):
+                            stack.append((entry.path, rel + "/"))
+            except OSError:
+                continue
+
+    def _forget_tree(self, folder: Path, rel_prefix: str) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Drop watches of a directory that was moved away, and of everything below it."""
+        for wd, (watch_folder, prefix) in list(self._watches.items()):
+            if watch_folder == folder and prefix is not None and prefix.startswith(rel_prefix):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def wait_for_changes(self, timeout: float) -> Optional[Set[str]]:
+        """
+        Wait up to timeout seconds and return the relative paths that changed.
+
+        Args:
+            timeout: Maximum number of seconds to block
+
+        Returns:
+            Set of changed paths (relative to .roo, or root allowlist keys; empty
+            when nothing changed), or None if events were lost and a full rescan
+            is required.
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        if self._fd < 0:
+            return set()
+        readable, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not readable:
+            return set()
+
+        changes: Set[str] = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                if mask & _IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    continue
+                target = self._watches.get(wd)
+                if target is not None:
+                    self._handle_event(target[0], target[1], mask, name, changes)
+        return None if overflow else changes
+
+    def _handle_event(
+        self, folder: Path, rel_prefix: Optional[str], mask: int, name: str, changes: Set[str]
+    ) -> None:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Translate one inotify event into changed relative paths."""
+        created_dir = mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO)
+        if rel_prefix is None:
+            # Base folder: only allowlisted root files and a (re)created .roo matter
+            if name in self._allowlist:
+                changes.add(name)
+            elif name == ".roo" and created_dir:
+                self._add_tree(folder, os.path.join(str(folder), ".roo"), "")
+                changes.add("")
+            return
+        if not name:
+            # The watched directory itself was deleted or moved away
+            if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                changes.add(rel_prefix.rstrip("/"))
+            return
+        rel = rel_prefix + name
+        if created_dir:
+            self._add_tree(folder, os.path.join(str(folder), ".roo", *rel.split("/")), rel + "/")
+        elif mask & _IN_ISDIR and mask & _IN_MOVED_FROM:
+            self._forget_tree(folder, rel + "/")
+        changes.add(rel)
+
+    def close(self) -> None:
+        """Release the inotify instance (and with it all watches)."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._watches = {}
+
+
+class PollingWatcher:
+    """
+    Portable change watcher that re-indexes folders at a fixed interval.
+
+    Attributes:
+        folders: Base folders being watched
+        interval: Seconds between polls
+    """
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+
+    def __init__(self, engine: SyncEngine, folders: List[Path], interval: float = 2.0):
+        """
+        Take the initial snapshot of every folder.
+
+        Args:
+            engine: Sync engine used to index folders
+            folders: Base folders (each containing .roo) to watch
+            interval: Seconds between polls
+        """
+        self._engine = engine
+        self.folders = list(folders)
+        self.interval = interval
+        # One in-memory directory cache per folder keeps polls cheap; files are
+        # still stat'ed so in-place edits are seen
+        self._caches = {str(folder): ScanCache(folder) for folder in self.folders}
+        self._snapshot = self._take_snapshot()
+        self._next_poll = time.monotonic() + interval
+
+    def _take_snapshot(self) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        """Return {(folder, relative path): (size, mtime_ns)} for all watched files."""
+        snapshot: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        for folder in self.folders:
+            folder_str = str(folder)
+            file_index = self._engine.index_folder(folder, cache=self._caches[folder_str])
+            for relative_path, entries in file_index.items():
+                for meta in entries:
+                    snapshot[(folder_str, relative_path)] = (meta["size"], meta["mtime_ns"])
+        return snapshot
+
+    def wait_for_changes(self, timeout: float) -> Optional[Set[str]]:
+        """
+        Wait for the next poll (at most timeout seconds) and return changed paths.
+
+        Args:
+            timeout: Maximum number of seconds to block
+
+        Returns:
+            Set of relative paths whose files appeared, vanished or changed in any
+            folder since the previous poll (empty if the poll is not due yet).
+        """
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        remaining = self._next_poll - time.monotonic()
+        if remaining > 0:
+            time.sleep(min(remaining, max(timeout, 0)))
+            if time.monotonic() < self._next_poll:
+                return set()
+        snapshot = self._take_snapshot()
+        self._next_poll = time.monotonic() + self.interval
+        previous, self._snapshot = self._snapshot, snapshot
+        return {
+            key[1]
+            for key in previous.keys() | snapshot.keys()
+            if previous.get(key) != snapshot.get(key)
+        }
+
+    def close(self) -> None:
+        """Release the in-memory snapshot."""
+        # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+        self._snapshot = {}
+        self._caches = {}
+
+
+def create_watcher(
+    engine: SyncEngine,
+    folders: List[Path],
+    interval: float = 2.0,
+    use_inotify: bool = True,
+):
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """
+    Return an InotifyWatcher when possible, otherwise a PollingWatcher.
+
+    Args:
+        engine: Sync engine providing config and indexing
+        folders: Base folders to watch
+        interval: Poll interval for the polling fallback
+        use_inotify: Set False to force polling
+
+    Returns:
+        Watcher object exposing wait_for_changes(timeout) and close()
+    """
+    if use_inotify:
+        try:
+            return InotifyWatcher(engine, folders)
+        except OSError:
+            pass
+    return PollingWatcher(engine, folders, interval)
+
+
+def _own_backups(changes: Set[str], written: Set[str]) -> Set[str]:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """Return the paths in changes that are timestamped backups of paths we just wrote."""
+    return {
+        rel for rel in changes
+        if rel.endswith(".bak") and rel.rsplit("_", 1)[0] in written
+    }
+
+
+def run_watch_loop(
+    engine: SyncEngine,
+    folders: List[Path],
+    debounce: float = 0.5,
+    interval: float = 2.0,
+    stop_event: Optional[threading.Event] = None,
+    use_inotify: bool = True,
+    on_cycle: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    control: Optional[SyncControl] = None,
+    journal: Optional[SyncJournal] = None,
+) -> List[Dict[str, Any]]:
+    # [Created-or-Modified] by [LLM model] | 2026-10-18_01
+    """
+    Keep folders in sync until stop_event is set or control is cancelled.
+
+    After the first change, further changes are collected until none arrived for
+    `debounce` seconds (capped at _MAX_DEBOUNCE_FACTOR * debounce), then only the
+    affected paths are re-indexed, planned and executed. Timestamped backups
+    created by the previous cycle are not treated as new files to spread.
+
+    Each cycle scans, plans and executes with control, so cancelling it (e.g. on
+    Ctrl+C, with the loop running on a worker thread) lets the copy in progress
+    finish instead of leaving a half-written temp file behind. With a journal,
+    every cycle's execution is journaled, so a crash mid-cycle is cleaned up by
+    SyncJournal.recover() like any interrupted sync.
+
+    Args:
+        engine: Configured sync engine (its event queue receives all events)
+        folders: Base folders to keep in sync; folders without .roo are ignored
+        debounce: Quiet period in seconds before a batch of changes is synced
+        interval: Poll interval for the polling fallback
+        stop_event: Optional event that ends the loop when set
+        use_inotify: Set False to force polling
+        on_cycle: Optional callback receiving the actions of every sync cycle
+        control: Optional SyncControl; the loop ends once it is cancelled
+        journal: Optional SyncJournal recording each cycle's execution
+
+    Returns:
+        Actions a cancelled cycle left unexecuted ([] if none)
+    """
+    folders = [folder for folder in folders if has_roo_dir(folder)]
+    stop_event = stop_event or threading.Event()
+    watcher = create_watcher(engine, folders, interval, use_inotify)
+    written: Set[str] = set()
+    left: List[Dict[str, Any]] = []
+
+    def stopped() -> bool:
+        return stop_event.is_set() or (control is not None and control.cancelled)
+
+    try:
+        while not stopped():
+            changes = watcher.wait_for_changes(_IDLE_WAIT)
+            if changes is not None and not changes:
+                continue
+            full_rescan = changes is None
+            pending: Set[str] = set(changes or ())
+
+            # Debounce: wait for a quiet period, bounded by a hard deadline
+            now = time.monotonic()
+            quiet_until = now + debounce
+            hard_deadline = now + debounce * _MAX_DEBOUNCE_FACTOR
+            while not stopped():
+                remaining = min(quiet_until, hard_deadline) - time.monotonic()
+                if remaining <= 0:
+                    break
+                more = watcher.wait_for_changes(remaining)
+                if more is None:
+                    full_rescan = True
+                elif not more:
+                    continue
+                else:
+                    pending |= more
+                quiet_until = time.monotonic() + debounce
+            if stopped():
+                break
+
+            pending -= _own_backups(pending, written)
+            if not full_rescan and not pending:
+                continue
+
+            try:
+                if full_rescan:
+                    file_index = engine.scan_folders(folders, control=control)
+                else:
+                    file_index = engine.scan_paths(folders, sorted(pending), control=control)
+                actions = engine.plan_actions(file_index, base_folders=folders, control=control)
+                if actions:
+                    left = engine.execute_actions(actions, control=control, journal=journal)
+            except SyncCancelled:
+                break
+            written = {action["relative_path"] for action in actions}
+            if on_cycle is not None:
+                on_cycle(actions)
+            if left:
+                break
+    finally:
+        watcher.close()
+    return left